@@ -13,27 +13,27 @@ See COPYRIGHT.md for copyright information.
 '''
 from arelle import PythonUtil # define 2.x or 3.x string types
 import gettext, time, datetime, os, shlex, sys, traceback, fnmatch, threading, json, logging, platform
+_importStartedAt = time.perf_counter()
+_modulesBeforeImport = len(sys.modules)
 from optparse import OptionGroup, OptionParser, SUPPRESS_HELP
 import regex as re
-from arelle import (Cntlr, FileSource, ModelDocument, RenderingEvaluator, XmlUtil, XbrlConst, Version,
-                    ViewFileDTS, ViewFileFactList, ViewFileFactTable, ViewFileConcepts,
-                    ViewFileFormulae, ViewFileRelationshipSet, ViewFileTests, ViewFileRssFeed,
-                    ViewFileRoleTypes,
-                    ModelManager)
+from arelle import Cntlr, FileSource, ModelDocument, XmlUtil, XbrlConst, Version, ModelManager
 from arelle.BetaFeatures import BETA_FEATURES_AND_DESCRIPTIONS
 from arelle.ModelValue import qname
 from arelle.Locale import format_string, setApplicationLocale, setDisableRTL
 from arelle.ModelFormulaObject import FormulaOptions
-from arelle import PluginManager
+from arelle import DocumentCache, PluginManager
 from arelle.PluginManager import pluginClassMethods
 from arelle.SocketUtils import INTERNET_CONNECTIVITY, OFFLINE
 from arelle.UrlUtil import isHttpUrl
 from arelle.Version import copyrightLabel
 from arelle.WebCache import proxyTuple
-from arelle.SystemInfo import get_system_info
-from pprint import pprint
 import logging
 from lxml import etree
+# subsystems used only by some options (views, rendering, formula grammar, versioning, ...) are imported
+# where those options are processed, the startup imports are reported by --showEnvironment
+startupImportTime = time.perf_counter() - _importStartedAt
+startupImportedModules = len(sys.modules) - _modulesBeforeImport
 win32file = win32api = win32process = pywintypes = None
 STILL_ACTIVE = 259 # MS Windows process status constants
 PROCESS_QUERY_INFORMATION = 0x400
@@ -152,6 +152,8 @@ def parseAndRun(args):
                       help=_("Select Edgar Filer Manual (U.S. SEC) disclosure system validation (strict)."))
     parser.add_option("--efm-skip-calc-tree", action="store_false", default=True, dest="validateEFMCalcTree",
                       help=_("Skip walking of calculation tree during EFM validation."))
+    parser.add_option("--textBlockValidationProcesses", "--textblockvalidationprocesses", type="int", action="store", dest="textBlockValidationProcesses",
+                      help=_("Specify the number of processes to validate distinct text block fact values in parallel during EFM, FERC or GFM validation."))
     parser.add_option("--gfm", action="store", dest="disclosureSystemName", help=SUPPRESS_HELP)
     parser.add_option("--disclosureSystem", "--disclosuresystem", action="store", dest="disclosureSystemName",
                       help=_("Specify a disclosure system name and"
@@ -189,6 +191,11 @@ def parseAndRun(args):
                       help=_("Write presentation linkbase into FILE"))
     parser.add_option("--table", "--csvTable", action="store", dest="tableFile",
                       help=_("Write table linkbase into FILE"))
+    parser.add_option("--renderedTables", "--renderedtables", action="store", dest="renderedTablesFile",
+                      help=_("Write each rendered table of the table linkbase into its own file beside FILE, "
+                             "of FILE's extension (html, or xml for the table model infoset), and an html index of the tables into FILE."))
+    parser.add_option("--tableRenderingProcesses", "--tablerenderingprocesses", type="int", action="store", dest="tableRenderingProcesses",
+                      help=_("Specify the number of processes to render tables of --renderedTables in parallel (requires fork, e.g. Linux)."))
     parser.add_option("--cal", "--csvCal", action="store", dest="calFile",
                       help=_("Write calculation linkbase into FILE"))
     parser.add_option("--dim", "--csvDim", action="store", dest="dimFile",
@@ -219,6 +226,11 @@ def parseAndRun(args):
                       help=_("Skip DTS activities (loading, discovery, validation), useful when an instance needs only to be parsed."))
     parser.add_option("--skipLoading", "--skiploading", action="store", dest="skipLoading",
                       help=_("Skip loading discovered or schemaLocated files matching pattern (unix-style file name patterns separated by '|'), useful when not all linkbases are needed."))
+    parser.add_option("--discoveryThreads", "--discoverythreads", type="int", action="store", dest="discoveryThreads",
+                      help=_("Specify the number of threads to read and parse discovered documents in parallel during DTS discovery."))
+    parser.add_option("--documentCacheSize", "--documentcachesize", type="int", action="store", dest="documentCacheSize",
+                      help=_("Specify the size (in MB of document source) of a cache of parsed discovered documents, "
+                             "kept by a long running process (such as the web server) for subsequent loads of unchanged documents."))
     parser.add_option("--logFile", "--logfile", action="store", dest="logFile",
                       help=_("Write log messages into file, otherwise they go to standard output.  "
                              "If file ends in .xml it is xml-formatted, otherwise it is text. "))
@@ -271,6 +283,7 @@ def parseAndRun(args):
     parser.add_option("--formulaVarExpressionEvaluation", "--formulavarexpressionevaluation", action="store_true", dest="formulaVarExpressionEvaluation", help=_("Specify formula tracing."))
     parser.add_option("--formulaVarExpressionResult", "--formulavarexpressionresult", action="store_true", dest="formulaVarExpressionResult", help=_("Specify formula tracing."))
     parser.add_option("--formulaVarFilterWinnowing", "--formulavarfilterwinnowing", action="store_true", dest="formulaVarFilterWinnowing", help=_("Specify formula tracing."))
+    parser.add_option("--formulaVarFilterPlan", "--formulavarfilterplan", action="store_true", dest="formulaVarFilterPlan", help=_("Specify formula tracing of fact variable filter plans (index lookups ordered by selectivity, then remaining filters)."))
     parser.add_option("--formulaVarFiltersResult", "--formulavarfiltersresult", action="store_true", dest="formulaVarFiltersResult", help=_("Specify formula tracing."))
     parser.add_option("--testcaseResultsCaptureWarnings", "--testcaseresultscapturewarnings", action="store_true", dest="testcaseResultsCaptureWarnings",
                       help=_("For testcase variations capture warning results, default is inconsistency or warning if there is any warning expected result.  "))
@@ -279,6 +292,8 @@ def parseAndRun(args):
     parser.add_option("--formulaRunIDs", "--formularunids", action="store", dest="formulaRunIDs", help=_("Specify formula/assertion IDs to run, separated by a '|' character, or a regex expression."))
     parser.add_option("--formulaCompileOnly", "--formulacompileonly", action="store_true", dest="formulaCompileOnly", help=_("Specify formula are to be compiled but not executed."))
     parser.add_option("--formulaCacheSize", "--formulacachesize", action="store", dest="formulaCacheSize", help=_("Specify the number of fact aspect combinations to cache during formula evaluations. Negative numbers have no limit. (10_000_000 is default)"))
+    parser.add_option("--formulaParallelProcesses", "--formulaparallelprocesses", type="int", action="store", dest="formulaParallelProcesses", help=_("Specify the number of processes to evaluate independent value and existence assertions in parallel (requires fork, e.g. Linux)."))
+    parser.add_option("--formulaResultCache", "--formularesultcache", action="store_true", dest="formulaResultCache", help=_("Reuse the results and messages of value and existence assertions whose definitions and potentially bound facts are unchanged since a prior run of the same entry point."))
     parser.add_option(UILANG_OPTION, UILANG_OPTION.lower(), action="store", dest="uiLang",
                       help=_("Language for user interface (override system settings, such as program messages).  Does not save setting.  Requires locale country code, e.g. en-GB or en-US."))
     parser.add_option("--proxy", action="store", dest="proxy",
@@ -421,6 +436,8 @@ def parseAndRun(args):
                     bottleCopyright="\n   Bottle (c) 2011-2013 Marcel Hellkamp" if hasWebServer else ""
         ))
     elif options.diagnostics:
+        from pprint import pprint
+        from arelle.SystemInfo import get_system_info
         pprint(get_system_info())
     elif options.disclosureSystemName in ("help", "help-verbose"):
         text = _("Disclosure system choices: \n{0}").format(' \n'.join(cntlr.modelManager.disclosureSystem.dirlist(options.disclosureSystemName)))
@@ -439,7 +456,7 @@ def parseAndRun(args):
         # webserver incompatible with file operations
         if any((options.entrypointFile, options.importFiles, options.diffFile, options.versReportFile,
                 options.factsFile, options.factListCols, options.factTableFile, options.factTableCols, options.relationshipCols,
-                options.conceptsFile, options.preFile, options.tableFile, options.calFile, options.dimFile, options.anchFile, options.formulaeFile, options.viewArcrole, options.viewFile,
+                options.conceptsFile, options.preFile, options.tableFile, options.renderedTablesFile, options.calFile, options.dimFile, options.anchFile, options.formulaeFile, options.viewArcrole, options.viewFile,
                 options.roleTypesFile, options.arcroleTypesFile
                 )):
             parser.error(_("incorrect arguments with --webserver, please try\n  python CntlrCmdLine.py --help"))
@@ -676,6 +693,11 @@ class CntlrCmdLine(Cntlr.Cntlr):
             from arelle import PackageManager
             savePackagesChanges = True
             showPackages = False
+            # validate and index packages not yet cached in parallel, messages are reported in command order below
+            PackageManager.indexPackages(self, [cmd[1:] if cmd.startswith("+") else cmd
+                                                for cmd in (packageCmd.strip() for packageCmd in options.packages.split('|'))
+                                                if cmd not in ("show", "temp") and not cmd.startswith(("~", "-"))],
+                                         options.packageManifestName)
             for packageCmd in options.packages.split('|'):
                 cmd = packageCmd.strip()
                 if cmd == "show":
@@ -730,6 +752,15 @@ class CntlrCmdLine(Cntlr.Cntlr):
             for envVar in ("XDG_CONFIG_HOME",):
                 if envVar in os.environ:
                     self.addToLog(_("XDG_CONFIG_HOME={0}").format(os.environ[envVar]))
+            self.addToLog(_("Command line startup: {0} modules imported in {1:.3f} sec, {2} modules now loaded ({3} arelle modules)").format(
+                          startupImportedModules, startupImportTime, len(sys.modules),
+                          sum(1 for moduleName in sys.modules if moduleName.startswith("arelle."))))
+            for moduleName, moduleInfo in sorted(PluginManager.pluginConfig.get("modules", {}).items()):
+                if moduleName in PluginManager.moduleImportTimes:
+                    self.addToLog(_("Plug-in {0}: imported at startup in {1:.3f} sec").format(
+                                  moduleName, PluginManager.moduleImportTimes[moduleName]))
+                elif moduleInfo.get("status") == "enabled":
+                    self.addToLog(_("Plug-in {0}: not imported at startup (imported when its class methods are first used)").format(moduleName))
             return True
 
         self.modelManager.customTransforms = None # clear out prior custom transforms
@@ -803,6 +834,13 @@ class CntlrCmdLine(Cntlr.Cntlr):
             self.modelManager.abortOnMajorError = True
         if options.collectProfileStats:
             self.modelManager.collectProfileStats = True
+            PluginManager.setCollectClassMethodStats(True)
+        if options.textBlockValidationProcesses:
+            self.modelManager.textBlockValidationProcesses = options.textBlockValidationProcesses
+        if options.discoveryThreads:
+            self.modelManager.discoveryThreads = options.discoveryThreads
+        if options.documentCacheSize:
+            self.modelManager.documentCacheSize = options.documentCacheSize
         if options.outputAttribution:
             self.modelManager.outputAttribution = options.outputAttribution
         self.modelManager.validateTestcaseSchema = options.validateTestcaseSchema
@@ -864,6 +902,8 @@ class CntlrCmdLine(Cntlr.Cntlr):
             fo.timeVariableSetEvaluation = True
         if options.formulaVarFilterWinnowing:
             fo.traceVariableFilterWinnowing = True
+        if options.formulaVarFilterPlan:
+            fo.traceVariableFilterPlan = True
         if options.formulaVarFiltersResult:
             fo.traceVariableFiltersResult = True
         if options.testcaseResultsCaptureWarnings:
@@ -878,6 +918,10 @@ class CntlrCmdLine(Cntlr.Cntlr):
             fo.formulaAction = options.formulaAction
         if options.formulaCacheSize:
             fo.cacheSize = options.formulaCacheSize
+        if options.formulaParallelProcesses:
+            fo.parallelProcesses = options.formulaParallelProcesses
+        if options.formulaResultCache:
+            fo.resultCache = True
         self.modelManager.formulaOptions = fo
 
         # run utility command line options that don't depend on entrypoint Files
@@ -959,6 +1003,7 @@ class CntlrCmdLine(Cntlr.Cntlr):
                                             (loadTime, timeNow)),
                                             messageCode="info", file=self.entrypointFile)
                 if modelXbrl.hasTableRendering:
+                    from arelle import RenderingEvaluator
                     RenderingEvaluator.init(modelXbrl)
                 if options.importFiles:
                     for importFile in options.importFiles.split("|"):
@@ -1051,37 +1096,56 @@ class CntlrCmdLine(Cntlr.Cntlr):
                                                     messageCode="info", file=self.entrypointFile)
 
 
+                    # views are only imported when a view option requests them
                     if options.testReport:
+                        from arelle import ViewFileTests
                         ViewFileTests.viewTests(self.modelManager.modelXbrl, options.testReport, options.testReportCols)
 
                     if options.rssReport:
+                        from arelle import ViewFileRssFeed
                         ViewFileRssFeed.viewRssFeed(self.modelManager.modelXbrl, options.rssReport, options.rssReportCols)
 
                     if options.DTSFile:
+                        from arelle import ViewFileDTS
                         ViewFileDTS.viewDTS(modelXbrl, options.DTSFile)
                     if options.factsFile:
+                        from arelle import ViewFileFactList
                         ViewFileFactList.viewFacts(modelXbrl, options.factsFile, labelrole=options.labelRole, lang=options.labelLang, cols=options.factListCols)
                     if options.factTableFile:
+                        from arelle import ViewFileFactTable
                         ViewFileFactTable.viewFacts(modelXbrl, options.factTableFile, labelrole=options.labelRole, lang=options.labelLang, cols=options.factTableCols)
                     if options.conceptsFile:
+                        from arelle import ViewFileConcepts
                         ViewFileConcepts.viewConcepts(modelXbrl, options.conceptsFile, labelrole=options.labelRole, lang=options.labelLang)
                     if options.preFile:
+                        from arelle import ViewFileRelationshipSet
                         ViewFileRelationshipSet.viewRelationshipSet(modelXbrl, options.preFile, "Presentation Linkbase", XbrlConst.parentChild, labelrole=options.labelRole, lang=options.labelLang, cols=options.relationshipCols)
                     if options.tableFile:
+                        from arelle import ViewFileRelationshipSet
                         ViewFileRelationshipSet.viewRelationshipSet(modelXbrl, options.tableFile, "Table Linkbase", "Table-rendering", labelrole=options.labelRole, lang=options.labelLang)
+                    if options.renderedTablesFile:
+                        from arelle import ViewFileRenderedGrid
+                        ViewFileRenderedGrid.viewRenderedGrids(modelXbrl, options.renderedTablesFile, lang=options.labelLang, processes=options.tableRenderingProcesses)
                     if options.calFile:
+                        from arelle import ViewFileRelationshipSet
                         ViewFileRelationshipSet.viewRelationshipSet(modelXbrl, options.calFile, "Calculation Linkbase", XbrlConst.summationItem, labelrole=options.labelRole, lang=options.labelLang, cols=options.relationshipCols)
                     if options.dimFile:
+                        from arelle import ViewFileRelationshipSet
                         ViewFileRelationshipSet.viewRelationshipSet(modelXbrl, options.dimFile, "Dimensions", "XBRL-dimensions", labelrole=options.labelRole, lang=options.labelLang, cols=options.relationshipCols)
                     if options.anchFile:
+                        from arelle import ViewFileRelationshipSet
                         ViewFileRelationshipSet.viewRelationshipSet(modelXbrl, options.anchFile, "Anchoring", XbrlConst.widerNarrower, labelrole=options.labelRole, lang=options.labelLang, cols=options.relationshipCols)
                     if options.formulaeFile:
+                        from arelle import ViewFileFormulae
                         ViewFileFormulae.viewFormulae(modelXbrl, options.formulaeFile, "Formulae", lang=options.labelLang)
                     if options.viewArcrole and options.viewFile:
+                        from arelle import ViewFileRelationshipSet
                         ViewFileRelationshipSet.viewRelationshipSet(modelXbrl, options.viewFile, os.path.basename(options.viewArcrole), options.viewArcrole, labelrole=options.labelRole, lang=options.labelLang, cols=options.relationshipCols)
                     if options.roleTypesFile:
+                        from arelle import ViewFileRoleTypes
                         ViewFileRoleTypes.viewRoleTypes(modelXbrl, options.roleTypesFile, "Role Types", isArcrole=False, lang=options.labelLang)
                     if options.arcroleTypesFile:
+                        from arelle import ViewFileRoleTypes
                         ViewFileRoleTypes.viewRoleTypes(modelXbrl, options.arcroleTypesFile, "Arcrole Types", isArcrole=True, lang=options.labelLang)
                     for pluginXbrlMethod in pluginClassMethods("CntlrCmdLine.Xbrl.Run"):
                         pluginXbrlMethod(self, options, modelXbrl, _entrypoint, responseZipStream=responseZipStream)
@@ -1104,6 +1168,8 @@ class CntlrCmdLine(Cntlr.Cntlr):
                 modelXbrl.profileStat(_("total"), time.time() - firstStartedAt)
                 if options.collectProfileStats and modelXbrl:
                     modelXbrl.logProfileStats()
+                    PluginManager.logClassMethodStats(self)
+                    DocumentCache.logStats(self)
                 if not options.keepOpen:
                     if modelDiffReport:
                         self.modelManager.close(modelDiffReport)
@@ -44,6 +44,7 @@ from arelle import (DialogURL, DialogLanguage,
                     ModelDocument,
                     ModelManager,
                     PackageManager,
+                    PluginManager,
                     RenderingEvaluator,
                     TableStructure,
                     ViewWinDTS,
@@ -238,6 +239,7 @@ class CntlrWinMain (Cntlr.Cntlr):
         logmsgMenu.add_command(label=_("Clear"), underline=0, command=self.logClear)
         logmsgMenu.add_command(label=_("Save to file"), underline=0, command=self.logSaveToFile)
         self.modelManager.collectProfileStats = self.config.setdefault("collectProfileStats",False)
+        PluginManager.setCollectClassMethodStats(self.modelManager.collectProfileStats)
         self.collectProfileStats = BooleanVar(value=self.modelManager.collectProfileStats)
         self.collectProfileStats.trace("w", self.setCollectProfileStats)
         logmsgMenu.add_checkbutton(label=_("Collect profile stats"), underline=0, variable=self.collectProfileStats, onvalue=True, offvalue=False)
@@ -981,6 +983,7 @@ class CntlrWinMain (Cntlr.Cntlr):
         modelXbrl = self.modelManager.modelXbrl
         if modelXbrl and self.modelManager.collectProfileStats:
             modelXbrl.logProfileStats()
+            PluginManager.logClassMethodStats(self)
 
     def clearProfileStats(self):
         modelXbrl = self.modelManager.modelXbrl
@@ -1305,6 +1308,7 @@ class CntlrWinMain (Cntlr.Cntlr):
 
     def setCollectProfileStats(self, *args):
         self.modelManager.collectProfileStats = self.collectProfileStats.get()
+        PluginManager.setCollectClassMethodStats(self.modelManager.collectProfileStats)
         self.config["collectProfileStats"] = self.modelManager.collectProfileStats
         self.saveConfig()
 
@@ -75,6 +75,7 @@ class DisclosureSystem:
         self.mappingsUrl = os.path.join(self.modelManager.cntlr.configDir, "mappings.xml")
         self.mappedFiles = {}
         self.mappedPaths = []
+        self.mappedPathsTrie = None
         self.utrUrl = ["http://www.xbrl.org/utr/utr.xml"]
         self.utrStatusFilters = None
         self.utrTypeEntries = None
@@ -356,10 +357,12 @@ class DisclosureSystem:
             mappedUrl = self.mappedFiles[url]
         else:  # handle mapped paths
             mappedUrl = url
-            for mapFrom, mapTo in self.mappedPaths:
-                if url.startswith(mapFrom):
-                    mappedUrl = mapTo + url[len(mapFrom):]
-                    break
+            if self.mappedPathsTrie is None or not self.mappedPathsTrie.isBuiltFrom(self.mappedPaths):
+                self.mappedPathsTrie = UrlUtil.UrlPrefixTrie(self.mappedPaths)
+            match = self.mappedPathsTrie.firstMatch(url)
+            if match is not None:
+                _order, mapFrom, mapTo = match
+                mappedUrl = mapTo + url[len(mapFrom):]
         return mappedUrl
 
     def uriAuthorityValid(self, uri):
@@ -0,0 +1,166 @@
+'''
+Concurrent reading and parsing of documents referenced during DTS discovery.
+
+When discovery loads a document, the not yet loaded documents it references (schema imports,
+includes and redefines, schemaRefs, linkbaseRefs, locs, roleRefs and arcroleRefs) form a wave
+which is read and parsed in a thread pool (lxml releases the GIL while parsing) while the loading
+thread continues modeling documents depth first.  ModelDocument.load takes a document's parsed
+tree from its prefetch instead of reading and parsing it, when the file it would read is the
+file that was prefetched, unchanged, so documents are modeled, urlDocs and namespaceDocs are
+ordered and messages are logged as in serial discovery.  Prefetch failures are ignored, the
+loading thread repeats the read and parse and reports any errors.
+
+Documents are only prefetched from local files, the web cache (without retrieval) and zip
+archives, and not when plug-ins customize loading or file access.  Documents the process's document
+cache (DocumentCache) would provide are parsed into that cache for the loading thread to copy.
+
+See COPYRIGHT.md for copyright information.
+'''
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from lxml import etree
+
+from arelle import UrlUtil, XbrlConst
+from arelle.FileSource import archiveFilenameParts
+from arelle.ModelObjectFactory import parser
+from arelle.PluginManager import pluginClassMethods
+
+if TYPE_CHECKING:
+    from arelle.ModelXbrl import ModelXbrl
+
+REFERENCES = etree.XPath(
+    "(//xsd:import|//xsd:include|//xsd:redefine)[not(ancestor-or-self::*/@xml:base)]/@schemaLocation | "
+    "(//link:schemaRef|//link:linkbaseRef|//link:loc|//link:roleRef|//link:arcroleRef)[not(ancestor-or-self::*/@xml:base)]/@xlink:href",
+    namespaces={"xsd": XbrlConst.xsd, "link": XbrlConst.link, "xlink": XbrlConst.xlink},
+    smart_strings=False)
+
+_pluginClassesCustomizingLoading = ("ModelDocument.CustomLoader", "FileSource.File")
+
+
+class PrefetchedDocument:
+    """
+    .. class:: PrefetchedDocument(filepath, fileStat, xmlDocument, encoding, parserLookups, errors)
+
+    Parse of a prefetched file, with its parser (and parser element class lookups) and syntax errors.
+    """
+    __slots__ = ("filepath", "fileStat", "xmlDocument", "encoding", "parserLookups", "errors")
+
+    def __init__(self, filepath, fileStat, xmlDocument, encoding, parserLookups, errors):
+        self.filepath = filepath
+        self.fileStat = fileStat
+        self.xmlDocument = xmlDocument
+        self.encoding = encoding
+        self.parserLookups = parserLookups
+        self.errors = errors
+
+
+class DiscoveryPrefetcher:
+    """
+    .. class:: DiscoveryPrefetcher(modelXbrl, threads)
+
+    Reads and parses documents referenced by discovered documents in a pool of threads.
+    """
+    def __init__(self, modelXbrl, threads):
+        self.modelXbrl = modelXbrl
+        self.webCache = modelXbrl.modelManager.cntlr.webCache
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="arelle-discovery")
+        self.prefetches = {}  # future of PrefetchedDocument (or None) by normalized url
+
+    def scheduleReferences(self, modelDocument, rootElement):
+        ''' prefetches not yet loaded documents referenced by modelDocument '''
+        if modelDocument.skipDTS:
+            return
+        modelXbrl = self.modelXbrl
+        urls = set()
+        for href in REFERENCES(rootElement):
+            url = href.partition("#")[0] # locs mostly repeat a few hrefs, only distinct urls are normalized
+            if url in urls:
+                continue
+            urls.add(url)
+            url = UrlUtil.splitDecodeFragment(url)[0]
+            if not url:
+                continue
+            normalizedUrl = self.webCache.normalizeUrl(url, modelDocument.uri)
+            if (normalizedUrl in self.prefetches or normalizedUrl in modelXbrl.urlDocs or
+                normalizedUrl in modelXbrl.urlUnloadableDocs):
+                continue
+            filepath = self.prefetchFilepath(normalizedUrl)
+            self.prefetches[normalizedUrl] = filepath and self.executor.submit(self.readAndParse, normalizedUrl, filepath)
+
+    def prefetchFilepath(self, normalizedUrl):
+        ''' returns filepath ModelDocument.load would read for normalizedUrl if known without retrieval, else None '''
+        fileSource = self.modelXbrl.fileSource
+        if fileSource.isMappedUrl(normalizedUrl):
+            mappedUrl = fileSource.mappedUrl(normalizedUrl)
+        else:
+            from arelle import PackageManager
+            if PackageManager.isMappedUrl(normalizedUrl):
+                mappedUrl = PackageManager.mappedUrl(normalizedUrl)
+            else:
+                mappedUrl = self.modelXbrl.modelManager.disclosureSystem.mappedUrl(normalizedUrl)
+        if fileSource.isInArchive(mappedUrl):
+            archiveFileSource = fileSource.fileSourceContainingFilepath(mappedUrl)
+            return mappedUrl if archiveFileSource is not None and archiveFileSource.isZip else None
+        if archiveFilenameParts(mappedUrl):
+            return None  # file of a web archive, which may require retrieval
+        filepath = self.webCache.getfilename(mappedUrl, filenameOnly=True)
+        if filepath and os.path.isfile(filepath):
+            return filepath
+        return None
+
+    def readAndParse(self, normalizedUrl, filepath):
+        # runs in a pool thread, its parser (with its element class lookups) is made in this thread
+        try:
+            documentCache = self.modelXbrl.documentCache
+            if documentCache is not None and documentCache.prefetch(self.modelXbrl.fileSource, filepath):
+                return None # the loading thread copies the cached parse
+            fileStat = None
+            if not self.modelXbrl.fileSource.isInArchive(filepath):
+                stat = os.stat(filepath)
+                fileStat = (stat.st_mtime_ns, stat.st_size)
+            file, encoding = self.modelXbrl.fileSource.xmlFile(filepath)
+            try:
+                parserLookups = parser(self.modelXbrl, normalizedUrl)
+                xmlDocument = etree.parse(file, parser=parserLookups[0], base_url=filepath)
+            finally:
+                file.close()
+            return PrefetchedDocument(filepath, fileStat, xmlDocument, encoding, parserLookups, list(parserLookups[0].error_log))
+        except Exception:
+            return None  # the loading thread repeats the read and parse and reports errors
+
+    def take(self, normalizedUrl, filepath):
+        ''' returns PrefetchedDocument of normalizedUrl if prefetched from filepath and unchanged since, else None '''
+        future = self.prefetches.pop(normalizedUrl, None)
+        if not future or future.cancel(): # not started, quicker to read and parse in the loading thread than wait
+            return None
+        prefetched = future.result()
+        if prefetched is None or prefetched.filepath != filepath:
+            return None
+        if prefetched.fileStat is not None:
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                return None
+            if prefetched.fileStat != (stat.st_mtime_ns, stat.st_size):
+                return None
+        return prefetched
+
+    def close(self) -> None:
+        for future in self.prefetches.values():
+            if future:
+                future.cancel()
+        self.executor.shutdown(wait=True)
+        self.prefetches.clear()
+
+
+def create(modelXbrl: ModelXbrl) -> DiscoveryPrefetcher | None:
+    ''' returns a DiscoveryPrefetcher if modelManager.discoveryThreads is more than one and no plug-ins
+        customize document loading or file access, else None '''
+    threads = getattr(modelXbrl.modelManager, "discoveryThreads", 0) or 0
+    if threads > 1 and not any(len(list(pluginClassMethods(pluginClass))) > 0 for pluginClass in _pluginClassesCustomizingLoading):
+        return DiscoveryPrefetcher(modelXbrl, threads)
+    return None
@@ -0,0 +1,222 @@
+'''
+Process-wide cache of parsed documents shared by the models loaded in a process.
+
+A long running process loading consecutive filings reads and parses the same taxonomy schemas and
+linkbases for each filing.  When ModelManager.documentCacheSize is set, ModelDocument.load takes a
+discovered (not entry) document from a local file or zip archive as a copy of its cached parse,
+keyed by file path and the modification time and size of the file (or of its archive), instead of
+reading and parsing the file again.  Mapped urls of a document resolve to its file path, which is what
+the signature describes, so a url remapped to another file between loads is not served a stale parse.  The cache is bounded by the source size of its documents and
+evicts the least recently used documents.
+
+A cached parse is never modeled or changed, each load models its own copy.  Cached parses (and so
+their copies) use a parser whose element class lookups dispatch to the lookups of the ModelXbrl
+which copied the document, as lxml copies keep the parser of the document they copy.  The lookups
+of a copy are registered with the copy's lxml document, which they reference so its id is not
+reused while registered, until ModelXbrl.close releases the copies of its model.
+
+See COPYRIGHT.md for copyright information.
+'''
+from __future__ import annotations
+
+import copy
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from lxml import etree
+
+from arelle.DiscoveryPrefetcher import PrefetchedDocument
+from arelle.ModelObjectFactory import parser
+from arelle.PluginManager import pluginClassMethods
+
+if TYPE_CHECKING:
+    from arelle.Cntlr import Cntlr
+    from arelle.FileSource import FileSource
+    from arelle.ModelXbrl import ModelXbrl
+
+_pluginClassesCustomizingLoading = ("ModelDocument.CustomLoader", "FileSource.File")
+_copiedDocumentLookups: dict[int, tuple[Any, Any, Any]] = {}  # (lxml document, nsNameLookup, classLookup) of a copied document by id of its lxml document
+_nextDocumentLookups = threading.local()  # (nsNameLookup, classLookup, copiedDocumentIds of the ModelXbrl) for the next copy made in this thread
+
+
+class _DocumentClassLookup(etree.PythonElementClassLookup):
+    def lookup(self, document, proxyElement):
+        lookups = _copiedDocumentLookups.get(id(document))
+        if lookups is None:
+            return None # cached parse, not modeled
+        return lookups[2].lookup(document, proxyElement)
+
+
+class _DocumentNamespaceLookup(etree.CustomElementClassLookup):
+    def lookup(self, node_type, document, ns, ln):
+        nextLookups = getattr(_nextDocumentLookups, "lookups", None)
+        if nextLookups is not None: # first lookup of a copy is of its root element
+            _nextDocumentLookups.lookups = None
+            nsNameLookup, classLookup, copiedDocumentIds = nextLookups
+            _copiedDocumentLookups[id(document)] = (document, nsNameLookup, classLookup)
+            copiedDocumentIds.append(id(document))
+        lookups = _copiedDocumentLookups.get(id(document))
+        if lookups is None:
+            return None
+        return lookups[1].lookup(node_type, document, ns, ln)
+
+
+class CachedDocument:
+    """
+    .. class:: CachedDocument(signature, xmlDocument, encoding, errors, size, isPrefetched)
+
+    Parse of a cached file (not modeled), with the file's signature, its encoding, syntax errors and source size.
+    """
+    __slots__ = ("signature", "xmlDocument", "encoding", "errors", "size", "isPrefetched")
+
+    def __init__(self, signature: tuple[int, int], xmlDocument: Any, encoding: str, errors: list[Any], size: int,
+                 isPrefetched: bool) -> None:
+        self.signature = signature
+        self.xmlDocument = xmlDocument
+        self.encoding = encoding
+        self.errors = errors
+        self.size = size
+        self.isPrefetched = isPrefetched # parsed for a load by its discovery prefetcher, not yet copied
+
+
+class DocumentCache:
+    """
+    .. class:: DocumentCache(maxSize)
+
+    Least recently used parsed documents, of at most maxSize bytes of source, with hit and miss statistics.
+    """
+    def __init__(self, maxSize: int) -> None:
+        self.maxSize = maxSize
+        self.size = 0
+        self.documents: OrderedDict[str, CachedDocument] = OrderedDict() # CachedDocument by filepath, least recently used first
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def signature(self, fileSource: FileSource, filepath: str) -> tuple[int, int] | None:
+        ''' returns (modification time, size) of the file or its zip archive if cacheable, else None '''
+        if fileSource.isInArchive(filepath):
+            archiveFileSource = fileSource.fileSourceContainingFilepath(filepath)
+            if archiveFileSource is None or not archiveFileSource.isZip:
+                return None
+            statFilepath = archiveFileSource.basefile
+        else:
+            statFilepath = filepath
+        try:
+            stat = os.stat(statFilepath)
+        except (OSError, TypeError):
+            return None # not a local file, such as a web archive
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def parse(self, fileSource: FileSource, filepath: str, signature: tuple[int, int], isPrefetched: bool = False) -> CachedDocument:
+        ''' reads, parses and caches filepath, returns its CachedDocument '''
+        file, encoding = fileSource.xmlFile(filepath)
+        try:
+            _parser = etree.XMLParser(recover=True, huge_tree=True, resolve_entities=False)
+            _parser.set_element_class_lookup(_documentLookup)
+            xmlDocument = etree.parse(file, parser=_parser, base_url=filepath)
+            size = getattr(file, "buffer", file).tell() # bytes read before any decoding, without seeking a streamed member
+        finally:
+            file.close()
+        cachedDocument = CachedDocument(signature, xmlDocument, encoding, list(_parser.error_log), size, isPrefetched)
+        with self.lock:
+            self.misses += 1
+            if filepath in self.documents: # replaces the parse of a changed file
+                self.size -= self.documents.pop(filepath).size
+            if size <= self.maxSize:
+                self.documents[filepath] = cachedDocument
+                self.size += size
+                self.evict()
+        return cachedDocument
+
+    def evict(self) -> None:
+        # evicts least recently used documents until within maxSize, with lock held
+        while self.size > self.maxSize:
+            self.size -= self.documents.popitem(last=False)[1].size
+            self.evictions += 1
+
+    def prefetch(self, fileSource: FileSource, filepath: str) -> bool:
+        ''' parses and caches filepath if cacheable and not cached, returns True if cacheable '''
+        signature = self.signature(fileSource, filepath)
+        if signature is None:
+            return False
+        with self.lock:
+            cachedDocument = self.documents.get(filepath)
+        if cachedDocument is None or cachedDocument.signature != signature:
+            self.parse(fileSource, filepath, signature, isPrefetched=True)
+        return True
+
+    def cachedDocument(self, filepath: str, signature: tuple[int, int]) -> CachedDocument | None:
+        with self.lock:
+            cachedDocument = self.documents.get(filepath)
+            if cachedDocument is not None and cachedDocument.signature == signature:
+                self.documents.move_to_end(filepath)
+                if cachedDocument.isPrefetched: # its parse was this load's miss
+                    cachedDocument.isPrefetched = False
+                else:
+                    self.hits += 1
+                return cachedDocument
+            return None
+
+    def copy(self, modelXbrl: ModelXbrl, normalizedUrl: str, filepath: str) -> PrefetchedDocument | None:
+        ''' returns PrefetchedDocument of a copy of filepath's cached parse, parsing and caching it if not cached
+            or changed since, or None if filepath is not cacheable '''
+        signature = self.signature(modelXbrl.fileSource, filepath)
+        if signature is None:
+            return None
+        cachedDocument = self.cachedDocument(filepath, signature)
+        if cachedDocument is None:
+            cachedDocument = self.parse(modelXbrl.fileSource, filepath, signature)
+        parserLookups = parser(modelXbrl, normalizedUrl) # its parser makes elements added to the copy
+        _nextDocumentLookups.lookups = (parserLookups[1], parserLookups[2], modelXbrl.copiedDocumentIds)
+        try:
+            xmlDocument = copy.deepcopy(cachedDocument.xmlDocument)
+        finally:
+            _nextDocumentLookups.lookups = None
+        return PrefetchedDocument(filepath, None, xmlDocument, cachedDocument.encoding, parserLookups, cachedDocument.errors)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.documents.clear()
+            self.size = 0
+
+    def logStats(self, cntlr: Cntlr) -> None:
+        if self.hits or self.misses:
+            cntlr.addToLog(_("Document cache {0} hits, {1} misses, {2} evictions, {3} documents of {4:.1f} MB cached").format(
+                           self.hits, self.misses, self.evictions, len(self.documents), self.size / 1048576),
+                           messageCode="info:documentCacheStats", level=logging.INFO)
+
+
+_documentLookup = _DocumentNamespaceLookup(_DocumentClassLookup())
+_documentCache: DocumentCache | None = None
+
+
+def documentCache(modelXbrl: ModelXbrl) -> DocumentCache | None:
+    ''' returns the process's DocumentCache if modelManager.documentCacheSize (MB) is set and no plug-ins
+        customize document loading or file access, else None '''
+    global _documentCache
+    cacheSize = (getattr(modelXbrl.modelManager, "documentCacheSize", 0) or 0) * 1048576
+    if cacheSize <= 0 or any(len(pluginClassMethods(pluginClass)) > 0 for pluginClass in _pluginClassesCustomizingLoading):
+        return None
+    if _documentCache is None:
+        _documentCache = DocumentCache(cacheSize)
+    elif _documentCache.maxSize != cacheSize:
+        with _documentCache.lock:
+            _documentCache.maxSize = cacheSize
+            _documentCache.evict()
+    return _documentCache
+
+
+def releaseCopiedDocuments(copiedDocumentIds: list[int]) -> None:
+    ''' drops the lookups (and references) of the documents copied for a closed ModelXbrl '''
+    for documentId in copiedDocumentIds:
+        _copiedDocumentLookups.pop(documentId, None)
+    copiedDocumentIds.clear()
+
+
+def logStats(cntlr: Cntlr) -> None:
+    ''' logs hit, miss and eviction counts of the process's document cache, if used '''
+    if _documentCache is not None:
+        _documentCache.logStats(cntlr)
@@ -3,12 +3,12 @@ See COPYRIGHT.md for copyright information.
 '''
 from __future__ import annotations
 from typing import IO, TYPE_CHECKING, Any, Union, cast
-import zipfile, tarfile, os, io, errno, base64, gzip, zlib, struct, random
+import zipfile, tarfile, os, io, errno, base64, gzip, zlib, struct, random, shutil, tempfile
 import regex as re
 from lxml import etree
 from arelle import XmlUtil
 from arelle import PackageManager
-from arelle.UrlUtil import isHttpUrl
+from arelle.UrlUtil import isHttpUrl, UrlPrefixTrie
 from arelle.typing import TypeGetText
 import arelle.PluginManager
 
@@ -25,6 +25,9 @@ archivePathSeparators = (".zip" + os.sep, ".tar.gz" + os.sep, ".eis" + os.sep, "
 
 archiveFilenameSuffixes = {".zip", ".tar.gz", ".eis", ".xml", ".xfd", ".frm"}
 
+ZIP_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H") # zip local file header preceding each member's data
+ZIP_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
 POST_UPLOADED_ZIP = os.sep + "POSTupload.zip"
 SERVER_WEB_CACHE = os.sep + "_HTTP_CACHE"
 
@@ -67,10 +70,11 @@ def openFileSource(
             ):
                 assert cntlr is not None
                 filesource = FileSource(filename, cntlr)
+                filesource.open(reloadCache, sourceFileSource)
                 selection = None
             else:
                 filesource = FileSource(archivepath, cntlr, checkIfXmlIsEis)
-            filesource.open(reloadCache)
+                filesource.open(reloadCache)
             if selection:
                 filesource.select(selection)
             return filesource
@@ -122,6 +126,43 @@ class FileNamedBytesIO(io.BytesIO):  # provide Bytes IO in memory but behave as
     def __str__(self) -> str:
         return self.fileName
 
+class ArchiveMemberSlice(io.RawIOBase):  # read only view of a stored (uncompressed) member's bytes in its archive file
+    def __init__(self, archiveFilepath: str, offset: int, size: int) -> None:
+        super(ArchiveMemberSlice, self).__init__()
+        self.fh = io.open(archiveFilepath, 'rb')
+        self.offset = offset
+        self.size = size
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        view = memoryview(b).cast("B")[0:max(0, self.size - self.position)]
+        self.fh.seek(self.offset + self.position)
+        n = self.fh.readinto(view)
+        self.position += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self.position = min(max(offset, 0), self.size)
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def close(self) -> None:
+        if not self.closed:
+            self.fh.close()
+        super(ArchiveMemberSlice, self).close()
+
 class ArchiveFileIOError(IOError):
     def __init__(self, fileSource: FileSource, errno: int, fileName: str) -> None:
         super(ArchiveFileIOError, self).__init__(errno,
@@ -135,6 +176,8 @@ class FileSource:
     eisDocument: etree._ElementTree | None
     fs: zipfile.ZipFile | tarfile.TarFile | io.StringIO | None
     filesDir: list[str] | None
+    zipMembers: dict[str, zipfile.ZipInfo]
+    containingFileSource: FileSource | None
     referencedFileSources: dict[str, FileSource]
     rssDocument: etree._ElementTree | None
     selection: str | list[str] | None
@@ -160,9 +203,16 @@ class FileSource:
         self.fs = None
         self.selection = None
         self.filesDir = None
+        self._filesDirSet: tuple[list[str] | None, set[str]] = (None, set())  # filesDir and a set of its files
+        self.zipMembers = {}  # zip member infos by / separated file name, indexed once from the central directory
+        self.containingFileSource = None  # file source opened (and closed) for the archive containing this nested archive
+        self.nestedArchiveStream: IO[bytes] | None = None
         self.referencedFileSources = {}  # archive file name, fileSource object
         self.taxonomyPackage = None # taxonomy package
         self.mappedPaths = None  # remappings of path segments may be loaded by taxonomyPackage manifest
+        self._mappedPathsTrie: UrlPrefixTrie | None = None
+        self.archiveMemberElements: dict[str, etree._Element] = {}  # EIS or XFD member contents elements by file name
+        self.archiveMemberBytes: dict[str, bytes] = {}  # decoded EIS or XFD member contents by file name
 
         # for SEC xml files, check if it's an EIS anyway
         if (not (self.isZip or self.isEis or self.isXfd or self.isRss) and
@@ -188,7 +238,9 @@ class FileSource:
         if self.cntlr:
             self.cntlr.addToLog(_("[{0}] {1}").format(type(err).__name__, err))
 
-    def open(self, reloadCache: bool = False) -> None:
+    def open(self, reloadCache: bool = False, sourceFileSource: FileSource | None = None) -> None:
+        # a nested archive is read from sourceFileSource, if it is the containing zip archive, else from
+        # a containing file source it opens and closes
         if not self.isOpen:
             if (self.isZip or self.isTarGz or self.isEis or self.isXfd or self.isRss or self.isInstalledTaxonomyPackage) and self.cntlr:
                 assert isinstance(self.url, str)
@@ -201,7 +253,21 @@ class FileSource:
             if self.isZip:
                 try:
                     assert isinstance(self.basefile, str)
-                    fileStream = openFileStream(self.cntlr, self.basefile, 'rb')
+                    containingArchiveParts = archiveFilenameParts(self.basefile)
+                    if containingArchiveParts is not None: # nested archive, read from within its containing archive
+                        if (sourceFileSource is not None and sourceFileSource.isZip and sourceFileSource.isOpen and
+                            sourceFileSource.basefile == containingArchiveParts[0]):
+                            containingFileSource = sourceFileSource
+                        else:
+                            containingFileSource = self.containingFileSource = FileSource(containingArchiveParts[0], self.cntlr)
+                            containingFileSource.open(reloadCache)
+                        try:
+                            fileStream = self.nestedArchiveStream = \
+                                containingFileSource.archiveMemberStream(containingArchiveParts[1], seekable=True)
+                        except KeyError:
+                            raise ArchiveFileIOError(containingFileSource, errno.ENOENT, containingArchiveParts[1])
+                    else:
+                        fileStream = openFileStream(self.cntlr, self.basefile, 'rb')
                     self.fs = zipfile.ZipFile(fileStream, mode="r")
                     self.isOpen = True
                 except EnvironmentError as err:
@@ -253,6 +319,7 @@ class FileSource:
                         parser = etree.XMLParser(recover=True, huge_tree=True)
                         self.eisDocument = etree.parse(_file, parser=parser)
                         _file.close()
+                        self.indexArchiveMembers()
                         self.isOpen = True
                     except EnvironmentError as err:
                         self.logError(err)
@@ -308,6 +375,7 @@ class FileSource:
                 try:
                     self.xfdDocument = etree.parse(file)
                     file.close()
+                    self.indexArchiveMembers()
                     self.isOpen = True
                 except EnvironmentError as err:
                     self.logError(err)
@@ -333,6 +401,104 @@ class FileSource:
                 # load mappings
                 self.loadTaxonomyPackageMappings()
 
+    def indexArchiveMembers(self) -> None:
+        # index base64 contents elements of EIS and XFD members by file name, once on open
+        self.archiveMemberElements = {}
+        self.archiveMemberBytes = {}
+        files = []
+        if self.isEis:
+            assert self.eisDocument is not None
+            for docElt in self.eisDocument.iter(tag="{http://www.sec.gov/edgar/common}document"):
+                outfn = docElt.findtext("{http://www.sec.gov/edgar/common}conformedName")
+                if outfn:
+                    files.append(outfn)
+                    contentsElt = docElt.find("{http://www.sec.gov/edgar/common}contents")
+                    if contentsElt is not None and contentsElt.text and outfn not in self.archiveMemberElements:
+                        self.archiveMemberElements[outfn] = contentsElt
+        elif self.isXfd:
+            assert self.xfdDocument is not None
+            for data in self.xfdDocument.iter(tag="data"):
+                outfn = data.findtext("filename")
+                if outfn:
+                    mimedataElt = data.find("mimedata")
+                    if mimedataElt is not None and mimedataElt.text and outfn not in self.archiveMemberElements:
+                        self.archiveMemberElements[outfn] = mimedataElt
+                    if len(outfn) > 2 and outfn[0].isalpha() and \
+                        outfn[1] == ':' and outfn[2] == '\\':
+                        continue
+                    files.append(outfn)
+        self.filesDir = files
+
+    def archiveMemberContents(self, archiveFileName: str) -> bytes:
+        # decoded contents of an EIS or XFD member, decoded on first request
+        try:
+            return self.archiveMemberBytes[archiveFileName]
+        except KeyError:
+            pass
+        contentsElt = self.archiveMemberElements.get(archiveFileName)
+        if contentsElt is None:
+            raise ArchiveFileIOError(self, errno.ENOENT, archiveFileName)
+        b = base64.b64decode(cast(str, contentsElt.text).encode("latin-1"))
+        # remove BOM codes if present
+        if len(b) > 3 and b[0] == 239 and b[1] == 187 and b[2] == 191:
+            b = b[3:]
+        self.archiveMemberBytes[archiveFileName] = b
+        return b
+
+    def archiveMemberStream(self, archiveFileName: str, seekable: bool = False) -> IO[bytes]:
+        # zip member bytes streamed from the archive, raises KeyError if not a member
+        # seekable streams (for a nested archive) are a view of a stored member in the archive file, or else a
+        # spooled temporary file, as seeking back in the member decompresses it again from its start
+        zipinfo = self.zipMemberInfo(archiveFileName)
+        assert isinstance(self.fs, zipfile.ZipFile)
+        if seekable:
+            if (zipinfo.compress_type == zipfile.ZIP_STORED and not zipinfo.flag_bits & 0x1 and
+                isinstance(self.basefile, str) and os.path.isfile(self.basefile)):
+                with io.open(self.basefile, 'rb') as fh:
+                    fh.seek(zipinfo.header_offset)
+                    localHeader = ZIP_LOCAL_HEADER.unpack(fh.read(ZIP_LOCAL_HEADER.size))
+                if localHeader[0] == ZIP_LOCAL_HEADER_SIGNATURE:
+                    offset = zipinfo.header_offset + ZIP_LOCAL_HEADER.size + localHeader[10] + localHeader[11]
+                    return io.BufferedReader(ArchiveMemberSlice(self.basefile, offset, zipinfo.file_size))
+            spooledFile = tempfile.TemporaryFile()
+            with self.fs.open(zipinfo) as memberStream:
+                shutil.copyfileobj(memberStream, spooledFile, 1048576)
+            spooledFile.seek(0)
+            return cast(IO[bytes], spooledFile)
+        return self.fs.open(zipinfo)
+
+    def indexZipMembers(self) -> None:
+        # index zip member infos by / separated file name, once from the central directory
+        files: list[str] = []
+        zipMembers: dict[str, zipfile.ZipInfo] = {}
+        assert isinstance(self.fs, zipfile.ZipFile)
+        for zipinfo in self.fs.infolist():
+            f = zipinfo.filename
+            if '\\' in f:
+                self.isZipBackslashed = True
+                f = f.replace("\\", "/")
+            files.append(f)
+            zipMembers[f] = zipinfo
+        self.zipMembers = zipMembers
+        self.filesDir = files
+
+    def zipMemberInfo(self, archiveFileName: str) -> zipfile.ZipInfo:
+        # zip member info of archiveFileName, raises KeyError if not a member
+        if self.filesDir is None:
+            self.open()
+            if self.isOpen:
+                self.indexZipMembers()
+        return self.zipMembers[archiveFileName.replace("\\", "/")]
+
+    def isArchiveFile(self, archiveFileName: str) -> bool:
+        # whether / separated archiveFileName is in the archive's dir, by a set of dir built once
+        files = self.dir
+        if files is None:
+            return False
+        if self._filesDirSet[0] is not files:
+            self._filesDirSet = (files, set(files))
+        return archiveFileName in self._filesDirSet[1]
+
     def loadTaxonomyPackageMappings(self, errors: list[str] = [], expectTaxonomyPackage: bool = False) -> None:
         if not self.mappedPaths and (self.taxonomyPackageMetadataFiles or expectTaxonomyPackage):
             if PackageManager.validateTaxonomyPackage(self.cntlr, self, errors=errors):
@@ -364,12 +530,21 @@ class FileSource:
             self.fs = None
             self.isOpen = False
             self.isZip = self.isZipBackslashed = False
+        self.zipMembers = {}
+        if self.nestedArchiveStream is not None:
+            self.nestedArchiveStream.close()
+            self.nestedArchiveStream = None
+        if self.containingFileSource is not None:
+            self.containingFileSource.close()
+            self.containingFileSource = None
         if self.isTarGz and self.isOpen:
             assert self.fs is not None
             self.fs.close()
             self.fs = None
             self.isOpen = False
             self.isTarGz = False
+        self.archiveMemberElements.clear()
+        self.archiveMemberBytes.clear()
         if self.isEis and self.isOpen:
             assert self.eisDocument is not None
             self.eisDocument.getroot().clear() # unlink nodes
@@ -413,23 +588,27 @@ class FileSource:
         if checkExistence:
             assert isinstance(filepath, str)
             assert isinstance(archiveFileSource.basefile, str)
-            assert archiveFileSource.dir is not None
             archiveFileName = filepath[len(archiveFileSource.basefile) + 1:].replace("\\", "/") # must be / file separators
-            return archiveFileName in archiveFileSource.dir
+            return archiveFileSource.isArchiveFile(archiveFileName)
         return True # True only means that the filepath maps into the archive, not that the file is really there
 
+    def mappedPathsTrie(self) -> UrlPrefixTrie:
+        assert self.mappedPaths is not None
+        if self._mappedPathsTrie is None or not self._mappedPathsTrie.isBuiltFrom(self.mappedPaths):
+            self._mappedPathsTrie = UrlPrefixTrie(self.mappedPaths)
+        return self._mappedPathsTrie
+
     def isMappedUrl(self, url: str) -> bool:
         if self.mappedPaths is not None:
-            return any(url.startswith(mapFrom)
-                       for mapFrom in self.mappedPaths)
+            return bool(self.mappedPathsTrie().matches(url))
         return False
 
     def mappedUrl(self, url: str) -> str:
         if self.mappedPaths:
-            for mapFrom, mapTo in self.mappedPaths.items():
-                if url.startswith(mapFrom):
-                    url = mapTo + url[len(mapFrom):]
-                    break
+            match = self.mappedPathsTrie().firstMatch(url)
+            if match is not None:
+                _order, mapFrom, mapTo = match
+                url = mapTo + url[len(mapFrom):]
         return url
 
     def fileSourceContainingFilepath(self, filepath: str | None) -> FileSource | None:
@@ -469,6 +648,7 @@ class FileSource:
         binary: bool = False,
         stripDeclaration: bool = False,
         encoding: str | None = None,
+        seekable: bool = False,
     ) -> (
             tuple[io.BytesIO | IO[Any]]
             | tuple[FileNamedTextIOWrapper, str | None]
@@ -477,6 +657,8 @@ class FileSource:
         '''
             for text, return a tuple of (open file handle, encoding)
             for binary, return a tuple of (open file handle, )
+            seekable requests a binary file handle which seeks without rereading, such as for a zip
+            archive reader, otherwise a zip member is a forward streamed file handle
         '''
         archiveFileSource = self.fileSourceContainingFilepath(filepath)
         if archiveFileSource is not None:
@@ -489,20 +671,18 @@ class FileSource:
                 archiveFileName = filepath[len(archiveFileSource.baseurl) + 1:]
             if archiveFileSource.isZip:
                 try:
-                    if archiveFileSource.isZipBackslashed:
-                        f = archiveFileName.replace("/", "\\")
-                    else:
-                        f = archiveFileName.replace("\\","/")
-
-                    assert isinstance(archiveFileSource.fs, zipfile.ZipFile)
-                    b = archiveFileSource.fs.read(f)
+                    # stream the member, memory is that of the reader not of the member
+                    memberStream = archiveFileSource.archiveMemberStream(archiveFileName, seekable=binary and seekable)
                     if binary:
-                        return (io.BytesIO(b), )
+                        return (memberStream, )
                     if encoding is None:
-                        encoding = XmlUtil.encoding(b)
+                        encoding = XmlUtil.encoding(memberStream.peek(512)[0:512]) # type: ignore[attr-defined]
                     if stripDeclaration:
-                        b = stripDeclarationBytes(b)
-                    return (FileNamedTextIOWrapper(filepath, io.BytesIO(b), encoding=encoding),
+                        b = stripDeclarationBytes(memberStream.read())
+                        memberStream.close()
+                        return (FileNamedTextIOWrapper(filepath, io.BytesIO(b), encoding=encoding),
+                                encoding)
+                    return (FileNamedTextIOWrapper(filepath, memberStream, encoding=encoding),
                             encoding)
                 except KeyError:
                     raise ArchiveFileIOError(self, errno.ENOENT, archiveFileName)
@@ -528,52 +708,14 @@ class FileSource:
                     # Not fixing this bug as a part of this PR
                     # Also expecting second argument to be int but is str here
                     raise ArchiveFileIOError(self, archiveFileName) # type: ignore[call-arg, arg-type]
-            elif archiveFileSource.isEis:
-                assert self.eisDocument is not None
-                for docElt in self.eisDocument.iter(tag="{http://www.sec.gov/edgar/common}document"):
-                    outfn = docElt.findtext("{http://www.sec.gov/edgar/common}conformedName")
-                    if outfn == archiveFileName:
-                        b64data = docElt.findtext("{http://www.sec.gov/edgar/common}contents")
-                        if b64data:
-                            b = base64.b64decode(b64data.encode("latin-1"))
-                            # remove BOM codes if present
-                            if len(b) > 3 and b[0] == 239 and b[1] == 187 and b[2] == 191:
-                                start = 3
-                                length = len(b) - 3
-                                b = b[start:start + length]
-                            else:
-                                start = 0
-                                length = len(b)
-                            if binary:
-                                return (io.BytesIO(b), )
-                            if encoding is None:
-                                encoding = XmlUtil.encoding(b, default="latin-1")
-                            return (io.TextIOWrapper(io.BytesIO(b), encoding=encoding),
-                                    encoding)
-                raise ArchiveFileIOError(self, errno.ENOENT, archiveFileName)
-            elif archiveFileSource.isXfd:
-                assert archiveFileSource.xfdDocument is not None
-                for data in archiveFileSource.xfdDocument.iter(tag="data"):
-                    outfn = data.findtext("filename")
-                    if outfn == archiveFileName:
-                        b64data = data.findtext("mimedata")
-                        if b64data:
-                            b = base64.b64decode(b64data.encode("latin-1"))
-                            # remove BOM codes if present
-                            if len(b) > 3 and b[0] == 239 and b[1] == 187 and b[2] == 191:
-                                start = 3
-                                length = len(b) - 3
-                                b = b[start:start + length]
-                            else:
-                                start = 0
-                                length = len(b)
-                            if binary:
-                                return (io.BytesIO(b), )
-                            if encoding is None:
-                                encoding = XmlUtil.encoding(b, default="latin-1")
-                            return (io.TextIOWrapper(io.BytesIO(b), encoding=encoding),
-                                    encoding)
-                raise ArchiveFileIOError(self, errno.ENOENT, archiveFileName)
+            elif archiveFileSource.isEis or archiveFileSource.isXfd:
+                b = archiveFileSource.archiveMemberContents(archiveFileName)
+                if binary:
+                    return (io.BytesIO(b), )
+                if encoding is None:
+                    encoding = XmlUtil.encoding(b, default="latin-1")
+                return (io.TextIOWrapper(io.BytesIO(b), encoding=encoding),
+                        encoding)
             elif archiveFileSource.isInstalledTaxonomyPackage:
                 # remove TAXONOMY_PACKAGE_FILE_NAME from file path
                 if filepath.startswith(archiveFileSource.basefile):
@@ -596,6 +738,36 @@ class FileSource:
         else:
             return openXmlFileStream(self.cntlr, filepath, stripDeclaration)
 
+    def xmlFile(self, filepath: str) -> tuple[IO[Any], str]:
+        '''
+            for an xml document to be parsed by lxml, return a tuple of (open file handle, encoding)
+            where the file handle provides the document bytes with their xml declaration, for libxml2
+            to decode without a decoded copy of the document, except for EIS and XFD contents and, when
+            there is no byte order mark or declaration, a default encoding libxml2 would not assume,
+            for which it provides the decoded text as file returns it
+        '''
+        archiveFileSource = self.fileSourceContainingFilepath(filepath)
+        if archiveFileSource is not None:
+            if archiveFileSource.isEis or archiveFileSource.isXfd:
+                return self.file(filepath, stripDeclaration=True) # type: ignore[return-value]
+            defaultEncoding = "utf-8"
+        elif self.cntlr is not None:
+            defaultEncoding = self.cntlr.modelManager.disclosureSystem.defaultXmlEncoding
+        else:
+            defaultEncoding = "utf-8"
+        fh = cast(IO[bytes], self.file(filepath, binary=True)[0]) # binary file returns a bytes stream
+        if isinstance(fh, io.BytesIO):
+            hdrBytes = fh.getbuffer()[0:512].tobytes()
+        else:
+            hdrBytes = fh.read(512)
+            fh.seek(0)
+        encoding = XmlUtil.encoding(hdrBytes, default="")
+        if not encoding: # no byte order mark or xml declaration, libxml2 assumes utf-8
+            encoding = defaultEncoding
+            if encoding and encoding.lower() not in ('utf-8','utf8'):
+                return (FileNamedTextIOWrapper(filepath, fh, encoding=encoding), encoding)
+        return (fh, encoding)
+
     def exists(self, filepath: str) -> bool:
         archiveFileSource = self.fileSourceContainingFilepath(filepath)
         if archiveFileSource is not None:
@@ -610,8 +782,7 @@ class FileSource:
             if (archiveFileSource.isZip or archiveFileSource.isTarGz or
                 archiveFileSource.isEis or archiveFileSource.isXfd or
                 archiveFileSource.isRss or self.isInstalledTaxonomyPackage):
-                assert archiveFileSource.dir is not None
-                return archiveFileName.replace("\\","/") in archiveFileSource.dir
+                return archiveFileSource.isArchiveFile(archiveFileName.replace("\\","/"))
 
         # custom overrides for decription, etc
         for pluginMethod in arelle.PluginManager.pluginClassMethods("FileSource.Exists"):
@@ -629,40 +800,14 @@ class FileSource:
         elif self.filesDir is not None:
             return self.filesDir
         elif self.isZip:
-            files: list[str] = []
-
-            assert isinstance(self.fs, zipfile.ZipFile)
-            for zipinfo in self.fs.infolist():
-                f = zipinfo.filename
-                if '\\' in f:
-                    self.isZipBackslashed = True
-                    f = f.replace("\\", "/")
-                files.append(f)
-            self.filesDir = files
+            self.indexZipMembers()
         elif self.isTarGz:
             assert isinstance(self.fs, tarfile.TarFile)
             self.filesDir = self.fs.getnames()
-        elif self.isEis:
-            files = []
-            assert self.eisDocument is not None
-            for docElt in self.eisDocument.iter(tag="{http://www.sec.gov/edgar/common}document"):
-                outfn = docElt.findtext("{http://www.sec.gov/edgar/common}conformedName")
-                if outfn:
-                    files.append(outfn)
-            self.filesDir = files
-        elif self.isXfd:
-            files = []
-            assert self.xfdDocument is not None
-            for data in self.xfdDocument.iter(tag="data"):
-                outfn = data.findtext("filename")
-                if outfn:
-                    if len(outfn) > 2 and outfn[0].isalpha() and \
-                        outfn[1] == ':' and outfn[2] == '\\':
-                        continue
-                    files.append(outfn)
-            self.filesDir = files
+        elif self.isEis or self.isXfd:
+            self.indexArchiveMembers()
         elif self.isRss:
-            files = []  # return title, descr, pubdate, linst doc
+            files: list[str] = []  # return title, descr, pubdate, linst doc
             edgr = "http://www.sec.gov/Archives/edgar"
             try:
                 assert self.rssDocument is not None
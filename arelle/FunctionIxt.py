@@ -24,13 +24,11 @@ def call(
         qn: QName,
         args: 'XPathContext.ResultStack',
 ) -> 'XPathContext.RecursiveContextItem':
-    try:
-        _ixtFunction = ixtNamespaceFunctions[qn.namespaceURI][qn.localName]
-    except KeyError:
+    if qn.localName not in ixtNamespaceFunctions.get(qn.namespaceURI, ()):
         raise XPathContext.FunctionNotAvailable(str(qn))
     if len(args) != 1: raise XPathContext.FunctionNumArgs()
     if len(args[0]) != 1: raise XPathContext.FunctionArgType(0,"xs:string")
-    return _ixtFunction(str(args[0][0]))
+    return transform(qn, str(args[0][0]))
 
 # class of deferred-compilation patterns
 # reduces load time by .5 sec (debug) .15 sec (compiled)
@@ -1279,3 +1277,42 @@ ixtNamespaceFunctions = {
     "http://www.xbrl.org/inlineXBRL/transformation/WGWD/YYYY-MM-DD": tr5Functions, # transformation registry v4 draft
     'http://www.xbrl.org/2008/inlineXBRL/transformation': tr1Functions # the CR/PR pre-REC namespace
 }
+
+# dispatch table of transformation registry functions by (namespace, local name)
+ixtFunctions = dict(((namespaceURI, localName), function)
+                    for namespaceURI, functions in ixtNamespaceFunctions.items()
+                    for localName, function in functions.items())
+
+# maximum entries of a memo of (namespace, local name, input) to (output, exception) of registry transforms,
+# which are functions of their input string only; as with FactAspectsCache, additions stop at the maximum size
+transformResultsMaxSize = 200000
+
+def transform(fmt, value, transformResults=None):
+    """Applies transformation registry function fmt (QName) to value, reusing the output (or exception)
+    of a prior application to the same value in transformResults, the memo of a model (ModelXbrl.ixTransformResults)
+    which is released with the model, or not reusing results if None.  Raises KeyError if fmt is not a registry function."""
+    key = (fmt.namespaceURI, fmt.localName, value)
+    memo = transformResults.get(key) if transformResults is not None else None
+    if memo is None:
+        try:
+            function = ixtFunctions[key[:2]]
+        except KeyError:
+            function = ixtNamespaceFunctions[fmt.namespaceURI][fmt.localName] # raises KeyError of local name
+        try:
+            result = function(value)
+        except Exception as err:
+            if transformResults is not None and len(transformResults) < transformResultsMaxSize:
+                # exception class, args and attributes, for a new exception to be raised by each reuse
+                transformResults[key] = (None, (type(err), err.args, dict(err.__dict__)))
+            raise
+        if transformResults is not None and len(transformResults) < transformResultsMaxSize:
+            transformResults[key] = (result, None)
+        return result
+    result, err = memo
+    if err is not None:
+        errClass, errArgs, errAttributes = err
+        exception = errClass.__new__(errClass)
+        exception.args = errArgs
+        exception.__dict__.update(errAttributes)
+        raise exception
+    return result
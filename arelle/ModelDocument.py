@@ -147,29 +147,48 @@ def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDisc
                 return None
             if modelDocument is not None:
                 return modelDocument
+        prefetched = None
+        if modelXbrl.discoveryPrefetcher is not None:
+            prefetched = modelXbrl.discoveryPrefetcher.take(normalizedUri, filepath)
         if (modelXbrl.modelManager.validateDisclosureSystem and (
             (isEntry and modelXbrl.modelManager.disclosureSystem.validateEntryText) or
             (modelXbrl.modelManager.disclosureSystem.validateFileText and
              not normalizedUri in modelXbrl.modelManager.disclosureSystem.standardTaxonomiesDict))):
             file, _encoding = ValidateFilingText.checkfile(modelXbrl,filepath)
+            prefetched = None
+        elif prefetched is not None:
+            _encoding = prefetched.encoding # read and parsed by discovery prefetcher thread
+        elif not isEntry and modelXbrl.documentCache is not None:
+            prefetched = modelXbrl.documentCache.copy(modelXbrl, normalizedUri, filepath)
+            if prefetched is not None:
+                _encoding = prefetched.encoding # copy of the process's cached parse
+            else: # not cacheable
+                file, _encoding = modelXbrl.fileSource.xmlFile(filepath)
         else:
-            file, _encoding = modelXbrl.fileSource.file(filepath, stripDeclaration=True)
+            file, _encoding = modelXbrl.fileSource.xmlFile(filepath)
         xmlDocument = None
         isPluginParserDocument = False
-        for pluginMethod in pluginClassMethods("ModelDocument.CustomLoader"):
-            modelDocument = pluginMethod(modelXbrl, file, mappedUri, filepath)
-            if modelDocument is not None:
-                file.close()
-                return modelDocument
-        _parser, _parserLookupName, _parserLookupClass = parser(modelXbrl,normalizedUri)
-        xmlDocument = etree.parse(file,parser=_parser,base_url=filepath)
-        for error in _parser.error_log:
+        if prefetched is not None:
+            xmlDocument = prefetched.xmlDocument
+            _parser, _parserLookupName, _parserLookupClass = prefetched.parserLookups
+            parserErrors = prefetched.errors
+        else:
+            for pluginMethod in pluginClassMethods("ModelDocument.CustomLoader"):
+                modelDocument = pluginMethod(modelXbrl, file, mappedUri, filepath)
+                if modelDocument is not None:
+                    file.close()
+                    return modelDocument
+            _parser, _parserLookupName, _parserLookupClass = parser(modelXbrl,normalizedUri)
+            xmlDocument = etree.parse(file,parser=_parser,base_url=filepath)
+            parserErrors = _parser.error_log
+        for error in parserErrors:
             modelXbrl.error("xmlSchema:syntax",
                     _("%(error)s, %(fileName)s, line %(line)s, column %(column)s"),
                     modelObject=(referringElement, os.path.basename(uri)),
                     fileName=os.path.basename(uri),
                     error=error.message, line=error.line, column=error.column)
-        file.close()
+        if file:
+            file.close()
     except (EnvironmentError, KeyError, UnicodeDecodeError) as err:  # missing zip file raises KeyError
         if file:
             file.close()
@@ -316,6 +335,9 @@ def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDisc
         if isEntry or isDiscovered:
             modelDocument.inDTS = True
 
+        if modelXbrl.discoveryPrefetcher is not None:
+            modelXbrl.discoveryPrefetcher.scheduleReferences(modelDocument, rootNode)
+
         # discovery (parsing)
         if any(pluginMethod(modelDocument)
                for pluginMethod in pluginClassMethods("ModelDocument.Discover")):
@@ -24,6 +24,8 @@ class FormulaOptions():
         self.runIDs = None # formula and assertion/assertionset IDs to execute
         self.cacheSize = 10_000_000  # maximum number of fact aspect comparisons to cache
         self.compileOnly = False # compile but don't execute formulas
+        self.parallelProcesses = 0 # evaluate independent assertions in this many forked processes (if > 1)
+        self.resultCache = False # reuse cached results of assertions whose definition and facts are unchanged
         self.formulaAction = None # none, validate, run
         self.traceParameterExpressionResult = False
         self.traceParameterInputValue = False
@@ -45,6 +47,7 @@ class FormulaOptions():
         self.traceVariablesDependencies = False
         self.traceVariablesOrder = False
         self.traceVariableFilterWinnowing = False
+        self.traceVariableFilterPlan = False
         self.traceVariableFiltersResult = False
         self.traceVariableExpressionSource = False
         self.traceVariableExpressionCode = False
@@ -648,7 +648,7 @@ class ModelInlineValueObject:
                 if f is not None:
                     if f.namespaceURI in FunctionIxt.ixtNamespaceFunctions:
                         try:
-                            v = FunctionIxt.ixtNamespaceFunctions[f.namespaceURI][f.localName](v)
+                            v = FunctionIxt.transform(f, v, self.modelXbrl.ixTransformResults)
                         except Exception as err:
                             self._ixValue = ModelValue.INVALIDixVALUE
                             raise err
@@ -59,6 +59,9 @@ class ModelManager:
         self.validateCalcs = 0 # ValidateXbrlCalcs.ValidateCalcsMode
         self.validateInfoset = False
         self.validateUtr = False
+        self.textBlockValidationProcesses = 0
+        self.discoveryThreads = 0
+        self.documentCacheSize = 0 # MB of source of the process's cache of parsed discovered documents, 0 to not cache
         self.validateTestcaseSchema = True
         self.skipDTS = False
         self.skipLoading = None
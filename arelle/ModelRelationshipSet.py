@@ -101,12 +101,14 @@ def baseSetRelationship(arcElement):
 class ModelRelationshipSet:
     __slots__ = ("isChanged", "modelXbrl", "arcrole", "linkrole", "linkqname", "arcqname",
                  "modelRelationshipsFrom", "modelRelationshipsTo", "modelConceptRoots", "modellinkRoleUris",
-                 "modelRelationships", "_testHintedLabelLinkrole")
+                 "modelRelationships", "_testHintedLabelLinkrole", "_labelTables", "_labelTablesDocumentCount")
 
     # arcrole can either be a single string or a tuple or frozenset of strings
     def __init__(self, modelXbrl, arcrole, linkrole=None, linkqname=None, arcqname=None, includeProhibits=False):
         self.isChanged = False
         self.modelXbrl = modelXbrl
+        self._labelTables = None
+        self._labelTablesDocumentCount = 0
         self.arcrole = arcrole # may be str, None, tuple or frozenset
         self.linkrole = linkrole # may be str, None, tuple or frozenset
         self.linkqname = linkqname
@@ -203,6 +205,7 @@ class ModelRelationshipSet:
         if self.modelConceptRoots is not None:
             del self.modelConceptRoots[:]
         self.linkqname = self.arcqname = None
+        self._labelTables = None
 
     def __bool__(self):  # some modelRelationships exist
         return len(self.modelRelationships) > 0
@@ -313,7 +316,31 @@ class ModelRelationshipSet:
                     visited.discard(toConcept)
         return False
 
+    def labelTable(self, role, lang, linkroleHint=None):
+        ''' returns dict by modelFrom of its label text for role, lang and linkroleHint, filled as labels are
+            found and discarded when DTS documents are added or removed '''
+        dtsDocumentCount = len(self.modelXbrl.urlDocs)
+        if self._labelTables is None or self._labelTablesDocumentCount != dtsDocumentCount:
+            self._labelTables = {}
+            self._labelTablesDocumentCount = dtsDocumentCount
+        key = (role, lang, linkroleHint)
+        try:
+            return self._labelTables[key]
+        except KeyError:
+            labelTable = self._labelTables[key] = {}
+            return labelTable
+
     def label(self, modelFrom, role, lang, returnMultiple=False, returnText=True, linkroleHint=None):
+        if returnMultiple or not returnText: # lists and label objects aren't shared in label tables
+            return self.findLabel(modelFrom, role, lang, returnMultiple, returnText, linkroleHint)
+        labelTable = self.labelTable(role, lang, linkroleHint)
+        try:
+            return labelTable[modelFrom]
+        except KeyError:
+            label = labelTable[modelFrom] = self.findLabel(modelFrom, role, lang, linkroleHint=linkroleHint)
+            return label
+
+    def findLabel(self, modelFrom, role, lang, returnMultiple=False, returnText=True, linkroleHint=None):
         _lang = lang.lower() if lang else lang # lang processing is case insensitive
         shorterLangInLabel = longerLangInLabel = None
         shorterLangLabels = longerLangLabels = None
@@ -23,6 +23,7 @@ CHILDREN_BUT_NO_ROLLUP = 3
 OPEN_ASPECT_ENTRY_SURROGATE = '\uDBFF'
 
 EMPTY_SET = set()
+EMPTY_LIST = []
 
 def definitionNodes(nodes):
     return [(ord.definitionNodeObject if isinstance(node, StructuralNode) else node) for node in nodes]
@@ -688,6 +689,59 @@ class ModelTable(ModelFormulaResource):
     def __repr__(self):
         return ("modlTable[{0}]{1})".format(self.objectId(),self.propertyView))
 
+class TableFactIndex:
+    """
+    .. class:: TableFactIndex(modelTable, xpCtx)
+
+    Item facts passing the table's filters, keyed by concept qname and the explicit dimension members
+    of their context, so the candidate facts of a body cell are found by hash lookup instead of by
+    filtering the instance's facts for each cell.  Built once per table by renderers (and plugins
+    rendering tables, such as saveHtmlEBAtables, by way of viewRenderedGrid).
+
+    :param modelTable: Table (2010 EU or table linkbase) whose filters apply to the indexed facts
+    :param xpCtx: Rendering XPath context of the table
+    """
+    def __init__(self, modelTable, xpCtx):
+        self.modelXbrl = modelTable.modelXbrl
+        facts = self.modelXbrl.factsInInstance
+        if getattr(modelTable, "filterRelationships", None):
+            facts = modelTable.filteredFacts(xpCtx, facts)
+        self.factsByConceptDims = {}
+        for fact in facts:
+            if fact.isItem and fact.context is not None:
+                memberQnames = []
+                for dim, dimValue in fact.context.qnameDims.items():
+                    if not dimValue.isExplicit:
+                        break # typed dimension facts are not indexed, cells with typed dimensions aren't looked up
+                    memberQnames.append((dim, dimValue.memberQname))
+                else:
+                    self.factsByConceptDims.setdefault((fact.qname, frozenset(memberQnames)), []).append(fact)
+
+    def cellFacts(self, cellAspectValues):
+        ''' returns facts of the cell's concept reporting exactly the cell's non-default explicit
+        dimension members, in document order, or None if the cell's aspects can't be looked up
+        (no concept, tuple concept or a typed, absent non-defaulted or undefined dimension) '''
+        priItemQname = cellAspectValues.get(Aspect.CONCEPT)
+        concept = self.modelXbrl.qnameConcepts.get(priItemQname)
+        if concept is None or not concept.isItem:
+            return None
+        dimDefaults = self.modelXbrl.qnameDimensionDefaults
+        memberQnames = []
+        for aspect, aspectValue in cellAspectValues.items():
+            if isinstance(aspect, QName):
+                if isinstance(aspectValue, ModelDimensionValue):
+                    if not aspectValue.isExplicit:
+                        return None
+                    aspectValue = aspectValue.memberQname
+                if aspectValue is None:
+                    if aspect in dimDefaults:
+                        return None
+                elif not isinstance(aspectValue, QName) or aspect not in self.modelXbrl.qnameConcepts:
+                    return None
+                elif dimDefaults.get(aspect) != aspectValue:
+                    memberQnames.append((aspect, aspectValue))
+        return self.factsByConceptDims.get((priItemQname, frozenset(memberQnames)), EMPTY_LIST)
+
 class ModelDefinitionNode(ModelFormulaResource):
     def init(self, modelDocument):
         super(ModelDefinitionNode, self).init(modelDocument)
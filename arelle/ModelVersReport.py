@@ -1,7 +1,7 @@
 '''
 See COPYRIGHT.md for copyright information.
 '''
-import os, datetime
+import os, datetime, hashlib
 import regex as re
 from collections import defaultdict
 from arelle import (XbrlConst, XbrlUtil, XmlUtil, UrlUtil, ModelXbrl, ModelDocument, ModelVersObject,
@@ -105,6 +105,10 @@ class ModelVersReport(ModelDocument.ModelDocument):
         .. attribute:: typedDomainsCorrespond
 
         Dict by (fromDimConcept,toDimConcept) of bool that is True if corresponding
+
+        .. attribute:: relationshipTreeFingerprints
+
+        Dict by (isToDTS,arcrole,linkrole,concept,isDRS) of relationship tree digest (see relationshipTreeFingerprint)
     """
 
     def __init__(self, modelXbrl,
@@ -127,6 +131,7 @@ class ModelVersReport(ModelDocument.ModelDocument):
         self.relationshipSetChanges = []
         self.instanceAspectChanges = []
         self.typedDomainsCorrespond = {}
+        self.relationshipTreeFingerprints = {}
 
     def close(self, *args, **kwargs):
         """Closes any views, formula output instances, modelDocument(s), and dereferences all memory used
@@ -499,6 +504,8 @@ class ModelVersReport(ModelDocument.ModelDocument):
             if toConceptQname in self.toDTS.qnameConcepts:
                 toConcept = self.toDTS.qnameConcepts[toConceptQname]
                 toConceptsMatched.add(toConceptQname)
+                if not fromConcept.isTuple and self.conceptFingerprint(self.fromDTS, fromConcept) == self.conceptFingerprint(self.toDTS, toConcept):
+                    continue # declaration, labels and references are unchanged
                 # compare concepts
                 action = None # keep same action for all of same concept's changes
                 if fromConcept.id != toConcept.id:
@@ -647,6 +654,10 @@ class ModelVersReport(ModelDocument.ModelDocument):
                             self.createRelationshipSetEvent("relationships", eventParent=self.relSetAddedEvent, fromConcept=toRoot, axis="descendant-or-self", comment="root relationship")
 
     def diffRelationships(self, fromConcept, toConcept, fromRelationshipSet, toRelationshipSet):
+        fromFingerprint = self.relationshipTreeFingerprint(self.fromDTS, fromRelationshipSet.arcrole, fromRelationshipSet.linkrole, fromConcept)
+        if fromFingerprint is not None and fromFingerprint == self.relationshipTreeFingerprint(
+                self.toDTS, toRelationshipSet.arcrole, toRelationshipSet.linkrole, toConcept):
+            return # subtrees are unchanged
         fromRels = fromRelationshipSet.fromModelObject(fromConcept)
         toRels = toRelationshipSet.fromModelObject(toConcept)
         for i, fromRel in enumerate(fromRels):
@@ -881,6 +892,10 @@ class ModelVersReport(ModelDocument.ModelDocument):
 
     def DRSdiff(self, fromConcept, fromLinkrole, toConcept, toLinkrole, arcrole, diffs=None):
         if diffs is None: diffs = []
+        fromFingerprint = self.relationshipTreeFingerprint(self.fromDTS, arcrole, fromLinkrole, fromConcept, isDRS=True)
+        if fromFingerprint is not None and fromFingerprint == self.relationshipTreeFingerprint(
+                self.toDTS, arcrole, toLinkrole, toConcept, isDRS=True):
+            return diffs # subtrees are unchanged
         fromRels = self.fromDTS.relationshipSet(arcrole, fromLinkrole).fromModelObject(fromConcept)
         toRels = self.toDTS.relationshipSet(arcrole, toLinkrole).fromModelObject(toConcept)
         if arcrole == XbrlConst.dimensionDomain: arcrole = XbrlConst.domainMember #consec rel set
@@ -911,6 +926,105 @@ class ModelVersReport(ModelDocument.ModelDocument):
                 diffs.append((None, toRel, set(), set()))
         return diffs
 
+    def relationshipTreeFingerprint(self, dts, arcrole, linkrole, concept, isDRS=False, visiting=None):
+        """Returns a digest of the relationships from concept and their descendants, of target concept names
+        (in fromDTS namespaces) and lexical arc attributes in relationship order, so that from and to DTS
+        subtrees with equal digests have no differences for diffRelationships or DRSdiff to report, and
+        only subtrees with different digests are compared in detail.  DRS subtrees follow consecutive
+        relationships, continuing dimension-domain with domain-member relationships.  Returns None for
+        subtrees with non-concept targets or cycles, which are always compared in detail.  Digests are
+        kept for the report, so subtrees shared by many parents, DRSes or primary items are traversed once.
+        """
+        isToDTS = dts is self.toDTS
+        key = (isToDTS, arcrole, linkrole, concept, isDRS)
+        try:
+            return self.relationshipTreeFingerprints[key]
+        except KeyError:
+            pass
+        if visiting is None:
+            visiting = set()
+        elif key in visiting:
+            return None # cycle
+        visiting.add(key)
+        childArcrole = XbrlConst.domainMember if isDRS and arcrole == XbrlConst.dimensionDomain else arcrole
+        sha256 = hashlib.sha256()
+        fingerprint = None
+        for rel in dts.relationshipSet(arcrole, linkrole).fromModelObject(concept):
+            toConcept = rel.toModelObject
+            if not isinstance(toConcept, ModelConcept):
+                break
+            toFingerprint = self.relationshipTreeFingerprint(dts, childArcrole, rel.consecutiveLinkrole if isDRS else linkrole,
+                                                             toConcept, isDRS, visiting)
+            if toFingerprint is None:
+                break
+            sha256.update((self.fromDTSqname(toConcept.qname) if isToDTS else toConcept.qname).clarkNotation.encode('utf-8','replace'))
+            self.lexicalFingerprint(sha256, rel.arcElement, isToDTS, relationshipSetArcAttributesExclusion)
+            sha256.update(b'\x1E')
+            sha256.update(toFingerprint.encode())
+            sha256.update(b'\x1D')
+        else:
+            fingerprint = sha256.hexdigest()
+        visiting.discard(key)
+        self.relationshipTreeFingerprints[key] = fingerprint
+        return fingerprint
+
+    def conceptFingerprint(self, dts, concept):
+        """Returns a digest of the lexical concept declaration and of its label and reference relationships
+        and resources, so that concepts with equal digests have no differences for diffConcepts to report,
+        and only concepts with different digests are compared in detail.
+        """
+        isToDTS = dts is self.toDTS
+        sha256 = hashlib.sha256()
+        self.lexicalFingerprint(sha256, concept, isToDTS)
+        for arcrole in (XbrlConst.conceptLabel, XbrlConst.elementLabel, XbrlConst.conceptReference, XbrlConst.elementReference):
+            relationshipSet = dts.relationshipSet(arcrole)
+            if relationshipSet:
+                for rel in relationshipSet.fromModelObject(concept):
+                    resource = rel.toModelObject
+                    sha256.update(b'\x1D')
+                    sha256.update("\x1F".join((rel.linkrole or "", arcrole, resource.role or "")).encode('utf-8','replace'))
+                    self.lexicalFingerprint(sha256, rel.arcElement.getparent(), isToDTS, (XbrlConst.xlink,), attributes=False)
+                    self.lexicalFingerprint(sha256, rel.arcElement, isToDTS, (XbrlConst.xlink, "use", "priority", "order", "id"))
+                    for elt in resource.iter():
+                        if isinstance(elt.tag, str): # skip comments and processing instructions
+                            self.lexicalFingerprint(sha256, elt, isToDTS, (XbrlConst.xlink,))
+                            sha256.update((elt.text or "").encode('utf-8','replace'))
+                        sha256.update(b'\x1E')
+                        if elt is not resource:
+                            sha256.update((elt.tail or "").encode('utf-8','replace'))
+        return sha256.hexdigest()
+
+    def lexicalFingerprint(self, sha256, elt, isToDTS, exclusions=(), attributes=True):
+        """Adds the element name and lexical attributes of elt to sha256, with namespaces (of names and of
+        prefixes of QName-like values) in fromDTS namespaces.  Exclusions are attribute names or namespaces.
+        Lexically equal attributes are equal attributes for XbrlUtil.attributes, without the cost of
+        validating them, while lexical differences which are not differences of value (such as of prefixes
+        or whitespace) are resolved by the detailed comparison.
+        """
+        renames = self.namespaceRenameToURI if isToDTS else {}
+        nsmap = elt.nsmap
+        ns, _sep, localName = elt.tag[1:].partition("}")
+        sha256.update("{{{}}}{}\x1F{}".format(renames.get(ns, ns), localName,
+                                             renames.get(nsmap.get(None), nsmap.get(None) or "")).encode('utf-8','replace'))
+        if not attributes:
+            return
+        for name, value in sorted(elt.items()):
+            if name in exclusions:
+                continue
+            if name.startswith("{"):
+                ns, _sep, localName = name[1:].partition("}")
+                if ns in exclusions:
+                    continue
+                name = "{{{}}}{}".format(renames.get(ns, ns), localName)
+            prefix, sep, localName = value.partition(":")
+            if sep and prefix in nsmap:
+                ns = nsmap[prefix]
+                value = "{{{}}}{}".format(renames.get(ns, ns), localName)
+            sha256.update(b'\x1F')
+            sha256.update(name.encode('utf-8','replace'))
+            sha256.update(b'\x1F')
+            sha256.update(value.encode('utf-8','replace'))
+
     def DRShcDiff(self, fromDTS, fromPriItemDRSrels, toDTS, toPriItemDRSrels):
         fromHcRels = {}
         toHcRels = {}
@@ -28,6 +28,8 @@ if TYPE_CHECKING:
     from arelle.ModelDtsObject import ModelConcept, ModelType, ModelRoleType
     from arelle.ModelFormulaObject import ModelConsistencyAssertion, ModelCustomFunctionSignature, ModelVariableSet
     from arelle.ModelInstanceObject import ModelContext, ModelFact, ModelUnit, ModelDimensionValue
+    from arelle.DiscoveryPrefetcher import DiscoveryPrefetcher
+    from arelle.DocumentCache import DocumentCache
     from arelle.ModelManager import ModelManager
     from arelle.ModelRelationshipSet import ModelRelationshipSet as ModelRelationshipSetClass
     from arelle.ModelValue import QName
@@ -84,13 +86,21 @@ def load(modelManager: ModelManager, url: str | FileSourceClass, nextaction: str
         modelXbrl.closeFileSource= True
     modelXbrl.modelDocument = None
     if kwargs.get("isLoadable",True): # used for test cases to block taxonomy packages without discoverable contents
-        modelXbrl.modelDocument = ModelDocument.load(modelXbrl, url, base, isEntry=True, **kwargs)
-        if supplementalUrls:
-            for url in supplementalUrls:
-                ModelDocument.load(modelXbrl, url, base, isEntry=False, isDiscovered=True, **kwargs)
-        if hasattr(modelXbrl, "entryLoadingUrl"):
-            del modelXbrl.entryLoadingUrl
-        loadSchemalocatedSchemas(modelXbrl)
+        from arelle import DiscoveryPrefetcher, DocumentCache
+        modelXbrl.documentCache = DocumentCache.documentCache(modelXbrl)
+        modelXbrl.discoveryPrefetcher = DiscoveryPrefetcher.create(modelXbrl)
+        try:
+            modelXbrl.modelDocument = ModelDocument.load(modelXbrl, url, base, isEntry=True, **kwargs)
+            if supplementalUrls:
+                for url in supplementalUrls:
+                    ModelDocument.load(modelXbrl, url, base, isEntry=False, isDiscovered=True, **kwargs)
+            if hasattr(modelXbrl, "entryLoadingUrl"):
+                del modelXbrl.entryLoadingUrl
+            loadSchemalocatedSchemas(modelXbrl)
+        finally:
+            if modelXbrl.discoveryPrefetcher is not None:
+                modelXbrl.discoveryPrefetcher.close()
+                modelXbrl.discoveryPrefetcher = None
 
     #from arelle import XmlValidate
     #uncomment for trial use of lxml xml schema validation of entry document
@@ -299,6 +309,7 @@ class ModelXbrl:
     _factsByDatatype: dict[bool | tuple[bool, QName], set[ModelFact]]
     _factsByLocalName: dict[str, set[ModelFact]]
     _factsByPeriodType: dict[str, set[ModelFact]]
+    _factsBySingleMeasure: dict[QName, set[ModelFact]]
     _nonNilFactsInInstance: set[ModelFact]
     _startedProfiledActivity: float
     _startedTimeStat: float
@@ -306,6 +317,7 @@ class ModelXbrl:
     def __init__(self,  modelManager: ModelManager, errorCaptureLevel: str | None = None) -> None:
         self.modelManager = modelManager
         self.skipDTS: bool = modelManager.skipDTS
+        self.copiedDocumentIds: list[int] = []  # ids of lxml documents copied from the document cache, released on close
         self.init(errorCaptureLevel=errorCaptureLevel)
 
     def init(self, keepViews: bool = False, errorCaptureLevel: str | None = None) -> None:
@@ -313,6 +325,9 @@ class ModelXbrl:
         self.namespaceDocs: defaultdict[str, list[ModelDocumentClass]] = defaultdict(list)
         self.urlDocs: dict[str, ModelDocumentClass] = {}
         self.urlUnloadableDocs: dict[bool, str] = {}  # if entry is True, entry is blocked and unloadable, False means loadable but warned
+        self.discoveryPrefetcher: DiscoveryPrefetcher | None = None  # reads and parses discovered documents in threads during load
+        self.documentCache: DocumentCache | None = None  # process's cache of parsed documents, copied for discovered documents
+        self.ixTransformResults: dict[tuple[str, str, str], tuple[Any, Any]] = {}  # memo of FunctionIxt.transform of this model's facts
         self.errorCaptureLevel: str = (errorCaptureLevel or logging._checkLevel("INCONSISTENCY"))  # type: ignore[attr-defined]
         self.errors: list[str | None] = []
         self.logCount: dict[str, int] = {}
@@ -372,11 +387,15 @@ class ModelXbrl:
                 self.fileSource.close()
             modelDocument = getattr(self,"modelDocument",None)
             urlDocs = getattr(self,"urlDocs",None)
+            copiedDocumentIds = getattr(self,"copiedDocumentIds",None)
             for relSet in self.relationshipSets.values():
                 relSet.clear()
             self.__dict__.clear() # dereference everything before closing document
             if modelDocument:
                 modelDocument.close(urlDocs=urlDocs)
+            if copiedDocumentIds:
+                from arelle import DocumentCache
+                DocumentCache.releaseCopiedDocuments(copiedDocumentIds)
 
     @property
     def isClosed(self) -> bool:
@@ -824,6 +843,23 @@ class ModelXbrl:
         except KeyError:
             return set()  # no facts for this period type
 
+    def factsBySingleMeasure(self, measureQname: QName) -> set[ModelFact]:  # indexed by single unit measure qname
+        """Numeric facts in the instance indexed by the measure of their single measure unit, cached
+
+        :param measureQname: Measure QName of a unit with one multiply measure and no divide measure
+        """
+        try:
+            return self._factsBySingleMeasure[measureQname]
+        except AttributeError:
+            fbsm: defaultdict[QName, set[ModelFact]]
+            self._factsBySingleMeasure = fbsm = defaultdict(set)
+            for f in self.factsInInstance:
+                if f.isNumeric and f.unit is not None and f.unit.isSingleMeasure:
+                    fbsm[f.unit.measures[0][0]].add(f)
+            return self.factsBySingleMeasure(measureQname)
+        except KeyError:
+            return set()  # no facts with this measure
+
     def factsByDimMemQname(self, dimQname: QName, memQname: QName | None = None) -> set[ModelFact]:  # indexed by fact (concept) qname
         """Facts in the instance indexed by their Dimension  and Member QName, cached
         If Member is None, returns facts that have the dimension (explicit or typed)
@@ -948,6 +984,8 @@ class ModelXbrl:
                 self._factsByPeriodType[newFact.concept.periodType].add(newFact)
             if hasattr(self, "_factsByDimQname"):
                 del self._factsByDimQname
+            if hasattr(self, "_factsBySingleMeasure"):
+                del self._factsBySingleMeasure
         self.setIsModified()
         return newFact
 
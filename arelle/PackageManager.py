@@ -5,14 +5,14 @@ See COPYRIGHT.md for copyright information.
 '''
 from __future__ import annotations
 from typing import TYPE_CHECKING
-import sys, os, io, time, json, logging
+import sys, os, io, time, json, logging, copy
 from collections import defaultdict
 from fnmatch import fnmatch
 from lxml import etree
 from urllib.parse import urljoin
 openFileSource = None
-from arelle import Locale, XmlUtil
-from arelle.UrlUtil import isAbsolute, isHttpUrl
+from arelle import Locale, Version, XmlUtil
+from arelle.UrlUtil import isAbsolute, isHttpUrl, UrlPrefixTrie
 from arelle.XmlValidate import lxmlResolvingParser
 ArchiveFileIOError = None
 try:
@@ -285,10 +285,19 @@ packagesJsonFile = None
 packagesConfig = None
 packagesConfigChanged = False
 packagesMappings = {}
+packagesCacheJsonFile = None
+packagesCache = None # dict of package infos, with their validation messages, by package URL, manifest name, language and Arelle version
+packagesCacheChanged = False
 _cntlr = None
+_remappingsTrie = None
 
 def init(cntlr: Cntlr, loadPackagesConfig: bool = True) -> None:
-    global packagesJsonFile, packagesConfig, packagesMappings, _cntlr
+    global packagesJsonFile, packagesConfig, packagesMappings, packagesCacheJsonFile, packagesCache, _cntlr
+    packagesCache = None
+    try: # package infos are cached also when packages config is not loaded (such as for command line)
+        packagesCacheJsonFile = cntlr.userAppDir + os.sep + "taxonomyPackagesCache.json"
+    except Exception:
+        packagesCacheJsonFile = None # on GAE no userAppDir
     if loadPackagesConfig:
         try:
             packagesJsonFile = cntlr.userAppDir + os.sep + "taxonomyPackages.json"
@@ -307,8 +316,10 @@ def init(cntlr: Cntlr, loadPackagesConfig: bool = True) -> None:
     _cntlr = cntlr
 
 def reset():  # force reloading modules and plugin infos
+    global packagesCache
     packagesConfig.clear()  # dict of loaded module pluginInfo objects by module names
     packagesMappings.clear() # dict by class of list of ordered callable function objects
+    packagesCache = None
 
 def orderedPackagesConfig():
     return OrderedDict(
@@ -340,8 +351,10 @@ def save(cntlr: Cntlr) -> None:
         packagesConfigChanged = False
 
 def close():  # close all loaded methods
+    global packagesCache
     packagesConfig.clear()
     packagesMappings.clear()
+    packagesCache = None
     global webCache
     webCache = None
 
@@ -428,129 +441,247 @@ def validateTaxonomyPackage(cntlr, filesource, packageFiles=[], errors=[]) -> bo
             errors.append("tpe:metadataFileNotFound")
         return len(errors) == numErrorsOnEntry
 
+class PackageMessagesRecorder:
+    """
+    .. class:: PackageMessagesRecorder(cntlr, logMessages)
+
+    Controller for indexing a package which records its log messages for caching and replay, logging
+    them with cntlr if logMessages, and otherwise acts as cntlr.
+    """
+    def __init__(self, cntlr, logMessages):
+        self.cntlr = cntlr
+        self.logMessages = logMessages
+        self.messages = []
+
+    def addToLog(self, message, messageCode="", messageArgs=None, file="", refs=None, level=logging.INFO):
+        self.messages.append([message, messageCode, messageArgs, file, refs, level])
+        if self.logMessages:
+            self.cntlr.addToLog(message, messageCode=messageCode, messageArgs=messageArgs, file=file, refs=refs, level=level)
+
+    def __getattr__(self, name):
+        return getattr(self.cntlr, name)
+
+def packageCacheKey(URL, packageManifestName):
+    return "|".join((URL, packageManifestName or "", Locale.getLanguageCode(), Version.__version__))
+
+def packageFileSignature(packageFilename):
+    # packages in the file system are revalidated when their size or modification time changes
+    try:
+        stat = os.stat(packageFilename)
+    except (OSError, ValueError):
+        return None # package in an archive or not in the file system, not cached
+    return [stat.st_size, stat.st_mtime_ns]
+
+def cachedPackages():
+    global packagesCache
+    if packagesCache is None:
+        packagesCache = {}
+        if packagesCacheJsonFile:
+            try:
+                with io.open(packagesCacheJsonFile, 'rt', encoding='utf-8') as f:
+                    packagesCache = json.load(f)
+            except Exception:
+                pass # no cache yet or not readable, packages are revalidated
+    return packagesCache
+
+def cachedPackageInfo(URL, packageFilename, packageManifestName):
+    cachedPackage = cachedPackages().get(packageCacheKey(URL, packageManifestName))
+    if (cachedPackage is not None and cachedPackage["filename"] == packageFilename and
+        cachedPackage["signature"] == packageFileSignature(packageFilename)):
+        return cachedPackage
+    return None
+
+def indexPackage(cntlr, URL, packageFilename, packageManifestName=None, logMessages=True):
+    # validates and parses package, for a file system package the result and its messages are cached
+    recorder = PackageMessagesRecorder(cntlr, logMessages)
+    errors = []
+    cachedPackage = {"filename": packageFilename,
+                     "signature": packageFileSignature(packageFilename),
+                     "packageInfo": packageFileInfo(recorder, URL, packageFilename, packageManifestName, errors),
+                     "messages": recorder.messages,
+                     "errors": errors}
+    if cachedPackage["signature"] is not None:
+        global packagesCacheChanged
+        cachedPackages()[packageCacheKey(URL, packageManifestName)] = cachedPackage
+        packagesCacheChanged = True
+    return cachedPackage
+
+def indexPackages(cntlr, URLs, packageManifestName=None):
+    # validates and parses file system packages not yet cached in parallel, for packageInfo to use their cached results
+    from concurrent.futures import ThreadPoolExecutor
+    uncachedPackages = []
+    for URL in URLs:
+        packageFilename = _cntlr.webCache.getfilename(URL, normalize=True)
+        if (packageFilename and packageFileSignature(packageFilename) is not None and
+            cachedPackageInfo(URL, packageFilename, packageManifestName) is None):
+            uncachedPackages.append((URL, packageFilename))
+    if len(uncachedPackages) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(uncachedPackages), os.cpu_count() or 1)) as executor:
+            for future in [executor.submit(packageFileIndex, cntlr, URL, packageFilename, packageManifestName)
+                           for URL, packageFilename in uncachedPackages]:
+                future.result()
+        savePackagesCache(cntlr)
+
+def packageFileIndex(cntlr, URL, packageFilename, packageManifestName):
+    try:
+        indexPackage(cntlr, URL, packageFilename, packageManifestName, logMessages=False)
+    except Exception:
+        pass # not cached, packageInfo repeats validation and reports the exception
+
+def replayCachedPackageInfo(cntlr, cachedPackage, errors):
+    for message, messageCode, messageArgs, file, refs, level in cachedPackage["messages"]:
+        cntlr.addToLog(message, messageCode=messageCode, messageArgs=messageArgs, file=file, refs=refs, level=level)
+    errors.extend(cachedPackage["errors"])
+    return copy.deepcopy(cachedPackage["packageInfo"]) # package infos are changed by package manager
+
+def savePackagesCache(cntlr: Cntlr) -> None:
+    global packagesCacheChanged
+    if packagesCacheChanged and packagesCacheJsonFile and cntlr.hasFileSystem and not cntlr.disablePersistentConfig:
+        # drop packages no longer in the file system
+        for key, cachedPackage in list(cachedPackages().items()):
+            if not os.path.exists(cachedPackage["filename"]):
+                del packagesCache[key]
+        try:
+            with io.open(packagesCacheJsonFile, 'wt', encoding='utf-8') as f:
+                f.write(json.dumps(packagesCache, ensure_ascii=False, default=str))
+        except EnvironmentError:
+            pass # packages are revalidated when not cached
+        packagesCacheChanged = False
+
 def packageInfo(cntlr, URL, reload=False, packageManifestName=None, errors=[]):
     #TODO several directories, eg User Application Data
     packageFilename = _cntlr.webCache.getfilename(URL, reload=reload, normalize=True)
     if packageFilename:
-        from arelle.FileSource import TAXONOMY_PACKAGE_FILE_NAMES
-        filesource = None
-        try:
-            global openFileSource
-            if openFileSource is None:
-                from arelle.FileSource import openFileSource
-            from arelle.FileSource import archiveFilenameParts
-            parts = archiveFilenameParts(packageFilename)
-            if parts is not None:
-                sourceFileSource = openFileSource(parts[0], _cntlr)
-                sourceFileSource.open()
-                fileDateTuple = sourceFileSource.fs.getinfo(parts[1]).date_time + (0,0,0)
-            else:
-                sourceFileSource = None
-                fileDateTuple = time.gmtime(os.path.getmtime(packageFilename))
-            filesource = openFileSource(packageFilename, _cntlr, sourceFileSource=sourceFileSource)
-            if sourceFileSource:
-                sourceFileSource.close()
-            # allow multiple manifests [[metadata, prefix]...] for multiple catalogs
-            packages = []
-            packageFiles = []
-            if filesource.isZip:
-                validateTaxonomyPackage(cntlr, filesource, packageFiles, errors)
-                if not packageFiles:
-                    # look for pre-PWD packages
-                    _dir = filesource.dir
-                    _metaInf = '{}/META-INF/'.format(
-                                os.path.splitext(os.path.basename(packageFilename))[0])
-                    if packageManifestName:
-                        # pre-pwd
-                        packageFiles = [fileName
-                                        for fileName in _dir
-                                        if fnmatch(fileName, packageManifestName)]
-                    elif _metaInf + 'taxonomyPackage.xml' in _dir:
-                        # PWD taxonomy packages
-                        packageFiles = [_metaInf + 'taxonomyPackage.xml']
-                    elif 'META-INF/taxonomyPackage.xml' in _dir:
-                        # root-level META-INF taxonomy packages
-                        packageFiles = ['META-INF/taxonomyPackage.xml']
-                if len(packageFiles) < 1:
-                    raise IOError(_("Taxonomy package contained no metadata file: {0}.")
-                                  .format(', '.join(packageFiles)))
-                # if current package files found, remove any nonconforming package files
-                if any(pf.startswith('_metaInf') for pf in packageFiles) and any(not pf.startswith(_metaInf) for pf in packageFiles):
-                    packageFiles = [pf for pf in packageFiles if pf.startswith(_metaInf)]
-                elif any(pf.startswith('META-INF/') for pf in packageFiles) and any(not pf.startswith('META-INF/') for pf in packageFiles):
-                    packageFiles = [pf for pf in packageFiles if pf.startswith('META-INF/')]
-
-                for packageFile in packageFiles:
-                    packageFileUrl = filesource.url + os.sep + packageFile
-                    packageFilePrefix = os.sep.join(os.path.split(packageFile)[:-1])
-                    if packageFilePrefix:
-                        packageFilePrefix += os.sep
-                    packageFilePrefix = filesource.baseurl + os.sep +  packageFilePrefix
-                    packages.append([packageFileUrl, packageFilePrefix, packageFile])
+        cachedPackage = cachedPackageInfo(URL, packageFilename, packageManifestName)
+        if cachedPackage is not None:
+            return replayCachedPackageInfo(cntlr, cachedPackage, errors)
+        cachedPackage = indexPackage(cntlr, URL, packageFilename, packageManifestName)
+        savePackagesCache(cntlr)
+        errors.extend(cachedPackage["errors"])
+        return copy.deepcopy(cachedPackage["packageInfo"]) # package infos are changed by package manager
+    return None
+
+def packageFileInfo(cntlr, URL, packageFilename, packageManifestName=None, errors=[]):
+    from arelle.FileSource import TAXONOMY_PACKAGE_FILE_NAMES
+    filesource = None
+    try:
+        global openFileSource
+        if openFileSource is None:
+            from arelle.FileSource import openFileSource
+        from arelle.FileSource import archiveFilenameParts
+        parts = archiveFilenameParts(packageFilename)
+        if parts is not None:
+            sourceFileSource = openFileSource(parts[0], cntlr)
+            sourceFileSource.open()
+            fileDateTuple = sourceFileSource.fs.getinfo(parts[1]).date_time + (0,0,0)
+        else:
+            sourceFileSource = None
+            fileDateTuple = time.gmtime(os.path.getmtime(packageFilename))
+        filesource = openFileSource(packageFilename, cntlr, sourceFileSource=sourceFileSource)
+        if sourceFileSource:
+            sourceFileSource.close()
+        # allow multiple manifests [[metadata, prefix]...] for multiple catalogs
+        packages = []
+        packageFiles = []
+        if filesource.isZip:
+            validateTaxonomyPackage(cntlr, filesource, packageFiles, errors)
+            if not packageFiles:
+                # look for pre-PWD packages
+                _dir = filesource.dir
+                _metaInf = '{}/META-INF/'.format(
+                            os.path.splitext(os.path.basename(packageFilename))[0])
+                if packageManifestName:
+                    # pre-pwd
+                    packageFiles = [fileName
+                                    for fileName in _dir
+                                    if fnmatch(fileName, packageManifestName)]
+                elif _metaInf + 'taxonomyPackage.xml' in _dir:
+                    # PWD taxonomy packages
+                    packageFiles = [_metaInf + 'taxonomyPackage.xml']
+                elif 'META-INF/taxonomyPackage.xml' in _dir:
+                    # root-level META-INF taxonomy packages
+                    packageFiles = ['META-INF/taxonomyPackage.xml']
+            if len(packageFiles) < 1:
+                raise IOError(_("Taxonomy package contained no metadata file: {0}.")
+                              .format(', '.join(packageFiles)))
+            # if current package files found, remove any nonconforming package files
+            if any(pf.startswith('_metaInf') for pf in packageFiles) and any(not pf.startswith(_metaInf) for pf in packageFiles):
+                packageFiles = [pf for pf in packageFiles if pf.startswith(_metaInf)]
+            elif any(pf.startswith('META-INF/') for pf in packageFiles) and any(not pf.startswith('META-INF/') for pf in packageFiles):
+                packageFiles = [pf for pf in packageFiles if pf.startswith('META-INF/')]
+
+            for packageFile in packageFiles:
+                packageFileUrl = filesource.url + os.sep + packageFile
+                packageFilePrefix = os.sep.join(os.path.split(packageFile)[:-1])
+                if packageFilePrefix:
+                    packageFilePrefix += os.sep
+                packageFilePrefix = filesource.baseurl + os.sep +  packageFilePrefix
+                packages.append([packageFileUrl, packageFilePrefix, packageFile])
+        else:
+            cntlr.addToLog(_("Taxonomy package is not a zip file."),
+                           messageCode="tpe:invalidArchiveFormat",
+                           file=os.path.basename(packageFilename),
+                           level=logging.ERROR)
+            errors.append("tpe:invalidArchiveFormat")
+            if (os.path.basename(filesource.url) in TAXONOMY_PACKAGE_FILE_NAMES or # individual manifest file
+                  (os.path.basename(filesource.url) == "taxonomyPackage.xml" and
+                   os.path.basename(os.path.dirname(filesource.url)) == "META-INF")):
+                packageFile = packageFileUrl = filesource.url
+                packageFilePrefix = os.path.dirname(packageFile)
+                if packageFilePrefix:
+                    packageFilePrefix += os.sep
+                packages.append([packageFileUrl, packageFilePrefix, ""])
             else:
-                cntlr.addToLog(_("Taxonomy package is not a zip file."),
-                               messageCode="tpe:invalidArchiveFormat",
-                               file=os.path.basename(packageFilename),
-                               level=logging.ERROR)
-                errors.append("tpe:invalidArchiveFormat")
-                if (os.path.basename(filesource.url) in TAXONOMY_PACKAGE_FILE_NAMES or # individual manifest file
-                      (os.path.basename(filesource.url) == "taxonomyPackage.xml" and
-                       os.path.basename(os.path.dirname(filesource.url)) == "META-INF")):
-                    packageFile = packageFileUrl = filesource.url
-                    packageFilePrefix = os.path.dirname(packageFile)
-                    if packageFilePrefix:
-                        packageFilePrefix += os.sep
-                    packages.append([packageFileUrl, packageFilePrefix, ""])
-                else:
-                    raise IOError(_("File must be a taxonomy package (zip file), catalog file, or manifest (): {0}.")
-                                  .format(packageFilename, ', '.join(TAXONOMY_PACKAGE_FILE_NAMES)))
-            remappings = {}
-            packageNames = []
-            descriptions = []
-            for packageFileUrl, packageFilePrefix, packageFile in packages:
-                parsedPackage = parsePackage(_cntlr, filesource, packageFileUrl, packageFilePrefix, errors)
-                if parsedPackage:
-                    packageNames.append(parsedPackage['name'])
-                    if parsedPackage.get('description'):
-                        descriptions.append(parsedPackage['description'])
-                    for prefix, remapping in parsedPackage["remappings"].items():
-                        if prefix not in remappings:
-                            remappings[prefix] = remapping
-                        else:
-                            cntlr.addToLog("Package mapping duplicate rewrite start string %(rewriteStartString)s",
-                                           messageArgs={"rewriteStartString": prefix},
-                                           messageCode="arelle.packageDuplicateMapping",
-                                           file=os.path.basename(URL),
-                                           level=logging.ERROR)
-                            errors.append("arelle.packageDuplicateMapping")
-            if not parsedPackage:
-                return None
-            package = {'name': ", ".join(packageNames),
-                       'status': 'enabled',
-                       'version': parsedPackage.get('version'),
-                       'license': parsedPackage.get('license'),
-                       'fileDate': time.strftime('%Y-%m-%dT%H:%M:%S UTC', fileDateTuple),
-                       'URL': URL,
-                       'entryPoints': parsedPackage.get('entryPoints', {}),
-                       'manifestName': packageManifestName,
-                       'description': "; ".join(descriptions),
-                       'publisher': parsedPackage.get('publisher'),
-                       'publisherURL': parsedPackage.get('publisherURL'),
-                       'publisherCountry': parsedPackage.get('publisherCountry'),
-                       'publicationDate': parsedPackage.get('publicationDate'),
-                       'supersededTaxonomyPackages': parsedPackage.get('supersededTaxonomyPackages'),
-                       'versioningReports': parsedPackage.get('versioningReports'),
-                       'remappings': remappings,
-                       }
-            filesource.close()
-            return package
-        except (EnvironmentError, etree.XMLSyntaxError):
-            pass
-        if filesource:
-            filesource.close()
+                raise IOError(_("File must be a taxonomy package (zip file), catalog file, or manifest (): {0}.")
+                              .format(packageFilename, ', '.join(TAXONOMY_PACKAGE_FILE_NAMES)))
+        remappings = {}
+        packageNames = []
+        descriptions = []
+        for packageFileUrl, packageFilePrefix, packageFile in packages:
+            parsedPackage = parsePackage(cntlr, filesource, packageFileUrl, packageFilePrefix, errors)
+            if parsedPackage:
+                packageNames.append(parsedPackage['name'])
+                if parsedPackage.get('description'):
+                    descriptions.append(parsedPackage['description'])
+                for prefix, remapping in parsedPackage["remappings"].items():
+                    if prefix not in remappings:
+                        remappings[prefix] = remapping
+                    else:
+                        cntlr.addToLog("Package mapping duplicate rewrite start string %(rewriteStartString)s",
+                                       messageArgs={"rewriteStartString": prefix},
+                                       messageCode="arelle.packageDuplicateMapping",
+                                       file=os.path.basename(URL),
+                                       level=logging.ERROR)
+                        errors.append("arelle.packageDuplicateMapping")
+        if not parsedPackage:
+            return None
+        package = {'name': ", ".join(packageNames),
+                   'status': 'enabled',
+                   'version': parsedPackage.get('version'),
+                   'license': parsedPackage.get('license'),
+                   'fileDate': time.strftime('%Y-%m-%dT%H:%M:%S UTC', fileDateTuple),
+                   'URL': URL,
+                   'entryPoints': parsedPackage.get('entryPoints', {}),
+                   'manifestName': packageManifestName,
+                   'description': "; ".join(descriptions),
+                   'publisher': parsedPackage.get('publisher'),
+                   'publisherURL': parsedPackage.get('publisherURL'),
+                   'publisherCountry': parsedPackage.get('publisherCountry'),
+                   'publicationDate': parsedPackage.get('publicationDate'),
+                   'supersededTaxonomyPackages': parsedPackage.get('supersededTaxonomyPackages'),
+                   'versioningReports': parsedPackage.get('versioningReports'),
+                   'remappings': remappings,
+                   }
+        filesource.close()
+        return package
+    except (EnvironmentError, etree.XMLSyntaxError):
+        pass
+    if filesource:
+        filesource.close()
     return None
 
 def rebuildRemappings(cntlr):
+    global _remappingsTrie
     remappings = packagesConfig["remappings"]
     remappings.clear()
     remapOverlapUrls = [] # (prefix, packageURL, rewriteString)
@@ -561,12 +692,18 @@ def rebuildRemappings(cntlr):
                 remappings[prefix] = remapping
                 remapOverlapUrls.append( (prefix, _packageInfoURL, remapping) )
     remapOverlapUrls.sort()
+    prefixIndexes = defaultdict(list) # sorted earlier remapOverlapUrls indexes by prefix
     for i, _remap in enumerate(remapOverlapUrls):
         _prefix, _packageURL, _rewrite = _remap
-        for j in range(i-1, -1, -1):
+        if not _prefix:
+            continue
+        # earlier (sorted) prefixes overlapping _prefix can only be its own leading substrings
+        overlapIndexes = sorted((j for k in range(1, len(_prefix) + 1) for j in prefixIndexes.get(_prefix[:k], ())),
+                                reverse=True)
+        prefixIndexes[_prefix].append(i)
+        for j in overlapIndexes:
             _prefix2, _packageURL2, _rewrite2 = remapOverlapUrls[j]
-            if (_packageURL != _packageURL2 and _prefix and _prefix2 and
-                (_prefix.startswith(_prefix2) or _prefix2.startswith(_prefix))):
+            if _packageURL != _packageURL2:
                 _url1 = os.path.basename(_packageURL)
                 _url2 = os.path.basename(_packageURL2)
                 if _url1 == _url2: # use full file names
@@ -579,26 +716,30 @@ def rebuildRemappings(cntlr):
                                messageCode="arelle.packageRewriteOverlap",
                                file=(_url1, _url2),
                                level=logging.WARNING)
+    _remappingsTrie = UrlPrefixTrie(remappings)
+
 
+def remappingsTrie():
+    global _remappingsTrie
+    remappings = packagesConfig.get('remappings', EMPTYDICT)
+    if _remappingsTrie is None or not _remappingsTrie.isBuiltFrom(remappings):
+        _remappingsTrie = UrlPrefixTrie(remappings)
+    return _remappingsTrie
 
 def isMappedUrl(url):
     return (packagesConfig is not None and url is not None and
-            any(url.startswith(mapFrom) and not url.startswith(mapTo) # prevent recursion in mapping for url hosted Packages
-                for mapFrom, mapTo in packagesConfig.get('remappings', EMPTYDICT).items()))
+            any(not url.startswith(mapTo) # prevent recursion in mapping for url hosted Packages
+                for _order, mapFrom, mapTo in remappingsTrie().matches(url)))
 
 def mappedUrl(url):
     if packagesConfig is not None and url is not None:
-        longestPrefix = 0
-        for mapFrom, mapTo in packagesConfig.get('remappings', EMPTYDICT).items():
-            if url.startswith(mapFrom):
-                if url.startswith(mapTo):
-                    return url # recursive mapping, this is already mapped
-                prefixLength = len(mapFrom)
-                if prefixLength > longestPrefix:
-                    mappedUrl = mapTo + url[prefixLength:]
-                    longestPrefix = prefixLength
-        if longestPrefix:
-            return mappedUrl
+        matches = remappingsTrie().matches(url)
+        if matches:
+            if any(url.startswith(mapTo) for _order, mapFrom, mapTo in matches):
+                return url # recursive mapping, this is already mapped
+            _order, mapFrom, mapTo = matches[-1] # longest prefix
+            if mapFrom:
+                return mapTo + url[len(mapFrom):]
     return url
 
 def addPackage(cntlr, url, packageManifestName=None):
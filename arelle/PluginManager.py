@@ -5,13 +5,13 @@ based on pull request 4
 
 '''
 from __future__ import annotations
-import os, sys, types, time, ast, importlib, io, json, gettext, traceback
+import os, sys, types, time, ast, importlib, io, json, gettext, traceback, copy, functools
 from importlib.metadata import entry_points, EntryPoint
 import importlib.util
 import logging
 
 from types import ModuleType
-from typing import TYPE_CHECKING, Any, Iterator, Callable
+from typing import TYPE_CHECKING, Any, Callable
 from arelle.Locale import getLanguageCodes
 import arelle.FileSource
 from arelle.UrlUtil import isAbsolute
@@ -37,14 +37,22 @@ pluginConfig: dict | None = None
 pluginConfigChanged = False
 pluginTraceFileLogger = None
 modulePluginInfos = {}
-pluginMethodsForClasses = {}
+pluginMethodsForClasses = {} # dispatch table by class name, tuple of ordered callable function objects
+collectClassMethodStats = False # when set dispatch tables have methods which collect classMethodStats
+classMethodStats = {} # [number of calls, seconds] by (class name, module name) of dispatched methods
+pluginManifestsJsonFile = None
+pluginManifests = None # scanned module infos and __pluginInfo__ class methods of plug-in module files, see pluginManifestsCache
+pluginManifestsChanged = False
+moduleImportTimes = {} # seconds to import each imported plug-in module by module name
 _cntlr = None
 _pluginBase = None
 EMPTYLIST = []
+EMPTYTUPLE = ()
 _ERROR_MESSAGE_IMPORT_TEMPLATE = "Unable to load module {}"
 
 def init(cntlr: Cntlr, loadPluginConfig: bool = True) -> None:
     global pluginJsonFile, pluginConfig, pluginTraceFileLogger, modulePluginInfos, pluginMethodsForClasses, pluginConfigChanged, _cntlr, _pluginBase
+    global pluginManifestsJsonFile, pluginManifests, moduleImportTimes
     if PLUGIN_TRACE_FILE:
         pluginTraceFileLogger = logging.getLogger(__name__)
         pluginTraceFileLogger.propagate = False
@@ -56,6 +64,12 @@ def init(cntlr: Cntlr, loadPluginConfig: bool = True) -> None:
     pluginConfigChanged = False
     _cntlr = cntlr
     _pluginBase = cntlr.pluginDir + os.sep
+    pluginManifests = None
+    moduleImportTimes = {}
+    try: # plug-in manifests are cached also when plug-in config is not loaded (such as for command line)
+        pluginManifestsJsonFile = cntlr.userAppDir + os.sep + "pluginManifests.json"
+    except Exception:
+        pluginManifestsJsonFile = None # on GAE no userAppDir
     if loadPluginConfig:
         try:
             pluginJsonFile = cntlr.userAppDir + os.sep + "plugins.json"
@@ -106,9 +120,13 @@ def save(cntlr: Cntlr) -> None:
         pluginConfigChanged = False
 
 def close():  # close all loaded methods
+    global pluginManifests
     pluginConfig.clear()
     modulePluginInfos.clear()
     pluginMethodsForClasses.clear()
+    moduleImportTimes.clear()
+    classMethodStats.clear()
+    pluginManifests = None
     global webCache
     webCache = None
 
@@ -213,7 +231,80 @@ def freshenModuleInfos():
             _msg = _("Exception at plug-in method freshenModuleInfos: {error}").format(error=err)
             logPluginTrace(_msg, logging.ERROR)
 
+def pluginManifestsCache():
+    # module infos by module URL and class methods of loaded __pluginInfo__ by module file name, with file signatures
+    global pluginManifests
+    if pluginManifests is None:
+        pluginManifests = {"moduleInfos": {}, "classMethods": {}}
+        if pluginManifestsJsonFile:
+            try:
+                with io.open(pluginManifestsJsonFile, 'rt', encoding='utf-8') as f:
+                    pluginManifests = json.load(f)
+            except Exception:
+                pass # no manifests yet or not readable, plug-in modules are scanned and imported
+    return pluginManifests
+
+def savePluginManifests():
+    global pluginManifestsChanged
+    if pluginManifestsChanged and pluginManifestsJsonFile and _cntlr.hasFileSystem and not _cntlr.disablePersistentConfig:
+        try:
+            with io.open(pluginManifestsJsonFile, 'wt', encoding='utf-8') as f:
+                f.write(json.dumps(pluginManifests, ensure_ascii=False))
+        except EnvironmentError:
+            pass # plug-in modules are scanned and imported when not cached
+        pluginManifestsChanged = False
+
+def fileSignature(filename):
+    # cached manifests are used until a file's (or directory's) size or modification time changes
+    try:
+        stat = os.stat(filename)
+    except (OSError, TypeError, ValueError):
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+def moduleInfoFilename(moduleURL):
+    # file of a plug-in module, or the __init__.py file of a plug-in package
+    moduleFilename = _cntlr.webCache.getfilename(moduleURL, normalize=True, base=_pluginBase)
+    if moduleFilename:
+        if os.path.isdir(moduleFilename):
+            moduleFilename = os.path.join(moduleFilename, "__init__.py")
+        elif not moduleFilename.endswith(".py") and not os.path.exists(moduleFilename) and os.path.exists(moduleFilename + ".py"):
+            moduleFilename += ".py" # extension module without .py suffix
+        return os.path.abspath(moduleFilename)
+    return None
+
+def moduleInfoFileSignatures(moduleInfo, signatures):
+    # signatures of module files and their directories (whose contents determine module_import and module_subtree imports)
+    moduleURL = moduleInfo["moduleURL"]
+    if isAbsolute(moduleURL):
+        return False # web plug-ins are not cached
+    moduleFilename = moduleInfoFilename(moduleURL)
+    for filename in (moduleFilename, moduleFilename and os.path.dirname(moduleFilename)):
+        signature = fileSignature(filename)
+        if signature is None:
+            return False
+        signatures.append([filename] + signature)
+    return all(moduleInfoFileSignatures(importModuleInfo, signatures)
+               for importModuleInfo in moduleInfo.get("imports", EMPTYLIST))
+
 def moduleModuleInfo(moduleURL, reload=False, parentImportsSubtree=False):
+    # scanned module infos are cached in the plug-in manifests until a module's file or directory changes
+    manifestKey = "|".join((moduleURL, _pluginBase or "", str(parentImportsSubtree)))
+    moduleInfos = pluginManifestsCache()["moduleInfos"]
+    cachedModuleInfo = moduleInfos.get(manifestKey)
+    if (not reload and cachedModuleInfo is not None and
+        all(fileSignature(filename) == signature for filename, *signature in cachedModuleInfo["signatures"])):
+        return copy.deepcopy(cachedModuleInfo["moduleInfo"]) # module infos are changed by plug-in manager
+    moduleInfo = scanModuleInfo(moduleURL, reload, parentImportsSubtree)
+    signatures = []
+    if moduleInfo is not None and moduleInfoFileSignatures(moduleInfo, signatures):
+        global pluginManifestsChanged
+        moduleInfos[manifestKey] = {"signatures": signatures, "moduleInfo": copy.deepcopy(moduleInfo)}
+        pluginManifestsChanged = True
+        savePluginManifests()
+    return moduleInfo
+
+def scanModuleInfo(moduleURL, reload=False, parentImportsSubtree=False):
     #TODO several directories, eg User Application Data
     moduleFilename = _cntlr.webCache.getfilename(moduleURL, reload=reload, normalize=True, base=_pluginBase)
     if moduleFilename:
@@ -408,6 +499,41 @@ def _find_and_load_module(moduleDir: str, moduleName: str) -> ModuleType | None:
 
     return sys.modules[moduleName]
 
+def recordPluginClassMethods(moduleFilename, pluginInfo):
+    # class methods of an imported module's __pluginInfo__, for its import to be deferred until one is dispatched
+    global pluginManifestsChanged
+    classMethods = [key for key, value in pluginInfo.items()
+                    if isinstance(value, types.FunctionType) or key == 'ModelObjectFactory.ElementSubstitutionClasses']
+    signature = fileSignature(moduleFilename)
+    cachedClassMethods = pluginManifestsCache()["classMethods"]
+    if signature is not None and cachedClassMethods.get(moduleFilename) != {"signature": signature, "classMethods": classMethods}:
+        cachedClassMethods[moduleFilename] = {"signature": signature, "classMethods": classMethods}
+        pluginManifestsChanged = True
+        savePluginManifests()
+
+def deferModuleImport(moduleInfo: dict[str, Any]) -> bool:
+    """
+    Defers importing an imported plug-in module until one of its class methods is dispatched by pluginClassMethods,
+    when its __pluginInfo__ class methods are known from a prior import of its unchanged module file.
+    :param moduleInfo: Module information of the imported plug-in module.
+    :return: True if the module import is deferred, False if it must be imported now.
+    """
+    name = moduleInfo.get("name")
+    if not name or isAbsolute(moduleInfo["moduleURL"]):
+        return False
+    moduleFilename = moduleInfoFilename(moduleInfo["moduleURL"])
+    cachedClassMethods = pluginManifestsCache()["classMethods"].get(moduleFilename)
+    if (cachedClassMethods is None or cachedClassMethods["signature"] != fileSignature(moduleFilename) or
+        'ModelObjectFactory.ElementSubstitutionClasses' in cachedClassMethods["classMethods"]): # substitution classes are registered on import
+        return False
+    pluginConfig['modules'].setdefault(name, moduleInfo)
+    for classMethod in cachedClassMethods["classMethods"]:
+        classModuleNames = pluginConfig['classes'].setdefault(classMethod, [])
+        if name not in classModuleNames:
+            classModuleNames.append(name)
+            pluginMethodsForClasses.pop(classMethod, None) # dispatch table is rebuilt with this module
+    return True
+
 def loadModule(moduleInfo: dict[str, Any], packagePrefix: str="") -> None:
     name = moduleInfo['name']
     moduleURL = moduleInfo['moduleURL']
@@ -423,7 +549,9 @@ def loadModule(moduleInfo: dict[str, Any], packagePrefix: str="") -> None:
         _cntlr.addToLog(message=_ERROR_MESSAGE_IMPORT_TEMPLATE.format(name), level=logging.ERROR)
     else:
         try:
+            startedAt = time.perf_counter()
             module = _find_and_load_module(moduleDir=moduleDir, moduleName=moduleName)
+            moduleImportTimes[name] = time.perf_counter() - startedAt
             pluginInfo = module.__pluginInfo__.copy()
             elementSubstitutionClasses = None
             if name == pluginInfo.get('name'):
@@ -446,11 +574,13 @@ def loadModule(moduleInfo: dict[str, Any], packagePrefix: str="") -> None:
                         classModuleNames = pluginConfig['classes'].setdefault(key, [])
                         if name and name not in classModuleNames:
                             classModuleNames.append(name)
+                            pluginMethodsForClasses.pop(key, None) # dispatch table is rebuilt with this module
                     if key == 'ModelObjectFactory.ElementSubstitutionClasses':
                         elementSubstitutionClasses = value
                 module._ = _gettext
                 global pluginConfigChanged
                 pluginConfigChanged = True
+                recordPluginClassMethods(os.path.abspath(module.__file__), pluginInfo)
             if elementSubstitutionClasses:
                 try:
                     from arelle.ModelObjectFactory import elementSubstitutionModelClass
@@ -460,7 +590,8 @@ def loadModule(moduleInfo: dict[str, Any], packagePrefix: str="") -> None:
                             name=name, error=err)
                     logPluginTrace(_msg, logging.ERROR)
             for importModuleInfo in moduleInfo.get('imports', EMPTYLIST):
-                loadModule(importModuleInfo, packageImportPrefix)
+                if not deferModuleImport(importModuleInfo):
+                    loadModule(importModuleInfo, packageImportPrefix)
         except (AttributeError, ImportError, FileNotFoundError, ModuleNotFoundError, TypeError, SystemError) as err:
             # Send a summary of the error to the logger and retain the stacktrace for stderr
             _cntlr.addToLog(message=_ERROR_MESSAGE_IMPORT_TEMPLATE.format(name), level=logging.ERROR)
@@ -469,29 +600,72 @@ def loadModule(moduleInfo: dict[str, Any], packagePrefix: str="") -> None:
                     name=name, error=err, traceback=traceback.format_tb(sys.exc_info()[2]))
             logPluginTrace(_msg, logging.ERROR)
 
-def pluginClassMethods(className: str) -> Iterator[Callable[..., Any]]:
-    if pluginConfig:
+def pluginClassMethods(className: str) -> tuple[Callable[..., Any], ...]:
+    """
+    Dispatch table of the plug-in methods of a class, in execution order, importing their modules on first use.
+    Tables are kept until plug-ins are reset or the modules of the class change.
+    :param className: Plug-in class name, such as "ModelDocument.PullLoader".
+    :return: Tuple of callable plug-in methods of the class.
+    """
+    try:
+        return pluginMethodsForClasses[className]
+    except KeyError:
+        pass
+    if not pluginConfig:
+        return EMPTYTUPLE
+    # load all modules for class
+    pluginMethodsForClass = []
+    modulesNamesLoaded = set()
+    if className in pluginConfig["classes"]:
+        for moduleName in pluginConfig["classes"].get(className):
+            if moduleName and moduleName in pluginConfig["modules"] and moduleName not in modulesNamesLoaded:
+                modulesNamesLoaded.add(moduleName) # prevent multiply executing same class
+                moduleInfo = pluginConfig["modules"][moduleName]
+                if moduleInfo["status"] == "enabled":
+                    if moduleName not in modulePluginInfos:
+                        loadModule(moduleInfo)
+                    if moduleName in modulePluginInfos:
+                        pluginInfo = modulePluginInfos[moduleName]
+                        if className in pluginInfo:
+                            if collectClassMethodStats:
+                                pluginMethodsForClass.append(profiledClassMethod(className, moduleName, pluginInfo[className]))
+                            else:
+                                pluginMethodsForClass.append(pluginInfo[className])
+    pluginMethodsForClasses[className] = pluginMethodsForClass = tuple(pluginMethodsForClass)
+    return pluginMethodsForClass
+
+def profiledClassMethod(className: str, moduleName: str, method: Callable[..., Any]) -> Callable[..., Any]:
+    stats = classMethodStats.setdefault((className, moduleName), [0, 0.0])
+    @functools.wraps(method)
+    def profiledMethod(*args, **kwargs):
+        startedAt = time.perf_counter()
         try:
-            pluginMethodsForClass = pluginMethodsForClasses[className]
-        except KeyError:
-            # load all modules for class
-            pluginMethodsForClass = []
-            modulesNamesLoaded = set()
-            if className in pluginConfig["classes"]:
-                for moduleName in pluginConfig["classes"].get(className):
-                    if moduleName and moduleName in pluginConfig["modules"] and moduleName not in modulesNamesLoaded:
-                        modulesNamesLoaded.add(moduleName) # prevent multiply executing same class
-                        moduleInfo = pluginConfig["modules"][moduleName]
-                        if moduleInfo["status"] == "enabled":
-                            if moduleName not in modulePluginInfos:
-                                loadModule(moduleInfo)
-                            if moduleName in modulePluginInfos:
-                                pluginInfo = modulePluginInfos[moduleName]
-                                if className in pluginInfo:
-                                    pluginMethodsForClass.append(pluginInfo[className])
-            pluginMethodsForClasses[className] = pluginMethodsForClass
-        for method in pluginMethodsForClass:
-            yield method
+            return method(*args, **kwargs)
+        finally:
+            stats[0] += 1
+            stats[1] += time.perf_counter() - startedAt
+    return profiledMethod
+
+def setCollectClassMethodStats(collect: bool) -> None:
+    """
+    Enables or disables collecting the number of calls and cumulative time of dispatched plug-in methods.
+    :param collect: True to collect classMethodStats.
+    """
+    global collectClassMethodStats
+    if collect != collectClassMethodStats:
+        collectClassMethodStats = collect
+        pluginMethodsForClasses.clear() # dispatch tables are rebuilt with or without profiled methods
+
+def logClassMethodStats(cntlr: Cntlr) -> None:
+    """
+    Logs the number of calls and cumulative time of dispatched plug-in methods, by decreasing time.
+    """
+    if classMethodStats:
+        cntlr.addToLog(_("Plug-in class method profile statistics \n") +
+                       ' \n'.join(_("{0} ({1}) {2} calls, {3:.3f} secs").format(className, moduleName, calls, secs)
+                                  for (className, moduleName), (calls, secs) in sorted(classMethodStats.items(), key=lambda item: -item[1][1])) +
+                       " \n",
+                       messageCode="info:pluginProfileStats", level=logging.INFO)
 
 
 def addPluginModule(name: str) -> dict[str, Any] | None:
@@ -532,6 +706,7 @@ def removePluginModule(name):
                     classMethods = pluginConfig["classes"].get(classMethod)
                     if classMethods and _name and _name in classMethods:
                         classMethods.remove(_name)
+                        pluginMethodsForClasses.pop(classMethod, None)
                         if not classMethods: # list has become unused
                             del pluginConfig["classes"][classMethod] # remove class
                 for importModuleInfo in moduleInfo.get('imports', EMPTYLIST):
@@ -570,6 +745,7 @@ def addPluginModuleInfo(plugin_module_info: dict[str, Any]) -> dict[str, Any] |
             _name = subModuleInfo["name"]
             if _name and _name not in classMethods:
                 classMethods.append(_name)
+                pluginMethodsForClasses.pop(classMethod, None)
         for importModuleInfo in subModuleInfo.get('imports', EMPTYLIST):
             _addPluginSubModule(importModuleInfo)
         pluginConfig["modules"][_name] = subModuleInfo
@@ -20,6 +20,11 @@ from arelle.formula.XPathContext import XPathException
 from numbers import Number
 
 RENDER_UNITS_PER_CHAR = 16 # nominal screen units per char for wrapLength computation and adjustment
+# view attributes set by resolution of x and y axes, restored when resolved axes are reused for another z choice
+RESOLVED_AXES_VIEW_ATTRIBUTES = ("dataCols", "dataRows", "colHdrRows", "colHdrNonStdRoles", "rowHdrNonStdRoles", "rowHdrCols",
+                                 "rowHdrColWidth", "rowNonAbstractHdrSpanMin", "aspectEntryObjectId", "xTopRollup", "yTopRollup")
+# view variables (with get and set methods) set by resolution of x and y axes, restored with the view attributes
+RESOLVED_AXES_VIEW_VARIABLES = ("xAxisChildrenFirst", "yAxisChildrenFirst")
 
 class ResolutionException(Exception):
     def __init__(self, code, message, **kwargs):
@@ -97,6 +102,8 @@ def resolveTableAxesStructure(view, table, tblAxisRelSet):
     xTopStructuralNode = yTopStructuralNode = zTopStructuralNode = None
     # must be cartesian product of top level relationships
     tblAxisRels = tblAxisRelSet.fromModelObject(table)
+    # a view producing each z choice of its tables in one pass provides resolvedLayouts for reuse of x and y axes
+    resolvedLayouts = getattr(view, "resolvedLayouts", None)
     facts = view.modelXbrl.factsInInstance
     if facts:
         facts = table.filteredFacts(view.rendrCntx, view.modelXbrl.factsInInstance) # apply table filters
@@ -107,6 +114,17 @@ def resolveTableAxesStructure(view, table, tblAxisRelSet):
 
     # do z's first to set variables needed by x and y axes expressions
     for disposition in ("z", "x", "y"):
+        if disposition == "x" and resolvedLayouts is not None:
+            layoutKey = (table, zChoicesLayoutKey(zTopStructuralNode))
+            if layoutKey in resolvedLayouts:
+                xTopStructuralNode, yTopStructuralNode, topRollup, viewAttributes = resolvedLayouts[layoutKey]
+                view.topRollup.update(topRollup)
+                for name, value in viewAttributes.items():
+                    if name in RESOLVED_AXES_VIEW_VARIABLES:
+                        getattr(view, name).set(value)
+                    else:
+                        setattr(view, name, value.copy() if isinstance(value, list) else value)
+                break
         for i, tblAxisRel in enumerate(tblAxisRels):
             definitionNode = tblAxisRel.toModelObject
             if (tblAxisRel.axisDisposition == disposition and
@@ -138,6 +156,18 @@ def resolveTableAxesStructure(view, table, tblAxisRelSet):
                     #addBreakdownNode(view, disposition, definitionNode)
                     expandDefinition(view, zTopStructuralNode, definitionNode, definitionNode, 1, disposition, facts, i, tblAxisRels)
                     break
+    else:
+        if resolvedLayouts is not None:
+            viewAttributes = {}
+            for name in RESOLVED_AXES_VIEW_ATTRIBUTES:
+                if hasattr(view, name):
+                    value = getattr(view, name)
+                    viewAttributes[name] = value.copy() if isinstance(value, list) else value
+            for name in RESOLVED_AXES_VIEW_VARIABLES:
+                if hasattr(view, name):
+                    viewAttributes[name] = getattr(view, name).get()
+            resolvedLayouts[layoutKey] = (xTopStructuralNode, yTopStructuralNode,
+                                          {axis: view.topRollup[axis] for axis in ("x", "y")}, viewAttributes)
     '''
     def jsonDefaultEncoder(obj):
         if isinstance(obj, StructuralNode):
@@ -193,6 +223,22 @@ def resolveTableAxesStructure(view, table, tblAxisRelSet):
 
     return (tblAxisRelSet, xTopStructuralNode, yTopStructuralNode, zTopStructuralNode)
 
+def zChoicesLayoutKey(zTopStructuralNode):
+    ''' Returns the z axis choices which x and y axes resolution depends on, None if x and y axes are independent
+    of z choices (no z structural node binds variables or a context item for x and y axes expressions) '''
+    if zTopStructuralNode is None:
+        return None
+    structuralNodes = []
+    def addStructuralNodes(structuralNode):
+        structuralNodes.append(structuralNode)
+        for childStructuralNode in structuralNode.childStructuralNodes:
+            addStructuralNodes(childStructuralNode)
+    addStructuralNodes(zTopStructuralNode)
+    if not any(structuralNode.variables or structuralNode.contextItemBinding is not None
+               for structuralNode in structuralNodes + (zTopStructuralNode.choiceStructuralNodes or [])):
+        return None
+    return tuple(getattr(structuralNode, "choiceNodeIndex", None) for structuralNode in structuralNodes)
+
 def sortkey(obj):
     if isinstance(obj, ModelObject):
         return obj.objectIndex
@@ -10,6 +10,7 @@ from urllib.request import pathname2url
 from urllib.parse import urldefrag, unquote, quote, urljoin
 from email.utils import parsedate
 from datetime import datetime
+from typing import Any
 
 def authority(url: str, includeScheme: bool=True) -> str:
     if url:
@@ -393,3 +394,56 @@ def decodeBase64DataImage(imageData: str | None) -> bytes | None:
         return None
     imageDataWithoutUriFragment = imageData.split("#", 1)[0]
     return base64.b64decode(imageDataWithoutUriFragment)
+
+
+class UrlPrefixTrie:
+    '''
+    .. class:: UrlPrefixTrie(mappings)
+
+    Character trie of url remapping prefixes, built from a dict of prefix: replacement, or a list of
+    (prefix, replacement) pairs, finding the remappings whose prefix starts a url in one pass over the url.
+    Matches are memoized by url, the trie is rebuilt when its mappings change.
+    '''
+    maxMemoSize = 65536
+
+    def __init__(self, mappings: dict[str, str] | list[tuple[str, str]]) -> None:
+        self.mappings = mappings
+        self.mappingsCount = len(mappings)
+        self.root: dict[str, Any] = {} # nodes are keyed by character, and by "" for the remapping of the prefix ending there
+        self.matchesMemo: dict[str, tuple[tuple[int, str, str], ...]] = {}
+        for order, (prefix, replacement) in enumerate(mappings.items() if isinstance(mappings, dict) else mappings):
+            node = self.root
+            for c in prefix:
+                node = node.setdefault(c, {})
+            if "" not in node: # of duplicated prefixes the first applies
+                node[""] = (order, prefix, replacement)
+
+    def isBuiltFrom(self, mappings: dict[str, str] | list[tuple[str, str]]) -> bool:
+        return mappings is self.mappings and len(mappings) == self.mappingsCount
+
+    def matches(self, url: str) -> tuple[tuple[int, str, str], ...]:
+        ''' returns (order, prefix, replacement) of each remapping whose prefix starts url, shortest prefix first '''
+        try:
+            return self.matchesMemo[url]
+        except KeyError:
+            pass
+        matches = []
+        node = self.root
+        if "" in node:
+            matches.append(node[""])
+        for c in url:
+            child: dict[str, Any] | None = node.get(c)
+            if child is None:
+                break
+            node = child
+            if "" in node:
+                matches.append(node[""])
+        if len(self.matchesMemo) >= self.maxMemoSize:
+            self.matchesMemo.clear()
+        self.matchesMemo[url] = _matches = tuple(matches)
+        return _matches
+
+    def firstMatch(self, url: str) -> tuple[int, str, str] | None:
+        ''' returns the matching remapping earliest in the mappings, as applied by a sequential startswith scan '''
+        matches = self.matches(url)
+        return min(matches) if matches else None
@@ -4,9 +4,7 @@ See COPYRIGHT.md for copyright information.
 import os, sys, traceback, logging
 import regex as re
 from collections import defaultdict, OrderedDict
-from arelle import (FileSource, ModelXbrl, ModelDocument, ModelVersReport, XbrlConst,
-               ValidateXbrl, ValidateVersReport,
-               ValidateInfoset, RenderingEvaluator, ViewFileRenderedGrid, UrlUtil)
+from arelle import FileSource, ModelXbrl, ModelDocument, XbrlConst, ValidateXbrl, UrlUtil
 from arelle.formula import ValidateFormula
 from arelle.ModelDocument import Type, ModelDocumentReference, load as modelDocumentLoad
 from arelle.ModelDtsObject import ModelResource
@@ -94,6 +92,7 @@ class Validate:
                     exc_info=True)
         elif self.modelXbrl.modelDocument.type == Type.VERSIONINGREPORT:
             try:
+                from arelle import ValidateVersReport
                 ValidateVersReport.ValidateVersReport(self.modelXbrl).validate(self.modelXbrl)
             except Exception as err:
                 self.modelXbrl.error("exception:" + type(err).__name__,
@@ -296,6 +295,7 @@ class Validate:
                     elif resultIsVersioningReport or resultIsTaxonomyPackage:
                         inputDTSes[dtsName] = modelXbrl
                     elif modelXbrl.modelDocument.type == Type.VERSIONINGREPORT:
+                        from arelle import ValidateVersReport
                         ValidateVersReport.ValidateVersReport(self.modelXbrl).validate(modelXbrl)
                         self.determineTestStatus(modelTestcaseVariation, modelXbrl.errors)
                         modelXbrl.close()
@@ -328,10 +328,12 @@ class Validate:
                     if os.path.exists(versReportFile): #validate existing
                         modelVersReport = ModelXbrl.load(self.modelXbrl.modelManager, versReportFile, _("validating existing version report"))
                         if modelVersReport and modelVersReport.modelDocument and modelVersReport.modelDocument.type == Type.VERSIONINGREPORT:
+                            from arelle import ValidateVersReport
                             ValidateVersReport.ValidateVersReport(self.modelXbrl).validate(modelVersReport)
                             self.determineTestStatus(modelTestcaseVariation, modelVersReport.errors)
                             modelVersReport.close()
                     elif len(inputDTSes) == 2:
+                        from arelle import ModelVersReport
                         ModelVersReport.ModelVersReport(self.modelXbrl).diffDTSes(
                               versReportFile, inputDTSes["from"], inputDTSes["to"])
                         modelTestcaseVariation.status = "generated"
@@ -378,6 +380,7 @@ class Validate:
                             unexpectedDataFiles=", ".join(sorted(os.path.basename(f) for f in foundDataFiles - expectedDataFiles)))
                     if modelXbrl.hasTableRendering or modelTestcaseVariation.resultIsTable:
                         try:
+                            from arelle import RenderingEvaluator
                             RenderingEvaluator.init(modelXbrl)
                         except Exception as err:
                             modelXbrl.error("exception:" + type(err).__name__,
@@ -409,6 +412,7 @@ class Validate:
                                 file=os.path.basename(modelTestcaseVariation.resultXbrlInstance))
                             modelTestcaseVariation.status = "result infoset not loadable"
                         else:   # check infoset
+                            from arelle import ValidateInfoset
                             ValidateInfoset.validate(self.instValidator, modelXbrl, infoset)
                         infoset.close()
                     if modelXbrl.hasTableRendering or modelTestcaseVariation.resultIsTable: # and self.modelXbrl.modelManager.validateInfoset:
@@ -417,6 +421,7 @@ class Validate:
                         if not any(alternativeValidation(modelXbrl, resultTableUri)
                                    for alternativeValidation in pluginClassMethods("Validate.TableInfoset")):
                             try:
+                                from arelle import ViewFileRenderedGrid
                                 ViewFileRenderedGrid.viewRenderedGrid(modelXbrl, resultTableUri, diffToFile=True)  # false to save infoset files
                             except Exception as err:
                                 modelXbrl.error("exception:" + type(err).__name__,
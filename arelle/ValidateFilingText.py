@@ -3,7 +3,7 @@ See COPYRIGHT.md for copyright information.
 '''
 #import xml.sax, xml.sax.handler
 from lxml.etree import XML, DTD, SubElement, _ElementTree, _Comment, _ProcessingInstruction, XMLSyntaxError, XMLParser
-import os, io, base64
+import os, io, base64, multiprocessing
 import regex as re
 from arelle.XbrlConst import ixbrlAll, xhtml
 from arelle.XmlUtil import setXmlns, xmlstring
@@ -30,6 +30,7 @@ imgDataMediaBase64Pattern = re.compile(r"data:image([^,;]*)(;base64)?,(.*)$", re
 
 edbodyDTD = None
 isInlineDTD = None
+_textBlockWorkerOptions = None
 
 ''' replace with lxml DTD validation
 bodyTags = {
@@ -507,10 +508,13 @@ def loadDTD(modelXbrl):
     _isInline = modelXbrl.modelDocument.type == ModelDocumentTypeINLINEXBRL
     if isInlineDTD is None or isInlineDTD != _isInline:
         isInlineDTD = _isInline
-        with open(os.path.join(modelXbrl.modelManager.cntlr.configDir,
-                               "xhtml1-strict-ix.dtd" if _isInline else "edbody.dtd")) as fh:
+        with open(dtdPath(modelXbrl, _isInline)) as fh:
             edbodyDTD = DTD(fh)
 
+def dtdPath(modelXbrl, isInline):
+    return os.path.join(modelXbrl.modelManager.cntlr.configDir,
+                        "xhtml1-strict-ix.dtd" if isInline else "edbody.dtd")
+
 def removeEntities(text):
     ''' ARELLE-128
     entitylessText = []
@@ -527,20 +531,195 @@ def removeEntities(text):
     '''
     return namedEntityPattern.sub("", text).replace('&','&amp;')
 
-def validateTextBlockFacts(modelXbrl):
-    #handler = TextBlockHandler(modelXbrl)
-    loadDTD(modelXbrl)
-    checkedGraphicsFiles = set() #  only check any graphics file reference once per fact
-    allowedExternalHrefPattern = modelXbrl.modelManager.disclosureSystem.allowedExternalHrefPattern
-    allowedImageTypes = modelXbrl.modelManager.disclosureSystem.allowedImageTypes
+class TextBlockEltRef:
+    """
+    .. class:: TextBlockEltRef(sourceline)
 
+    Stands in for an element of a parsed text block value in message refs, which only use its source line.
+    """
+    __slots__ = ("sourceline",)
+
+    def __init__(self, sourceline):
+        self.sourceline = sourceline
+
+def textBlockFindings(value, allowedExternalHrefPattern, allowedImageTypes):
+    ''' returns list of findings (kind, args) of validating text block value against the loaded DTD,
+        findings only depend on the value, so they may be shared by facts having the same value,
+        and are picklable, so they may be produced by worker processes.  Graphic files are found
+        relative to the fact's document and are only checked when logging the fact's findings.
+    '''
+    findings = []
+    # test encoded entity tags
+    for match in namedEntityPattern.finditer(value):
+        entity = match.group()
+        if not entity in xhtmlEntities:
+            findings.append(("entity", entity))
     if isInlineDTD:
         htmlBodyTemplate = "<body><div>\n{0}\n</div></body>\n"
     else:
         htmlBodyTemplate = "<body>\n{0}\n</body>\n"
     _xhtmlNs = "{{{}}}".format(xhtml)
     _xhtmlNsLen = len(_xhtmlNs)
+    # test html
+    for xmltext in [value] + CDATApattern.findall(value):
+        checkedGraphicsFiles = set() #  only check any graphics file reference once per text
+        xmlBodyWithoutEntities = htmlBodyTemplate.format(removeEntities(xmltext))
+        try:
+            textblockXml = XML(xmlBodyWithoutEntities)
+            if not edbodyDTD.validate( textblockXml ):
+                errors = edbodyDTD.error_log.filter_from_errors()
+                htmlError = any(e.type_name in ("DTD_INVALID_CHILD", "DTD_UNKNOWN_ATTRIBUTE")
+                                for e in errors)
+                findings.append(("dtdError", htmlError, ', '.join(e.message for e in errors)))
+            for elt in textblockXml.iter():
+                eltTag = elt.tag
+                if isinstance(elt, ModelObject) and elt.namespaceURI == xhtml:
+                    eltTag = elt.localName
+                elif isinstance(elt, (_ElementTree, _Comment, _ProcessingInstruction)):
+                    continue # comment or other non-parsed element
+                else:
+                    eltTag = elt.tag
+                    if eltTag.startswith(_xhtmlNs):
+                        eltTag = eltTag[_xhtmlNsLen:]
+                if isInlineDTD and eltTag in efmBlockedInlineHtmlElements:
+                    findings.append(("disallowedElement", elt.sourceline, eltTag))
+                for attrTag, attrValue in elt.items():
+                    if isInlineDTD:
+                        if attrTag in efmBlockedInlineHtmlElementAttributes.get(eltTag,()):
+                            findings.append(("disallowedAttribute", elt.sourceline, eltTag, attrTag, attrValue))
+                    if ((attrTag == "href" and eltTag == "a") or
+                        (attrTag == "src" and eltTag == "img")):
+                        if "javascript:" in attrValue:
+                            findings.append(("activeContent", attrTag, eltTag))
+                        elif eltTag == "a" and (not allowedExternalHrefPattern or allowedExternalHrefPattern.match(attrValue)):
+                            pass
+                        elif scheme(attrValue) in ("http", "https", "ftp"):
+                            findings.append(("externalReference", attrTag, eltTag))
+                        if attrTag == "src" and allowedImageTypes and attrValue not in checkedGraphicsFiles:
+                            if scheme(attrValue)  == "data":
+                                try: # allow embedded newlines
+                                    m = imgDataMediaBase64Pattern.match(attrValue)
+                                    if (not allowedImageTypes["data-scheme"] or
+                                        not m or not m.group(1) or not m.group(2)
+                                        or m.group(1)[1:] not in allowedImageTypes["mime-types"]
+                                        or m.group(1)[1:] != validateGraphicHeaderType(decodeBase64DataImage(m.group(3)))):
+                                        findings.append(("graphicDataUrl", attrValue[:32], eltTag))
+                                except base64.binascii.Error as err:
+                                    findings.append(("graphicDataEncodingError", str(err), attrValue[:32], eltTag))
+                            elif attrValue.lower()[-3:] not in allowedImageTypes["img-file-extensions"]:
+                                findings.append(("graphicFileType", attrValue, eltTag))
+                            else:   # test file contents
+                                findings.append(("graphicFile", attrValue, eltTag))
+                            checkedGraphicsFiles.add(attrValue)
+                if eltTag == "table" and any(a is not None for a in elt.iterancestors("table")):
+                    findings.append(("nestedTable",))
+        except (XMLSyntaxError,
+                UnicodeDecodeError) as err:
+            #if not err.endswith("undefined entity"):
+            findings.append(("xmlError", str(err)))
+    return findings
+
+def logTextBlockFindings(modelXbrl, f1, findings):
+    allowedImageTypes = modelXbrl.modelManager.disclosureSystem.allowedImageTypes
+    for finding in findings:
+        kind = finding[0]
+        if kind == "entity":
+            entity = finding[1]
+            modelXbrl.error(("EFM.6.05.16", "GFM.1.2.15", "FERC.6.05.16"),
+                _("Fact %(fact)s contextID %(contextID)s has disallowed entity %(entity)s"),
+                modelObject=f1, fact=f1.qname, contextID=f1.contextID, entity=entity, error=entity)
+        elif kind == "dtdError":
+            htmlError, error = finding[1:]
+            modelXbrl.error(("EFM.6.05.16","FERC.6.05.16") if htmlError else ("EFM.6.05.15.dtdError", "GFM.1.02.14", "FERC.6.05.15.dtdError"),
+                _("Fact %(fact)s contextID %(contextID)s has text which causes the XML error %(error)s"),
+                modelObject=f1, fact=f1.qname, contextID=f1.contextID,
+                error=error,
+                messageCodes=("EFM.6.05.16", "EFM.6.05.15.dtdError", "GFM.1.02.14", "FERC.6.05.16", "FERC.6.05.15.dtdError"))
+        elif kind == "disallowedElement":
+            sourceline, eltTag = finding[1:]
+            modelXbrl.error(("EFM.5.02.05.disallowedElement", "FERC.5.02.05.disallowedElement"),
+                _("%(validatedObjectLabel)s has disallowed element <%(element)s>"),
+                modelObject=TextBlockEltRef(sourceline), validatedObjectLabel=f1.qname,
+                element=eltTag)
+        elif kind == "disallowedAttribute":
+            sourceline, eltTag, attrTag, attrValue = finding[1:]
+            modelXbrl.error(("EFM.5.02.05.disallowedAttribute", "FERC.5.02.05.disallowedAttribute"),
+                _("%(validatedObjectLabel)s has disallowed attribute on element <%(element)s>: %(attribute)s=\"%(value)s\""),
+                modelObject=TextBlockEltRef(sourceline), validatedObjectLabel=f1.qname,
+                element=eltTag, attribute=attrTag, value=attrValue)
+        elif kind == "activeContent":
+            attrTag, eltTag = finding[1:]
+            modelXbrl.error(("EFM.6.05.16.activeContent", "FERC.6.05.16.activeContent"),
+                _("Fact %(fact)s of context %(contextID)s has javascript in '%(attribute)s' for <%(element)s>"),
+                modelObject=f1, fact=f1.qname, contextID=f1.contextID,
+                attribute=attrTag, element=eltTag)
+        elif kind == "externalReference":
+            attrTag, eltTag = finding[1:]
+            modelXbrl.error(("EFM.6.05.16.externalReference", "FERC.6.05.16.externalReference"),
+                _("Fact %(fact)s of context %(contextID)s has an invalid external reference in '%(attribute)s' for <%(element)s>"),
+                modelObject=f1, fact=f1.qname, contextID=f1.contextID,
+                attribute=attrTag, element=eltTag)
+        elif kind == "graphicDataUrl":
+            attrValue, eltTag = finding[1:]
+            modelXbrl.error(("EFM.6.05.16.graphicDataUrl", "FERC.6.05.16.graphicDataUrl"),
+                _("Fact %(fact)s of context %(contextID)s references a graphics data URL which isn't accepted or valid '%(attribute)s' for <%(element)s>"),
+                modelObject=f1, fact=f1.qname, contextID=f1.contextID,
+                attribute=attrValue, element=eltTag)
+        elif kind == "graphicDataEncodingError":
+            err, attrValue, eltTag = finding[1:]
+            modelXbrl.error(("EFM.6.05.16.graphicDataEncodingError", "FERC.6.05.16.graphicDataEncodingError"),
+                _("Fact %(fact)s of context %(contextID)s Base64 encoding error %(err)s in <%(element)s>"),
+                modelObject=f1, fact=f1.qname, contextID=f1.contextID, err=err,
+                attribute=attrValue, element=eltTag)
+        elif kind == "graphicFileType":
+            attrValue, eltTag = finding[1:]
+            modelXbrl.error(("EFM.6.05.16.graphicFileType", "FERC.6.05.16.graphicFileType"),
+                _("Fact %(fact)s of context %(contextID)s references a graphics file which isn't %(allowedExtensions)s '%(attribute)s' for <%(element)s>"),
+                modelObject=f1, fact=f1.qname, contextID=f1.contextID, allowedExtensions=allowedImageTypes["img-file-extensions"],
+                attribute=attrValue, element=eltTag)
+        elif kind == "graphicFile":
+            attrValue, eltTag = finding[1:]
+            try:
+                if validateGraphicFile(f1, attrValue) != attrValue.lower()[-3:]:
+                    modelXbrl.error(("EFM.6.05.16.graphicFileContent", "FERC.6.05.16.graphicFileContent"),
+                        _("Fact %(fact)s of context %(contextID)s references a graphics file which has invalid format '%(attribute)s' for <%(element)s>"),
+                        modelObject=f1, fact=f1.qname, contextID=f1.contextID,
+                        attribute=attrValue, element=eltTag)
+            except IOError as err:
+                modelXbrl.error(("EFM.6.05.16.graphicFileError", "FERC.6.05.16.graphicFileError"),
+                    _("Fact %(fact)s of context %(contextID)s references a graphics file which isn't openable '%(attribute)s' for <%(element)s>, error: %(error)s"),
+                    modelObject=f1, fact=f1.qname, contextID=f1.contextID,
+                    attribute=attrValue, element=eltTag, error=err)
+        elif kind == "nestedTable":
+            modelXbrl.error(("EFM.6.05.16.nestedTable", "FERC.6.05.16.nestedTable"),
+                _("Fact %(fact)s of context %(contextID)s has nested <table> elements."),
+                modelObject=f1, fact=f1.qname, contextID=f1.contextID)
+        elif kind == "xmlError":
+            modelXbrl.error(("EFM.6.05.15", "GFM.1.02.14", "FERC.6.05.15"),
+                _("Fact %(fact)s contextID %(contextID)s has text which causes the XML error %(error)s"),
+                modelObject=f1, fact=f1.qname, contextID=f1.contextID, error=finding[1])
 
+def _initTextBlockWorker(_dtdPath, _isInline, allowedExternalHrefPattern, allowedImageTypes):
+    global edbodyDTD, isInlineDTD, _textBlockWorkerOptions
+    isInlineDTD = _isInline
+    with open(_dtdPath) as fh:
+        edbodyDTD = DTD(fh)
+    _textBlockWorkerOptions = (allowedExternalHrefPattern, allowedImageTypes)
+
+def _textBlockFindingsInWorker(value):
+    return textBlockFindings(value, *_textBlockWorkerOptions)
+
+def validateTextBlockFacts(modelXbrl):
+    ''' validates html of text block facts, each distinct text block value is validated once, by
+        modelManager.textBlockValidationProcesses worker processes if more than one, and the
+        findings are logged for each fact in fact order, as when validated serially.
+    '''
+    loadDTD(modelXbrl)
+    allowedExternalHrefPattern = modelXbrl.modelManager.disclosureSystem.allowedExternalHrefPattern
+    allowedImageTypes = modelXbrl.modelManager.disclosureSystem.allowedImageTypes
+
+    textBlockFacts = []
+    findingsByValue = {}
     for f1 in modelXbrl.facts:
         # build keys table for 6.5.14
         concept = f1.concept
@@ -548,128 +727,22 @@ def validateTextBlockFacts(modelXbrl):
            concept is not None and \
            concept.isTextBlock and \
            XMLpattern.match(f1.value):
-            #handler.fact = f1
-            # test encoded entity tags
-            for match in namedEntityPattern.finditer(f1.value):
-                entity = match.group()
-                if not entity in xhtmlEntities:
-                    modelXbrl.error(("EFM.6.05.16", "GFM.1.2.15", "FERC.6.05.16"),
-                        _("Fact %(fact)s contextID %(contextID)s has disallowed entity %(entity)s"),
-                        modelObject=f1, fact=f1.qname, contextID=f1.contextID, entity=entity, error=entity)
-            # test html
-            for xmltext in [f1.value] + CDATApattern.findall(f1.value):
-                '''
-                try:
-                    xml.sax.parseString(
-                        "<?xml version='1.0' encoding='utf-8' ?>\n<body>\n{0}\n</body>\n".format(
-                         removeEntities(xmltext)).encode('utf-8'),handler,handler)
-                except (xml.sax.SAXParseException,
-                        xml.sax.SAXException,
-                        UnicodeDecodeError) as err:
-                    # ignore errors which are not errors (e.g., entity codes checked previously
-                    if not err.endswith("undefined entity"):
-                        handler.modelXbrl.error(("EFM.6.05.15", "GFM.1.02.14", "FERC.6.05.15"),
-                            _("Fact %(fact)s contextID %(contextID)s has text which causes the XML error %(error)s"),
-                            modelObject=f1, fact=f1.qname, contextID=f1.contextID, error=err)
-                '''
-                xmlBodyWithoutEntities = htmlBodyTemplate.format(removeEntities(xmltext))
-                try:
-                    textblockXml = XML(xmlBodyWithoutEntities)
-                    if not edbodyDTD.validate( textblockXml ):
-                        errors = edbodyDTD.error_log.filter_from_errors()
-                        htmlError = any(e.type_name in ("DTD_INVALID_CHILD", "DTD_UNKNOWN_ATTRIBUTE")
-                                        for e in errors)
-                        modelXbrl.error(("EFM.6.05.16","FERC.6.05.16") if htmlError else ("EFM.6.05.15.dtdError", "GFM.1.02.14", "FERC.6.05.15.dtdError"),
-                            _("Fact %(fact)s contextID %(contextID)s has text which causes the XML error %(error)s"),
-                            modelObject=f1, fact=f1.qname, contextID=f1.contextID,
-                            error=', '.join(e.message for e in errors),
-                            messageCodes=("EFM.6.05.16", "EFM.6.05.15.dtdError", "GFM.1.02.14", "FERC.6.05.16", "FERC.6.05.15.dtdError"))
-                    for elt in textblockXml.iter():
-                        eltTag = elt.tag
-                        if isinstance(elt, ModelObject) and elt.namespaceURI == xhtml:
-                            eltTag = elt.localName
-                        elif isinstance(elt, (_ElementTree, _Comment, _ProcessingInstruction)):
-                            continue # comment or other non-parsed element
-                        else:
-                            eltTag = elt.tag
-                            if eltTag.startswith(_xhtmlNs):
-                                eltTag = eltTag[_xhtmlNsLen:]
-                        if isInlineDTD and eltTag in efmBlockedInlineHtmlElements:
-                            modelXbrl.error(("EFM.5.02.05.disallowedElement", "FERC.5.02.05.disallowedElement"),
-                                _("%(validatedObjectLabel)s has disallowed element <%(element)s>"),
-                                modelObject=elt, validatedObjectLabel=f1.qname,
-                                element=eltTag)
-                        for attrTag, attrValue in elt.items():
-                            if isInlineDTD:
-                                if attrTag in efmBlockedInlineHtmlElementAttributes.get(eltTag,()):
-                                    modelXbrl.error(("EFM.5.02.05.disallowedAttribute", "FERC.5.02.05.disallowedAttribute"),
-                                        _("%(validatedObjectLabel)s has disallowed attribute on element <%(element)s>: %(attribute)s=\"%(value)s\""),
-                                        modelObject=elt, validatedObjectLabel=validatedObjectLabel,
-                                        element=eltTag, attribute=attrTag, value=attrValue)
-                            if ((attrTag == "href" and eltTag == "a") or
-                                (attrTag == "src" and eltTag == "img")):
-                                if "javascript:" in attrValue:
-                                    modelXbrl.error(("EFM.6.05.16.activeContent", "FERC.6.05.16.activeContent"),
-                                        _("Fact %(fact)s of context %(contextID)s has javascript in '%(attribute)s' for <%(element)s>"),
-                                        modelObject=f1, fact=f1.qname, contextID=f1.contextID,
-                                        attribute=attrTag, element=eltTag)
-                                elif eltTag == "a" and (not allowedExternalHrefPattern or allowedExternalHrefPattern.match(attrValue)):
-                                    pass
-                                elif scheme(attrValue) in ("http", "https", "ftp"):
-                                    modelXbrl.error(("EFM.6.05.16.externalReference", "FERC.6.05.16.externalReference"),
-                                        _("Fact %(fact)s of context %(contextID)s has an invalid external reference in '%(attribute)s' for <%(element)s>"),
-                                        modelObject=f1, fact=f1.qname, contextID=f1.contextID,
-                                        attribute=attrTag, element=eltTag)
-                                if attrTag == "src" and allowedImageTypes and attrValue not in checkedGraphicsFiles:
-                                    if scheme(attrValue)  == "data":
-                                        try: # allow embedded newlines
-                                            m = imgDataMediaBase64Pattern.match(attrValue)
-                                            if (not allowedImageTypes["data-scheme"] or
-                                                not m or not m.group(1) or not m.group(2)
-                                                or m.group(1)[1:] not in allowedImageTypes["mime-types"]
-                                                or m.group(1)[1:] != validateGraphicHeaderType(decodeBase64DataImage(m.group(3)))):
-                                                modelXbrl.error(("EFM.6.05.16.graphicDataUrl", "FERC.6.05.16.graphicDataUrl"),
-                                                    _("Fact %(fact)s of context %(contextID)s references a graphics data URL which isn't accepted or valid '%(attribute)s' for <%(element)s>"),
-                                                    modelObject=f1, fact=f1.qname, contextID=f1.contextID,
-                                                    attribute=attrValue[:32], element=eltTag)
-                                        except base64.binascii.Error as err:
-                                            modelXbrl.error(("EFM.6.05.16.graphicDataEncodingError", "FERC.6.05.16.graphicDataEncodingError"),
-                                                _("Fact %(fact)s of context %(contextID)s Base64 encoding error %(err)s in <%(element)s>"),
-                                                modelObject=f1, fact=f1.qname, contextID=f1.contextID, err=err,
-                                                attribute=attrValue[:32], element=eltTag)
-                                    elif attrValue.lower()[-3:] not in allowedImageTypes["img-file-extensions"]:
-                                        modelXbrl.error(("EFM.6.05.16.graphicFileType", "FERC.6.05.16.graphicFileType"),
-                                            _("Fact %(fact)s of context %(contextID)s references a graphics file which isn't %(allowedExtensions)s '%(attribute)s' for <%(element)s>"),
-                                            modelObject=f1, fact=f1.qname, contextID=f1.contextID, allowedExtensions=allowedImageTypes["img-file-extensions"],
-                                            attribute=attrValue, element=eltTag)
-                                    else:   # test file contents
-                                        try:
-                                            if validateGraphicFile(f1, attrValue) != attrValue.lower()[-3:]:
-                                                modelXbrl.error(("EFM.6.05.16.graphicFileContent", "FERC.6.05.16.graphicFileContent"),
-                                                    _("Fact %(fact)s of context %(contextID)s references a graphics file which has invalid format '%(attribute)s' for <%(element)s>"),
-                                                    modelObject=f1, fact=f1.qname, contextID=f1.contextID,
-                                                    attribute=attrValue, element=eltTag)
-                                        except IOError as err:
-                                            modelXbrl.error(("EFM.6.05.16.graphicFileError", "FERC.6.05.16.graphicFileError"),
-                                                _("Fact %(fact)s of context %(contextID)s references a graphics file which isn't openable '%(attribute)s' for <%(element)s>, error: %(error)s"),
-                                                modelObject=f1, fact=f1.qname, contextID=f1.contextID,
-                                                attribute=attrValue, element=eltTag, error=err)
-                                    checkedGraphicsFiles.add(attrValue)
-                        if eltTag == "table" and any(a is not None for a in elt.iterancestors("table")):
-                            modelXbrl.error(("EFM.6.05.16.nestedTable", "FERC.6.05.16.nestedTable"),
-                                _("Fact %(fact)s of context %(contextID)s has nested <table> elements."),
-                                modelObject=f1, fact=f1.qname, contextID=f1.contextID)
-                except (XMLSyntaxError,
-                        UnicodeDecodeError) as err:
-                    #if not err.endswith("undefined entity"):
-                    modelXbrl.error(("EFM.6.05.15", "GFM.1.02.14", "FERC.6.05.15"),
-                        _("Fact %(fact)s contextID %(contextID)s has text which causes the XML error %(error)s"),
-                        modelObject=f1, fact=f1.qname, contextID=f1.contextID, error=err)
-
-                checkedGraphicsFiles.clear()
-
-            #handler.fact = None
-                #handler.modelXbrl = None
+            textBlockFacts.append(f1)
+            findingsByValue[f1.value] = None
+
+    processes = min(getattr(modelXbrl.modelManager, "textBlockValidationProcesses", 0) or 0, len(findingsByValue))
+    if processes > 1:
+        modelXbrl.modelManager.showStatus(_("validating {0} text blocks in {1} processes").format(len(findingsByValue), processes))
+        values = list(findingsByValue.keys())
+        with multiprocessing.Pool(processes, initializer=_initTextBlockWorker,
+                                  initargs=(dtdPath(modelXbrl, isInlineDTD), isInlineDTD, allowedExternalHrefPattern, allowedImageTypes)) as pool:
+            for value, findings in zip(values, pool.imap(_textBlockFindingsInWorker, values, max(1, len(values) // (processes * 8)))):
+                findingsByValue[value] = findings
+    for f1 in textBlockFacts:
+        findings = findingsByValue[f1.value]
+        if findings is None:
+            findings = findingsByValue[f1.value] = textBlockFindings(f1.value, allowedExternalHrefPattern, allowedImageTypes)
+        logTextBlockFindings(modelXbrl, f1, findings)
 
 def copyHtml(sourceXml, targetHtml):
     for sourceChild in sourceXml.iterchildren():
@@ -10,7 +10,7 @@ from arelle.FileSource import FileNamedStringIO
 NoneType = type(None) # for isinstance testing
 
 # deferred opening of openpyxl so it's not needed in site-packages unless it is used
-Workbook = cell = utils = Font = PatternFill = Border = Alignment = Color = fills = Side = None
+Workbook = WriteOnlyCell = cell = utils = Font = PatternFill = Border = Alignment = Color = fills = Side = None
 
 NOOUT = 0
 CSV   = 1
@@ -20,11 +20,13 @@ XML   = 4
 JSON  = 5
 TYPENAMES = ["NOOUT", "CSV", "XLSX", "HTML", "XML", "JSON"] # null means no output
 nonNameCharPattern =  re.compile(r"[^\w\-\.:]")
+STREAMED_ROWS = 1000 # html, xml and json rows held in memory before being written to output
+ROWS_MARKER = "rows" # comment marking the position of rows in the serialization of a streamed html or xml document
 
 class View:
     # note that cssExtras override any css entries provided by this module if they have the same name
     def __init__(self, modelXbrl, outfile, rootElementName, lang=None, style="table", cssExtras=""):
-        global Workbook, cell, utils, Font, PatternFill, Border, Alignment, Color, fills, Side
+        global Workbook, WriteOnlyCell, cell, utils, Font, PatternFill, Border, Alignment, Color, fills, Side
         self.modelXbrl = modelXbrl
         self.lang = lang
         if lang and lang[:2] in {'ar', 'he'}:
@@ -54,6 +56,7 @@ class View:
             self.type = XLSX
             if Workbook is None:
                 from openpyxl import Workbook, cell, utils
+                from openpyxl.cell import WriteOnlyCell
                 from openpyxl.styles import Font, PatternFill, Border, Alignment, Color, fills, Side
         else:
             self.type = CSV
@@ -64,6 +67,10 @@ class View:
             self.rootElementName = rootElementName[0].lower() + nonNameCharPattern.sub("", rootElementName.title())[1:]
         self.numHdrCols = 0
         self.treeCols = 0  # set to number of tree columns for auto-tree-columns
+        # streamed output (html and xml other than renderings, and json) is opened when rows are first written
+        self.isStreamed = False
+        self.streamFh = None
+        self.streamFailed = False
         if modelXbrl:
             if not lang:
                 self.lang = modelXbrl.modelManager.defaultLang
@@ -78,12 +85,12 @@ class View:
                 self.csvFile = open(outfile, 'w', newline='', encoding='utf-8-sig')
             self.csvWriter = csv.writer(self.csvFile, dialect="excel")
         elif self.type == XLSX:
-            self.xlsxWb = Workbook()
-            # remove pre-existing worksheets
-            while len(self.xlsxWb.worksheets)>0:
-                self.xlsxWb.remove(self.xlsxWb.worksheets[0])
+            # write-only workbook streams rows to a temporary file as they are appended
+            self.xlsxWb = Workbook(write_only=True)
             self.xlsxWs = self.xlsxWb.create_sheet(title=rootElementName)
             self.xlsxRow = 0
+            self.xlsxMaxCol = 0
+            self.xlsxPendingRows = [] # heading rows held until the first data row, as column widths can't be set after rows are written
             self.xlsxColWrapText = [] # bool true if col is always wrap text
         elif self.type == HTML:
             if style == "rendering":
@@ -149,16 +156,19 @@ class View:
             self.tblElt = None
             for self.tblElt in self.xmlDoc.iter(tag="{http://www.w3.org/1999/xhtml}table"):
                 break
+            self.isStreamed = style != "rendering" and self.tblElt is not None
         elif self.type == XML:
             html = io.StringIO("<{0}/>".format(self.rootElementName))
             self.xmlDoc = etree.parse(html)
             html.close()
             self.docEltLevels = [self.xmlDoc.getroot()]
             self.tblElt = self.docEltLevels[0]
+            self.isStreamed = style != "rendering"
         elif self.type == JSON:
             self.entries = []
             self.entryLevels = [self.entries]
             self.jsonObject = {self.rootElementName: self.entries}
+            self.isStreamed = True
 
     def setColWidths(self, colWidths):
         # widths in monospace character counts (as with xlsx files)
@@ -183,8 +193,10 @@ class View:
                                      cols[1:]))
         elif self.type == XLSX:
             cell = None
+            row = []
             for iCol, col in enumerate(cols):
-                cell = self.xlsxWs.cell(row=self.xlsxRow+1, column=iCol+1)
+                cell = WriteOnlyCell(self.xlsxWs)
+                row.append(cell)
                 if asHeader:
                     cell.value = col.replace('\u00AD','') # remove soft-breaks
                     cell.alignment = Alignment(horizontal="center", vertical="center")
@@ -196,13 +208,22 @@ class View:
                 if self.xlsxColWrapText and iCol < len(self.xlsxColWrapText) and self.xlsxColWrapText[iCol]:
                     cell.alignment = Alignment(wrap_text=True)
             if lastColSpan and cell is not None:
-                self.xlsxWs.merge_cells(range_string='%s%s:%s%s' % (utils.get_column_letter(iCol+1),
-                                                                    self.xlsxRow+1,
-                                                                    utils.get_column_letter(iCol+lastColSpan),
-                                                                    self.xlsxRow+1))
+                self.xlsxWs.merged_cells.add('%s%s:%s%s' % (utils.get_column_letter(iCol+1),
+                                                            self.xlsxRow+1,
+                                                            utils.get_column_letter(iCol+lastColSpan),
+                                                            self.xlsxRow+1))
+                self.xlsxMaxCol = max(self.xlsxMaxCol, iCol + lastColSpan)
+            else:
+                self.xlsxMaxCol = max(self.xlsxMaxCol, len(row))
             if asHeader and self.xlsxRow == 0:
-                self.xlsxWs.freeze_panes = self.xlsxWs["A2"] # freezes row 1 and no columns
+                self.xlsxWs.freeze_panes = "A2" # freezes row 1 and no columns
             self.xlsxRow += 1
+            if self.xlsxPendingRows is not None:
+                self.xlsxPendingRows.append(row)
+                if not asHeader:
+                    self.writeXlsxPendingRows()
+            else:
+                self.xlsxWs.append(row)
         elif self.type == HTML:
             tr = etree.SubElement(self.tblElt, "{http://www.w3.org/1999/xhtml}tr")
             td = None
@@ -228,6 +249,8 @@ class View:
                 td.text = str(col) if col else '\u00A0'  # produces &nbsp;
             if lastColSpan and td is not None:
                 td.set("colspan", str(lastColSpan))
+            if self.isStreamed and len(self.tblElt) >= STREAMED_ROWS:
+                self.writeStreamedRows()
         elif self.type == XML:
             if asHeader:
                 # save column element names
@@ -240,6 +263,8 @@ class View:
                 else:
                     # problem, error message? unexpected indent
                     parentElt = self.docEltLevels[0]
+                if self.isStreamed and parentElt is self.tblElt and len(parentElt) >= STREAMED_ROWS:
+                    self.writeStreamedRows() # prior top level rows have no more descendant rows
                 # escape attributes content
                 escapedRowEltAttr = dict(((k, v.replace("&","&amp;").replace("<","&lt;"))
                                           for k,v in xmlRowEltAttr.items())
@@ -285,6 +310,8 @@ class View:
                 else:
                     # problem, error message? unexpected indent
                     entries = self.entryLevels[0]
+                if self.isStreamed and entries is self.entries and len(entries) >= STREAMED_ROWS:
+                    self.writeStreamedRows() # prior top level entries have no more descendant entries
                 entry = []
                 if xmlRowElementName:
                     entry.append(xmlRowElementName)
@@ -316,14 +343,87 @@ class View:
         if asHeader and lastColSpan:
             self.numHdrCols += lastColSpan - 1
 
+    def writeXlsxPendingRows(self):
+        for row in self.xlsxPendingRows:
+            self.xlsxWs.append(row)
+        self.xlsxPendingRows = None
+
+    def openStreamedOutput(self):
+        # writes the document up to its rows, and saves the document after its rows for close
+        from arelle import XmlUtil
+        try:
+            if self.type == JSON:
+                head = "{{{}: [".format(json.dumps(self.rootElementName, ensure_ascii=False))
+                self.streamTail = "]}"
+            else:
+                rows = list(self.tblElt)
+                for rowElt in rows:
+                    self.tblElt.remove(rowElt)
+                self.tblElt.append(etree.Comment(ROWS_MARKER))
+                doc = io.StringIO()
+                XmlUtil.writexml(doc, self.xmlDoc, encoding="utf-8", xmlcharrefreplace=(self.type == HTML))
+                self.tblElt.remove(self.tblElt[-1])
+                self.tblElt.extend(rows)
+                head, _sep, self.streamTail = doc.getvalue().partition("<!--{}-->\n".format(ROWS_MARKER))
+                self.streamIndent = head[len(head.rstrip(" ")):]
+                head = head[:len(head) - len(self.streamIndent)]
+            self.streamRowSeparator = ""
+            if isinstance(self.outfile, FileNamedStringIO):
+                self.streamFh = self.outfile
+            else:
+                self.streamFh = open(self.outfile, "w", encoding="utf-8")
+            self.streamFh.write(head)
+        except (IOError, EnvironmentError) as err:
+            self.streamFailed = True
+            self.modelXbrl.exception("arelle:htmlIOError", _("Failed to save output %(type)s to %(file)s: %(error)s"),
+                                     file=self.outfile, type=TYPENAMES[self.type], error=err)
+
+    def writeStreamedRows(self):
+        # writes and dereferences the rows held in memory, which must have no more descendant rows to come
+        from arelle import XmlUtil
+        if self.streamFh is None and not self.streamFailed:
+            self.openStreamedOutput()
+        try:
+            if self.type == JSON:
+                if not self.streamFailed:
+                    for entry in self.entries:
+                        self.streamFh.write(self.streamRowSeparator)
+                        self.streamFh.write(json.dumps(entry, ensure_ascii=False))
+                        self.streamRowSeparator = ", "
+                del self.entries[:] # same list object is the json root object's entries
+            else:
+                for rowElt in list(self.tblElt):
+                    if not self.streamFailed:
+                        XmlUtil.writexml(self.streamFh, rowElt, indent=self.streamIndent,
+                                         xmlcharrefreplace=(self.type == HTML))
+                    self.tblElt.remove(rowElt)
+        except (IOError, EnvironmentError) as err:
+            self.streamFailed = True
+            self.modelXbrl.exception("arelle:htmlIOError", _("Failed to save output %(type)s to %(file)s: %(error)s"),
+                                     file=self.outfile, type=TYPENAMES[self.type], error=err)
+
     def close(self, noWrite=False):
         if self.type == CSV:
             if not isinstance(self.outfile, FileNamedStringIO):
                 self.csvFile.close()
         elif self.type == XLSX:
+            if self.xlsxPendingRows is not None:
+                self.writeXlsxPendingRows()
             # add filtering
-            self.xlsxWs.auto_filter.ref = 'A1:{}{}'.format(utils.get_column_letter(self.xlsxWs.max_column), len(self.xlsxWs['A']))
+            self.xlsxWs.auto_filter.ref = 'A1:{}{}'.format(utils.get_column_letter(max(self.xlsxMaxCol, 1)), max(self.xlsxRow, 1))
             self.xlsxWb.save(self.outfile)
+        elif self.streamFh is not None or self.streamFailed:
+            if not noWrite:
+                self.writeStreamedRows()
+            if not self.streamFailed:
+                try:
+                    self.streamFh.write(self.streamTail)
+                    if not isinstance(self.outfile, FileNamedStringIO):
+                        self.streamFh.close()
+                    self.modelXbrl.info("info", _("Saved output %(type)s to %(file)s"), file=self.outfile, type=TYPENAMES[self.type])
+                except (IOError, EnvironmentError) as err:
+                    self.modelXbrl.exception("arelle:htmlIOError", _("Failed to save output %(type)s to %(file)s: %(error)s"),
+                                             file=self.outfile, type=TYPENAMES[self.type], error=err)
         elif self.type != NOOUT and not noWrite:
             fileType = TYPENAMES[self.type]
             try:
@@ -1,7 +1,7 @@
 '''
 See COPYRIGHT.md for copyright information.
 '''
-import os
+import multiprocessing, os
 from arelle import ViewFile
 from lxml import etree
 from arelle.RenderingResolver import resolveAxesStructure, RENDER_UNITS_PER_CHAR
@@ -14,7 +14,7 @@ from arelle.ModelInstanceObject import ModelDimensionValue
 from arelle.ModelValue import QName
 from arelle.ModelXbrl import DEFAULT
 from arelle.ModelRenderingObject import (ModelClosedDefinitionNode, ModelEuAxisCoord, ModelFilterDefinitionNode,
-                                         OPEN_ASPECT_ENTRY_SURROGATE)
+                                         TableFactIndex, OPEN_ASPECT_ENTRY_SURROGATE)
 from arelle.PrototypeInstanceObject import FactPrototype
 # change tableModel for namespace needed for consistency suite
 '''
@@ -22,7 +22,7 @@ from arelle.XbrlConst import (tableModelMMDD as tableModelNamespace,
                               tableModelMMDDQName as tableModelQName)
 '''
 from arelle import XbrlConst
-from arelle.XmlUtil import innerTextList, child, elementFragmentIdentifier, addQnameValue
+from arelle.XmlUtil import innerTextList, child, elementFragmentIdentifier, addQnameValue, writexml
 from collections import defaultdict
 
 emptySet = set()
@@ -46,6 +46,81 @@ def viewRenderedGrid(modelXbrl, outfile, lang=None, viewTblELR=None, sourceView=
         view.close()
     modelXbrl.modelManager.showStatus(_("rendering saved to {0}").format(outfile), clearAfter=5000)
 
+_workerState = None  # (modelXbrl, table files, lang, cssExtras), set in parent before forking workers
+
+def _initTableWorker():
+    # replace parent's log handlers (files, buffers, UI) in the forked worker by a capturing handler
+    from arelle.formula.ParallelEvaluator import LogRecordCapture
+    capture = LogRecordCapture()
+    _workerState[0].logger.handlers = [capture]
+    _workerState.append(capture)
+
+def _viewTableInWorker(index):
+    modelXbrl, tableFiles, lang, cssExtras, capture = _workerState
+    tblELR, tableFile, label = tableFiles[index]
+    viewRenderedGrid(modelXbrl, tableFile, lang=lang, viewTblELR=tblELR, cssExtras=cssExtras)
+    return (index, capture.takeRecords())
+
+def tableLinkroles(modelXbrl, lang=None):
+    ''' returns (linkrole, label) of each table linkbase table, in linkrole order '''
+    tblELRs = []
+    for tblELR in sorted(modelXbrl.relationshipSet("Table-rendering").linkRoleUris):
+        label = None
+        for table in modelXbrl.relationshipSet((XbrlConst.euTableAxis, XbrlConst.tableBreakdown, XbrlConst.tableBreakdownMMDD, XbrlConst.tableBreakdown201305, XbrlConst.tableBreakdown201301, XbrlConst.tableAxis2011), tblELR).rootConcepts:
+            label = table.genLabel(lang=lang, strip=True)
+            break
+        if not label:
+            modelRoleTypes = modelXbrl.roleTypes.get(tblELR)
+            label = (modelRoleTypes and modelRoleTypes[0].definition) or os.path.basename(tblELR)
+        tblELRs.append((tblELR, label))
+    return tblELRs
+
+def viewRenderedGrids(modelXbrl, indexFile, lang=None, processes=0, cssExtras=""):
+    ''' renders each table into its own file beside indexFile, of the index file's extension (html or
+        xml infoset), in forked worker processes if processes is more than one, and writes an html
+        index of the table files.  Table files are numbered in linkrole order and log messages are
+        replayed in that order, so output does not depend on the number of processes.
+    '''
+    from arelle.formula.ParallelEvaluator import parallelEvaluationAvailable, replayLogRecords
+    global _workerState
+    indexBase, _sep, ext = indexFile.rpartition(".")
+    if ext not in ("html", "htm", "xml"):
+        indexBase, ext = indexFile, "html"
+    tableFiles = [(tblELR, "{0}-{1}.{2}".format(indexBase, i, ext), label)
+                  for i, (tblELR, label) in enumerate(tableLinkroles(modelXbrl, lang), start=1)]
+    processes = min(processes or 0, len(tableFiles))
+    if processes > 1 and parallelEvaluationAvailable():
+        modelXbrl.modelManager.showStatus(_("rendering {0} tables in {1} processes").format(len(tableFiles), processes))
+        recordsByTable = [None] * len(tableFiles)
+        _workerState = [modelXbrl, tableFiles, lang, cssExtras]
+        try:
+            with multiprocessing.get_context("fork").Pool(processes, initializer=_initTableWorker) as pool:
+                for index, records in pool.imap_unordered(_viewTableInWorker, range(len(tableFiles))):
+                    recordsByTable[index] = records
+        finally:
+            _workerState = None
+        for records in recordsByTable:
+            replayLogRecords(modelXbrl, records)
+    else:
+        for tblELR, tableFile, label in tableFiles:
+            viewRenderedGrid(modelXbrl, tableFile, lang=lang, viewTblELR=tblELR, cssExtras=cssExtras)
+
+    htmlElt = etree.Element("{http://www.w3.org/1999/xhtml}html", nsmap={None: "http://www.w3.org/1999/xhtml"})
+    headElt = etree.SubElement(htmlElt, "{http://www.w3.org/1999/xhtml}head")
+    etree.SubElement(headElt, "{http://www.w3.org/1999/xhtml}title").text = os.path.basename(modelXbrl.modelDocument.uri)
+    listElt = etree.SubElement(etree.SubElement(htmlElt, "{http://www.w3.org/1999/xhtml}body"), "{http://www.w3.org/1999/xhtml}ul")
+    for tblELR, tableFile, label in tableFiles:
+        etree.SubElement(etree.SubElement(listElt, "{http://www.w3.org/1999/xhtml}li"),
+                         "{http://www.w3.org/1999/xhtml}a", attrib={"href": os.path.basename(tableFile), "title": tblELR}
+                         ).text = label
+    try:
+        with open(indexFile, "w", encoding="utf-8") as fh:
+            writexml(fh, etree.ElementTree(htmlElt), encoding="utf-8")
+        modelXbrl.info("info", _("Saved rendered tables index to %(file)s"), file=indexFile)
+    except (IOError, EnvironmentError) as err:
+        modelXbrl.exception("arelle:htmlIOError", _("Failed to save rendered tables index to %(file)s: %(error)s"),
+                            file=indexFile, error=err)
+
 class ViewRenderedGrid(ViewFile.View):
     def __init__(self, modelXbrl, outfile, lang, cssExtras):
         # find table model namespace based on table namespace
@@ -89,6 +164,8 @@ class ViewRenderedGrid(ViewFile.View):
 
         for tblELR in tblELRs:
             self.zOrdinateChoices = {}
+            self.resolvedLayouts = {} # x and y axes resolved for z choices of this table
+            self.tableFactIndex = None # facts by concept and dimensions, built on first body cell of this table
 
 
             for discriminator in range(1, 65535):
@@ -701,11 +778,17 @@ class ViewRenderedGrid(ViewFile.View):
                         justify = None
                         fp = FactPrototype(self, cellAspectValues)
                         if conceptNotAbstract:
-                            # reduce set of matchable facts to those with pri item qname and have dimension aspects
-                            facts = self.modelXbrl.factsByQname[priItemQname] if priItemQname else self.modelXbrl.factsInInstance
-                            if self.hasTableFilters:
-                                facts = self.modelTable.filterFacts(self.rendrCntx, facts)
-                            for aspect in matchableAspects:  # trim down facts with explicit dimensions match or just present
+                            if self.tableFactIndex is None:
+                                self.tableFactIndex = TableFactIndex(self.modelTable, self.rendrCntx)
+                            facts = self.tableFactIndex.cellFacts(cellAspectValues)
+                            if facts is None: # reduce set of matchable facts to those with pri item qname and have dimension aspects
+                                facts = self.modelXbrl.factsByQname[priItemQname] if priItemQname else self.modelXbrl.factsInInstance
+                                if self.hasTableFilters:
+                                    facts = self.modelTable.filteredFacts(self.rendrCntx, facts)
+                                matchableDims = matchableAspects
+                            else:
+                                matchableDims = emptySet # index has facts of the cell's explicit dimensions
+                            for aspect in matchableDims:  # trim down facts with explicit dimensions match or just present
                                 if isinstance(aspect, QName):
                                     aspectValue = cellAspectValues.get(aspect, None)
                                     if isinstance(aspectValue, ModelDimensionValue):
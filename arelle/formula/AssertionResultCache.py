@@ -0,0 +1,348 @@
+'''
+Persistent cache of value and existence assertion results across validation runs.
+
+Re-validating a filing after a minor correction re-evaluates every assertion, although most
+of them bind only to unchanged facts.  Each cacheable assertion is keyed by:
+
+- an environment hash of everything outside the instance facts which can affect evaluation
+  or its messages (DTS and formula linkbase documents, parameter values, formula options,
+  logger filters, default language, loaded plugins and Arelle version),
+- a definition hash of the serialized variable set and all resources reachable from it
+  (variables, filters, preconditions, messages and severities, with their arcs), and
+- a hash of the facts it may bind: when every fact variable has a static concept name filter,
+  the facts of those concepts, otherwise all facts of the instance.  Each fact contributes its
+  content: ModelFact.md5sum (concept, value, and context and unit md5sums), decimals, precision
+  and id, but not its position, so lines inserted or deleted elsewhere in the instance do not
+  invalidate results.
+
+On a cache hit the assertion's result counts are applied and its captured log records are
+replayed, as for parallel evaluation, instead of evaluating it.  Message references to facts
+are stored by fact content and remapped on replay to the current facts, so their lines and
+element pointers are those of a re-evaluation.  Any dependency change causes a cache miss.  Assertions which may read documents or the clock, use custom functions without an
+XPath implementation, or use instance variables, are never cached.
+
+Each entry point has its own cache file in the user application directory, rewritten after
+each run with the entries used or produced by that run.
+
+See COPYRIGHT.md for copyright information.
+'''
+from __future__ import annotations
+
+import io
+import json
+import os
+import re
+from hashlib import md5
+
+from lxml import etree
+
+from arelle import XbrlConst
+from arelle.ModelDocument import Type
+from arelle.ModelInstanceObject import ModelFact
+from arelle.ModelXbrl import ModelXbrl
+from arelle.ModelFormulaObject import ModelConceptName, ModelFactVariable, ModelParameter
+from arelle.formula import ParallelEvaluator
+
+CACHE_FORMAT = 2
+ALL = frozenset(("*",))  # marker for dependency on all facts of the instance
+
+_nonDeterministicFunctionsPattern = re.compile(
+    r"(^|[^\w.-])(doc|doc-available|collection|unparsed-text|unparsed-text-available|"
+    r"current-dateTime|current-date|current-time|implicit-timezone)\s*\(")
+_instanceNavigationPattern = re.compile(r"instance\s*\(|-in-instance|root\s*\(|//|\.\.|::")
+_definitionArcroles = (
+    (XbrlConst.variableSet,
+     XbrlConst.variableSetFilter,
+     XbrlConst.variableSetPrecondition,
+     XbrlConst.assertionSatisfiedMessage,
+     XbrlConst.assertionUnsatisfiedMessage) + XbrlConst.assertionUnsatisfiedSeverities,
+    (XbrlConst.variableFilter, XbrlConst.booleanFilter),
+)
+_excludedFormulaOptions = {"parallelProcesses", "resultCache", "cacheSize", "testcaseResultOptions"}
+
+
+class AssertionResultCache:
+    """
+    .. class:: AssertionResultCache(xpathContext, cacheFile=None)
+
+    Result cache for the assertions evaluated by one formula processing run of xpathContext's modelXbrl.
+    """
+    def __init__(self, xpathContext, cacheFile=None):
+        self.xpathContext = xpathContext
+        self.modelXbrl = xpathContext.modelXbrl
+        self.cacheFile = cacheFile
+        self.entries = {}
+        self.usedEntries = {}
+        self.hits = self.misses = self.uncacheable = 0
+        self.capture = None
+        self._factHashes = {}
+        self._factSetHashes = {}
+        self._factsByHash = None
+        if cacheFile and os.path.exists(cacheFile):
+            try:
+                with io.open(cacheFile, "rt", encoding="utf-8") as fh:
+                    cached = json.load(fh)
+                if cached.get("format") == CACHE_FORMAT:
+                    self.entries = cached.get("entries", {})
+            except (ValueError, OSError):
+                pass  # corrupt or unreadable cache file is ignored, it is rewritten on save
+        self.environmentHash = self.computeEnvironmentHash()
+
+    def computeEnvironmentHash(self):
+        modelXbrl = self.modelXbrl
+        _md5 = md5()
+        def update(*args):
+            for arg in args:
+                _md5.update(str(arg).encode("utf-8", "replace"))
+                _md5.update(b"\x1E")
+        from arelle import PluginManager, Version
+        update(Version.__version__, modelXbrl.modelDocument.uri, modelXbrl.modelManager.defaultLang)
+        for name, info in sorted(PluginManager.modulePluginInfos.items()):
+            update(name, info.get("version"))
+        logger = modelXbrl.logger
+        update(logger.level, modelXbrl.errorCaptureLevel,
+               getattr(getattr(logger, "messageCodeFilter", None), "pattern", None),
+               getattr(getattr(logger, "messageLevelFilter", None), "pattern", None),
+               modelXbrl.logRefObjectProperties, modelXbrl.logRefHasPluginProperties, modelXbrl.logRefHasPluginAttrs)
+        for name, value in sorted(vars(self.xpathContext.formulaOptions).items()):
+            if name not in _excludedFormulaOptions:
+                update(name, value)
+        for qn, value in sorted(self.xpathContext.inScopeVars.items(), key=lambda item: str(item[0])):
+            if isinstance(value, ModelXbrl):  # output or named instance
+                value = value.uri
+            update(qn, value)
+        for url, doc in sorted(modelXbrl.urlDocs.items()):
+            if doc.type not in (Type.INSTANCE, Type.INLINEXBRL, Type.INLINEXBRLDOCUMENTSET):
+                update(url, self.documentHash(doc))
+        return _md5.hexdigest()
+
+    @staticmethod
+    def documentHash(modelDocument):
+        filepath = getattr(modelDocument, "filepath", None)
+        if filepath and os.path.isfile(filepath):
+            stat = os.stat(filepath)
+            return "{}:{}".format(stat.st_size, stat.st_mtime_ns)
+        if modelDocument.xmlRootElement is not None:  # e.g., archive member, hash its contents
+            return md5(etree.tostring(modelDocument.xmlRootElement)).hexdigest()
+        return None
+
+    def definition(self, modelVariableSet):
+        ''' returns (definition hash, texts of expressions and messages, variables) reachable from modelVariableSet '''
+        modelXbrl = self.modelXbrl
+        _md5 = md5()
+        texts = []
+        variables = []
+        visited = set()
+        def visit(modelObject, arcroles):
+            if modelObject is None or modelObject in visited:
+                return
+            visited.add(modelObject)
+            _md5.update(etree.tostring(modelObject, with_tail=False))
+            _md5.update(b"\x1E")
+            for elt in modelObject.iter():
+                if isinstance(elt.tag, str):
+                    texts.extend(value for name, value in elt.items() if not name.startswith("{http://www.w3.org/1999/xlink}"))
+                    if elt.text:
+                        texts.append(elt.text)
+            for arcrole in arcroles:
+                for rel in modelXbrl.relationshipSet(arcrole).fromModelObject(modelObject):
+                    _md5.update(etree.tostring(rel.arcElement, with_tail=False))
+                    toModelObject = rel.toModelObject
+                    if arcrole == XbrlConst.variableSet:
+                        variables.append(toModelObject)
+                    visit(toModelObject, _definitionArcroles[1])
+        visit(modelVariableSet, _definitionArcroles[0])
+        return _md5.hexdigest(), texts, variables
+
+    def factsDependency(self, modelVariableSet, texts, variables):
+        ''' returns the concept qnames whose facts the variable set may bind, ALL for any fact, or None if not cacheable '''
+        modelXbrl = self.modelXbrl
+        instanceVariables = modelXbrl.relationshipSet(XbrlConst.instanceVariable)
+        if any(instanceVariables.toModelObject(variable) for variable in variables):
+            return None  # binds to other (e.g., formula output) instances
+        customFunctionNames = set()
+        for custFnSig in modelXbrl.modelCustomFunctionSignatures.values():
+            if custFnSig is not None:
+                if custFnSig.customFunctionImplementation is None:
+                    if any(custFnSig.functionQname.localName + "(" in text.replace(" ", "") for text in texts):
+                        return None  # function implemented by a plug-in
+                customFunctionNames.add(custFnSig.functionQname.localName + "(")
+        if any(_nonDeterministicFunctionsPattern.search(text) for text in texts):
+            return None
+        if any(_instanceNavigationPattern.search(text) or any(name in text.replace(" ", "") for name in customFunctionNames)
+               for text in texts):
+            return ALL
+        conceptQnames = set()
+        for variable in variables:
+            if isinstance(variable, ModelParameter):
+                continue
+            if not isinstance(variable, ModelFactVariable):
+                return ALL  # general variable
+            staticConceptFilters = [
+                rel.toModelObject
+                for rel in variable.filterRelationships
+                if isinstance(rel.toModelObject, ModelConceptName) and not rel.isComplemented
+                and rel.toModelObject.conceptQnames and not rel.toModelObject.qnameExpressions]
+            if not staticConceptFilters:
+                return ALL
+            conceptQnames |= set.intersection(*(set(conceptFilter.conceptQnames) for conceptFilter in staticConceptFilters))
+        return frozenset(conceptQnames)
+
+    def factHash(self, fact):
+        try:
+            return self._factHashes[fact]
+        except KeyError:
+            _md5 = md5()
+            _md5.update("{}\x1F{}\x1F{}\x1F{}".format(
+                fact.md5sum, fact.get("decimals"), fact.get("precision"), fact.id).encode("utf-8"))
+            if fact.isTuple:
+                for childFact in fact.modelTupleFacts:
+                    _md5.update(self.factHash(childFact).encode("ascii"))
+            h = self._factHashes[fact] = _md5.hexdigest()
+            return h
+
+    def factSetHash(self, conceptQnames):
+        try:
+            return self._factSetHashes[conceptQnames]
+        except KeyError:
+            if conceptQnames is ALL:
+                facts = self.modelXbrl.factsInInstance
+            else:
+                factsByQname = self.modelXbrl.factsByQname
+                facts = [fact for qn in conceptQnames for fact in factsByQname.get(qn, ())]
+            _md5 = md5()
+            for fact in sorted(facts, key=lambda f: f.objectIndex):
+                _md5.update(self.factHash(fact).encode("ascii"))
+            h = self._factSetHashes[conceptQnames] = _md5.hexdigest()
+            return h
+
+    def key(self, modelVariableSet):
+        ''' returns the cache key of modelVariableSet, or None if it is not cacheable '''
+        if not ParallelEvaluator.isParallelizable(self.modelXbrl, modelVariableSet):
+            self.uncacheable += 1
+            return None
+        definitionHash, texts, variables = self.definition(modelVariableSet)
+        conceptQnames = self.factsDependency(modelVariableSet, texts, variables)
+        if conceptQnames is None:
+            self.uncacheable += 1
+            return None
+        return md5("{}|{}|{}".format(self.environmentHash, definitionHash, self.factSetHash(conceptQnames)).encode("ascii")).hexdigest()
+
+    def lookup(self, key):
+        ''' returns cached (counters, log records) result for key, or None '''
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        counters, records = result
+        records = self.currentRefs(records)
+        if records is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.usedEntries[key] = result
+        return tuple(counters), records
+
+    def startCapture(self):
+        self.capture = ParallelEvaluator.LogRecordCapture()
+        self.modelXbrl.logger.addHandler(self.capture)
+
+    def endCapture(self):
+        self.modelXbrl.logger.removeHandler(self.capture)
+        records = self.capture.takeRecords()
+        self.capture = None
+        return records
+
+    def store(self, key, counters, records):
+        records = self.contentRefs(records)
+        if records is None:
+            return  # references instance objects other than facts
+        entry = [list(counters), [list(record) for record in records]]
+        try:
+            if json.loads(json.dumps(entry)) != entry:
+                return  # not exactly representable (e.g., tuple message arguments), don't cache
+        except (TypeError, ValueError):
+            return
+        self.usedEntries[key] = entry
+
+    def factsByHash(self):
+        if self._factsByHash is None:
+            self._factsByHash = {}
+            for fact in sorted(self.modelXbrl.factsInInstance, key=lambda f: f.objectIndex):
+                self._factsByHash.setdefault(self.factHash(fact), []).append(fact)
+        return self._factsByHash
+
+    def contentRefs(self, records):
+        ''' returns records with message references to facts replaced by the fact's hash and occurrence among
+            facts of equal hash, or None if a record references other objects of the instance '''
+        modelXbrl = self.modelXbrl
+        contentRecords = []
+        for level, msg, args, extras in records:
+            refs = extras.get("refs")
+            if refs:
+                contentRefs = []
+                for ref in refs:
+                    modelObject = modelXbrl.modelObject(ref["objectId"]) if "objectId" in ref else None
+                    if isinstance(modelObject, ModelFact):
+                        factHash = self.factHash(modelObject)
+                        ref = {"fact": [factHash, self.factsByHash()[factHash].index(modelObject)]}
+                    elif modelObject is not None and modelObject.modelDocument.type in (
+                            Type.INSTANCE, Type.INLINEXBRL, Type.INLINEXBRLDOCUMENTSET):
+                        return None
+                    contentRefs.append(ref)
+                extras = dict(extras, refs=contentRefs)
+            contentRecords.append((level, msg, args, extras))
+        return contentRecords
+
+    def currentRefs(self, records):
+        ''' returns records with content references to facts remapped to the current facts, or None if a
+            referenced fact is not in the instance '''
+        currentRecords = []
+        for level, msg, args, extras in records:
+            refs = extras.get("refs")
+            if refs and any("fact" in ref for ref in refs):
+                currentRefs = []
+                for ref in refs:
+                    if "fact" in ref:
+                        factHash, occurrence = ref["fact"]
+                        facts = self.factsByHash().get(factHash, ())
+                        if occurrence >= len(facts):
+                            return None
+                        # as logged for the fact by a re-evaluation
+                        ref = self.modelXbrl.logArguments("", "", {"modelObject": facts[occurrence]})[2]["refs"][0]
+                    currentRefs.append(ref)
+                extras = dict(extras, refs=currentRefs)
+            currentRecords.append((level, msg, args, extras))
+        return currentRecords
+
+    def save(self):
+        if self.cacheFile:
+            tmpFile = self.cacheFile + ".tmp"
+            with io.open(tmpFile, "wt", encoding="utf-8") as fh:
+                json.dump({"format": CACHE_FORMAT, "entries": self.usedEntries}, fh)
+            os.replace(tmpFile, self.cacheFile)
+
+    def logReuse(self):
+        evaluated = self.hits + self.misses
+        self.modelXbrl.info(
+            "formula:resultCacheReuse",
+            _("Assertion result cache reused %(hits)s of %(cacheable)s cacheable assertion results (%(rate)s), "
+              "%(uncacheable)s assertions not cacheable"),
+            modelObject=self.modelXbrl,
+            hits=self.hits,
+            cacheable=evaluated,
+            rate="{:.0%}".format(self.hits / evaluated) if evaluated else "n/a",
+            uncacheable=self.uncacheable,
+        )
+
+
+def assertionResultCache(xpathContext):
+    ''' returns the AssertionResultCache of the instance of xpathContext, persisted if the controller has a file system '''
+    modelXbrl = xpathContext.modelXbrl
+    cntlr = modelXbrl.modelManager.cntlr
+    cacheFile = None
+    if getattr(cntlr, "hasFileSystem", False) and getattr(cntlr, "userAppDir", None):
+        cacheDir = os.path.join(cntlr.userAppDir, "formulaResultCache")
+        os.makedirs(cacheDir, exist_ok=True)
+        cacheFile = os.path.join(cacheDir, md5(modelXbrl.modelDocument.uri.encode("utf-8")).hexdigest() + ".json")
+    return AssertionResultCache(xpathContext, cacheFile)
@@ -0,0 +1,165 @@
+'''
+Filter plans for fact variables and variable set group filters.
+
+A plan is made once for each filtered variable (or variable set) of a formula processing run.
+Filters whose result depends only on the instance (static concept name, concept period type,
+explicit dimension, typed dimension without test, single measure unit and nil filters) are
+planned as index lookups on the instance fact indexes.  Index lookups are applied first,
+ordered by the number of facts they are estimated to pass using instance statistics, so the
+remaining (XPath, variable dependent or per-fact) filters winnow the smallest fact set.  The
+remaining filters are applied in their relationship order, and aspects covered by all filters
+are accumulated in relationship order, as filters such as relative filters depend on aspects
+covered by preceding filters.
+
+See COPYRIGHT.md for copyright information.
+'''
+from __future__ import annotations
+
+from arelle.ModelFormulaObject import (
+    ModelConceptName,
+    ModelConceptPeriodType,
+    ModelExplicitDimension,
+    ModelFilter,
+    ModelNilFilter,
+    ModelSingleMeasure,
+    ModelTestFilter,
+    ModelTypedDimension,
+)
+from arelle.ModelXbrl import NONDEFAULT
+
+
+def staticFilterIndex(_filter):
+    ''' returns function of an instance to the facts _filter passes (uncomplemented), or None if not indexable '''
+    if isinstance(_filter, ModelConceptName):
+        if _filter.conceptQnames and not _filter.qnameExpressionProgs:
+            conceptQnames = _filter.conceptQnames
+            return lambda inst: set.union(*[inst.factsByQname.get(qn, set()) for qn in conceptQnames])
+    elif isinstance(_filter, ModelConceptPeriodType):
+        periodType = _filter.periodType
+        return lambda inst: inst.factsByPeriodType(periodType)
+    elif isinstance(_filter, ModelExplicitDimension):
+        if getattr(_filter, "isFilterStatic", False):
+            dimQname = _filter.dimQname
+            memQnames = _filter.staticMemberQnames
+            if memQnames:
+                return lambda inst: set.union(*[inst.factsByDimMemQname(dimQname, memQname) for memQname in memQnames])
+            return lambda inst: inst.factsByDimMemQname(dimQname)
+    elif isinstance(_filter, ModelTypedDimension):
+        dimQname = _filter.dimQname
+        if dimQname and not _filter.test:
+            return lambda inst: inst.factsByDimMemQname(dimQname, NONDEFAULT)
+    elif isinstance(_filter, ModelSingleMeasure):
+        measureQname = _filter.measureQname
+        if measureQname:
+            return lambda inst: inst.factsBySingleMeasure(measureQname)
+    elif isinstance(_filter, ModelNilFilter):
+        return lambda inst: inst.factsInInstance - inst.nonNilFactsInInstance
+    return None
+
+
+class FilterStep:
+    """
+    .. class:: FilterStep(filterRelationship)
+
+    A filter of the plan, with its index lookup function if it is a static filter.
+    """
+    __slots__ = ("rel", "filter", "isComplemented", "index")
+
+    def __init__(self, filterRelationship):
+        self.rel = filterRelationship
+        self.filter = filterRelationship.toModelObject
+        self.isComplemented = filterRelationship.isComplemented
+        self.index = staticFilterIndex(self.filter)
+
+    def indexedFacts(self, instances):
+        return set.union(*[self.index(inst) for inst in instances])
+
+    def description(self, xpCtx):
+        if self.index is not None:
+            kind = _("index lookup")
+        elif not self.filter.hasNoFilterVariableDependencies(xpCtx):
+            kind = _("variable dependent")
+        elif isinstance(self.filter, ModelTestFilter):
+            kind = _("XPath test per fact")
+        else:
+            kind = _("per fact")
+        return "{}{} {} ({})".format("complemented " if self.isComplemented else "",
+                                     self.filter.localName, self.filter.xlinkLabel, kind)
+
+
+class FilterPlan:
+    """
+    .. class:: FilterPlan(filterRelationships, isGroupFilter=False)
+
+    Plan of a fact variable's filters, or of a variable set's group filters (which don't cover aspects).
+    """
+    def __init__(self, filterRelationships, isGroupFilter=False):
+        self.isGroupFilter = isGroupFilter
+        self.steps = [FilterStep(rel) for rel in filterRelationships if isinstance(rel.toModelObject, ModelFilter)]
+        self.indexSteps = [step for step in self.steps if step.index is not None]
+        self.indexStepsOrder = {}  # ordered index steps by instances
+
+    def orderedIndexSteps(self, xpCtx, vb):
+        instances = tuple(vb.instances)
+        try:
+            return self.indexStepsOrder[instances]
+        except KeyError:
+            numFacts = sum(len(inst.factsInInstance) for inst in instances)
+            estimates = {}
+            for step in self.indexSteps:
+                numIndexed = len(step.indexedFacts(instances))
+                estimates[step] = (numFacts - numIndexed) if step.isComplemented else numIndexed
+            ordered = self.indexStepsOrder[instances] = sorted(self.indexSteps, key=lambda step: estimates[step])
+            if xpCtx.formulaOptions.traceVariableFilterPlan and self.steps:
+                planSteps = [(step, estimates[step]) for step in ordered] + [
+                    (step, None) for step in self.steps if step.index is None]
+                xpCtx.modelXbrl.info(
+                    "formula:trace",
+                    _("Fact Variable %(variable)s %(filterType)sfilter plan for %(factCount)s facts: \n%(plan)s"),
+                    modelObject=vb.var,
+                    variable=vb.qname,
+                    filterType="group " if self.isGroupFilter else "",
+                    factCount=numFacts,
+                    plan="\n".join("{}. {}{}".format(i, step.description(xpCtx),
+                                                     "" if estimate is None else _(", passes {} facts").format(estimate))
+                                   for i, (step, estimate) in enumerate(planSteps, start=1)),
+                )
+            return ordered
+
+    def filter(self, xpCtx, vb, facts):
+        traceWinnowing = xpCtx.formulaOptions.traceVariableFilterWinnowing
+        for step in self.orderedIndexSteps(xpCtx, vb):
+            indexedFacts = step.indexedFacts(vb.instances)
+            facts = (facts - indexedFacts) if step.isComplemented else (facts & indexedFacts)
+            if traceWinnowing:
+                self.traceWinnowing(xpCtx, vb, step, facts)
+        for step in self.steps:
+            if step.index is None and (facts or self.isGroupFilter):
+                facts = step.filter.filter(xpCtx, vb, facts, step.isComplemented)
+                if traceWinnowing:
+                    self.traceWinnowing(xpCtx, vb, step, facts)
+            if not self.isGroupFilter and step.rel.isCovered:  # block boolean group filters that have cover in subnetworks
+                vb.aspectsCovered |= step.filter.aspectsCovered(vb)
+        return facts
+
+    def traceWinnowing(self, xpCtx, vb, step, facts):
+        xpCtx.modelXbrl.info(
+            "formula:trace",
+            _("Fact Variable %(variable)s %(filterType)s %(filter)s filter %(xlinkLabel)s passes %(factCount)s facts %(allFacts)s"),
+            modelObject=vb.var,
+            variable=vb.qname,
+            filterType="group " if self.isGroupFilter else "",
+            filter=step.filter.localName,
+            xlinkLabel=step.filter.xlinkLabel,
+            factCount=len(facts),
+            allFacts="".join(str(fact) for fact in facts),
+        )
+
+
+def filterPlan(xpCtx, modelObject, filterRelationships, isGroupFilter=False):
+    ''' returns the FilterPlan of a fact variable or variable set's group filters for this formula processing run '''
+    try:
+        return xpCtx.filterPlans[modelObject]
+    except KeyError:
+        plan = xpCtx.filterPlans[modelObject] = FilterPlan(filterRelationships, isGroupFilter)
+        return plan
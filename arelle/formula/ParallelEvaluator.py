@@ -0,0 +1,141 @@
+'''
+Parallel evaluation of independent formula variable sets.
+
+Value and existence assertions which are not linked by variables-scope relationships only read
+the (input or already produced output) instances and only update their own result counters,
+so they can be evaluated independently.  Their evaluations are partitioned across a pool of
+forked worker processes, which share the loaded instance copy-on-write.  Each worker captures
+the log records produced by each variable set evaluation and returns them with the assertion
+result counts; the parent process replays the records and applies the counts in variable set
+order, so messages and results are identical to serial evaluation.
+
+See COPYRIGHT.md for copyright information.
+'''
+from __future__ import annotations
+
+import logging
+import multiprocessing
+
+from arelle import XbrlConst
+from arelle.ModelFormulaObject import ModelExistenceAssertion, ModelValueAssertion
+
+ASSERTION_COUNTERS = ("countSatisfied", "countNotSatisfied", "countOkMessages", "countWarningMessages", "countErrorMessages")
+_LOG_RECORD_ATTRIBUTES = frozenset(logging.LogRecord("", 0, "", 0, "", (), None).__dict__.keys()) | {"message", "asctime"}
+
+_workerState = None  # (xpathContext, variable sets), set in parent before forking workers
+
+
+class LogRecordCapture(logging.Handler):
+    """
+    .. class:: LogRecordCapture()
+
+    Log handler capturing records as picklable tuples of (level, msg, args, extras) for later replay.
+    """
+    def __init__(self):
+        super(LogRecordCapture, self).__init__()
+        self.records = []
+
+    def emit(self, logRecord):
+        extras = dict((k, v) for k, v in logRecord.__dict__.items() if k not in _LOG_RECORD_ATTRIBUTES)
+        self.records.append((logRecord.levelno, logRecord.msg, logRecord.args or None, extras))
+
+    def takeRecords(self):
+        records = self.records
+        self.records = []
+        return records
+
+
+def replayLogRecords(modelXbrl, records, countErrors=True):
+    ''' log captured records to modelXbrl's logger, counting them (and their error codes) as ModelXbrl.log does '''
+    logger = modelXbrl.logger
+    for level, msg, args, extras in records:
+        if countErrors:
+            modelXbrl.logCount[level] = modelXbrl.logCount.get(level, 0) + 1
+            if level >= modelXbrl.errorCaptureLevel:
+                try:
+                    modelXbrl.errors.extend([extras.get("messageCode")] * int(args["errorCount"]))
+                except (TypeError, KeyError, ValueError):
+                    modelXbrl.errors.append(extras.get("messageCode"))
+        if args:
+            logger.log(level, msg, args, extra=extras)
+        else:
+            logger.log(level, msg, extra=extras)
+
+
+def isParallelizable(modelXbrl, modelVariableSet):
+    ''' true if the variable set evaluation only reads instances and only affects its own counters and messages '''
+    if not isinstance(modelVariableSet, (ModelValueAssertion, ModelExistenceAssertion)):
+        return False  # formulas produce output instance facts and drive consistency assertions
+    variablesScope = modelXbrl.relationshipSet(XbrlConst.variablesScope)
+    return not (variablesScope.fromModelObject(modelVariableSet) or variablesScope.toModelObject(modelVariableSet))
+
+
+def parallelEvaluationAvailable():
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def _initWorker():
+    # replace parent's log handlers (files, buffers, UI) in the forked worker by a capturing handler
+    xpathContext = _workerState[0]
+    capture = LogRecordCapture()
+    xpathContext.modelXbrl.logger.handlers = [capture]
+    _workerState.append(capture)
+
+
+def _evaluateInWorker(index):
+    from arelle.formula.FormulaEvaluator import evaluate
+    from arelle.formula.XPathContext import XPathException
+    xpathContext, variableSets, capture = _workerState
+    modelVariableSet = variableSets[index]
+    try:
+        evaluate(xpathContext, modelVariableSet)
+    except XPathException as err:
+        xpathContext.modelXbrl.error(
+            err.code,
+            _("Variable set \n%(variableSet)s \nException: \n%(error)s"),
+            modelObject=modelVariableSet,
+            variableSet=str(modelVariableSet),
+            error=err.message,
+        )
+    except Exception as err:
+        xpathContext.modelXbrl.error(
+            "formula:parallelEvaluationException",
+            _("Variable set %(xlinkLabel)s exception in parallel evaluation: %(error)s"),
+            modelObject=modelVariableSet,
+            xlinkLabel=modelVariableSet.xlinkLabel,
+            error="{}: {}".format(type(err).__name__, err),
+        )
+    xpathContext.factAspectsCache.clear()
+    return (index, resultCounters(modelVariableSet), capture.takeRecords())
+
+
+def evaluateInParallel(xpathContext, modelVariableSets, processes):
+    ''' evaluates modelVariableSets (which must all be parallelizable) in forked worker processes,
+        returning a dict by variable set of (counters, log records) to be applied by applyResult
+        in the order the variable sets would be serially evaluated
+    '''
+    global _workerState
+    results = {}
+    if not modelVariableSets:
+        return results
+    _workerState = [xpathContext, modelVariableSets]
+    try:
+        processes = min(processes, len(modelVariableSets))
+        chunksize = max(1, len(modelVariableSets) // (processes * 8))
+        with multiprocessing.get_context("fork").Pool(processes, initializer=_initWorker) as pool:
+            for index, counters, records in pool.imap_unordered(_evaluateInWorker, range(len(modelVariableSets)), chunksize):
+                results[modelVariableSets[index]] = (counters, records)
+    finally:
+        _workerState = None
+    return results
+
+
+def resultCounters(modelVariableSet):
+    return tuple(getattr(modelVariableSet, counter, 0) for counter in ASSERTION_COUNTERS)
+
+
+def applyResult(modelXbrl, modelVariableSet, result):
+    counters, records = result
+    for counter, value in zip(ASSERTION_COUNTERS, counters):
+        setattr(modelVariableSet, counter, value)
+    replayLogRecords(modelXbrl, records)
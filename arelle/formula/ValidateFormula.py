@@ -38,7 +38,7 @@ from arelle.ModelValue import QName, qname
 from arelle.PluginManager import pluginClassMethods
 from arelle.PythonUtil import normalizeSpace
 from arelle.XmlValidate import validate as xml_validate
-from arelle.formula import XPathContext, XPathParser
+from arelle.formula import AssertionResultCache, ParallelEvaluator, XPathContext, XPathParser
 
 formulaIdWhitespacesSeparatedPattern = re.compile(r"(\w+\s)*(\w+)$")  # prenormalized IDs list
 
@@ -878,38 +878,99 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
 
         formulaEvaluatorInit()  # one-time module initialization
         val.modelXbrl.profileActivity("... evaluations", minTimeToShow=1.0)
+        parallelProcesses = getattr(formulaOptions, "parallelProcesses", 0) or 0
+        if parallelProcesses > 1 and (maxFormulaRunTimeTimer or not ParallelEvaluator.parallelEvaluationAvailable()):
+            val.modelXbrl.info(
+                "formula:parallelEvaluationUnavailable",
+                _("Parallel formula evaluation is not available %(reason)s, evaluating serially"),
+                modelObject=val.modelXbrl,
+                reason="with a maximum formula run time" if maxFormulaRunTimeTimer else "on this platform",
+            )
+            parallelProcesses = 0
+        resultCache = None
+        if getattr(formulaOptions, "resultCache", False):
+            if formulaOptions.timeVariableSetEvaluation:
+                val.modelXbrl.info(
+                    "formula:resultCacheUnavailable",
+                    _("Assertion result cache is not used when timing variable set evaluations"),
+                    modelObject=val.modelXbrl,
+                )
+            else:
+                resultCache = AssertionResultCache.assertionResultCache(xpathContext)
         for instanceQname in orderedInstancesList:
-            for modelVariableSet in instanceProducingVariableSets[instanceQname]:
-                # produce variable evaluations if no dependent variables-scope relationships
-                if not val.modelXbrl.relationshipSet(XbrlConst.variablesScope).toModelObject(modelVariableSet):
-                    if (
-                        not runIDs
-                        or runIDs.match(modelVariableSet.id)
-                        or (
-                            modelVariableSet.hasConsistencyAssertion
-                            and any(
-                                runIDs.match(modelRel.fromModelObject.id)
-                                for modelRel in val.modelXbrl.relationshipSet(XbrlConst.consistencyAssertionFormula).toModelObject(modelVariableSet)
-                                if isinstance(modelRel.fromModelObject, ModelConsistencyAssertion)
-                            )
+            # produce variable evaluations if no dependent variables-scope relationships
+            instanceVariableSets = [
+                modelVariableSet
+                for modelVariableSet in instanceProducingVariableSets[instanceQname]
+                if not val.modelXbrl.relationshipSet(XbrlConst.variablesScope).toModelObject(modelVariableSet)
+                and (
+                    not runIDs
+                    or runIDs.match(modelVariableSet.id)
+                    or (
+                        modelVariableSet.hasConsistencyAssertion
+                        and any(
+                            runIDs.match(modelRel.fromModelObject.id)
+                            for modelRel in val.modelXbrl.relationshipSet(XbrlConst.consistencyAssertionFormula).toModelObject(modelVariableSet)
+                            if isinstance(modelRel.fromModelObject, ModelConsistencyAssertion)
                         )
-                    ):
+                    )
+                )
+            ]
+            results = {}  # cached or parallel evaluation results by variable set
+            cacheKeys = {}  # result cache keys of variable sets to be evaluated
+            if resultCache is not None and instanceQname is None:  # assertions, after output instances are produced
+                for modelVariableSet in instanceVariableSets:
+                    cacheKey = resultCache.key(modelVariableSet)
+                    if cacheKey is not None:
+                        result = resultCache.lookup(cacheKey)
+                        if result is not None:
+                            results[modelVariableSet] = result
+                        else:
+                            cacheKeys[modelVariableSet] = cacheKey
+                val.modelXbrl.profileStat(_("formulaResultCacheLookup"))
+            if parallelProcesses > 1 and instanceQname is None:
+                val.modelXbrl.modelManager.showStatus(_("evaluating assertions in {0} processes").format(parallelProcesses))
+                parallelResults = ParallelEvaluator.evaluateInParallel(
+                    xpathContext,
+                    [modelVariableSet
+                     for modelVariableSet in instanceVariableSets
+                     if modelVariableSet not in results and ParallelEvaluator.isParallelizable(val.modelXbrl, modelVariableSet)],
+                    parallelProcesses,
+                )
+                for modelVariableSet, result in parallelResults.items():
+                    results[modelVariableSet] = result
+                    if modelVariableSet in cacheKeys:
+                        resultCache.store(cacheKeys.pop(modelVariableSet), result[0], result[1])
+                val.modelXbrl.profileStat(_("formulaParallelEvaluation"))
+            for modelVariableSet in instanceVariableSets:
+                if modelVariableSet in results:
+                    ParallelEvaluator.applyResult(val.modelXbrl, modelVariableSet, results.pop(modelVariableSet))
+                else:
+                    cacheKey = cacheKeys.get(modelVariableSet)
+                    try:
+                        varSetId = modelVariableSet.id or modelVariableSet.xlinkLabel
+                        val.modelXbrl.profileActivity("... evaluating " + varSetId, minTimeToShow=10.0)
+                        val.modelXbrl.modelManager.showStatus(_("evaluating {0}").format(varSetId))
+                        val.modelXbrl.profileActivity("... evaluating " + varSetId, minTimeToShow=1.0)
+                        if cacheKey is not None:
+                            resultCache.startCapture()
                         try:
-                            varSetId = modelVariableSet.id or modelVariableSet.xlinkLabel
-                            val.modelXbrl.profileActivity("... evaluating " + varSetId, minTimeToShow=10.0)
-                            val.modelXbrl.modelManager.showStatus(_("evaluating {0}").format(varSetId))
-                            val.modelXbrl.profileActivity("... evaluating " + varSetId, minTimeToShow=1.0)
                             evaluate(xpathContext, modelVariableSet)
-                            xpathContext.factAspectsCache.clear()
-                            val.modelXbrl.profileStat(modelVariableSet.localName + "_" + varSetId)
-                        except XPathContext.XPathException as err:
-                            val.modelXbrl.error(
-                                err.code,
-                                _("Variable set \n%(variableSet)s \nException: \n%(error)s"),
-                                modelObject=modelVariableSet,
-                                variableSet=str(modelVariableSet),
-                                error=err.message,
-                            )
+                        finally:
+                            if cacheKey is not None:
+                                records = resultCache.endCapture()
+                        if cacheKey is not None:
+                            resultCache.store(cacheKey, ParallelEvaluator.resultCounters(modelVariableSet), records)
+                        xpathContext.factAspectsCache.clear()
+                        val.modelXbrl.profileStat(modelVariableSet.localName + "_" + varSetId)
+                    except XPathContext.XPathException as err:
+                        val.modelXbrl.error(
+                            err.code,
+                            _("Variable set \n%(variableSet)s \nException: \n%(error)s"),
+                            modelObject=modelVariableSet,
+                            variableSet=str(modelVariableSet),
+                            error=err.message,
+                        )
         if maxFormulaRunTimeTimer:
             maxFormulaRunTimeTimer.cancel()
     except XPathContext.RunTimeExceededException:
@@ -919,6 +980,9 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
             modelObject=val.modelXbrl,
             mins=val.maxFormulaRunTime,
         )
+    if resultCache is not None:
+        resultCache.save()
+        resultCache.logReuse()
 
     logAssertionResultCounts(val, formulaOptions, runIDs)
 
@@ -55,6 +55,7 @@ from arelle.typing import TypeGetText
 if TYPE_CHECKING:
     from arelle.ModelDocument import ModelDocument
     from arelle.ModelFormulaObject import FormulaOptions, ModelGeneral, Trace as TraceClass
+    from arelle.formula.FilterPlan import FilterPlan
 
 _: TypeGetText
 
@@ -231,6 +232,7 @@ class XPathContext:
         self.factAspectsCache = factAspectsCache or FactAspectsCache(modelXbrl.modelManager.formulaOptions.cacheSize)
         self.inScopeVars: dict[QName, ModelXbrl | ModelObject | int | str] = {} if inScopeVars is None else inScopeVars
         self.cachedFilterResults: dict[ModelGeneral, set[ModelFact]] = {}
+        self.filterPlans: dict[ModelObject, FilterPlan] = {}  # by fact variable or variable set (group filters)
         if inputXbrlInstance:
             self.inScopeVars[XbrlConst.qnStandardInputInstance] = inputXbrlInstance.modelXbrl
         self.customFunctions: dict[
@@ -253,6 +255,7 @@ class XPathContext:
         self.outputFirstFact.clear()
         self.inScopeVars.clear()
         self.cachedFilterResults.clear()
+        self.filterPlans.clear()
         self.__dict__.clear()  # dereference everything
 
     def runTimeExceededCallback(self) -> None:
@@ -11,36 +11,12 @@ from decimal import Decimal
 from typing import Any, List, Sequence, TYPE_CHECKING, Union
 from xml.dom import minidom
 
-from pyparsing import (
-    CaselessLiteral,
-    Combine,
-    Forward,
-    Group,
-    Keyword,
-    Literal,
-    Opt,
-    ParseBaseException,
-    ParseException,
-    ParseResults,
-    ParseSyntaxException,
-    ParserElement,
-    Regex,
-    StringEnd,
-    Suppress,
-    Word,
-    ZeroOrMore,
-    alphanums,
-    alphas,
-    delimited_list,
-    nums,
-    quoted_string,
-)
-
 from arelle import ModelValue, XbrlConst, XmlUtil
 from arelle.Locale import format_string
 from arelle.PluginManager import pluginClassMethods
 
 if TYPE_CHECKING:
+    from pyparsing import ParseBaseException, ParseResults, ParserElement
     from arelle.ModelFormulaObject import ModelFormulaResource
     from arelle.ModelXbrl import ModelXbrl
     from arelle.ModelManager import ModelManager
@@ -490,320 +466,353 @@ def pushExpr(sourceStr: str, loc: int, toks: ParseResults) -> Expr:
     return expr
 
 
-ParserElement.enablePackrat()
-# define grammar
-variableRef = Regex(
-    "[$]"  # variable prefix
-    # optional prefix part
-    "([A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]"
-    "[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]*:)?"
-    # localname part
-    "([A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]"
-    "[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]*)"
-)
-# for now :: axis step is expected in QName production (processed in parser's QName structure)
-# qName = Word(alphas + '_',alphanums + ':_-.*') # note: this will pick up forward and reverse axes and handle by pushQName
-
-# try to match axis step, prefix, and localname, allowin wildcard prefix or localname
-# don't grab occurence indicator if on qname, e.g., not * of xs:string*
-qName = Regex(
-    "([A-Za-z-]+::)?"  # axis step part (just ansi characters)
-    # prefix or wildcard-prefix part
-    "([A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]"
-    "[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]*:|[*]:)?"
-    # localname or wildcard-localname part
-    "([A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]"
-    "[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]*|[*])"
-)
-# above qName definition allows double :: and excludes non-ascii letters
-# qName = Regex("[_A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD]"
-#               r"[_\-\."
-#               "\xB7A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040]*"
-#               "[:]?"
-#               r"[_\-\."
-#               "\xB7A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040]*")
-
-ncName = Word(alphas + '_', alphanums + '_-.')
-prefixOp = Literal(":")
-
-decimalPoint = Literal('.')
-exponentLiteral = CaselessLiteral('e')
-plusorminusLiteral = Literal('+') | Literal('-')
-digits = Word(nums)
-integerLiteral = Combine(Opt(plusorminusLiteral) + digits)
-decimalFractionLiteral = Combine(Opt(plusorminusLiteral) + decimalPoint + digits)
-infLiteral = Combine(Opt(plusorminusLiteral) + Literal("INF"))
-nanLiteral = Literal("NaN")
-floatLiteral = (
-    Combine(
-        integerLiteral
-        + ((decimalPoint + Opt(digits) + exponentLiteral + integerLiteral) | (exponentLiteral + integerLiteral))
+def _buildXPathGrammar() -> ParserElement:
+    from pyparsing import (
+        CaselessLiteral,
+        Combine,
+        Forward,
+        Group,
+        Keyword,
+        Literal,
+        Opt,
+        ParserElement,
+        Regex,
+        StringEnd,
+        Suppress,
+        Word,
+        ZeroOrMore,
+        alphanums,
+        alphas,
+        delimited_list,
+        nums,
+        quoted_string,
     )
-    | Combine(decimalFractionLiteral + exponentLiteral + integerLiteral)
-    | infLiteral
-    | nanLiteral
-)
-decimalLiteral = Combine(integerLiteral + decimalPoint + Opt(digits)) | decimalFractionLiteral
-
-
-# emptySequence = Literal( "(" ) + Literal( ")" )
-lParen = Literal("(")
-rParen = Literal(")")
-lPred = Literal("[")
-rPred = Literal("]")
-expOp = Literal("^")
-
-commaOp = Literal(",")
-forOp = Keyword("for").setParseAction(pushOp)
-someOp = Keyword("some")
-everyOp = Keyword("every")
-quantifiedOp = (someOp | everyOp).setParseAction(pushOp)
-inOp = Keyword("in")
-returnOp = Keyword("return").setParseAction(pushOp)
-satisfiesOp = Keyword("satisfies").setParseAction(pushOp)
-ifOp = Keyword("if").setParseAction(pushOp)
-thenOp = Keyword("then").setParseAction(pushOp)
-elseOp = Keyword("else").setParseAction(pushOp)
-andOp = Keyword("and")
-orOp = Keyword("or")
-eqValueOp = Keyword("eq")
-neValueOp = Keyword("ne")
-ltValueOp = Keyword("lt")
-leValueOp = Keyword("le")
-gtValueOp = Keyword("gt")
-geValueOp = Keyword("ge")
-valueCompOp = eqValueOp | neValueOp | ltValueOp | leValueOp | gtValueOp | geValueOp
-isNodeOp = Keyword("is")
-precedesNodeOp = Literal("<<")
-followsNodeOp = Literal(">>")
-nodeCompOp = isNodeOp | precedesNodeOp | followsNodeOp
-neGeneralOp = Literal("!=")
-leGeneralOp = Literal("<=")
-ltGeneralOp = Literal("<")
-geGeneralOp = Literal(">=")
-gtGeneralOp = Literal(">")
-eqGeneralOp = Literal("=")
-generalCompOp = neGeneralOp | leGeneralOp | ltGeneralOp | geGeneralOp | gtGeneralOp | eqGeneralOp
-comparisonOp = (nodeCompOp | valueCompOp | generalCompOp).setParseAction(pushOp)
-toOp = Keyword("to").setParseAction(pushOp)
-plusOp = Literal("+")
-minusOp = Literal("-")
-plusMinusOp = (plusOp | minusOp).setParseAction(pushOp)
-multOp = Literal("*")
-divOp = Keyword("div")
-idivOp = Keyword("idiv")
-modOp = Keyword("mod")
-multDivOp = (multOp | divOp | idivOp | modOp).setParseAction(pushOp)
-unionWordOp = Keyword("union")
-unionSymbOp = Literal("|")
-unionOp = unionWordOp | unionSymbOp
-intersectOp = Keyword("intersect")
-exceptOp = Keyword("except")
-intersectExceptOp = intersectOp | exceptOp
-instanceOp = Keyword("instance")
-ofOp = Keyword("of")
-treatOp = Keyword("treat")
-asOp = Keyword("as")
-castableOp = Keyword("castable")
-castOp = Keyword("cast")
-unaryOp = plusOp | minusOp
-occurOptionalOp = Literal("?")
-occurAnyOp = multOp
-occurAtLeastOnceOp = plusOp
-occurrenceOp = occurOptionalOp | occurAnyOp | occurAtLeastOnceOp
-wildOp = multOp
-typeName = qName
-elementName = qName
-attributeName = qName
-elementDeclaration = elementName
-schemaElementTest = (
-    Keyword("schema-element")
-    + Suppress(lParen)
-    + elementDeclaration
-    + Suppress(rParen)
-).setParseAction(pushOperation)
-elementNameOrWildcard = elementName | wildOp
-elementTest = (
-    Keyword("element")
-    + Suppress(lParen)
-    + Opt(
-        elementNameOrWildcard
-        + Opt(
-            Suppress(commaOp)
-            + typeName
-            + Opt(Literal("?"))
+
+    ParserElement.enablePackrat()
+    # define grammar
+    variableRef = Regex(
+        "[$]"  # variable prefix
+        # optional prefix part
+        "([A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]"
+        "[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]*:)?"
+        # localname part
+        "([A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]"
+        "[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]*)"
+    )
+    # for now :: axis step is expected in QName production (processed in parser's QName structure)
+    # qName = Word(alphas + '_',alphanums + ':_-.*') # note: this will pick up forward and reverse axes and handle by pushQName
+
+    # try to match axis step, prefix, and localname, allowin wildcard prefix or localname
+    # don't grab occurence indicator if on qname, e.g., not * of xs:string*
+    qName = Regex(
+        "([A-Za-z-]+::)?"  # axis step part (just ansi characters)
+        # prefix or wildcard-prefix part
+        "([A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]"
+        "[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]*:|[*]:)?"
+        # localname or wildcard-localname part
+        "([A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD_]"
+        "[A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040\xB7_.-]*|[*])"
+    )
+    # above qName definition allows double :: and excludes non-ascii letters
+    # qName = Regex("[_A-Za-z\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD]"
+    #               r"[_\-\."
+    #               "\xB7A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040]*"
+    #               "[:]?"
+    #               r"[_\-\."
+    #               "\xB7A-Za-z0-9\xC0-\xD6\xD8-\xF6\xF8-\xFF\u0100-\u02FF\u0370-\u037D\u037F-\u1FFF\u200C-\u200D\u2070-\u218F\u2C00-\u2FEF\u3001-\uD7FF\uF900-\uFDCF\uFDF0-\uFFFD\u0300-\u036F\u203F-\u2040]*")
+
+    ncName = Word(alphas + '_', alphanums + '_-.')
+    prefixOp = Literal(":")
+
+    decimalPoint = Literal('.')
+    exponentLiteral = CaselessLiteral('e')
+    plusorminusLiteral = Literal('+') | Literal('-')
+    digits = Word(nums)
+    integerLiteral = Combine(Opt(plusorminusLiteral) + digits)
+    decimalFractionLiteral = Combine(Opt(plusorminusLiteral) + decimalPoint + digits)
+    infLiteral = Combine(Opt(plusorminusLiteral) + Literal("INF"))
+    nanLiteral = Literal("NaN")
+    floatLiteral = (
+        Combine(
+            integerLiteral
+            + ((decimalPoint + Opt(digits) + exponentLiteral + integerLiteral) | (exponentLiteral + integerLiteral))
         )
+        | Combine(decimalFractionLiteral + exponentLiteral + integerLiteral)
+        | infLiteral
+        | nanLiteral
     )
-    + Suppress(rParen)
-).setParseAction(pushOperation)
-attributeDeclaration = attributeName
-schemaAttributeTest = (
-    Keyword("schema-attribute")
-    + Suppress(lParen)
-    + attributeDeclaration
-    + Suppress(rParen)
-).setParseAction(pushOperation)
-attribNameOrWildcard = attributeName | wildOp
-attributeTest = (
-    Keyword("attribute")
-    + Suppress(lParen)
-    + Opt(attribNameOrWildcard + Opt(commaOp + typeName))
-    + Suppress(rParen)
-).setParseAction(pushOperation)
-PITest = (
-    Keyword("processing-instruction")
-    + Suppress(lParen)
-    + Opt(ncName | quoted_string)
-    + Suppress(rParen)
-).setParseAction(pushOperation)
-commentTest = (
-        Keyword("comment")
+    decimalLiteral = Combine(integerLiteral + decimalPoint + Opt(digits)) | decimalFractionLiteral
+
+
+    # emptySequence = Literal( "(" ) + Literal( ")" )
+    lParen = Literal("(")
+    rParen = Literal(")")
+    lPred = Literal("[")
+    rPred = Literal("]")
+    expOp = Literal("^")
+
+    commaOp = Literal(",")
+    forOp = Keyword("for").setParseAction(pushOp)
+    someOp = Keyword("some")
+    everyOp = Keyword("every")
+    quantifiedOp = (someOp | everyOp).setParseAction(pushOp)
+    inOp = Keyword("in")
+    returnOp = Keyword("return").setParseAction(pushOp)
+    satisfiesOp = Keyword("satisfies").setParseAction(pushOp)
+    ifOp = Keyword("if").setParseAction(pushOp)
+    thenOp = Keyword("then").setParseAction(pushOp)
+    elseOp = Keyword("else").setParseAction(pushOp)
+    andOp = Keyword("and")
+    orOp = Keyword("or")
+    eqValueOp = Keyword("eq")
+    neValueOp = Keyword("ne")
+    ltValueOp = Keyword("lt")
+    leValueOp = Keyword("le")
+    gtValueOp = Keyword("gt")
+    geValueOp = Keyword("ge")
+    valueCompOp = eqValueOp | neValueOp | ltValueOp | leValueOp | gtValueOp | geValueOp
+    isNodeOp = Keyword("is")
+    precedesNodeOp = Literal("<<")
+    followsNodeOp = Literal(">>")
+    nodeCompOp = isNodeOp | precedesNodeOp | followsNodeOp
+    neGeneralOp = Literal("!=")
+    leGeneralOp = Literal("<=")
+    ltGeneralOp = Literal("<")
+    geGeneralOp = Literal(">=")
+    gtGeneralOp = Literal(">")
+    eqGeneralOp = Literal("=")
+    generalCompOp = neGeneralOp | leGeneralOp | ltGeneralOp | geGeneralOp | gtGeneralOp | eqGeneralOp
+    comparisonOp = (nodeCompOp | valueCompOp | generalCompOp).setParseAction(pushOp)
+    toOp = Keyword("to").setParseAction(pushOp)
+    plusOp = Literal("+")
+    minusOp = Literal("-")
+    plusMinusOp = (plusOp | minusOp).setParseAction(pushOp)
+    multOp = Literal("*")
+    divOp = Keyword("div")
+    idivOp = Keyword("idiv")
+    modOp = Keyword("mod")
+    multDivOp = (multOp | divOp | idivOp | modOp).setParseAction(pushOp)
+    unionWordOp = Keyword("union")
+    unionSymbOp = Literal("|")
+    unionOp = unionWordOp | unionSymbOp
+    intersectOp = Keyword("intersect")
+    exceptOp = Keyword("except")
+    intersectExceptOp = intersectOp | exceptOp
+    instanceOp = Keyword("instance")
+    ofOp = Keyword("of")
+    treatOp = Keyword("treat")
+    asOp = Keyword("as")
+    castableOp = Keyword("castable")
+    castOp = Keyword("cast")
+    unaryOp = plusOp | minusOp
+    occurOptionalOp = Literal("?")
+    occurAnyOp = multOp
+    occurAtLeastOnceOp = plusOp
+    occurrenceOp = occurOptionalOp | occurAnyOp | occurAtLeastOnceOp
+    wildOp = multOp
+    typeName = qName
+    elementName = qName
+    attributeName = qName
+    elementDeclaration = elementName
+    schemaElementTest = (
+        Keyword("schema-element")
+        + Suppress(lParen)
+        + elementDeclaration
+        + Suppress(rParen)
+    ).setParseAction(pushOperation)
+    elementNameOrWildcard = elementName | wildOp
+    elementTest = (
+        Keyword("element")
         + Suppress(lParen)
+        + Opt(
+            elementNameOrWildcard
+            + Opt(
+                Suppress(commaOp)
+                + typeName
+                + Opt(Literal("?"))
+            )
+        )
         + Suppress(rParen)
-).setParseAction(pushOperation)
-textTest = (
-        Keyword("text")
+    ).setParseAction(pushOperation)
+    attributeDeclaration = attributeName
+    schemaAttributeTest = (
+        Keyword("schema-attribute")
         + Suppress(lParen)
+        + attributeDeclaration
         + Suppress(rParen)
-).setParseAction(pushOperation)
-documentTest = (
-    Keyword("document-node")
-    + Suppress(lParen)
-    + Opt(elementTest | schemaElementTest)
-    + Suppress(rParen)
-).setParseAction(pushOperation)
-anyKindTest = (
-        Keyword("node")
+    ).setParseAction(pushOperation)
+    attribNameOrWildcard = attributeName | wildOp
+    attributeTest = (
+        Keyword("attribute")
         + Suppress(lParen)
+        + Opt(attribNameOrWildcard + Opt(commaOp + typeName))
         + Suppress(rParen)
-).setParseAction(pushOperation)
-kindTest = (
-    documentTest
-    | elementTest
-    | attributeTest
-    | schemaElementTest
-    | schemaAttributeTest
-    | PITest
-    | commentTest
-    | textTest
-    | anyKindTest
-)
-wildcard = Combine(ncName + prefixOp + wildOp) | Combine(wildOp + prefixOp + ncName) | wildOp
-nameTest = qName | wildcard
-nodeTest = kindTest | nameTest
-abbrevForwardStep = (Literal("@") + nodeTest).setParseAction(pushAttr) | (nodeTest)
-atomicType = qName
-itemType = kindTest | Keyword("item") + lParen + rParen | atomicType
-occurrenceIndicator = occurOptionalOp | multOp | plusOp  # oneOf("? * +")
-sequenceType = (Keyword("empty-sequence") + lParen + rParen) | (itemType + Opt(occurrenceIndicator))
-singleType = atomicType + Opt(occurOptionalOp)
-contextItem = decimalPoint
-pathDescOp = Literal("//")
-pathStepOp = Literal("/")
-pathOp = pathStepOp | pathDescOp
-pathRootOp = Regex(r"(/$|/[^/])")
-axisOp = Literal("::")
-forwardAxis = (
-    (Keyword("child") + axisOp)
-    | (Keyword("descendant") + axisOp)
-    | (Keyword("attribute") + axisOp)
-    | (Keyword("self") + axisOp)
-    | (Keyword("descendant-or-self") + axisOp)
-    | (Keyword("following-sibling") + axisOp)
-    | (Keyword("following") + axisOp)
-    | (Keyword("namespace") + axisOp)
-)
-forwardStep = (forwardAxis + nodeTest) | abbrevForwardStep
-reverseAxis = (
-    (Keyword("parent") + axisOp)
-    | (Keyword("ancestor") + axisOp)
-    | (Keyword("preceding-sibling") + axisOp)
-    | (Keyword("preceding") + axisOp)
-    | (Keyword("ancestor-or-self") + axisOp)
-)
-abbrevReverseStep = Literal("..")
-reverseStep = (reverseAxis + nodeTest) | abbrevReverseStep
-step = forwardStep | reverseStep
-
-expr = Forward()
-atom = (
-    (
-        forOp
-        - (variableRef + inOp + expr).setParseAction(pushRangeVar)
-        + ZeroOrMore(Suppress(commaOp) + (variableRef + inOp + expr).setParseAction(pushRangeVar))
-        - (returnOp + expr).setParseAction(pushExpr)
     ).setParseAction(pushOperation)
-    | (
-        quantifiedOp
-        - (variableRef + inOp + expr).setParseAction(pushRangeVar)
-        + ZeroOrMore(Suppress(commaOp) + (variableRef + inOp + expr).setParseAction(pushRangeVar))
-        - (satisfiesOp + expr).setParseAction(pushExpr)
+    PITest = (
+        Keyword("processing-instruction")
+        + Suppress(lParen)
+        + Opt(ncName | quoted_string)
+        + Suppress(rParen)
     ).setParseAction(pushOperation)
-    | (
-        (ifOp - Suppress(lParen) + Group(expr, aslist=True) + Suppress(rParen)).setParseAction(pushExpr)
-        - (thenOp + expr).setParseAction(pushOperation)
-        - (elseOp + expr).setParseAction(pushOperation)
+    commentTest = (
+            Keyword("comment")
+            + Suppress(lParen)
+            + Suppress(rParen)
     ).setParseAction(pushOperation)
-    | (qName + Suppress(lParen) + Opt(delimited_list(expr)) + Suppress(rParen)).setParseAction(pushFunction)
-    | floatLiteral.setParseAction(pushFloat)
-    | decimalLiteral.setParseAction(pushDecimal)
-    | integerLiteral.setParseAction(pushInt)
-    | quoted_string.setParseAction(pushQuotedString)
-    | variableRef.setParseAction(pushVarRef)
-    | abbrevReverseStep.setParseAction(pushOperation)
-    | contextItem.setParseAction(pushOperation)
-    | qName.setParseAction(pushQName)
-    | (
-        Suppress(lParen) - Opt(expr) - ZeroOrMore(commaOp.setParseAction(pushOp) - expr) - Suppress(rParen)
-    ).setParseAction(pushSequence)
-)
-# stepExpr = ( ( atom + ZeroOrMore( (lPred.setParseAction( pushOp ) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) ) |
-#             ( (reverseStep | forwardStep) + ZeroOrMore( (lPred.setParseAction( pushOp ) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) ) )
-stepExpr = (
-    atom + ZeroOrMore((lPred.setParseAction(pushOp) - expr - Suppress(rPred)).setParseAction(pushPredicate))
-) | (step + ZeroOrMore((lPred.setParseAction(pushOp) - expr - Suppress(rPred)).setParseAction(pushPredicate)))
-relativePathExpr = stepExpr + ZeroOrMore(((pathDescOp | pathStepOp) + stepExpr).setParseAction(pushOperation))
-pathExpr = (
-    (pathDescOp + relativePathExpr).setParseAction(pushRootStep)
-    | (pathStepOp + relativePathExpr).setParseAction(pushRootStep)
-    | (relativePathExpr)
-    | ((pathRootOp).setParseAction(pushRootStep))
-)
-
-
-valueExpr = pathExpr
-
-# filterExpr = ( atom + ZeroOrMore( (Suppress(lPred) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) )
-# axisStep = ( (reverseStep | forwardStep) + ZeroOrMore( (Suppress(lPred) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) )
-# stepExpr = filterExpr | axisStep
-# relativePathExpr = ( stepExpr + ZeroOrMore( ( pathStepOp | pathDescOp ) + stepExpr ).setParseAction( pushOperation ) )
-# pathExpr = ( ( pathDescOp + relativePathExpr ) |
-#             ( pathStepOp + relativePathExpr ) |
-#             ( relativePathExpr ) |
-#             ( pathStepOp ) )
-# valueExpr = pathExpr
-unaryExpr = (plusMinusOp + valueExpr).setParseAction(pushUnaryOperation) | valueExpr
-castExpr = unaryExpr + ZeroOrMore((castOp + asOp + singleType).setParseAction(pushOperation))
-castableExpr = castExpr + ZeroOrMore((castableOp + asOp + singleType).setParseAction(pushOperation))
-treatExpr = castableExpr + ZeroOrMore((treatOp + asOp + sequenceType).setParseAction(pushOperation))
-instanceOfExpr = treatExpr + ZeroOrMore((instanceOp + Suppress(ofOp) + sequenceType).setParseAction(pushOperation))
-intersectExceptExpr = instanceOfExpr + ZeroOrMore((intersectExceptOp + instanceOfExpr).setParseAction(pushOperation))
-unionExpr = intersectExceptExpr + ZeroOrMore((unionOp + intersectExceptExpr).setParseAction(pushOperation))
-multiplicitaveExpr = unionExpr + ZeroOrMore((multDivOp + unionExpr).setParseAction(pushOperation))
-additiveExpr = multiplicitaveExpr + ZeroOrMore((plusMinusOp + multiplicitaveExpr).setParseAction(pushOperation))
-rangeExpr = additiveExpr + ZeroOrMore((toOp + additiveExpr).setParseAction(pushOperation))
-comparisonExpr = rangeExpr + ZeroOrMore((comparisonOp + rangeExpr).setParseAction(pushOperation))
-andExpr = comparisonExpr + ZeroOrMore((andOp + comparisonExpr).setParseAction(pushOperation))
-orExpr = andExpr + ZeroOrMore((orOp + andExpr).setParseAction(pushOperation))
-
-expr <<= orExpr
-# The Forward expression streamline implementation (expr.streamline())
-# streamlines the wrapped expression (self.expr.streamline()). However, the
-# wrapped expression is reassigned by the left shift bitwise operator, but
-# doesn't reset the streamlined setting of the Forward expression instance.
-assert isinstance(expr.expr, ParserElement)
-expr.streamlined = expr.expr.streamlined
-xpathExpr = expr + StringEnd()  # type: ignore[no-untyped-call]
+    textTest = (
+            Keyword("text")
+            + Suppress(lParen)
+            + Suppress(rParen)
+    ).setParseAction(pushOperation)
+    documentTest = (
+        Keyword("document-node")
+        + Suppress(lParen)
+        + Opt(elementTest | schemaElementTest)
+        + Suppress(rParen)
+    ).setParseAction(pushOperation)
+    anyKindTest = (
+            Keyword("node")
+            + Suppress(lParen)
+            + Suppress(rParen)
+    ).setParseAction(pushOperation)
+    kindTest = (
+        documentTest
+        | elementTest
+        | attributeTest
+        | schemaElementTest
+        | schemaAttributeTest
+        | PITest
+        | commentTest
+        | textTest
+        | anyKindTest
+    )
+    wildcard = Combine(ncName + prefixOp + wildOp) | Combine(wildOp + prefixOp + ncName) | wildOp
+    nameTest = qName | wildcard
+    nodeTest = kindTest | nameTest
+    abbrevForwardStep = (Literal("@") + nodeTest).setParseAction(pushAttr) | (nodeTest)
+    atomicType = qName
+    itemType = kindTest | Keyword("item") + lParen + rParen | atomicType
+    occurrenceIndicator = occurOptionalOp | multOp | plusOp  # oneOf("? * +")
+    sequenceType = (Keyword("empty-sequence") + lParen + rParen) | (itemType + Opt(occurrenceIndicator))
+    singleType = atomicType + Opt(occurOptionalOp)
+    contextItem = decimalPoint
+    pathDescOp = Literal("//")
+    pathStepOp = Literal("/")
+    pathOp = pathStepOp | pathDescOp
+    pathRootOp = Regex(r"(/$|/[^/])")
+    axisOp = Literal("::")
+    forwardAxis = (
+        (Keyword("child") + axisOp)
+        | (Keyword("descendant") + axisOp)
+        | (Keyword("attribute") + axisOp)
+        | (Keyword("self") + axisOp)
+        | (Keyword("descendant-or-self") + axisOp)
+        | (Keyword("following-sibling") + axisOp)
+        | (Keyword("following") + axisOp)
+        | (Keyword("namespace") + axisOp)
+    )
+    forwardStep = (forwardAxis + nodeTest) | abbrevForwardStep
+    reverseAxis = (
+        (Keyword("parent") + axisOp)
+        | (Keyword("ancestor") + axisOp)
+        | (Keyword("preceding-sibling") + axisOp)
+        | (Keyword("preceding") + axisOp)
+        | (Keyword("ancestor-or-self") + axisOp)
+    )
+    abbrevReverseStep = Literal("..")
+    reverseStep = (reverseAxis + nodeTest) | abbrevReverseStep
+    step = forwardStep | reverseStep
+
+    expr = Forward()
+    atom = (
+        (
+            forOp
+            - (variableRef + inOp + expr).setParseAction(pushRangeVar)
+            + ZeroOrMore(Suppress(commaOp) + (variableRef + inOp + expr).setParseAction(pushRangeVar))
+            - (returnOp + expr).setParseAction(pushExpr)
+        ).setParseAction(pushOperation)
+        | (
+            quantifiedOp
+            - (variableRef + inOp + expr).setParseAction(pushRangeVar)
+            + ZeroOrMore(Suppress(commaOp) + (variableRef + inOp + expr).setParseAction(pushRangeVar))
+            - (satisfiesOp + expr).setParseAction(pushExpr)
+        ).setParseAction(pushOperation)
+        | (
+            (ifOp - Suppress(lParen) + Group(expr, aslist=True) + Suppress(rParen)).setParseAction(pushExpr)
+            - (thenOp + expr).setParseAction(pushOperation)
+            - (elseOp + expr).setParseAction(pushOperation)
+        ).setParseAction(pushOperation)
+        | (qName + Suppress(lParen) + Opt(delimited_list(expr)) + Suppress(rParen)).setParseAction(pushFunction)
+        | floatLiteral.setParseAction(pushFloat)
+        | decimalLiteral.setParseAction(pushDecimal)
+        | integerLiteral.setParseAction(pushInt)
+        | quoted_string.setParseAction(pushQuotedString)
+        | variableRef.setParseAction(pushVarRef)
+        | abbrevReverseStep.setParseAction(pushOperation)
+        | contextItem.setParseAction(pushOperation)
+        | qName.setParseAction(pushQName)
+        | (
+            Suppress(lParen) - Opt(expr) - ZeroOrMore(commaOp.setParseAction(pushOp) - expr) - Suppress(rParen)
+        ).setParseAction(pushSequence)
+    )
+    # stepExpr = ( ( atom + ZeroOrMore( (lPred.setParseAction( pushOp ) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) ) |
+    #             ( (reverseStep | forwardStep) + ZeroOrMore( (lPred.setParseAction( pushOp ) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) ) )
+    stepExpr = (
+        atom + ZeroOrMore((lPred.setParseAction(pushOp) - expr - Suppress(rPred)).setParseAction(pushPredicate))
+    ) | (step + ZeroOrMore((lPred.setParseAction(pushOp) - expr - Suppress(rPred)).setParseAction(pushPredicate)))
+    relativePathExpr = stepExpr + ZeroOrMore(((pathDescOp | pathStepOp) + stepExpr).setParseAction(pushOperation))
+    pathExpr = (
+        (pathDescOp + relativePathExpr).setParseAction(pushRootStep)
+        | (pathStepOp + relativePathExpr).setParseAction(pushRootStep)
+        | (relativePathExpr)
+        | ((pathRootOp).setParseAction(pushRootStep))
+    )
+
+
+    valueExpr = pathExpr
+
+    # filterExpr = ( atom + ZeroOrMore( (Suppress(lPred) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) )
+    # axisStep = ( (reverseStep | forwardStep) + ZeroOrMore( (Suppress(lPred) - expr - Suppress(rPred)).setParseAction(pushPredicate) ) )
+    # stepExpr = filterExpr | axisStep
+    # relativePathExpr = ( stepExpr + ZeroOrMore( ( pathStepOp | pathDescOp ) + stepExpr ).setParseAction( pushOperation ) )
+    # pathExpr = ( ( pathDescOp + relativePathExpr ) |
+    #             ( pathStepOp + relativePathExpr ) |
+    #             ( relativePathExpr ) |
+    #             ( pathStepOp ) )
+    # valueExpr = pathExpr
+    unaryExpr = (plusMinusOp + valueExpr).setParseAction(pushUnaryOperation) | valueExpr
+    castExpr = unaryExpr + ZeroOrMore((castOp + asOp + singleType).setParseAction(pushOperation))
+    castableExpr = castExpr + ZeroOrMore((castableOp + asOp + singleType).setParseAction(pushOperation))
+    treatExpr = castableExpr + ZeroOrMore((treatOp + asOp + sequenceType).setParseAction(pushOperation))
+    instanceOfExpr = treatExpr + ZeroOrMore((instanceOp + Suppress(ofOp) + sequenceType).setParseAction(pushOperation))
+    intersectExceptExpr = instanceOfExpr + ZeroOrMore((intersectExceptOp + instanceOfExpr).setParseAction(pushOperation))
+    unionExpr = intersectExceptExpr + ZeroOrMore((unionOp + intersectExceptExpr).setParseAction(pushOperation))
+    multiplicitaveExpr = unionExpr + ZeroOrMore((multDivOp + unionExpr).setParseAction(pushOperation))
+    additiveExpr = multiplicitaveExpr + ZeroOrMore((plusMinusOp + multiplicitaveExpr).setParseAction(pushOperation))
+    rangeExpr = additiveExpr + ZeroOrMore((toOp + additiveExpr).setParseAction(pushOperation))
+    comparisonExpr = rangeExpr + ZeroOrMore((comparisonOp + rangeExpr).setParseAction(pushOperation))
+    andExpr = comparisonExpr + ZeroOrMore((andOp + comparisonExpr).setParseAction(pushOperation))
+    orExpr = andExpr + ZeroOrMore((orOp + andExpr).setParseAction(pushOperation))
+
+    expr <<= orExpr
+    # The Forward expression streamline implementation (expr.streamline())
+    # streamlines the wrapped expression (self.expr.streamline()). However, the
+    # wrapped expression is reassigned by the left shift bitwise operator, but
+    # doesn't reset the streamlined setting of the Forward expression instance.
+    assert isinstance(expr.expr, ParserElement)
+    expr.streamlined = expr.expr.streamlined
+    return expr + StringEnd()  # type: ignore[no-untyped-call]
+
+
+xpathExpr: ParserElement | None = None
+
+
+def xpathGrammar() -> ParserElement:
+    # pyparsing is imported and the grammar built when first used rather than when this module is imported
+    global xpathExpr
+    if xpathExpr is None:
+        xpathExpr = _buildXPathGrammar()
+    return xpathExpr
 
 
 # map operator symbols to corresponding arithmetic operations
@@ -891,7 +900,7 @@ def initializeParser(modelManager: ModelManager) -> bool:
 
         modelManager.showStatus(_("initializing formula xpath2 grammar"))
         startedAt = time.time()
-        xpathExpr.parseString("0", parseAll=True)
+        xpathGrammar().parseString("0", parseAll=True)
         modelManager.addToLog(format_string(modelManager.locale,
                                     _("Formula xpath2 grammar initialized in %.2f secs"),
                                     time.time() - startedAt))
@@ -945,6 +954,7 @@ def parse(
         traceType: int
 ) -> ExpressionStack | None:
     from arelle.ModelFormulaObject import Trace
+    from pyparsing import ParseException, ParseSyntaxException
 
     global modelXbrl, pluginCustomFunctionQNames
     modelXbrl = modelObject.modelXbrl
@@ -981,7 +991,7 @@ def parse(
             assert element is not None
             exprStack.append(ProgHeader(modelObject, name, element, normalizedExpr, traceType))
 
-            L = xpathExpr.parseString(normalizedExpr, parseAll=True)
+            L = xpathGrammar().parseString(normalizedExpr, parseAll=True)
 
             # modelXbrl.error( _("AST {0} {1}").format(name, L),
             #    "info", "formula:trace")
@@ -1145,8 +1155,10 @@ def codeModule(code: Iterable[Any]) -> str:
 
 
 def parser_unit_test() -> None:
+    from pyparsing import ParseException, ParseSyntaxException
+
     # initialize
-    xpathExpr.parseString("0", parseAll=True)
+    xpathGrammar().parseString("0", parseAll=True)
 
     test1 = "3*7+5"
     test1a = "5+3*7"
@@ -1285,7 +1297,7 @@ def parser_unit_test() -> None:
         # try parsing the input string
         L: ParseResults | list[Any]
         try:
-            L = xpathExpr.parseString(normalizeExpr(test), parseAll=True)
+            L = xpathGrammar().parseString(normalizeExpr(test), parseAll=True)
         except (ParseException, ParseSyntaxException) as err:
             L = ['Parse Failure', test, err]
 
@@ -987,7 +987,7 @@ def loadFromOIM(cntlr, error, warning, modelXbrl, oimFile, mappedUri):
                     del oimObject[DUPJSONKEY]
                 oimWb = None
             elif isXL:
-                _file = modelXbrl.fileSource.file(filepath, binary=True)[0]
+                _file = modelXbrl.fileSource.file(filepath, binary=True, seekable=True)[0]
                 with _file as f:
                     oimWb = load_workbook(f, data_only=True)
                 if "metadata" not in oimWb:
@@ -1471,7 +1471,7 @@ def loadFromOIM(cntlr, error, warning, modelXbrl, oimFile, mappedUri):
                                           table=tableId, url=tableUrl)
                                 continue
                             if tableUrl.endswith(".xlsx"):
-                                _file = modelXbrl.fileSource.file(tablePath, binary=True)[0]
+                                _file = modelXbrl.fileSource.file(tablePath, binary=True, seekable=True)[0]
                                 tableWb = load_workbook(_file, data_only=True)
                                 _cellValue = xlValue
                             else:
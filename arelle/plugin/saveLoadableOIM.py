@@ -61,6 +61,21 @@ csvOpenMode = 'w'
 csvOpenNewline = ''
 
 
+def canonicalDecimal(value):
+    ''' xsd:decimal canonical representation of a finite Decimal, e.g. 100.0 or -0.25 '''
+    if value == 0:
+        return "0.0"
+    text = "{:f}".format(value.normalize()) # no exponent and no trailing fraction zeros
+    return text if "." in text else text + ".0"
+
+
+def canonicalFloat(value):
+    ''' xsd:double canonical representation of a finite float, e.g. 1.0E2 or -2.5E-3 '''
+    sign, digits, exponent = Decimal(repr(value)).normalize().as_tuple()
+    mantissa = "".join(str(d) for d in digits)
+    return "{}{}.{}E{}".format("-" if sign else "", mantissa[0], mantissa[1:] or "0", exponent + len(digits) - 1)
+
+
 def saveLoadableOIM(modelXbrl, oimFile, outputZip=None,
                     # arguments to add extension features to OIM document
                     extensionPrefixes=None,
@@ -111,6 +126,8 @@ def saveLoadableOIM(modelXbrl, oimFile, outputZip=None,
                     return "-INF" if object < 0 else "INF"
                 elif isnan(object):
                     return "NaN"
+                elif isJSON: # xbrl:canonicalValues is declared for JSON
+                    return canonicalDecimal(object) if isinstance(object, Decimal) else canonicalFloat(object)
                 else:
                     if isinstance(object, Decimal) and object == object.to_integral():
                         object = object.quantize(ONE) # drop any .0
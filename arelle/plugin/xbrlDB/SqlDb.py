@@ -193,13 +193,15 @@ class SqlDbConnection():
             if not hasSQLite:
                 raise XPDBException("xpgDB:MissingSQLiteInterface",
                                     _("SQLite interface is not installed"))
-            self.conn = sqliteConnect(database, (timeout or 60), detect_types=sqliteParseDecltypes)
+            # pooled connections may be committed by another thread than the one inserting (never concurrently)
+            self.conn = sqliteConnect(database, (timeout or 60), detect_types=sqliteParseDecltypes, check_same_thread=False)
             self.product = product
             self.syncSequences = False # for object_id coordination of autoincrement values
         else:
             self.product = None
         self.tableColTypes = {}
         self.tableColDeclaration = {}
+        self.dbKey = "{}:{}:{}:{}".format(product, host, port, database) # identifies database for client-side caches
         self.accessionId = "(None)"
         self.tempInputTableName = "input{}".format(os.getpid())
 
@@ -327,8 +329,9 @@ class SqlDbConnection():
             result = self.execute('LOCK TABLES {}'
                                   .format(', '.join(['{} WRITE'.format(t) for t in tableNames])),
                                   close=False, commit=False, fetch=False, action="locking table")
-        elif self.product in ("sqlite",) and isSessionTransaction:
-            result = self.execute('BEGIN TRANSACTION',
+        elif self.product in ("sqlite",) and isSessionTransaction and not self.conn.in_transaction:
+            # immediate, so concurrent inserting connections wait for the database lock instead of deadlocking
+            result = self.execute('BEGIN IMMEDIATE TRANSACTION',
                                   close=False, commit=False, fetch=False, action="locking table")
         # note, there is no lock for MS SQL (as far as I could find)
 
@@ -62,6 +62,7 @@ from .SqlDb import XPDBException, isSqlConnection, SqlDbConnection
 from .tableFacts import tableFacts
 from .entityInformation import loadEntityInformation
 from .primaryDocumentFacts import loadPrimaryDocumentFacts
+from .dbIdCache import dbIdCache
 from collections import defaultdict
 
 
@@ -104,18 +105,23 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
     def verifyTables(self):
         missingTables = XBRLDBTABLES - self.tablesInDB()
 
-    def insertXbrl(self, entrypoint, rssItem):
+    def insertXbrl(self, entrypoint, rssItem, commit=True):
+        ''' inserts the filing of modelXbrl, commit=False leaves the transaction open (and cached ids staged)
+            so that further filings may be inserted in the same transaction, committed by commitXbrl
+        '''
         try:
             # must also have default dimensions loaded
             from arelle import ValidateXbrlDimensions
             ValidateXbrlDimensions.loadDimensionDefaults(self.modelXbrl)
 
-            # get logging entries (needed to find which aspects to identify)
-            self.loggingEntries = []
-            for handler in logging.getLogger("arelle").handlers:
-                if hasattr(handler, "dbHandlerLogEntries"):
-                    self.loggingEntries = handler.dbHandlerLogEntries()
-                    break
+            # get logging entries (needed to find which aspects to identify), as captured for the model by a pipeline
+            self.loggingEntries = getattr(self.modelXbrl, "dbLoggingEntries", None)
+            if self.loggingEntries is None:
+                self.loggingEntries = []
+                for handler in logging.getLogger("arelle").handlers:
+                    if hasattr(handler, "dbHandlerLogEntries"):
+                        self.loggingEntries = handler.dbHandlerLogEntries()
+                        break
 
             # must have a valid XBRL instance or document
             if self.modelXbrl.modelDocument is None:
@@ -135,6 +141,7 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
                             isSessionTransaction=True) # lock for whole transaction
 
             # find pre-existing documents in server database
+            self.idCache = dbIdCache(self.modelXbrl.modelManager.cntlr, self.dbKey)
             self.identifyPreexistingDocuments()
             self.identifyAspectsUsed()
 
@@ -168,15 +175,29 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
             self.insertValidationResults()
             self.modelXbrl.profileStat(_("XbrlSqlDB: Validation results insertion"), time.time() - startedAt)
 
-            startedAt = time.time()
-            self.showStatus("Committing entries")
-            self.commit()
-            self.modelXbrl.profileStat(_("XbrlSqlDB: insertion committed"), time.time() - startedAt)
-            self.showStatus("DB insertion completed", clearAfter=5000)
+            if commit:
+                startedAt = time.time()
+                self.showStatus("Committing entries")
+                self.commitXbrl()
+                self.modelXbrl.profileStat(_("XbrlSqlDB: insertion committed"), time.time() - startedAt)
+                self.showStatus("DB insertion completed", clearAfter=5000)
         except Exception as ex:
+            if getattr(self, "idCache", None) is not None:
+                self.idCache.discard()
             self.showStatus("DB insertion failed due to exception", clearAfter=5000)
             raise
 
+    def commitXbrl(self):
+        ''' commits the transaction of inserted filings, then the ids they staged in the id cache '''
+        try:
+            self.commit()
+        except Exception:
+            if getattr(self, "idCache", None) is not None:
+                self.idCache.discard()
+            raise
+        if getattr(self, "idCache", None) is not None:
+            self.idCache.commit()
+
     def identifyTaxonomyRelSetsOwner(self):
         # walk down referenced document set from instance to find 'lowest' taxonomy relationship set ownership
         instanceReferencedDocuments = set()
@@ -363,18 +384,59 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
             self.urlDocs[url] = modelDocument
             if self.isSemanticDocument(modelDocument):
                 docUris.add(self.dbStr(url))
+        hasSemanticDocuments = bool(docUris)
+        idCache = self.idCache
+        if idCache is not None and docUris:
+            cachedIds = {}
+            for url, modelDocument in self.urlDocs.items():
+                if self.isSemanticDocument(modelDocument):
+                    docId = idCache.documentId(url)
+                    if docId is not None:
+                        cachedIds[url] = docId
+            if cachedIds and not self.verifyCachedIds(idCache, cachedIds):
+                idCache.invalidate()
+                cachedIds = {}
+            for url, docId in cachedIds.items():
+                self.existingDocumentIds[self.urlDocs[url]] = docId
+            docUris = set(self.dbStr(url)
+                          for url, modelDocument in self.urlDocs.items()
+                          if url not in cachedIds and self.isSemanticDocument(modelDocument))
         if docUris:
             results = self.execute("SELECT document_id, document_url FROM {} WHERE document_url IN ({})"
                                    .format(self.dbTableName("document"),
                                            ', '.join(docUris)))
-            self.existingDocumentIds = dict((self.urlDocs[self.pyStrFromDbStr(docUrl)],docId)
-                                            for docId, docUrl in results)
-
+            for docId, docUrl in results:
+                url = self.pyStrFromDbStr(docUrl)
+                modelDocument = self.urlDocs[url]
+                self.existingDocumentIds[modelDocument] = docId
+                if idCache is not None and modelDocument.type not in (Type.INSTANCE, Type.INLINEXBRL):
+                    idCache.stageDocument(url, docId) # taxonomy documents are shared by subsequent filings
+        if hasSemanticDocuments:
             # identify whether taxonomyRelsSetsOwner is existing
             self.isExistingTaxonomyRelSetsOwner = (
                 self.taxonomyRelSetsOwner.type not in (Type.INSTANCE, Type.INLINEXBRL, Type.INLINEXBRLDOCUMENTSET) and
                 self.taxonomyRelSetsOwner in self.existingDocumentIds)
 
+    def verifyCachedIds(self, idCache, cachedIds):
+        ''' checks the cached ids of the filing's documents, and a sample of the cached type and aspect ids
+            of those documents, against the database (which may have been recreated since they were cached) '''
+        results = self.execute("SELECT document_id, document_url FROM {} WHERE document_id IN ({})"
+                               .format(self.dbTableName("document"),
+                                       ', '.join(str(docId) for docId in cachedIds.values())))
+        dbUrls = dict((docId, self.pyStrFromDbStr(docUrl)) for docId, docUrl in results)
+        if any(dbUrls.get(docId) != url for url, docId in cachedIds.items()):
+            return False
+        for table, idCol, sample in (("data_type", "data_type_id", idCache.sampleTypes(cachedIds.values())),
+                                     ("aspect", "aspect_id", idCache.sampleAspects(cachedIds.values()))):
+            if sample:
+                results = self.execute("SELECT {0}, document_id, qname FROM {1} WHERE {0} IN ({2})"
+                                       .format(idCol, self.dbTableName(table),
+                                               ', '.join(str(id) for id, docId, qn in sample)))
+                dbObjects = dict((id, (docId, self.pyStrFromDbStr(qn))) for id, docId, qn in results)
+                if any(dbObjects.get(id) != (docId, qn) for id, docId, qn in sample):
+                    return False
+        return True
+
     def identifyAspectsUsed(self):
         # relationshipSets are a dts property
         self.relationshipSets = [(arcrole, ELR, linkqname, arcqname)
@@ -547,6 +609,14 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
 
         # get existing element IDs
         self.typeQnameId = {}
+        idCache = self.idCache
+        if idCache is not None:
+            for modelType in tuple(existingDocumentUsedTypes):
+                if modelType.modelDocument in self.documentIds:
+                    typeId = idCache.typeId(self.documentIds[modelType.modelDocument], modelType.qname.clarkNotation)
+                    if typeId is not None:
+                        self.typeQnameId[modelType.qname] = typeId
+                        existingDocumentUsedTypes.discard(modelType)
         if existingDocumentUsedTypes:
             typeQnameIds = []
             table = self.getTable('data_type', 'data_type_id',
@@ -560,6 +630,8 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
                                   insertIfNotMatched=False)
             for typeId, docId, qn in table:
                 self.typeQnameId[qname(qn)] = typeId
+                if idCache is not None:
+                    idCache.stageType(docId, qn, typeId)
 
         table = self.getTable('data_type', 'data_type_id',
                               ('document_id', 'xml_id', 'xml_child_seq',
@@ -600,6 +672,13 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
         self.aspectQnameId = {}
 
         # get existing element IDs
+        if idCache is not None:
+            for concept in tuple(existingDocumentUsedAspects):
+                if concept.modelDocument in self.documentIds:
+                    aspectId = idCache.aspectId(self.documentIds[concept.modelDocument], concept.qname.clarkNotation)
+                    if aspectId is not None:
+                        self.aspectQnameId[concept.qname] = aspectId
+                        existingDocumentUsedAspects.discard(concept)
         if existingDocumentUsedAspects:
             table = self.getTable('aspect', 'aspect_id',
                                   ('document_id', 'qname',),
@@ -612,6 +691,8 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
                                   insertIfNotMatched=False)
             for aspectId, docId, qn in table:
                 self.aspectQnameId[qname(qn)] = aspectId
+                if idCache is not None:
+                    idCache.stageAspect(docId, qn, aspectId)
 
         aspects = []
         for concept in filingDocumentAspects:
@@ -188,6 +188,23 @@ def xbrlDBcommandLineOptionExtender(parser, *args, **kwargs):
                       help=_("Load from XBRL DB.  "
                              "Provides connection string: host,port,user,password,database[,timeout[,{postgres|rexster|rdfDB}]]. "
                              "Specifies DB parameters to load and optional file to save XBRL into.  "))
+    parser.add_option("--xbrlDB-rss-processes",
+                      action="store",
+                      type="int",
+                      dest="xbrlDBrssProcesses",
+                      help=_("Store RSS feed filings into a semantic SQL XBRL DB with a pipeline of this many "
+                             "worker processes loading, validating and inserting filings.  "))
+    parser.add_option("--xbrlDB-rss-batch",
+                      action="store",
+                      type="int",
+                      dest="xbrlDBrssBatch",
+                      help=_("Number of RSS feed filings stored into a semantic SQL XBRL DB per database transaction "
+                             "(default 1).  "))
+    parser.add_option("--xbrlDB-rss-progress",
+                      action="store",
+                      dest="xbrlDBrssProgress",
+                      help=_("JSON file recording progress of RSS feed filings stored into XBRL DB, "
+                             "for resuming an interrupted RSS feed ingestion.  "))
 
     logging.getLogger("arelle").addHandler(LogToDbHandler())
 
@@ -203,6 +220,15 @@ def xbrlDBCommandLineXbrlLoaded(cntlr, options, modelXbrl, entrypoint, *args, **
             # specify reloading of cached source documents (may have been corrupted originally or refiled)
             modelXbrl.reloadCache = True
             storeIntoDB(modelXbrl.xbrlDBconnection, modelXbrl, entrypoint=entrypoint, rssObject=modelXbrl.modelDocument)
+        if (getattr(options, "xbrlDBrssProcesses", None) or getattr(options, "xbrlDBrssBatch", None) or
+            getattr(options, "xbrlDBrssProgress", None)):
+            # pipelined ingestion, marks ingested rssItems to be skipped by subsequent RSS feed validation
+            from .rssIngestion import ingestRssFeed
+            ingestRssFeed(modelXbrl, modelXbrl.xbrlDBconnection,
+                          processes=getattr(options, "xbrlDBrssProcesses", None) or 1,
+                          progressFile=getattr(options, "xbrlDBrssProgress", None),
+                          validate=getattr(options, "validate", False),
+                          batchSize=getattr(options, "xbrlDBrssBatch", None) or 1)
 
 def xbrlDBCommandLineXbrlRun(cntlr, options, modelXbrl, entrypoint, *args, **kwargs):
     from arelle.ModelDocument import Type
@@ -302,9 +328,22 @@ class LogToDbHandler(logging.Handler):
     def flush(self):
         del self.logRecordBuffer[:]
 
-    def dbHandlerLogEntries(self, clear=True):
+    def dbHandlerLogEntries(self, clear=True, thread=None):
+        # entries of buffered records, if thread (ident) only those logged in that thread
+        self.acquire()
+        try:
+            if thread is None:
+                logRecords = self.logRecordBuffer[:]
+                if clear:
+                    del self.logRecordBuffer[:]
+            else:
+                logRecords = [logRec for logRec in self.logRecordBuffer if logRec.thread == thread]
+                if clear:
+                    self.logRecordBuffer[:] = [logRec for logRec in self.logRecordBuffer if logRec.thread != thread]
+        finally:
+            self.release()
         entries = []
-        for logRec in self.logRecordBuffer:
+        for logRec in logRecords:
             message = { "text": self.format(logRec) }
             if logRec.args:
                 for n, v in logRec.args.items():
@@ -314,8 +353,6 @@ class LogToDbHandler(logging.Handler):
                      "refs": logRec.refs,
                      "message": message}
             entries.append(entry)
-        if clear:
-            del self.logRecordBuffer[:]
         return entries
 
     def emit(self, logRecord):
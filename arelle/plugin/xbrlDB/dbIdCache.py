@@ -0,0 +1,158 @@
+'''
+dbIdCache.py provides a client-side, persistent cache of database ids of taxonomy documents,
+data types and aspects for the semantic SQL database (XbrlSemanticSqlDB).
+
+Most filings reference the same base taxonomy release (e.g., US-GAAP) already stored in the
+database.  Without the cache every filing queries the database for every taxonomy document and
+for every data type and aspect it uses; with the cache only extension objects (and taxonomy
+objects first seen by this client) are queried.
+
+One cache is kept per database (product, host, port, database), in memory for the process and
+in a JSON file in the user application directory.  Ids are verified for each filing: the cached
+ids of documents used by the filing, and a random sample of the cached type and aspect ids of
+those documents, are checked against the database, and any mismatch (e.g., database recreated)
+invalidates the whole cache.
+
+Ids learned during a filing's transaction are staged and only become cached after commit, so a
+rolled back insertion never leaves ids in the cache.
+
+See COPYRIGHT.md for copyright information.
+'''
+import os, io, json, hashlib, random, threading
+
+DBIDCACHE_ENABLED = True  # set False to always query the database for existing ids
+DBIDCACHE_VERIFY_SAMPLE_SIZE = 10  # cached type and aspect ids verified per filing
+
+_caches = {}  # dict by database key of DbIdCache, shared by connections within the process
+_cachesLock = threading.Lock()
+
+
+class DbIdCache:
+    """
+    .. class:: DbIdCache(dbKey, cacheFile=None)
+
+    Maps document urls to document ids, and (document id, type or aspect clark qname) to data_type and aspect ids.
+    """
+    def __init__(self, dbKey, cacheFile=None):
+        self.dbKey = dbKey
+        self.cacheFile = cacheFile
+        self.documents = {}
+        self.types = {}
+        self.aspects = {}
+        self.staged = []
+        self.changed = False
+        self.hits = self.misses = 0
+        self.lock = threading.Lock()
+        if cacheFile and os.path.exists(cacheFile):
+            try:
+                with io.open(cacheFile, "rt", encoding="utf-8") as fh:
+                    cached = json.load(fh)
+                if cached.get("dbKey") == dbKey:
+                    self.documents = cached.get("documents", {})
+                    self.types = cached.get("types", {})
+                    self.aspects = cached.get("aspects", {})
+            except (ValueError, OSError):
+                pass  # corrupt or unreadable cache file is ignored, it is rewritten on next save
+
+    @staticmethod
+    def objectKey(docId, clarkQname):
+        return "{}|{}".format(docId, clarkQname)
+
+    def documentId(self, url):
+        docId = self.documents.get(url)
+        if docId is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return docId
+
+    def typeId(self, docId, clarkQname):
+        return self._lookup(self.types, self.objectKey(docId, clarkQname))
+
+    def aspectId(self, docId, clarkQname):
+        return self._lookup(self.aspects, self.objectKey(docId, clarkQname))
+
+    def _lookup(self, table, key):
+        id = table.get(key)
+        if id is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return id
+
+    def sampleTypes(self, docIds, size=DBIDCACHE_VERIFY_SAMPLE_SIZE):
+        return self._sample(self.types, docIds, size)
+
+    def sampleAspects(self, docIds, size=DBIDCACHE_VERIFY_SAMPLE_SIZE):
+        return self._sample(self.aspects, docIds, size)
+
+    def _sample(self, table, docIds, size):
+        ''' returns a random sample of (id, docId, clarkQname) of cached objects of the documents of docIds '''
+        docKeys = set(str(docId) for docId in docIds)
+        with self.lock:
+            entries = [(id, key) for key, id in table.items() if key.partition("|")[0] in docKeys]
+        sample = []
+        for id, key in random.sample(entries, min(size, len(entries))):
+            docKey, sep, clarkQname = key.partition("|")
+            sample.append((id, int(docKey), clarkQname))
+        return sample
+
+    def stageDocument(self, url, docId):
+        self.staged.append((self.documents, url, docId))
+
+    def stageType(self, docId, clarkQname, typeId):
+        self.staged.append((self.types, self.objectKey(docId, clarkQname), typeId))
+
+    def stageAspect(self, docId, clarkQname, aspectId):
+        self.staged.append((self.aspects, self.objectKey(docId, clarkQname), aspectId))
+
+    def commit(self):
+        ''' apply ids staged during the committed transaction and persist the cache if it changed '''
+        with self.lock:
+            for table, key, id in self.staged:
+                if table.get(key) != id:
+                    table[key] = id
+                    self.changed = True
+            del self.staged[:]
+            if self.changed:
+                self.save()
+
+    def discard(self):
+        del self.staged[:]
+
+    def invalidate(self):
+        with self.lock:
+            self.documents.clear()
+            self.types.clear()
+            self.aspects.clear()
+            del self.staged[:]
+            self.changed = False
+            if self.cacheFile and os.path.exists(self.cacheFile):
+                os.remove(self.cacheFile)
+
+    def save(self):
+        if self.cacheFile:
+            tmpFile = self.cacheFile + ".tmp"
+            with io.open(tmpFile, "wt", encoding="utf-8") as fh:
+                json.dump({"dbKey": self.dbKey,
+                           "documents": self.documents,
+                           "types": self.types,
+                           "aspects": self.aspects}, fh)
+            os.replace(tmpFile, self.cacheFile)
+        self.changed = False
+
+
+def dbIdCache(cntlr, dbKey):
+    ''' returns the process-wide DbIdCache for the database of dbKey, or None if caching is disabled '''
+    if not DBIDCACHE_ENABLED:
+        return None
+    with _cachesLock:
+        cache = _caches.get(dbKey)
+        if cache is None:
+            cacheFile = None
+            if getattr(cntlr, "hasFileSystem", False) and getattr(cntlr, "userAppDir", None):
+                cacheDir = os.path.join(cntlr.userAppDir, "xbrlDBidCache")
+                os.makedirs(cacheDir, exist_ok=True)
+                cacheFile = os.path.join(cacheDir, hashlib.md5(dbKey.encode("utf-8")).hexdigest() + ".json")
+            cache = _caches[dbKey] = DbIdCache(dbKey, cacheFile)
+        return cache
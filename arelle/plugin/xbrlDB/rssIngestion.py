@@ -0,0 +1,494 @@
+'''
+rssIngestion.py implements pipelined, parallel ingestion of RSS feed filings into
+the semantic SQL databases (XbrlSemanticSqlDB).
+
+Filings of a ModelRssObject feed are loaded, validated and inserted by a pool of worker
+processes, each holding a pooled database connection (reused across the filings it ingests).
+Model objects are lxml-backed and cannot be passed between processes, so the write stage
+runs in the same process that loaded the model.  Filings are inserted in batches, batchSize
+filings per database transaction, so a commit is shared by the filings of a batch.  A filing
+which fails insertion rolls back its batch; the other filings of the batch are recorded as
+failed and retried by a resumed run.
+
+In a single process, the model manager, web cache, plugins and log handler are not thread
+safe, so filings are loaded, validated and inserted by one thread, and a writer thread only
+commits each batch's transaction, while the next filing is being loaded and validated.
+The connection is handed from one thread to the other, never used by both at once.
+
+The log entries stored with a filing are those logged while loading and validating it, taken
+from the LogToDbHandler buffer (and attached to its model as dbLoggingEntries), so that
+messages logged meanwhile for the prior or next filing are not stored with it.
+
+Progress is tracked per rssItem (by accession number) in an optional JSON progress file,
+so an interrupted run can be resumed, skipping filings already stored.
+
+to use from command line:
+
+   arelleCmdLine --plugin xbrlDB -f http://sec.org/somewhere/some.rss -v
+       --store-to-XBRL-DB 'localhost,,,,/tmp/xbrlDB.sqlite,,sqliteSemantic'
+       --xbrlDB-rss-processes 8 --xbrlDB-rss-batch 10 --xbrlDB-rss-progress /tmp/rssProgress.json
+
+See COPYRIGHT.md for copyright information.
+'''
+import os, io, json, time, datetime, threading, queue, logging, multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# database types which support connection reuse across filings (XbrlSqlDatabaseConnection)
+POOLABLE_DB_TYPES = {"mssqlSemantic", "mysqlSemantic", "orclSemantic", "pgSemantic", "sqliteSemantic"}
+
+STORED = "stored"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+class RssIngestionProgress:
+    """
+    .. class:: RssIngestionProgress(progressFile=None)
+
+    Persistent per-rssItem progress record, keyed by accession number.  Filings recorded as
+    stored (with the same acceptance datetime) are skipped on a resumed run; failed filings are retried.
+    The file is rewritten atomically after each update so that an interrupted run never leaves it truncated.
+    """
+    def __init__(self, progressFile=None):
+        self.progressFile = progressFile
+        self.items = {}
+        self.lock = threading.Lock()
+        if progressFile and os.path.exists(progressFile):
+            with io.open(progressFile, "rt", encoding="utf-8") as fh:
+                self.items = json.load(fh)
+
+    def isDone(self, accessionNumber, acceptanceDatetime=None):
+        item = self.items.get(accessionNumber)
+        if item is None or item.get("status") != STORED:
+            return False
+        return acceptanceDatetime is None or item.get("acceptanceDatetime") in (None, str(acceptanceDatetime))
+
+    def record(self, accessionNumber, status, acceptanceDatetime=None, **kwargs):
+        with self.lock:
+            item = {"status": status,
+                    "acceptanceDatetime": str(acceptanceDatetime) if acceptanceDatetime is not None else None,
+                    "time": datetime.datetime.now().isoformat(timespec="seconds")}
+            item.update(kwargs)
+            self.items[accessionNumber] = item
+            self.save()
+
+    def save(self):
+        if self.progressFile:
+            tmpFile = self.progressFile + ".tmp"
+            with io.open(tmpFile, "wt", encoding="utf-8") as fh:
+                json.dump(self.items, fh, indent=1, sort_keys=True)
+            os.replace(tmpFile, self.progressFile)
+
+    def counts(self):
+        counts = {}
+        for item in self.items.values():
+            counts[item["status"]] = counts.get(item["status"], 0) + 1
+        return counts
+
+
+class SqlDbConnectionPool:
+    """
+    .. class:: SqlDbConnectionPool(dbConnection, size=1)
+
+    Pool of XbrlSqlDatabaseConnection objects for one connection string.  A connection is bound to the
+    modelXbrl of the filing being inserted, and per-filing state is dropped when it is unbound so
+    the prior model can be garbage collected while cached column types and the connection itself are kept.
+    A connection which raised an exception is closed with rollback and not returned to the pool.
+    """
+    def __init__(self, dbConnection, size=1):
+        self.dbConnection = dbConnection
+        self.size = size
+        self.idle = queue.Queue()
+        self.created = 0
+        self.lock = threading.Lock()
+
+    def connectionArgs(self):
+        host = port = user = password = db = timeout = dbType = None
+        dbConnection = self.dbConnection
+        if len(dbConnection) > 0: host = dbConnection[0]
+        if len(dbConnection) > 1: port = dbConnection[1]
+        if len(dbConnection) > 2: user = dbConnection[2]
+        if len(dbConnection) > 3: password = dbConnection[3]
+        if len(dbConnection) > 4: db = dbConnection[4]
+        if len(dbConnection) > 5 and dbConnection[5] and dbConnection[5].isdigit():
+            timeout = int(dbConnection[5])
+        if len(dbConnection) > 6: dbType = dbConnection[6]
+        return user, password, host, port, db, timeout, dbType
+
+    def acquire(self, modelXbrl):
+        try:
+            conn = self.idle.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                canCreate = self.created < self.size
+                if canCreate:
+                    self.created += 1
+            if not canCreate:
+                conn = self.idle.get() # wait for a connection to be released
+            else:
+                try:
+                    conn = self.newConnection(modelXbrl)
+                except Exception:
+                    with self.lock:
+                        self.created -= 1
+                    raise
+                return conn
+        self.bind(conn, modelXbrl)
+        return conn
+
+    def bind(self, conn, modelXbrl):
+        conn.modelXbrl = modelXbrl
+        conn.disclosureSystem = modelXbrl.modelManager.disclosureSystem
+
+    def newConnection(self, modelXbrl):
+        from . import dbProduct
+        from .XbrlSemanticSqlDB import XbrlSqlDatabaseConnection
+        user, password, host, port, db, timeout, dbType = self.connectionArgs()
+        conn = XbrlSqlDatabaseConnection(modelXbrl, user, password, host, port, db, timeout, dbProduct.get(dbType))
+        conn.verifyTables()
+        conn.poolBaseAttributes = set(conn.__dict__.keys()) | {"poolBaseAttributes"}
+        return conn
+
+    def unbind(self, conn):
+        for attr in [a for a in conn.__dict__.keys() if a not in conn.poolBaseAttributes and a != "idCache"]:
+            delattr(conn, attr) # per-filing state (documents, aspects, ids) references the prior model
+        conn.modelXbrl = None
+        conn.closeCursor()
+
+    def release(self, conn, failed=False):
+        if failed:
+            with self.lock:
+                self.created -= 1
+            try:
+                conn.close(rollback=True)
+            except Exception:
+                pass
+            return
+        self.unbind(conn)
+        self.idle.put(conn)
+
+    def commit(self, conn):
+        ''' commits the filings inserted in the transaction of conn and returns it to the pool '''
+        try:
+            conn.commitXbrl()
+        except Exception:
+            self.release(conn, failed=True)
+            raise
+        self.release(conn)
+
+    def close(self):
+        while True:
+            try:
+                conn = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self.created = 0
+
+
+def takeLogEntries(thread=None):
+    ''' returns and clears the LogToDbHandler entries, if thread (ident) only those logged in that thread '''
+    for handler in logging.getLogger("arelle").handlers:
+        if hasattr(handler, "dbHandlerLogEntries"):
+            return handler.dbHandlerLogEntries(clear=True, thread=thread)
+    return []
+
+
+class BatchInserter:
+    """
+    .. class:: BatchInserter(pool, batchSize=1)
+
+    Inserts filings into the open transaction of a pooled connection, up to batchSize filings per transaction,
+    taken (with the filings of the batch) to be committed by commitBatch.  A filing failing insertion rolls back
+    the transaction, failing with it the filings inserted before it in the batch.
+    """
+    def __init__(self, pool, batchSize=1):
+        self.pool = pool
+        self.batchSize = max(1, batchSize)
+        self.conn = None
+        self.batch = [] # (rssItem, duration) of filings inserted in the open transaction
+
+    def insert(self, modelXbrl, rssItem, startedAt):
+        ''' inserts modelXbrl into the open transaction, returning the (rssItem, status, error, duration) results
+            of filings failed by its insertion, if any '''
+        try:
+            if self.conn is None:
+                self.conn = self.pool.acquire(modelXbrl) # waits for the commit of a prior batch
+            else:
+                self.pool.bind(self.conn, modelXbrl)
+            self.conn.insertXbrl(None, rssItem, commit=False)
+        except Exception as ex:
+            error = "{}: {}".format(type(ex).__name__, ex)
+            results = [(batchItem, FAILED, "rolled back with failed filing {}".format(rssItem.accessionNumber), duration)
+                       for batchItem, duration in self.batch]
+            results.append((rssItem, FAILED, error, time.time() - startedAt))
+            self.rollback()
+            return results
+        self.pool.unbind(self.conn)
+        self.batch.append((rssItem, time.time() - startedAt))
+        return []
+
+    def isFull(self):
+        return len(self.batch) >= self.batchSize
+
+    def take(self):
+        ''' returns the connection and filings of the open transaction, starting a new batch '''
+        conn, batch = self.conn, self.batch
+        self.conn = None
+        self.batch = []
+        return conn, batch
+
+    def rollback(self):
+        if self.conn is not None:
+            self.pool.release(self.conn, failed=True)
+        self.conn = None
+        self.batch = []
+
+
+def commitBatch(pool, conn, batch):
+    ''' commits the transaction of a batch of inserted filings, returning their (rssItem, status, error, duration) results '''
+    startedAt = time.time()
+    try:
+        pool.commit(conn)
+        status, error = STORED, None
+    except Exception as ex:
+        status, error = FAILED, "{}: {}".format(type(ex).__name__, ex)
+    commitDuration = time.time() - startedAt
+    return [(rssItem, status, error, duration + commitDuration) for rssItem, duration in batch]
+
+
+class FilingWriter(threading.Thread):
+    """
+    .. class:: FilingWriter(pool)
+
+    Writer stage: commits, in order, the transactions of batches of filings inserted by the loading thread.
+    It uses only the connection handed to it, never models, the model manager or logging, which are not
+    thread safe; the connection is returned to the pool for the loading thread's next batch when committed.
+    """
+    def __init__(self, pool):
+        super(FilingWriter, self).__init__(name="xbrlDB-writer", daemon=True)
+        self.pool = pool
+        self.queue = queue.Queue()
+        self.results = queue.Queue()
+
+    def put(self, conn, batch):
+        self.queue.put((conn, batch))
+
+    def finish(self):
+        self.queue.put(None)
+        self.join()
+
+    def takeResults(self):
+        ''' returns the results of batches committed so far (to be recorded by the loading thread) '''
+        results = []
+        while True:
+            try:
+                results.extend(self.results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def run(self):
+        while True:
+            entry = self.queue.get()
+            if entry is None:
+                break
+            conn, batch = entry
+            self.results.put(commitBatch(self.pool, conn, batch))
+
+
+def loadAndValidate(modelManager, rssItem, validate=True, reloadCache=False, formulaParameters=None):
+    ''' loads and validates an rssItem filing as Validate.validateRssFeed does, returning modelXbrl
+        or None if the filing was not loaded or not to be processed
+    '''
+    from arelle import ModelXbrl, ValidateXbrl
+    from arelle.FileSource import openFileSource
+    from arelle.PluginManager import pluginClassMethods
+    modelXbrl = ModelXbrl.load(modelManager,
+                               openFileSource(rssItem.zippedUrl, modelManager.cntlr, reloadCache=reloadCache),
+                               _("validating"), rssItem=rssItem)
+    for pluginXbrlMethod in pluginClassMethods("RssItem.Xbrl.Loaded"):
+        pluginXbrlMethod(modelXbrl, {}, rssItem)
+    if getattr(rssItem, "doNotProcessRSSitem", False) or modelXbrl.modelDocument is None:
+        modelXbrl.close()
+        return None
+    if validate:
+        instValidator = ValidateXbrl.ValidateXbrl(modelXbrl)
+        instValidator.validate(modelXbrl, formulaParameters)
+        instValidator.close()
+    rssItem.setResults(modelXbrl)
+    return modelXbrl
+
+
+
+def ingestFiling(inserter, modelManager, rssItem, validate=True, reloadCache=False, formulaParameters=None):
+    ''' loads, validates and inserts an rssItem filing into the open transaction of inserter, returning the
+        (rssItem, status, error, duration) results of filings completed by this step (skipped or failed)
+    '''
+    startedAt = time.time()
+    thread = threading.get_ident()
+    takeLogEntries(thread) # messages preceding this filing
+    try:
+        modelXbrl = loadAndValidate(modelManager, rssItem, validate, reloadCache, formulaParameters)
+    except Exception as ex:
+        takeLogEntries(thread)
+        return [(rssItem, FAILED, "{}: {}".format(type(ex).__name__, ex), time.time() - startedAt)]
+    if modelXbrl is None:
+        takeLogEntries(thread)
+        return [(rssItem, SKIPPED, None, time.time() - startedAt)]
+    modelXbrl.dbLoggingEntries = takeLogEntries(thread) # this filing's load and validation messages
+    try:
+        return inserter.insert(modelXbrl, rssItem, startedAt)
+    finally:
+        modelXbrl.close()
+        takeLogEntries(thread) # discard messages of insertion, not of any filing
+
+
+def ingestSerially(rssModelXbrl, rssItems, dbConnection, progress, validate=True, batchSize=1):
+    ''' single process pipeline: this thread loads, validates and inserts filings, batchSize filings
+        per transaction, a writer thread commits each batch while the next filing is loaded and validated '''
+    modelManager = rssModelXbrl.modelManager
+    reloadCache = getattr(rssModelXbrl, "reloadCache", False)
+    formulaParameters = modelManager.formulaOptions.typedParameters(rssModelXbrl.prefixedNamespaces)
+    pool = SqlDbConnectionPool(dbConnection, size=1)
+    inserter = BatchInserter(pool, batchSize)
+
+    def recordResults(results):
+        for rssItem, status, error, duration in results:
+            progress.record(rssItem.accessionNumber, status, rssItem.acceptanceDatetime, error=error, duration=round(duration, 3))
+            logResult(rssModelXbrl, rssItem.accessionNumber, status, error, duration)
+
+    writer = FilingWriter(pool)
+    writer.start()
+    try:
+        for rssItem in rssItems:
+            recordResults(ingestFiling(inserter, modelManager, rssItem, validate, reloadCache, formulaParameters))
+            if inserter.isFull():
+                writer.put(*inserter.take())
+            recordResults(writer.takeResults())
+        if inserter.batch:
+            writer.put(*inserter.take())
+    finally:
+        inserter.rollback() # uncommitted batch of an interrupted ingestion
+        writer.finish()
+        recordResults(writer.takeResults())
+        pool.close()
+
+
+# worker process state, initialized once per process by _initWorker
+_worker = None
+
+def _initWorker(rssUrl, dbConnection, pluginConfig, disclosureSystemName, formulaOptions, validate, reloadCache):
+    global _worker
+    from arelle import Cntlr, PluginManager
+    from . import LogToDbHandler
+    cntlr = Cntlr.Cntlr(logFileName="logToBuffer")
+    logging.getLogger("arelle").addHandler(LogToDbHandler()) # messages to store with each filing
+    if pluginConfig:
+        PluginManager.pluginConfig = pluginConfig
+        PluginManager.reset()
+    modelManager = cntlr.modelManager
+    modelManager.formulaOptions = formulaOptions
+    if disclosureSystemName:
+        modelManager.validateDisclosureSystem = True
+        modelManager.disclosureSystem.select(disclosureSystemName)
+    rssModelXbrl = modelManager.load(rssUrl)
+    _worker = {"cntlr": cntlr,
+               "rssModelXbrl": rssModelXbrl,
+               "rssItems": dict((rssItem.accessionNumber, rssItem) for rssItem in rssModelXbrl.modelDocument.rssItems),
+               "pool": SqlDbConnectionPool(dbConnection, size=1),
+               "validate": validate,
+               "reloadCache": reloadCache,
+               "formulaParameters": formulaOptions.typedParameters(rssModelXbrl.prefixedNamespaces)}
+
+def _ingestInWorker(accessionNumbers):
+    ''' load, validate and store a batch of filings in a worker process, committed in one transaction,
+        returning their (accessionNumber, status, error, duration) results '''
+    cntlr = _worker["cntlr"]
+    inserter = BatchInserter(_worker["pool"], len(accessionNumbers))
+    results = []
+    for accessionNumber in accessionNumbers:
+        rssItem = _worker["rssItems"].get(accessionNumber)
+        if rssItem is None:
+            results.append((accessionNumber, FAILED, "rssItem not found in worker feed", 0.0))
+            continue
+        for rssItem, status, error, duration in ingestFiling(inserter, cntlr.modelManager, rssItem, _worker["validate"],
+                                                             _worker["reloadCache"], _worker["formulaParameters"]):
+            results.append((rssItem.accessionNumber, status, error, duration))
+        cntlr.logHandler.flush() # discard buffered log entries of this filing
+    if inserter.batch:
+        for rssItem, status, error, duration in commitBatch(inserter.pool, *inserter.take()):
+            results.append((rssItem.accessionNumber, status, error, duration))
+    return results
+
+def ingestInProcessPool(rssModelXbrl, rssItems, dbConnection, progress, processes, validate=True, batchSize=1):
+    from arelle import PluginManager
+    modelManager = rssModelXbrl.modelManager
+    disclosureSystemName = modelManager.disclosureSystem.name if modelManager.validateDisclosureSystem else None
+    initargs = (rssModelXbrl.modelDocument.uri, dbConnection, PluginManager.pluginConfig, disclosureSystemName,
+                modelManager.formulaOptions, validate, getattr(rssModelXbrl, "reloadCache", False))
+    acceptanceDatetimes = dict((rssItem.accessionNumber, rssItem.acceptanceDatetime) for rssItem in rssItems)
+    accessionNumbers = [rssItem.accessionNumber for rssItem in rssItems]
+    with ProcessPoolExecutor(max_workers=processes,
+                             mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_initWorker, initargs=initargs) as executor:
+        futures = [executor.submit(_ingestInWorker, accessionNumbers[i:i + batchSize])
+                   for i in range(0, len(accessionNumbers), batchSize)]
+        for future in as_completed(futures):
+            for accessionNumber, status, error, duration in future.result():
+                progress.record(accessionNumber, status, acceptanceDatetimes.get(accessionNumber), error=error, duration=round(duration, 3))
+                logResult(rssModelXbrl, accessionNumber, status, error, duration)
+
+def logResult(rssModelXbrl, accessionNumber, status, error, duration):
+    if status == FAILED:
+        rssModelXbrl.error("xpDB:rssItemFailed",
+                           _("RSS item %(accessionNumber)s not stored: %(error)s"),
+                           modelObject=rssModelXbrl, accessionNumber=accessionNumber, error=error)
+    else:
+        rssModelXbrl.info("info",
+                          _("RSS item %(accessionNumber)s %(status)s in %(duration)s secs"),
+                          modelObject=rssModelXbrl, accessionNumber=accessionNumber, status=status,
+                          duration="{:.2f}".format(duration))
+
+def ingestRssFeed(rssModelXbrl, dbConnection, processes=1, progressFile=None, validate=True, batchSize=1):
+    ''' ingest all filings of the RSS feed loaded in rssModelXbrl into the database of dbConnection (list of
+        connection parameters as for --store-to-XBRL-DB), batchSize filings per transaction, returning the
+        RssIngestionProgress.
+
+        After ingestion, the rssItems which were processed are marked skipRssItem so that a subsequent
+        validation of the feed does not load them again.
+    '''
+    dbType = dbConnection[6] if len(dbConnection) > 6 else None
+    if dbType not in POOLABLE_DB_TYPES:
+        rssModelXbrl.error("xpDB:rssIngestionDbType",
+                           _("RSS ingestion pipeline requires a semantic SQL database type (%(dbTypes)s), not %(dbType)s"),
+                           modelObject=rssModelXbrl, dbTypes=", ".join(sorted(POOLABLE_DB_TYPES)), dbType=dbType)
+        return None
+    if dbType == "mysqlSemantic":
+        batchSize = 1 # each filing's LOCK TABLES implicitly commits the transaction of prior filings
+    progress = RssIngestionProgress(progressFile)
+    rssItems = []
+    for rssItem in rssModelXbrl.modelDocument.rssItems:
+        if getattr(rssItem, "skipRssItem", False) or progress.isDone(rssItem.accessionNumber, rssItem.acceptanceDatetime):
+            rssItem.skipRssItem = True
+        else:
+            rssItems.append(rssItem)
+    startedAt = time.time()
+    rssModelXbrl.info("info",
+                      _("RSS ingestion of %(count)s filings (%(skipped)s previously stored) with %(processes)s processes"),
+                      modelObject=rssModelXbrl, count=len(rssItems),
+                      skipped=len(rssModelXbrl.modelDocument.rssItems) - len(rssItems), processes=processes)
+    if processes > 1 and len(rssItems) > 1:
+        ingestInProcessPool(rssModelXbrl, rssItems, dbConnection, progress, min(processes, len(rssItems)), validate, batchSize)
+    else:
+        ingestSerially(rssModelXbrl, rssItems, dbConnection, progress, validate, batchSize)
+    for rssItem in rssItems:
+        rssItem.skipRssItem = True
+    rssModelXbrl.profileStat(_("XbrlSqlDB: RSS feed ingestion"), time.time() - startedAt)
+    rssModelXbrl.info("info",
+                      _("RSS ingestion completed in %(duration)s secs: %(counts)s"),
+                      modelObject=rssModelXbrl, duration="{:.2f}".format(time.time() - startedAt),
+                      counts=", ".join("{}={}".format(k, v) for k, v in sorted(progress.counts().items())))
+    return progress
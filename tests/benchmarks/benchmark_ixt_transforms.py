@@ -0,0 +1,90 @@
+"""
+Micro-benchmark of inline XBRL transformation registry functions.
+
+Applies every function of every transformation registry to a set of representative date, number
+and text inputs, repeated as large inline filings repeat the same formats on the same strings,
+timing direct calls against FunctionIxt.transform (dispatch table and memo of prior results).
+
+    python -m tests.benchmarks.benchmark_ixt_transforms --repeat 20
+"""
+from __future__ import annotations
+
+import builtins
+import time
+from argparse import ArgumentParser
+
+if "_" not in builtins.__dict__:
+    builtins.__dict__["_"] = lambda s: s
+
+from arelle import FunctionIxt
+from arelle.ModelValue import QName
+
+SAMPLE_INPUTS = (
+    "12/31/2020", "31/12/2020", "31.12.2020", "12/31", "31/12", "2020-12-31",
+    "December 31, 2020", "31 December 2020", "Dec 31, 2020", "31 Dec 2020", "December 2020", "2020 December",
+    "31. prosince 2020", "31 dets 2020", "31 décembre 2020", "31. Dezember 2020", "2020. december 31.",
+    "1,234,567.89", "1.234.567,89", "1 234 567,89", "1'234'567.89", "1234567", "-", "—", "nil",
+    "twelve", "one hundred twenty-three", "no", "none", "5 dollars 30 cents", "12 ½", "令和2年12月31日",
+)
+
+
+def registryNamespaces():
+    ''' the namespace of each distinct registry, by registry name '''
+    namespaces = {}
+    for name, namespaceURI in sorted(FunctionIxt.ixtNamespaces.items()):
+        if id(FunctionIxt.ixtNamespaceFunctions[namespaceURI]) not in (id(FunctionIxt.ixtNamespaceFunctions[ns]) for ns in namespaces.values()):
+            namespaces[name] = namespaceURI
+    return namespaces
+
+
+def applyDirect(namespaceURI, repeat):
+    calls = 0
+    for localName, function in FunctionIxt.ixtNamespaceFunctions[namespaceURI].items():
+        for _i in range(repeat):
+            for value in SAMPLE_INPUTS:
+                try:
+                    function(value)
+                except Exception:
+                    pass
+                calls += 1
+    return calls
+
+
+def applyTransform(namespaceURI, repeat):
+    calls = 0
+    for localName in FunctionIxt.ixtNamespaceFunctions[namespaceURI].keys():
+        fmt = QName("ixt", namespaceURI, localName)
+        for _i in range(repeat):
+            for value in SAMPLE_INPUTS:
+                try:
+                    FunctionIxt.transform(fmt, value)
+                except Exception:
+                    pass
+                calls += 1
+    return calls
+
+
+def timed(function, *args):
+    startedAt = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - startedAt
+
+
+def main():
+    parser = ArgumentParser(description="Time inline XBRL transformation registry functions.")
+    parser.add_argument("--repeat", type=int, default=10, help="Applications of each function to each sample input.")
+    options = parser.parse_args()
+    applyDirect(FunctionIxt.ixtNamespaces["ixt v1"], 1) # compile deferred patterns outside of timings
+    print("{:<8} {:>9} {:>9} {:>12} {:>12} {:>8}".format("registry", "functions", "calls", "direct sec", "memo sec", "speedup"))
+    for name, namespaceURI in registryNamespaces().items():
+        FunctionIxt.transformResults.clear()
+        calls, directSecs = timed(applyDirect, namespaceURI, options.repeat)
+        _calls, memoSecs = timed(applyTransform, namespaceURI, options.repeat)
+        print("{:<8} {:>9} {:>9} {:>12.4f} {:>12.4f} {:>7.1f}x".format(
+            name, len(FunctionIxt.ixtNamespaceFunctions[namespaceURI]), calls, directSecs, memoSecs,
+            directSecs / memoSecs if memoSecs else float("inf")))
+    FunctionIxt.transformResults.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Benchmarks of core load and validation hot paths on synthetic workloads.
+
+Generates a synthetic DTS and xBRL-XML, inline XBRL and xBRL-CSV reports of the requested size
+(see synthetic.py), then times instance loading, XBRL validation, calculations, dimensional
+validation, formula evaluation, inline XBRL discovery, xBRL-CSV loading, OIM save and load, view
+generation and instance creation through the object model, each the best of --repeat runs.  Results are written to JSON and, with --baseline, compared to a
+prior results file, exiting with status 1 when any benchmark is slower than its baseline by more
+than --threshold.  Each load is checked to have loaded the workload's facts without errors, exiting
+with status 2 (and no results) when it did not, as timings of a broken load are not comparable.
+
+Standard taxonomy schemas are resolved offline from the minimal copies in webcache/ (the elements,
+types and arcroles the workload uses), so the benchmarks need no network access or prior caching.
+
+    python -m tests.benchmarks.run_benchmarks --concepts 200 --members 20 --output results.json
+    python -m tests.benchmarks.run_benchmarks --concepts 200 --members 20 --baseline results.json
+    python -m tests.benchmarks.run_benchmarks --facts 1000000 --dimensions 4 --benchmarks load,calculations
+"""
+from __future__ import annotations
+
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from dataclasses import asdict
+from collections.abc import Callable
+from typing import Any
+
+from arelle import PluginManager, ValidateXbrlCalcs, ViewFileConcepts, ViewFileFactList, ViewFileRelationshipSet, XbrlConst
+from arelle.Cntlr import Cntlr
+from arelle.ModelFormulaObject import FormulaOptions
+from arelle.ValidateXbrl import ValidateXbrl
+from arelle.ValidateXbrlCalcs import ValidateCalcsMode
+from arelle.Version import __version__
+from arelle.formula import ValidateFormula
+from tests.benchmarks.synthetic import Workload, addParameterArguments, buildInstance, generateWorkload, parametersFromArguments
+
+RESULTS_FORMAT = 1
+WEB_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "webcache")
+
+
+class WorkloadError(Exception):
+    """A benchmarked load did not load the workload's facts, or logged errors."""
+
+
+class BenchmarkRun:
+    """
+    .. class:: BenchmarkRun(cntlr, workload, outputDir)
+
+    The benchmarks of a workload, each run repeatedly against the model loaded by the load benchmark.
+    """
+    def __init__(self, cntlr: Cntlr, workload: Workload, outputDir: str) -> None:
+        self.cntlr = cntlr
+        self.modelManager = cntlr.modelManager
+        self.workload = workload
+        self.outputDir = outputDir
+        self.oimReport = os.path.join(workload.directory, "report.json")
+        self.modelXbrl: Any = None
+        self.val: Any = None
+        self.benchmarks: dict[str, Callable[[], Any]] = {
+            "load": self.load,
+            "validate": self.validate,
+            "calculations": self.calculations,
+            "dimensions": self.dimensions,
+            "formula": self.formula,
+            "ixbrlLoad": self.ixbrlLoad,
+            "csvLoad": self.csvLoad,
+            "oimSave": self.oimSave,
+            "oimLoad": self.oimLoad,
+            "views": self.views,
+            "createInstance": self.createInstance,
+        }
+
+    def load(self) -> Any:
+        if self.modelXbrl is not None:
+            self.modelXbrl.close()
+        self.modelXbrl = self.modelManager.load(self.workload.instance)
+        return self.modelXbrl
+
+    def validate(self) -> None:
+        hasFormulae = self.modelXbrl.hasFormulae
+        self.modelXbrl.hasFormulae = False # formula evaluation is its own benchmark
+        try:
+            self.val = ValidateXbrl(self.modelXbrl)
+            self.val.validate(self.modelXbrl)
+        finally:
+            self.modelXbrl.hasFormulae = hasFormulae
+
+    def calculations(self) -> None:
+        ValidateXbrlCalcs.validate(self.modelXbrl, ValidateCalcsMode.ROUND_TO_NEAREST)
+
+    def dimensions(self) -> None:
+        for cache in ("priItemElrHcRels", "dimensionMembersUsable", "dimensionMemberStates"):
+            self.val.__dict__.pop(cache, None)
+        self.val.checkFactsDimensions(self.modelXbrl.facts)
+        self.val.checkContextsDimensions(self.modelXbrl.contexts.values())
+
+    def formula(self) -> None:
+        ValidateFormula.validate(self.val)
+
+    def ixbrlLoad(self) -> Any:
+        return self.modelManager.load(self.workload.inline)
+
+    def csvLoad(self) -> Any:
+        return self.modelManager.load(self.workload.csv)
+
+    def oimSave(self) -> None:
+        for pluginMethod in PluginManager.pluginClassMethods("SaveLoadableOim.Save"):
+            pluginMethod(self.modelXbrl, self.oimReport) # beside the workload, as its taxonomy reference is relative
+
+    def oimLoad(self) -> Any:
+        return self.modelManager.load(self.oimReport)
+
+    def views(self) -> None:
+        ViewFileFactList.viewFacts(self.modelXbrl, os.path.join(self.outputDir, "facts.csv"))
+        ViewFileConcepts.viewConcepts(self.modelXbrl, os.path.join(self.outputDir, "concepts.csv"))
+        ViewFileRelationshipSet.viewRelationshipSet(self.modelXbrl, os.path.join(self.outputDir, "calculations.csv"),
+                                                    "Calculations", XbrlConst.summationItem)
+
+    def createInstance(self) -> None:
+        buildInstance(self.modelManager, self.workload.directory, self.workload.parameters)
+
+    def checkLoad(self, name: str, modelXbrl: Any) -> None:
+        ''' raises WorkloadError unless modelXbrl has the workload's facts and no errors, closes it unless it is
+            the model of the other benchmarks '''
+        try:
+            facts = len(modelXbrl.facts) if modelXbrl is not None and modelXbrl.modelDocument is not None else 0
+            errors = sorted(set(str(e) for e in (modelXbrl.errors if modelXbrl is not None else ["not loaded"])))
+        finally:
+            if modelXbrl is not None and modelXbrl is not self.modelXbrl:
+                modelXbrl.close()
+        if errors or facts != self.workload.parameters.facts:
+            raise WorkloadError("{} loaded {} of the workload's {} facts{}".format(
+                name, facts, self.workload.parameters.facts, ", with errors " + ", ".join(errors) if errors else ""))
+
+    def run(self, names: list[str], repeat: int) -> dict[str, dict[str, Any]]:
+        results = {}
+        for name in names:
+            seconds = []
+            for _i in range(repeat):
+                gc.collect()
+                startedAt = time.perf_counter()
+                loaded = self.benchmarks[name]()
+                seconds.append(time.perf_counter() - startedAt)
+                if name in ("load", "ixbrlLoad", "csvLoad", "oimLoad"):
+                    self.checkLoad(name, loaded)
+            results[name] = {"seconds": seconds, "best": min(seconds)}
+            print("{:<14} {:>10.4f} sec".format(name, results[name]["best"]), flush=True)
+        if self.modelXbrl is not None:
+            self.modelXbrl.close()
+        return results
+
+
+def compareToBaseline(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    ''' returns names of benchmarks slower than baseline by more than threshold (a fraction of baseline time) '''
+    if baseline.get("parameters") != results["parameters"]:
+        print("Baseline parameters {} differ from {}, not compared".format(baseline.get("parameters"), results["parameters"]))
+        return []
+    regressions = []
+    print("{:<14} {:>10} {:>10} {:>8}".format("benchmark", "baseline", "best", "change"))
+    for name, result in results["benchmarks"].items():
+        baselineResult = baseline.get("benchmarks", {}).get(name)
+        if baselineResult is None:
+            continue
+        change = result["best"] / baselineResult["best"] - 1.0 if baselineResult["best"] else 0.0
+        isRegression = change > threshold
+        if isRegression:
+            regressions.append(name)
+        print("{:<14} {:>10.4f} {:>10.4f} {:>+7.1%}{}".format(
+            name, baselineResult["best"], result["best"], change, "  REGRESSION" if isRegression else ""))
+    return regressions
+
+
+def main() -> int:
+    parser = ArgumentParser(description="Time core load and validation hot paths on a synthetic workload.")
+    addParameterArguments(parser)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each benchmark, the best is recorded.")
+    parser.add_argument("--benchmarks", help="Comma separated benchmarks to run (default all, load is always run first).")
+    parser.add_argument("--workDir", help="Directory for the generated workload and outputs (default a temporary directory).")
+    parser.add_argument("--output", help="File to save results JSON.")
+    parser.add_argument("--baseline", help="Results JSON to compare to.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown against baseline, as a fraction (default 0.25).")
+    parser.add_argument("--logFile", default="logToBuffer", help="File to log messages of the benchmarked operations to.")
+    args = parser.parse_args()
+
+    parameters = parametersFromArguments(args)
+    workDir = args.workDir or tempfile.mkdtemp(prefix="arelle-benchmarks-")
+    workload = generateWorkload(os.path.join(workDir, "workload"), parameters)
+    print("Workload of {} facts in {} contexts in {}".format(parameters.facts, parameters.contexts, workDir))
+
+    cntlr = Cntlr(logFileName=args.logFile)
+    cntlr.webCache.cacheDir = WEB_CACHE_DIR # standard taxonomy schemas
+    cntlr.webCache.workOffline = True
+    cntlr.modelManager.formulaOptions = FormulaOptions()
+    for plugin in ("loadFromOIM", "saveLoadableOIM"):
+        PluginManager.addPluginModule(plugin)
+    PluginManager.reset()
+    run = BenchmarkRun(cntlr, workload, workDir)
+    names = list(run.benchmarks.keys())
+    if args.benchmarks:
+        selected = set(args.benchmarks.split(","))
+        names = ["load"] + [name for name in names if name in selected and name != "load"]
+        if "dimensions" in selected or "formula" in selected:
+            names.insert(1, "validate") # provides the validation state they use
+            names = list(dict.fromkeys(names))
+    try:
+        benchmarkResults = run.run(names, args.repeat)
+    except WorkloadError as err:
+        print("Workload not loaded as generated, benchmarks not comparable: {}".format(err))
+        return 2
+    finally:
+        cntlr.close()
+    results = {
+        "format": RESULTS_FORMAT,
+        "arelleVersion": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": dict(asdict(parameters), facts=parameters.facts),
+        "benchmarks": benchmarkResults,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        if compareToBaseline(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,511 @@
+"""
+Synthetic DTS and instance workloads for benchmarks and scaling tests.
+
+Writes a taxonomy (schema, label, presentation, calculation, definition and formula linkbases) and
+xBRL-XML, inline XBRL and xBRL-CSV reports of its facts, sized by parameters.  Documents are
+written element by element (row by row for xBRL-CSV), so the generator holds only one context's
+facts at a time and 1M+ fact workloads do not need to be held in memory.  buildInstance creates the
+same xBRL-XML instance through the object model (ModelXbrl.createInstance, createContext, createUnit
+and createFact), as a reference for the streamed documents of small workloads.
+
+Item concepts are summed in groups of groupSize by total concepts, which are summed in turn by
+higher level totals for calcLevels levels (calculation linkbase).  All concepts are primary items of
+a closed hypercube of the given number of explicit dimensions, each of the given number of members
+and a default (definition linkbase), and value assertions check first level totals (formula
+linkbase).  Facts are reported for every concept in every context, contexts being the periods by
+each member index (a member of every dimension) and the dimension defaults, with duplicateRate of
+the facts reported a second time (consistent duplicates).
+
+Standard taxonomy schemas are referenced by their official locations, so they are resolved by the
+web cache (run_benchmarks.py points it at minimal copies in webcache/).
+
+    python -m tests.benchmarks.synthetic /tmp/workload --facts 1000000 --dimensions 4 --duplicateRate 0.01
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+import sys
+from argparse import ArgumentParser
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+NAMESPACE = "http://example.com/synthetic"
+PREFIX = "syn"
+ROLE = "http://example.com/synthetic/role/Main"
+SCHEMA_FILE = "synthetic.xsd"
+ENTITY_SCHEME = "http://example.com/entity"
+ENTITY_IDENTIFIER = "0000000001"
+FORMATS = ("xml", "inline", "csv")
+
+XBRLI_XSD = "http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd"
+LINK_XSD = "http://www.xbrl.org/2003/xbrl-linkbase-2003-12-31.xsd"
+XBRLDT_XSD = "http://www.xbrl.org/2005/xbrldt-2005.xsd"
+IXT_NAMESPACE = "http://www.xbrl.org/inlineXBRL/transformation/2020-02-12"
+ISO4217_NAMESPACE = "http://www.xbrl.org/2003/iso4217"
+
+
+@dataclass(frozen=True)
+class WorkloadParameters:
+    concepts: int = 100  # item concepts, summed in groups by total concepts
+    members: int = 10  # members of each explicit dimension
+    periods: int = 2  # duration periods (years)
+    assertions: int = 20  # value assertions of first level totals
+    dimensions: int = 1  # explicit dimensions of the hypercube
+    groupSize: int = 5  # items (or lower level totals) summed by each total
+    calcLevels: int = 1  # levels of totals in the calculation network
+    duplicateRate: float = 0.0  # fraction of facts reported a second time
+
+    @classmethod
+    def forFacts(cls, facts: int, **kwargs) -> WorkloadParameters:
+        ''' parameters with the item concepts giving about the requested number of facts '''
+        parameters = cls(**kwargs)
+        factsPerItem = parameters.contexts * (1.0 + parameters.duplicateRate) * (
+            1.0 + sum(parameters.groupSize ** -level for level in range(1, parameters.calcLevels + 1)))
+        return replace(parameters, concepts=max(1, round(facts / factsPerItem)))
+
+    @property
+    def totals(self) -> tuple[int, ...]:
+        ''' number of total concepts of each calculation level '''
+        counts: list[int] = []
+        summed = self.concepts
+        while len(counts) < self.calcLevels and (summed > 1 or not counts):
+            summed = (summed + self.groupSize - 1) // self.groupSize
+            counts.append(summed)
+        return tuple(counts)
+
+    @property
+    def groups(self) -> int:
+        return self.totals[0]
+
+    @property
+    def contexts(self) -> int:
+        return self.periods * (self.members + 1)
+
+    @property
+    def uniqueFacts(self) -> int:
+        return (self.concepts + sum(self.totals)) * self.contexts
+
+    @property
+    def facts(self) -> int:
+        return self.uniqueFacts + int(self.uniqueFacts * self.duplicateRate)
+
+
+@dataclass(frozen=True)
+class Workload:
+    parameters: WorkloadParameters
+    directory: str
+    schema: str
+    instance: str | None
+    inline: str | None
+    csv: str | None
+
+
+def itemName(i: int) -> str:
+    return "Item{}".format(i)
+
+
+def totalName(level: int, g: int) -> str:
+    return "Total{}".format(g) if level == 1 else "Level{}Total{}".format(level, g)
+
+
+def dimensionName(d: int) -> str:
+    return "Dimension{}".format(d)
+
+
+def domainName(d: int) -> str:
+    return "Domain{}".format(d)
+
+
+def memberName(d: int, m: int) -> str:
+    return "Member{}_{}".format(d, m)
+
+
+def summedRange(parameters: WorkloadParameters, level: int, g: int) -> range:
+    ''' indexes of items (level 1) or lower level totals summed by total g of level '''
+    lowerCount = parameters.concepts if level == 1 else parameters.totals[level - 2]
+    return range(g * parameters.groupSize, min((g + 1) * parameters.groupSize, lowerCount))
+
+
+def summedNames(parameters: WorkloadParameters, level: int, g: int) -> list[str]:
+    if level == 1:
+        return [itemName(i) for i in summedRange(parameters, level, g)]
+    return [totalName(level - 1, i) for i in summedRange(parameters, level, g)]
+
+
+def groupItems(parameters: WorkloadParameters, g: int) -> range:
+    return summedRange(parameters, 1, g)
+
+
+def allConceptNames(parameters: WorkloadParameters):
+    ''' item and total concept names, in fact order '''
+    for g in range(parameters.groups):
+        for i in groupItems(parameters, g):
+            yield itemName(i)
+        yield totalName(1, g)
+    for level, count in enumerate(parameters.totals[1:], start=2):
+        for g in range(count):
+            yield totalName(level, g)
+
+
+def contextIds(parameters: WorkloadParameters):
+    ''' yields (context id, period index, member index or None for the dimension defaults) '''
+    for p in range(parameters.periods):
+        yield "p{}".format(p), p, None
+        for m in range(parameters.members):
+            yield "p{}m{}".format(p, m), p, m
+
+
+def contextMembers(parameters: WorkloadParameters, m: int | None) -> list[tuple[str, str]]:
+    ''' (dimension name, member name) of a context's member index, spreading members across dimensions '''
+    if m is None:
+        return []
+    return [(dimensionName(d), memberName(d, (m + d) % parameters.members)) for d in range(parameters.dimensions)]
+
+
+def factValues(parameters: WorkloadParameters, p: int, m: int | None):
+    ''' yields (concept name, value) of facts of a context, totals consistent with what they sum '''
+    lowerTotals = []
+    for g in range(parameters.groups):
+        total = 0
+        for i in groupItems(parameters, g):
+            value = (i + 1) * ((m if m is not None else parameters.members) + 1) * (p + 1)
+            total += value
+            yield itemName(i), value
+        lowerTotals.append(total)
+        yield totalName(1, g), total
+    for level, count in enumerate(parameters.totals[1:], start=2):
+        levelTotals = [sum(lowerTotals[i] for i in summedRange(parameters, level, g)) for g in range(count)]
+        for g, total in enumerate(levelTotals):
+            yield totalName(level, g), total
+        lowerTotals = levelTotals
+
+
+def reportedFacts(parameters: WorkloadParameters):
+    ''' yields (context id, period index, member index, concept name, value) of each reported fact, including duplicates '''
+    n = 0
+    for contextId, p, m in contextIds(parameters):
+        for name, value in factValues(parameters, p, m):
+            yield contextId, p, m, name, value
+            n += 1
+            if int(n * parameters.duplicateRate) > int((n - 1) * parameters.duplicateRate):
+                yield contextId, p, m, name, value
+
+
+def writeLinkbase(path: str, body, namespaces: str = "", schemaLocations: str = ""):
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink" '
+                 'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" {} '
+                 'xsi:schemaLocation="http://www.xbrl.org/2003/linkbase {}{}">\n'.format(namespaces, LINK_XSD, schemaLocations))
+        for line in body():
+            fh.write(line)
+        fh.write('</link:linkbase>\n')
+
+
+def loc(name: str, label: str | None = None) -> str:
+    return '<link:loc xlink:type="locator" xlink:href="{0}#{1}_{2}" xlink:label="{3}"/>\n'.format(
+        SCHEMA_FILE, PREFIX, name, label or name)
+
+
+def writeSchema(directory: str, parameters: WorkloadParameters) -> str:
+    path = os.path.join(directory, SCHEMA_FILE)
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance" '
+                 'xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink" '
+                 'xmlns:xbrldt="http://xbrl.org/2005/xbrldt" xmlns:{0}="{1}" targetNamespace="{1}" '
+                 'elementFormDefault="qualified" attributeFormDefault="unqualified">\n'
+                 '<xs:annotation><xs:appinfo>\n'.format(PREFIX, NAMESPACE))
+        for linkbase, role in (("lab", "label"), ("pre", "presentation"), ("cal", "calculation"), ("def", "definition"), ("for", None)):
+            fh.write('<link:linkbaseRef xlink:type="simple" xlink:href="synthetic-{}.xml" {}'
+                     'xlink:arcrole="http://www.w3.org/1999/xlink/properties/linkbase"/>\n'.format(
+                         linkbase, 'xlink:role="http://www.xbrl.org/2003/role/{}LinkbaseRef" '.format(role) if role else ""))
+        fh.write('<link:roleType roleURI="{}" id="Main"><link:definition>Main</link:definition>\n'
+                 '<link:usedOn>link:presentationLink</link:usedOn><link:usedOn>link:calculationLink</link:usedOn>'
+                 '<link:usedOn>link:definitionLink</link:usedOn></link:roleType>\n'
+                 '</xs:appinfo></xs:annotation>\n'
+                 '<xs:import namespace="http://www.xbrl.org/2003/instance" schemaLocation="{}"/>\n'
+                 '<xs:import namespace="http://xbrl.org/2005/xbrldt" schemaLocation="{}"/>\n'.format(ROLE, XBRLI_XSD, XBRLDT_XSD))
+        element = ('<xs:element name="{0}" id="{1}_{0}" type="{2}" substitutionGroup="{3}" '
+                   'xbrli:periodType="duration" abstract="{4}" nillable="true"/>\n')
+        for name in allConceptNames(parameters):
+            fh.write(element.format(name, PREFIX, "xbrli:monetaryItemType", "xbrli:item", "false"))
+        fh.write(element.format("LineItems", PREFIX, "xbrli:stringItemType", "xbrli:item", "true"))
+        fh.write(element.format("Table", PREFIX, "xbrli:stringItemType", "xbrldt:hypercubeItem", "true"))
+        for d in range(parameters.dimensions):
+            fh.write(element.format(dimensionName(d), PREFIX, "xbrli:stringItemType", "xbrldt:dimensionItem", "true"))
+            fh.write(element.format(domainName(d), PREFIX, "xbrli:stringItemType", "xbrli:item", "true"))
+            for m in range(parameters.members):
+                fh.write(element.format(memberName(d, m), PREFIX, "xbrli:stringItemType", "xbrli:item", "true"))
+        fh.write('</xs:schema>\n')
+    return path
+
+
+def writeLinkbases(directory: str, parameters: WorkloadParameters):
+    def labels():
+        yield '<link:labelLink xlink:type="extended" xlink:role="http://www.xbrl.org/2003/role/link">\n'
+        for name in allConceptNames(parameters):
+            yield loc(name)
+            yield ('<link:label xlink:type="resource" xlink:label="{0}_lbl" xlink:role="http://www.xbrl.org/2003/role/label" '
+                   'xml:lang="en">{0} label</link:label>\n'.format(name))
+            yield ('<link:labelArc xlink:type="arc" xlink:arcrole="http://www.xbrl.org/2003/arcrole/concept-label" '
+                   'xlink:from="{0}" xlink:to="{0}_lbl"/>\n'.format(name))
+        yield '</link:labelLink>\n'
+
+    def presentation():
+        yield '<link:roleRef roleURI="{0}" xlink:type="simple" xlink:href="{1}#Main"/>\n'.format(ROLE, SCHEMA_FILE)
+        yield '<link:presentationLink xlink:type="extended" xlink:role="{}">\n'.format(ROLE)
+        yield loc("LineItems")
+        for order, name in enumerate(allConceptNames(parameters), start=1):
+            yield loc(name)
+            yield ('<link:presentationArc xlink:type="arc" xlink:arcrole="http://www.xbrl.org/2003/arcrole/parent-child" '
+                   'xlink:from="LineItems" xlink:to="{}" order="{}"/>\n'.format(name, order))
+        yield '</link:presentationLink>\n'
+
+    def calculation():
+        yield '<link:roleRef roleURI="{0}" xlink:type="simple" xlink:href="{1}#Main"/>\n'.format(ROLE, SCHEMA_FILE)
+        yield '<link:calculationLink xlink:type="extended" xlink:role="{}">\n'.format(ROLE)
+        for name in allConceptNames(parameters): # one locator each, as totals are both summing and summed
+            yield loc(name)
+        for level, count in enumerate(parameters.totals, start=1):
+            for g in range(count):
+                for order, name in enumerate(summedNames(parameters, level, g), start=1):
+                    yield ('<link:calculationArc xlink:type="arc" xlink:arcrole="http://www.xbrl.org/2003/arcrole/summation-item" '
+                           'xlink:from="{}" xlink:to="{}" weight="1" order="{}"/>\n'.format(totalName(level, g), name, order))
+        yield '</link:calculationLink>\n'
+
+    def definition():
+        yield '<link:roleRef roleURI="{0}" xlink:type="simple" xlink:href="{1}#Main"/>\n'.format(ROLE, SCHEMA_FILE)
+        for arcrole in ("all", "hypercube-dimension", "dimension-domain", "domain-member", "dimension-default"):
+            yield ('<link:arcroleRef arcroleURI="http://xbrl.org/int/dim/arcrole/{0}" xlink:type="simple" '
+                   'xlink:href="{1}#{0}"/>\n'.format(arcrole, XBRLDT_XSD))
+        yield '<link:definitionLink xlink:type="extended" xlink:role="{}">\n'.format(ROLE)
+        arc = ('<link:definitionArc xlink:type="arc" xlink:arcrole="http://xbrl.org/int/dim/arcrole/{}" '
+               'xlink:from="{}" xlink:to="{}" order="{}"{}/>\n')
+        yield loc("LineItems")
+        yield loc("Table")
+        yield arc.format("all", "LineItems", "Table", 1, ' xbrldt:contextElement="segment" xbrldt:closed="true"')
+        for d in range(parameters.dimensions):
+            dimension, domain = dimensionName(d), domainName(d)
+            yield loc(dimension)
+            yield loc(domain)
+            yield loc(domain, domain + "Default") # arcs from and to the same labels would be duplicates
+            yield arc.format("hypercube-dimension", "Table", dimension, d + 1, "")
+            yield arc.format("dimension-domain", dimension, domain, 1, "")
+            yield arc.format("dimension-default", dimension, domain + "Default", 1, "")
+            for m in range(parameters.members):
+                yield loc(memberName(d, m))
+                yield arc.format("domain-member", domain, memberName(d, m), m + 1, "")
+        for order, name in enumerate(allConceptNames(parameters), start=1):
+            yield loc(name)
+            yield arc.format("domain-member", "LineItems", name, order, "")
+        yield '</link:definitionLink>\n'
+
+    def formula():
+        yield '<generic:link xlink:type="extended" xlink:role="http://www.xbrl.org/2003/role/link">\n'
+        for a in range(parameters.assertions):
+            g = a % parameters.groups
+            items = list(groupItems(parameters, g))
+            yield ('<va:valueAssertion xlink:type="resource" xlink:label="va{0}" id="va{0}" aspectModel="dimensional" '
+                   'implicitFiltering="true" test="{1}"/>\n'.format(
+                       a, escape("$total eq " + " + ".join("$i{}".format(i) for i in items))))
+            for varName, conceptName in [("total", totalName(1, g))] + [("i{}".format(i), itemName(i)) for i in items]:
+                yield ('<variable:factVariable xlink:type="resource" xlink:label="va{0}_{1}" bindAsSequence="false"/>\n'
+                       '<cf:conceptName xlink:type="resource" xlink:label="va{0}_{1}_f"><cf:concept><cf:qname>{2}:{3}</cf:qname>'
+                       '</cf:concept></cf:conceptName>\n'
+                       '<variable:variableArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-set" '
+                       'xlink:from="va{0}" xlink:to="va{0}_{1}" name="{1}"/>\n'
+                       '<variable:variableFilterArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-filter" '
+                       'xlink:from="va{0}_{1}" xlink:to="va{0}_{1}_f" complement="false" cover="true"/>\n'.format(
+                           a, varName, PREFIX, conceptName))
+        yield '</generic:link>\n'
+
+    writeLinkbase(os.path.join(directory, "synthetic-lab.xml"), labels)
+    writeLinkbase(os.path.join(directory, "synthetic-pre.xml"), presentation)
+    writeLinkbase(os.path.join(directory, "synthetic-cal.xml"), calculation)
+    writeLinkbase(os.path.join(directory, "synthetic-def.xml"), definition,
+                  'xmlns:xbrldt="http://xbrl.org/2005/xbrldt"', " http://xbrl.org/2005/xbrldt " + XBRLDT_XSD)
+    writeLinkbase(os.path.join(directory, "synthetic-for.xml"), formula,
+                  'xmlns:generic="http://xbrl.org/2008/generic" xmlns:va="http://xbrl.org/2008/assertion/value" '
+                  'xmlns:variable="http://xbrl.org/2008/variable" xmlns:cf="http://xbrl.org/2008/filter/concept" '
+                  'xmlns:{}="{}"'.format(PREFIX, NAMESPACE),
+                  " http://xbrl.org/2008/generic http://www.xbrl.org/2008/generic-link.xsd"
+                  " http://xbrl.org/2008/assertion/value http://www.xbrl.org/2008/value-assertion.xsd"
+                  " http://xbrl.org/2008/variable http://www.xbrl.org/2008/variable.xsd"
+                  " http://xbrl.org/2008/filter/concept http://www.xbrl.org/2008/concept-filter.xsd")
+
+
+def contextElement(parameters: WorkloadParameters, contextId: str, p: int, m: int | None, prefix: str = "xbrli") -> str:
+    segment = ""
+    if m is not None:
+        segment = '<{0}:segment>{1}</{0}:segment>'.format(prefix, "".join(
+            '<xbrldi:explicitMember dimension="{0}:{1}">{0}:{2}</xbrldi:explicitMember>'.format(PREFIX, dimension, member)
+            for dimension, member in contextMembers(parameters, m)))
+    return ('<{0}:context id="{1}"><{0}:entity><{0}:identifier scheme="{2}">{3}</{0}:identifier>'
+            '{4}</{0}:entity><{0}:period><{0}:startDate>{5}-01-01</{0}:startDate><{0}:endDate>{5}-12-31</{0}:endDate>'
+            '</{0}:period></{0}:context>\n'.format(prefix, contextId, ENTITY_SCHEME, ENTITY_IDENTIFIER, segment, 2000 + p))
+
+
+def writeInstance(directory: str, parameters: WorkloadParameters) -> str:
+    path = os.path.join(directory, "instance.xml")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase" '
+                 'xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:xbrldi="http://xbrl.org/2006/xbrldi" '
+                 'xmlns:iso4217="{}" xmlns:{}="{}">\n'
+                 '<link:schemaRef xlink:type="simple" xlink:href="{}"/>\n'.format(ISO4217_NAMESPACE, PREFIX, NAMESPACE, SCHEMA_FILE))
+        for contextId, p, m in contextIds(parameters):
+            fh.write(contextElement(parameters, contextId, p, m))
+        fh.write('<xbrli:unit id="USD"><xbrli:measure>iso4217:USD</xbrli:measure></xbrli:unit>\n')
+        for contextId, p, m, name, value in reportedFacts(parameters):
+            fh.write('<{0}:{1} contextRef="{2}" unitRef="USD" decimals="0">{3}</{0}:{1}>\n'.format(PREFIX, name, contextId, value))
+        fh.write('</xbrli:xbrl>\n')
+    return path
+
+
+def writeInline(directory: str, parameters: WorkloadParameters) -> str:
+    path = os.path.join(directory, "inline.htm")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:ix="http://www.xbrl.org/2013/inlineXBRL" '
+                 'xmlns:ixt="{}" xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase" '
+                 'xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:xbrldi="http://xbrl.org/2006/xbrldi" '
+                 'xmlns:iso4217="{}" xmlns:{}="{}">\n'
+                 '<head><title>Synthetic</title></head><body>\n'
+                 '<div style="display:none"><ix:header><ix:references>'
+                 '<link:schemaRef xlink:type="simple" xlink:href="{}"/></ix:references><ix:resources>\n'.format(
+                     IXT_NAMESPACE, ISO4217_NAMESPACE, PREFIX, NAMESPACE, SCHEMA_FILE))
+        for contextId, p, m in contextIds(parameters):
+            fh.write(contextElement(parameters, contextId, p, m))
+        fh.write('<xbrli:unit id="USD"><xbrli:measure>iso4217:USD</xbrli:measure></xbrli:unit>\n'
+                 '</ix:resources></ix:header></div>\n')
+        tableContextId = None
+        for contextId, p, m, name, value in reportedFacts(parameters):
+            if contextId != tableContextId: # a table of each context's facts
+                fh.write('{}<table>\n'.format('</table>\n' if tableContextId else ''))
+                tableContextId = contextId
+            fh.write('<tr><td>{1}</td><td><ix:nonFraction name="{0}:{1}" contextRef="{2}" unitRef="USD" decimals="0" '
+                     'format="ixt:num-dot-decimal">{3:,}</ix:nonFraction></td></tr>\n'.format(PREFIX, name, contextId, value))
+        if tableContextId:
+            fh.write('</table>\n')
+        fh.write('</body></html>\n')
+    return path
+
+
+def writeCsv(directory: str, parameters: WorkloadParameters) -> str:
+    ''' writes the xBRL-CSV metadata and facts table, returning the metadata file path '''
+    path = os.path.join(directory, "report-csv.json")
+    dimensionColumns = ["{}_{}".format(PREFIX, dimensionName(d)) for d in range(parameters.dimensions)]
+    tableDimensions = {"concept": "$concept", "entity": "ent:" + ENTITY_IDENTIFIER, "period": "$period", "unit": "iso4217:USD"}
+    for d, column in enumerate(dimensionColumns):
+        tableDimensions["{}:{}".format(PREFIX, dimensionName(d))] = "$" + column
+    metadata = {
+        "documentInfo": {
+            "documentType": "https://xbrl.org/2021/xbrl-csv",
+            "namespaces": {PREFIX: NAMESPACE, "ent": ENTITY_SCHEME, "iso4217": ISO4217_NAMESPACE},
+            "taxonomy": [SCHEMA_FILE],
+        },
+        "tableTemplates": {
+            "facts": {
+                "dimensions": tableDimensions,
+                "columns": dict([("concept", {}), ("period", {})] + [(column, {}) for column in dimensionColumns] +
+                                [("value", {"dimensions": {}, "decimals": 0})]),
+            },
+        },
+        "tables": {"facts": {"template": "facts", "url": "report-facts.csv"}},
+    }
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(metadata, fh, indent=2)
+    with open(os.path.join(directory, "report-facts.csv"), "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["concept", "period"] + dimensionColumns + ["value"])
+        rowContextId = None
+        for contextId, p, m, name, value in reportedFacts(parameters):
+            if contextId != rowContextId:
+                rowContextId = contextId
+                period = "{}-01-01T00:00:00/{}-01-01T00:00:00".format(2000 + p, 2001 + p)
+                members = ["{}:{}".format(PREFIX, member) for _dimension, member in contextMembers(parameters, m)
+                           ] or [""] * parameters.dimensions # empty cells for dimension defaults
+            writer.writerow(["{}:{}".format(PREFIX, name), period] + members + [value])
+    return path
+
+
+def buildInstance(modelManager, directory: str, parameters: WorkloadParameters) -> str:
+    '''
+    Creates the xBRL-XML instance of a generated taxonomy through the object model, which holds the
+    whole instance in memory (unlike the streamed writers), for cross checking small workloads.
+    '''
+    from arelle import XbrlConst
+    from arelle.ModelValue import qname
+    from arelle.PrototypeInstanceObject import DimValuePrototype
+    path = os.path.join(directory, "instance-model.xml")
+    modelXbrl = modelManager.load(os.path.join(directory, SCHEMA_FILE))
+    try:
+        modelXbrl.createInstance(path)
+        modelXbrl.createUnit([qname(XbrlConst.iso4217, "iso4217:USD")], [], id="USD")
+        for contextId, p, m in contextIds(parameters):
+            qnameDims = {}
+            for dimension, member in contextMembers(parameters, m):
+                dimQname = qname(NAMESPACE, "{}:{}".format(PREFIX, dimension))
+                qnameDims[dimQname] = DimValuePrototype(modelXbrl, None, dimQname, qname(NAMESPACE, "{}:{}".format(PREFIX, member)), "segment")
+            modelXbrl.createContext(ENTITY_SCHEME, ENTITY_IDENTIFIER, "duration", datetime(2000 + p, 1, 1), datetime(2001 + p, 1, 1),
+                                    None, qnameDims, [], [], id=contextId)
+        for contextId, p, m, name, value in reportedFacts(parameters):
+            modelXbrl.createFact(qname(NAMESPACE, "{}:{}".format(PREFIX, name)),
+                                 attributes=(("contextRef", contextId), ("unitRef", "USD"), ("decimals", "0")), text=str(value))
+        modelXbrl.saveInstance(overrideFilepath=path)
+    finally:
+        modelXbrl.close()
+    return path
+
+
+def generateWorkload(directory: str, parameters: WorkloadParameters, formats=FORMATS) -> Workload:
+    os.makedirs(directory, exist_ok=True)
+    schema = writeSchema(directory, parameters)
+    writeLinkbases(directory, parameters)
+    return Workload(parameters, directory, schema,
+                    writeInstance(directory, parameters) if "xml" in formats else None,
+                    writeInline(directory, parameters) if "inline" in formats else None,
+                    writeCsv(directory, parameters) if "csv" in formats else None)
+
+
+def addParameterArguments(parser: ArgumentParser) -> None:
+    ''' adds arguments of WorkloadParameters, and --facts to choose the item concepts for a number of facts '''
+    defaults = WorkloadParameters()
+    parser.add_argument("--facts", type=int, help="Approximate number of facts (chooses --concepts).")
+    parser.add_argument("--concepts", type=int, default=defaults.concepts, help="Item concepts (summed in groups by total concepts).")
+    parser.add_argument("--members", type=int, default=defaults.members, help="Members of each explicit dimension.")
+    parser.add_argument("--periods", type=int, default=defaults.periods, help="Duration periods.")
+    parser.add_argument("--assertions", type=int, default=defaults.assertions, help="Value assertions.")
+    parser.add_argument("--dimensions", type=int, default=defaults.dimensions, help="Explicit dimensions of the hypercube.")
+    parser.add_argument("--groupSize", type=int, default=defaults.groupSize, help="Items or lower level totals summed by each total.")
+    parser.add_argument("--calcLevels", type=int, default=defaults.calcLevels, help="Levels of totals in the calculation network.")
+    parser.add_argument("--duplicateRate", type=float, default=defaults.duplicateRate, help="Fraction of facts reported twice.")
+
+
+def parametersFromArguments(args) -> WorkloadParameters:
+    kwargs = {name: getattr(args, name) for name in asdict(WorkloadParameters())}
+    if args.facts:
+        del kwargs["concepts"]
+        return WorkloadParameters.forFacts(args.facts, **kwargs)
+    return WorkloadParameters(**kwargs)
+
+
+def main() -> int:
+    parser = ArgumentParser(description="Generate a synthetic taxonomy and reports of its facts.")
+    parser.add_argument("directory", help="Directory to write the workload to.")
+    addParameterArguments(parser)
+    parser.add_argument("--formats", default=",".join(FORMATS), help="Comma separated report formats (xml, inline, csv).")
+    args = parser.parse_args()
+    parameters = parametersFromArguments(args)
+    workload = generateWorkload(args.directory, parameters, args.formats.split(","))
+    print("Workload of {} facts ({} unique) of {} concepts in {} contexts in {}".format(
+        parameters.facts, parameters.uniqueFacts, parameters.concepts + sum(parameters.totals), parameters.contexts, workload.directory))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
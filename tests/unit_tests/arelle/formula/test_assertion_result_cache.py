@@ -0,0 +1,170 @@
+import logging
+from unittest.mock import Mock, patch
+
+import pytest
+
+from arelle.Cntlr import Cntlr
+from arelle.ModelFormulaObject import FormulaOptions
+from arelle.formula.AssertionResultCache import AssertionResultCache
+
+
+def _resultCache(cacheFile):
+    with patch.object(AssertionResultCache, "computeEnvironmentHash", return_value="env"):
+        return AssertionResultCache(Mock(), cacheFile)
+
+
+class TestAssertionResultCache:
+    def test_stored_results_are_reused_by_next_run(self, tmp_path):
+        cacheFile = str(tmp_path / "cache.json")
+        records = [(logging.ERROR, "%(formulaMessage)s", {"formulaMessage": "a=1"}, {"messageCode": "message:va1", "refs": [{"href": "i.xml#f1", "sourceLine": 6}]})]
+        resultCache = _resultCache(cacheFile)
+        assert resultCache.lookup("k1") is None
+        resultCache.store("k1", (0, 1, 0, 0, 1), records)
+        resultCache.save()
+
+        rerun = _resultCache(cacheFile)
+
+        assert rerun.lookup("k1") == ((0, 1, 0, 0, 1), records)
+        assert rerun.lookup("k2") is None
+        assert (rerun.hits, rerun.misses) == (1, 1)
+
+    def test_results_not_exactly_representable_are_not_stored(self, tmp_path):
+        cacheFile = str(tmp_path / "cache.json")
+        resultCache = _resultCache(cacheFile)
+        resultCache.store("k1", (1, 0, 0, 0, 0), [(logging.INFO, "%(value)s", {"value": (1, 2)}, {"messageCode": "m"})])
+        resultCache.save()
+
+        assert _resultCache(cacheFile).lookup("k1") is None
+
+    def test_unused_entries_are_pruned(self, tmp_path):
+        cacheFile = str(tmp_path / "cache.json")
+        resultCache = _resultCache(cacheFile)
+        resultCache.store("k1", (1, 0, 0, 0, 0), [])
+        resultCache.store("k2", (1, 0, 0, 0, 0), [])
+        resultCache.save()
+        rerun = _resultCache(cacheFile)
+        rerun.lookup("k2")
+        rerun.save()
+
+        assert list(_resultCache(cacheFile).entries) == ["k2"]
+
+
+XBRLI_XSD = """<schema xmlns="http://www.w3.org/2001/XMLSchema" targetNamespace="http://www.xbrl.org/2003/instance">
+<element name="item" abstract="true"/>
+<element name="tuple" abstract="true"/>
+</schema>"""
+
+SCHEMA = """<schema xmlns="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance"
+xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink" targetNamespace="http://example.com/e">
+<annotation><appinfo><link:linkbaseRef xlink:type="simple" xlink:href="formula.xml"
+xlink:arcrole="http://www.w3.org/1999/xlink/properties/linkbase"/></appinfo></annotation>
+<import namespace="http://www.xbrl.org/2003/instance" schemaLocation="xbrli.xsd"/>
+<element name="Revenue" id="e_Revenue" type="decimal" substitutionGroup="xbrli:item" xbrli:periodType="duration"/>
+<element name="Cost" id="e_Cost" type="decimal" substitutionGroup="xbrli:item" xbrli:periodType="duration"/>{elements}
+</schema>"""
+
+FORMULA = """<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink"
+xmlns:generic="http://xbrl.org/2008/generic" xmlns:va="http://xbrl.org/2008/assertion/value"
+xmlns:variable="http://xbrl.org/2008/variable" xmlns:cf="http://xbrl.org/2008/filter/concept" xmlns:e="http://example.com/e">
+<generic:link xlink:type="extended" xlink:role="http://www.xbrl.org/2003/role/link">{padding}
+<va:valueAssertion xlink:type="resource" xlink:label="va1" id="va1" test="{test}" aspectModel="dimensional" implicitFiltering="true"/>
+<variable:factVariable xlink:type="resource" xlink:label="r" bindAsSequence="false"/>
+<variable:variableArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-set" xlink:from="va1" xlink:to="r" name="r"/>
+<cf:conceptName xlink:type="resource" xlink:label="f"><cf:concept><cf:qname>e:Revenue</cf:qname></cf:concept></cf:conceptName>
+<variable:variableFilterArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-filter"
+xlink:from="r" xlink:to="f" complement="false" cover="true"/>
+</generic:link>
+</link:linkbase>"""
+
+INSTANCE = """<xbrl xmlns="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase"
+xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:e="http://example.com/e" xmlns:iso4217="http://www.xbrl.org/2003/iso4217">
+<link:schemaRef xlink:type="simple" xlink:href="e.xsd"/>{padding}
+<context id="c"><entity><identifier scheme="http://example.com">1</identifier></entity>
+<period><startDate>2023-01-01</startDate><endDate>2023-12-31</endDate></period></context>
+<unit id="u"><measure>iso4217:USD</measure></unit>
+<e:Cost contextRef="c" unitRef="u" decimals="0">{cost}</e:Cost>
+<e:Revenue contextRef="c" unitRef="u" decimals="0">{revenue}</e:Revenue>
+</xbrl>"""
+
+UNRELATED_LINES = "\n<!-- unrelated comment -->\n\n"
+
+
+class TestAssertionResultCacheKeys:
+
+    @pytest.fixture
+    def filing(self, tmp_path):
+        cntlr = Cntlr(logFileName="logToBuffer")
+        cntlr.webCache.workOffline = True
+        models = []
+
+        def write(name, text):
+            path = tmp_path / name
+            if not path.exists() or path.read_text() != text:  # unchanged DTS documents keep their modification time
+                path.write_text(text)
+
+        def load(test="$r gt 0", elements="", formulaPadding="", instancePadding="", cost=1, revenue=100):
+            write("xbrli.xsd", XBRLI_XSD)
+            write("e.xsd", SCHEMA.format(elements=elements))
+            write("formula.xml", FORMULA.format(test=test, padding=formulaPadding))
+            write("i.xml", INSTANCE.format(padding=instancePadding, cost=cost, revenue=revenue))
+            modelXbrl = cntlr.modelManager.load(str(tmp_path / "i.xml"))
+            assert not modelXbrl.errors
+            models.append(modelXbrl)
+            resultCache = AssertionResultCache(Mock(modelXbrl=modelXbrl, formulaOptions=FormulaOptions(), inScopeVars={}),
+                                               str(tmp_path / "cache.json"))
+            modelVariableSet, = modelXbrl.modelVariableSets
+            return resultCache, modelVariableSet
+
+        yield load
+        for modelXbrl in models:
+            modelXbrl.close()
+        cntlr.close()
+
+    def test_inserted_lines_are_a_hit_and_refs_are_remapped(self, filing):
+        resultCache, modelVariableSet = filing()
+        modelXbrl = resultCache.modelXbrl
+        key = resultCache.key(modelVariableSet)
+        revenue, = [fact for fact in modelXbrl.factsInInstance if fact.qname.localName == "Revenue"]
+        refs = modelXbrl.logArguments("message:va1", "Revenue", {"modelObject": revenue})[2]["refs"]
+        resultCache.store(key, (0, 1, 0, 0, 1), [(logging.ERROR, "Revenue", None, {"messageCode": "message:va1", "refs": refs})])
+        resultCache.save()
+
+        rerun, modelVariableSet = filing(instancePadding=UNRELATED_LINES)
+
+        assert rerun.key(modelVariableSet) == key
+        counters, records = rerun.lookup(key)
+        revenue, = [fact for fact in rerun.modelXbrl.factsInInstance if fact.qname.localName == "Revenue"]
+        replayedRef, = records[0][3]["refs"]
+        assert counters == (0, 1, 0, 0, 1)
+        assert replayedRef["sourceLine"] == revenue.sourceline == refs[0]["sourceLine"] + UNRELATED_LINES.count("\n")
+        assert replayedRef["href"] == refs[0]["href"] and replayedRef["objectId"] == revenue.objectId()
+
+    def test_changed_fact_value_is_a_miss(self, filing):
+        resultCache, modelVariableSet = filing()
+        key = resultCache.key(modelVariableSet)
+
+        otherConcept, modelVariableSet = filing(cost=2)
+        assert otherConcept.key(modelVariableSet) == key  # depends only on Revenue facts
+        changed, modelVariableSet = filing(revenue=200)
+        assert changed.key(modelVariableSet) != key
+
+    def test_changed_definition_is_a_miss(self, filing):
+        resultCache, modelVariableSet = filing()
+        definitionHash = resultCache.definition(modelVariableSet)[0]
+        key = resultCache.key(modelVariableSet)
+
+        moved, modelVariableSet = filing(formulaPadding=UNRELATED_LINES)
+        assert moved.definition(modelVariableSet)[0] == definitionHash
+        changed, modelVariableSet = filing(test="$r gt 1")
+        assert changed.definition(modelVariableSet)[0] != definitionHash
+        assert changed.key(modelVariableSet) != key
+
+    def test_changed_dts_is_a_miss(self, filing):
+        resultCache, modelVariableSet = filing()
+        key = resultCache.key(modelVariableSet)
+
+        changed, modelVariableSet = filing(
+            elements='\n<element name="Profit" id="e_Profit" type="decimal" substitutionGroup="xbrli:item" xbrli:periodType="duration"/>')
+
+        assert changed.environmentHash != resultCache.environmentHash
+        assert changed.key(modelVariableSet) != key
@@ -0,0 +1,46 @@
+from unittest.mock import Mock, patch
+
+from arelle.ModelFormulaObject import ModelFilter
+from arelle.formula.FilterPlan import FilterPlan
+
+
+def _filterRel(name, passes=None, isComplemented=False, isCovered=True):
+    _filter = Mock(spec=ModelFilter, localName=name, xlinkLabel=name)
+    _filter.aspectsCovered.return_value = {name}
+    if passes is not None:
+        _filter.filter.side_effect = lambda xpCtx, vb, facts, cmplmt: facts & passes
+    return Mock(toModelObject=_filter, isComplemented=isComplemented, isCovered=isCovered)
+
+
+class TestFilterPlan:
+    def test_index_lookups_ordered_by_selectivity_before_other_filters(self):
+        indexes = {"concept": {1, 2, 3}, "unit": {3}, "nil": {2, 4}}
+        rels = [_filterRel("general", passes={1, 3}), _filterRel("concept"), _filterRel("unit"),
+                _filterRel("nil", isComplemented=True)]
+        with patch("arelle.formula.FilterPlan.staticFilterIndex",
+                   side_effect=lambda _filter: (lambda inst: indexes[_filter.localName]) if _filter.localName in indexes else None):
+            plan = FilterPlan(rels)
+        instance = Mock(factsInInstance={1, 2, 3, 4})
+        xpCtx = Mock()
+        xpCtx.formulaOptions.traceVariableFilterWinnowing = False
+        xpCtx.formulaOptions.traceVariableFilterPlan = False
+        vb = Mock(instances=[instance], aspectsCovered=set())
+
+        facts = plan.filter(xpCtx, vb, {1, 2, 3, 4})
+
+        assert facts == {3}
+        assert [step.filter.localName for step in plan.orderedIndexSteps(xpCtx, vb)] == ["unit", "nil", "concept"]
+        rels[0].toModelObject.filter.assert_called_once_with(xpCtx, vb, {3}, False)
+        assert vb.aspectsCovered == {"general", "concept", "unit", "nil"}
+
+    def test_group_filters_do_not_cover_aspects(self):
+        rels = [_filterRel("general", passes=set())]
+        with patch("arelle.formula.FilterPlan.staticFilterIndex", return_value=None):
+            plan = FilterPlan(rels, isGroupFilter=True)
+        xpCtx = Mock()
+        xpCtx.formulaOptions.traceVariableFilterWinnowing = False
+        xpCtx.formulaOptions.traceVariableFilterPlan = False
+        vb = Mock(instances=[Mock(factsInInstance={1})], aspectsCovered=set())
+
+        assert plan.filter(xpCtx, vb, {1}) == set()
+        assert vb.aspectsCovered == set()
@@ -0,0 +1,26 @@
+import logging
+from unittest.mock import Mock
+
+from arelle.formula.ParallelEvaluator import LogRecordCapture, replayLogRecords
+
+
+class TestParallelEvaluator:
+    def test_captured_records_replay_identically(self):
+        logger = logging.getLogger("test_parallel_evaluator")
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        capture = LogRecordCapture()
+        logger.handlers = [capture]
+        logger.log(logging.ERROR, "%(label)s failed", {"label": "va1"}, extra={"messageCode": "message:va1", "refs": [{"href": "f.xml#va1"}]})
+        logger.log(logging.INFO, "no args", extra={"messageCode": "info", "refs": []})
+        records = capture.takeRecords()
+
+        replayed = LogRecordCapture()
+        logger.handlers = [replayed]
+        modelXbrl = Mock(logger=logger, logCount={}, errors=[], errorCaptureLevel=logging.ERROR - 2)
+        replayLogRecords(modelXbrl, records)
+
+        assert replayed.takeRecords() == records
+        assert capture.takeRecords() == []
+        assert modelXbrl.errors == ["message:va1"]
+        assert modelXbrl.logCount == {logging.ERROR: 1, logging.INFO: 1}
@@ -0,0 +1,44 @@
+from __future__ import annotations
+from decimal import Decimal
+
+import pytest
+
+from arelle.plugin.loadFromOIM import CanonicalXmlTypePattern
+from arelle.plugin.saveLoadableOIM import canonicalDecimal, canonicalFloat
+
+
+class TestSaveLoadableOIM:
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            (Decimal("100"), "100.0"),
+            (Decimal("1E+3"), "1000.0"),
+            (Decimal("1.50"), "1.5"),
+            (Decimal("-12.3400"), "-12.34"),
+            (Decimal("0.001"), "0.001"),
+            (Decimal("0.00"), "0.0"),
+            (Decimal("-0"), "0.0"),
+        ]
+    )
+    def test_canonical_decimal(self, value: Decimal, expected: str):
+        result = canonicalDecimal(value)
+
+        assert result == expected
+        assert CanonicalXmlTypePattern["decimal"].match(result)
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            (100.0, "1.0E2"),
+            (1.5, "1.5E0"),
+            (-0.0025, "-2.5E-3"),
+            (1e100, "1.0E100"),
+            (0.0, "0.0E0"),
+        ]
+    )
+    def test_canonical_float(self, value: float, expected: str):
+        result = canonicalFloat(value)
+
+        assert result == expected
+        assert CanonicalXmlTypePattern["double"].match(result)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+import os
+import sqlite3
+from unittest.mock import patch
+
+from arelle.Cntlr import Cntlr
+from arelle.UrlUtil import ensureUrl
+from arelle.plugin.xbrlDB.dbIdCache import DbIdCache, dbIdCache
+
+
+class TestDbIdCache:
+
+    def test_staged_ids_cached_only_after_commit(self, tmp_path):
+        cache = DbIdCache("sqlite:None:None:db", str(tmp_path / "cache.json"))
+        cache.stageDocument("http://xbrl.fasb.org/us-gaap/2023/elts/us-gaap-2023.xsd", 7)
+        cache.stageAspect(7, "{http://fasb.org/us-gaap/2023}Assets", 101)
+
+        assert cache.documentId("http://xbrl.fasb.org/us-gaap/2023/elts/us-gaap-2023.xsd") is None
+        cache.commit()
+
+        assert cache.documentId("http://xbrl.fasb.org/us-gaap/2023/elts/us-gaap-2023.xsd") == 7
+        assert cache.aspectId(7, "{http://fasb.org/us-gaap/2023}Assets") == 101
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_discard_drops_staged_ids(self):
+        cache = DbIdCache("sqlite:None:None:db")
+        cache.stageType(7, "{http://www.xbrl.org/2003/instance}monetaryItemType", 3)
+        cache.discard()
+        cache.commit()
+
+        assert cache.typeId(7, "{http://www.xbrl.org/2003/instance}monetaryItemType") is None
+
+    def test_persisted_per_database(self, tmp_path):
+        cacheFile = str(tmp_path / "cache.json")
+        cache = DbIdCache("postgres:localhost:5432:db1", cacheFile)
+        cache.stageDocument("http://example.com/a.xsd", 1)
+        cache.commit()
+
+        assert DbIdCache("postgres:localhost:5432:db1", cacheFile).documentId("http://example.com/a.xsd") == 1
+        assert DbIdCache("postgres:localhost:5432:db2", cacheFile).documentId("http://example.com/a.xsd") is None
+
+    def test_invalidate_removes_file(self, tmp_path):
+        cacheFile = tmp_path / "cache.json"
+        cache = DbIdCache("sqlite:None:None:db", str(cacheFile))
+        cache.stageDocument("http://example.com/a.xsd", 1)
+        cache.commit()
+        cache.invalidate()
+
+        assert not cacheFile.exists()
+        assert cache.documentId("http://example.com/a.xsd") is None
+
+    def test_sample_of_documents_objects(self):
+        cache = DbIdCache("sqlite:None:None:db")
+        for i in range(20):
+            cache.stageAspect(7, "{http://example.com/a}A%s" % i, 100 + i)
+        cache.stageAspect(8, "{http://example.com/b}B", 200)
+        cache.commit()
+
+        sample = cache.sampleAspects([7], size=5)
+
+        assert len(sample) == 5
+        assert all(docId == 7 and cache.aspectId(docId, qn) == id for id, docId, qn in sample)
+        assert cache.sampleAspects([8]) == [(200, 8, "{http://example.com/b}B")]
+        assert cache.sampleTypes([7]) == []
+
+
+XBRLI_XSD = """<schema xmlns="http://www.w3.org/2001/XMLSchema" targetNamespace="http://www.xbrl.org/2003/instance">
+<element name="item" abstract="true"/>
+<element name="tuple" abstract="true"/>
+</schema>"""
+
+SCHEMA = """<schema xmlns="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance"
+targetNamespace="http://example.com/{0}">
+<import namespace="http://www.xbrl.org/2003/instance" schemaLocation="xbrli.xsd"/>
+<element name="Revenue" id="{0}_Revenue" type="decimal" substitutionGroup="xbrli:item" xbrli:periodType="duration"/>
+</schema>"""
+
+INSTANCE = """<xbrl xmlns="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase"
+xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:{0}="http://example.com/{0}" xmlns:iso4217="http://www.xbrl.org/2003/iso4217">
+<link:schemaRef xlink:type="simple" xlink:href="{0}.xsd"/>
+<context id="c"><entity><identifier scheme="http://www.sec.gov/CIK">0000000001</identifier></entity>
+<period><startDate>2023-01-01</startDate><endDate>2023-12-31</endDate></period></context>
+<unit id="u"><measure>iso4217:USD</measure></unit>
+<{0}:Revenue contextRef="c" unitRef="u" decimals="0">100</{0}:Revenue>
+</xbrl>"""
+
+
+class TestDbIdCacheSqlite:
+
+    @staticmethod
+    def _store(cntlr, dbFile, prefixes, recreate):
+        from arelle.plugin.xbrlDB.XbrlSemanticSqlDB import XbrlSqlDatabaseConnection, insertIntoDB
+        if recreate:
+            if os.path.exists(dbFile):
+                os.remove(dbFile)
+            conn = XbrlSqlDatabaseConnection(cntlr.modelManager.load(os.path.join(os.path.dirname(dbFile), "xbrli.xsd")),
+                                             None, None, "localhost", None, dbFile, None, "sqlite")
+            conn.create(os.path.join("sql", "semantic", "xbrlSemanticSQLiteDB.ddl"))
+            conn.close()
+        for prefix in prefixes:
+            modelXbrl = cntlr.modelManager.load(os.path.join(os.path.dirname(dbFile), prefix + ".xml"))
+            insertIntoDB(modelXbrl, host="localhost", database=dbFile, product="sqlite")
+            modelXbrl.close()
+
+    def test_recreated_database_invalidates_cache(self, tmp_path):
+        (tmp_path / "xbrli.xsd").write_text(XBRLI_XSD)
+        for prefix in ("a", "b"):
+            (tmp_path / (prefix + ".xsd")).write_text(SCHEMA.format(prefix))
+            (tmp_path / (prefix + ".xml")).write_text(INSTANCE.format(prefix))
+        for name in ("a2", "a3"):
+            (tmp_path / (name + ".xml")).write_text(INSTANCE.format("a"))
+        dbFile = str(tmp_path / "xbrlDB.sqlite")
+        cntlr = Cntlr(logFileName="logToBuffer")
+        cntlr.webCache.workOffline = True
+        schemaUrl = ensureUrl(str(tmp_path / "a.xsd"))
+
+        # a.xsd is cached when a2 finds it stored, and verified when a3 uses the cached id
+        self._store(cntlr, dbFile, ["a", "a2", "a3"], recreate=True)
+        cache = dbIdCache(cntlr, "sqlite:localhost:None:" + dbFile)
+        cachedId = cache.documentId(schemaUrl)
+        assert cachedId is not None
+
+        # recreated database, in which b's documents take the ids which a's documents had
+        with patch.object(DbIdCache, "invalidate", autospec=True, side_effect=DbIdCache.invalidate) as invalidate:
+            self._store(cntlr, dbFile, ["b", "a"], recreate=True)
+
+        assert invalidate.call_count == 1
+        db = sqlite3.connect(dbFile)
+        try:
+            dbId = db.execute("SELECT document_id FROM document WHERE document_url = ?", (schemaUrl,)).fetchone()[0]
+            aspectDocumentUrls = db.execute("SELECT d.document_url FROM data_point dp "
+                                            "JOIN aspect a ON a.aspect_id = dp.aspect_id "
+                                            "JOIN document d ON d.document_id = a.document_id "
+                                            "ORDER BY d.document_url").fetchall()
+        finally:
+            db.close()
+        assert dbId != cachedId
+        assert cache.documentId(schemaUrl) is None  # stale id dropped, a.xsd is new in the recreated database
+        assert aspectDocumentUrls == [(schemaUrl,), (ensureUrl(str(tmp_path / "b.xsd")),)]
+        cntlr.modelManager.close()
+        cntlr.close()
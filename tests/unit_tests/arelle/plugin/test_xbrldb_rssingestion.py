@@ -0,0 +1,283 @@
+from __future__ import annotations
+import json
+import logging
+import os
+import sqlite3
+from unittest.mock import Mock, patch
+
+import pytest
+
+from arelle.Cntlr import Cntlr
+from arelle.ModelFormulaObject import FormulaOptions
+from arelle.plugin.xbrlDB import LogToDbHandler, rssIngestion
+from arelle.plugin.xbrlDB.rssIngestion import (
+    FAILED, STORED, BatchInserter, FilingWriter, RssIngestionProgress, SqlDbConnectionPool, ingestRssFeed,
+)
+
+
+class _Conn:
+    def __init__(self):
+        self.modelXbrl = None
+        self.tableColTypes = {}
+        self.poolBaseAttributes = set(self.__dict__.keys()) | {"poolBaseAttributes"}
+
+    def closeCursor(self):
+        pass
+
+    def close(self, rollback=False):
+        self.closed = rollback
+
+
+class TestRssIngestionProgress:
+
+    def test_resume_skips_stored(self, tmp_path):
+        progressFile = str(tmp_path / "progress.json")
+        progress = RssIngestionProgress(progressFile)
+        progress.record("0001-23-000001", STORED, "2023-01-01 10:00:00")
+        progress.record("0001-23-000002", FAILED, "2023-01-01 11:00:00", error="boom")
+
+        resumed = RssIngestionProgress(progressFile)
+
+        assert resumed.isDone("0001-23-000001", "2023-01-01 10:00:00")
+        assert not resumed.isDone("0001-23-000001", "2023-02-01 10:00:00")  # refiled
+        assert not resumed.isDone("0001-23-000002")
+        assert not resumed.isDone("0001-23-000003")
+        assert resumed.counts() == {STORED: 1, FAILED: 1}
+        with open(progressFile, encoding="utf-8") as fh:
+            assert json.load(fh)["0001-23-000002"]["error"] == "boom"
+
+
+class TestSqlDbConnectionPool:
+
+    def test_reuses_connection_and_drops_filing_state(self):
+        pool = SqlDbConnectionPool(["localhost", "", "", "", "db", "", "sqliteSemantic"], size=1)
+        pool.newConnection = Mock(side_effect=lambda modelXbrl: _Conn())
+        modelXbrl1, modelXbrl2 = Mock(), Mock()
+
+        conn = pool.acquire(modelXbrl1)
+        conn.filingId = 1
+        pool.release(conn)
+        reused = pool.acquire(modelXbrl2)
+
+        assert reused is conn
+        assert reused.modelXbrl is modelXbrl2
+        assert not hasattr(reused, "filingId")
+        assert pool.newConnection.call_count == 1
+
+    def test_failed_connection_not_reused(self):
+        pool = SqlDbConnectionPool(["localhost", "", "", "", "db", "", "sqliteSemantic"], size=1)
+        pool.newConnection = Mock(side_effect=lambda modelXbrl: _Conn())
+
+        conn = pool.acquire(Mock())
+        pool.release(conn, failed=True)
+        other = pool.acquire(Mock())
+
+        assert conn.closed
+        assert other is not conn
+        assert pool.newConnection.call_count == 2
+
+
+class _Pool:
+    def __init__(self, insertXbrl=None, commitXbrl=None):
+        self.insertXbrl = insertXbrl
+        self.commitXbrl = commitXbrl
+        self.released = []
+
+    def acquire(self, modelXbrl):
+        return Mock(insertXbrl=self.insertXbrl)
+
+    def bind(self, conn, modelXbrl):
+        pass
+
+    def unbind(self, conn):
+        pass
+
+    def release(self, conn, failed=False):
+        self.released.append(failed)
+
+    def commit(self, conn):
+        self.commitXbrl()
+
+
+def _rssItem(accessionNumber):
+    return Mock(accessionNumber=accessionNumber, acceptanceDatetime=None)
+
+
+class TestBatchInserter:
+
+    def test_failed_insertion_rolls_back_batch(self):
+        def insertXbrl(entrypoint, rssItem, commit=True):
+            assert not commit
+            if rssItem.accessionNumber == "bad":
+                raise ValueError("bad filing")
+
+        pool = _Pool(insertXbrl)
+        inserter = BatchInserter(pool, batchSize=3)
+        a, bad, c = _rssItem("a"), _rssItem("bad"), _rssItem("c")
+
+        assert inserter.insert(Mock(), a, 0.0) == []
+        results = inserter.insert(Mock(), bad, 0.0)
+        assert inserter.insert(Mock(), c, 0.0) == []
+
+        assert [(rssItem, status) for rssItem, status, error, duration in results] == [(a, FAILED), (bad, FAILED)]
+        assert results[0][2] == "rolled back with failed filing bad"
+        assert results[1][2] == "ValueError: bad filing"
+        assert pool.released == [True]
+        assert [rssItem for rssItem, duration in inserter.batch] == [c]
+        assert not inserter.isFull()
+
+
+class TestFilingWriter:
+
+    def test_commits_batches_in_order_and_reports_failures(self):
+        commits = iter([None, ValueError("commit failed"), None])
+
+        def commitXbrl():
+            ex = next(commits)
+            if ex is not None:
+                raise ex
+
+        writer = FilingWriter(_Pool(commitXbrl=commitXbrl))
+        writer.start()
+        for batch in (["a", "b"], ["c"], ["d"]):
+            writer.put(Mock(), [(rssItem, 0.0) for rssItem in batch])
+        writer.finish()
+
+        assert [(rssItem, status) for rssItem, status, error, duration in writer.takeResults()] == [
+            ("a", STORED), ("b", STORED), ("c", FAILED), ("d", STORED)]
+
+
+def _log(code):
+    logging.getLogger("arelle").info("%(code)s", {"code": code}, extra={"messageCode": code, "refs": []})
+
+
+@pytest.fixture
+def logToDbHandler():
+    handler = LogToDbHandler()
+    logger = logging.getLogger("arelle")
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    yield handler
+    logger.removeHandler(handler)
+    logger.setLevel(level)
+
+
+class TestRssIngestionLogEntries:
+
+    @staticmethod
+    def _ingest(stored):
+        def loadAndValidate(modelManager, rssItem, *args):
+            _log("load." + rssItem.accessionNumber)
+            return Mock()
+
+        def insert(inserter, modelXbrl, rssItem, startedAt):
+            _log("insert." + rssItem.accessionNumber)
+            stored[rssItem.accessionNumber] = [entry["code"] for entry in modelXbrl.dbLoggingEntries]
+            return []
+
+        return patch.object(rssIngestion, "loadAndValidate", loadAndValidate), \
+            patch.object(BatchInserter, "insert", insert)
+
+    def test_serial_filing_entries_exclude_prior_and_next_filing(self, logToDbHandler):
+        stored = {}
+        _log("before")
+        patchLoad, patchInsert = self._ingest(stored)
+        with patchLoad, patchInsert:
+            rssIngestion.ingestSerially(Mock(), [_rssItem("a"), _rssItem("b")], [], RssIngestionProgress())
+
+        assert stored == {"a": ["load.a"], "b": ["load.b"]}
+        assert logToDbHandler.logRecordBuffer == []
+
+    def test_worker_filing_entries(self, logToDbHandler):
+        stored = {}
+        worker = {"cntlr": Mock(), "rssItems": {"a": _rssItem("a"), "b": _rssItem("b")}, "pool": None,
+                  "validate": True, "reloadCache": False, "formulaParameters": None}
+        _log("before")
+        patchLoad, patchInsert = self._ingest(stored)
+        with patch.object(rssIngestion, "_worker", worker), patchLoad, patchInsert:
+            results = rssIngestion._ingestInWorker(["a", "b"])
+
+        assert results == []  # inserted filings are not committed (and reported) by the mocked inserter
+        assert stored == {"a": ["load.a"], "b": ["load.b"]}
+        assert logToDbHandler.logRecordBuffer == []
+
+
+XBRLI_XSD = """<schema xmlns="http://www.w3.org/2001/XMLSchema" targetNamespace="http://www.xbrl.org/2003/instance">
+<element name="item" abstract="true"/>
+<element name="tuple" abstract="true"/>
+</schema>"""
+
+SCHEMA = """<schema xmlns="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance"
+targetNamespace="http://example.com/e">
+<import namespace="http://www.xbrl.org/2003/instance" schemaLocation="xbrli.xsd"/>
+<element name="Revenue" id="e_Revenue" type="decimal" substitutionGroup="xbrli:item" xbrli:periodType="duration"/>
+</schema>"""
+
+INSTANCE = """<xbrl xmlns="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase"
+xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:e="http://example.com/e" xmlns:iso4217="http://www.xbrl.org/2003/iso4217">
+<link:schemaRef xlink:type="simple" xlink:href="e.xsd"/>
+<context id="c"><entity><identifier scheme="http://www.sec.gov/CIK">{cik}</identifier></entity>
+<period><startDate>2023-01-01</startDate><endDate>2023-12-31</endDate></period></context>
+<unit id="u"><measure>iso4217:USD</measure></unit>
+<e:Revenue contextRef="c" unitRef="u" decimals="0">{value}</e:Revenue>
+</xbrl>"""
+
+RSS_ITEM = """<item><title>Filing {n}</title><pubDate>Tue, 0{n} Jan 2024 10:00:00 EST</pubDate>
+<edgar:xbrlFiling xmlns:edgar="http://www.sec.gov/Archives/edgar">
+<edgar:companyName>Company {n}</edgar:companyName><edgar:formType>10-K</edgar:formType>
+<edgar:filingDate>01/0{n}/2024</edgar:filingDate><edgar:cikNumber>{cik}</edgar:cikNumber>
+<edgar:accessionNumber>0000000000-24-00000{n}</edgar:accessionNumber>
+<edgar:acceptanceDatetime>2024010{n}100000</edgar:acceptanceDatetime><edgar:period>20231231</edgar:period>
+<edgar:xbrlFiles><edgar:xbrlFile edgar:sequence="1" edgar:file="f{n}.xml" edgar:type="EX-101.INS" edgar:url="{url}"/>
+</edgar:xbrlFiles></edgar:xbrlFiling></item>"""
+
+
+def _ingestLocalFeed(directory, processes, batchSize):
+    directory.mkdir()
+    (directory / "xbrli.xsd").write_text(XBRLI_XSD)
+    (directory / "e.xsd").write_text(SCHEMA)
+    items = []
+    for n in (1, 2):
+        cik = "000000000{}".format(n)
+        (directory / "f{}.xml".format(n)).write_text(INSTANCE.format(cik=cik, value=n * 100))
+        items.append(RSS_ITEM.format(n=n, cik=cik, url=str(directory / "f{}.xml".format(n))))
+    (directory / "feed.rss").write_text('<rss version="2.0"><channel><title>Feed</title>{}</channel></rss>'.format("".join(items)))
+    dbFile = str(directory / "xbrlDB.sqlite")
+    progressFile = str(directory / "progress.json")
+    cntlr = Cntlr(logFileName="logToBuffer")
+    cntlr.webCache.workOffline = True
+    cntlr.modelManager.formulaOptions = FormulaOptions()
+    rssModelXbrl = cntlr.modelManager.load(str(directory / "feed.rss"))
+    from arelle.plugin.xbrlDB.XbrlSemanticSqlDB import XbrlSqlDatabaseConnection
+    conn = XbrlSqlDatabaseConnection(rssModelXbrl, None, None, "localhost", None, dbFile, None, "sqlite")
+    conn.create(os.path.join("sql", "semantic", "xbrlSemanticSQLiteDB.ddl"))
+    conn.close()
+    progress = ingestRssFeed(rssModelXbrl, ["localhost", "", "", "", dbFile, "", "sqliteSemantic"],
+                             processes=processes, progressFile=progressFile, validate=False, batchSize=batchSize)
+    cntlr.modelManager.close()
+    cntlr.close()
+    db = sqlite3.connect(dbFile)
+    try:
+        filings = db.execute("SELECT filing_number, reference_number FROM filing ORDER BY filing_number").fetchall()
+        values = db.execute("SELECT effective_value FROM data_point ORDER BY effective_value").fetchall()
+    finally:
+        db.close()
+    with open(progressFile, encoding="utf-8") as fh:
+        progressItems = json.load(fh)
+    return progress, filings, values, progressItems
+
+
+class TestRssIngestionSqlite:
+
+    @pytest.mark.parametrize("processes, batchSize", [(1, 1), (1, 2), (2, 1)])
+    def test_local_feed_stored(self, tmp_path, processes, batchSize):
+        progress, filings, values, progressItems = _ingestLocalFeed(tmp_path / "feed", processes, batchSize)
+
+        assert filings == [("0000000000-24-000001", "0000000001"), ("0000000000-24-000002", "0000000002")]
+        assert values == [(100.0,), (200.0,)]
+        assert progress.counts() == {STORED: 2}
+        assert {accessionNumber: (item["status"], item["acceptanceDatetime"], item["error"])
+                for accessionNumber, item in progressItems.items()} == {
+            "0000000000-24-000001": (STORED, "2024-01-01 10:00:00", None),
+            "0000000000-24-000002": (STORED, "2024-01-02 10:00:00", None)}
@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+
+import arelle
+
+ARELLE_ROOT = os.path.dirname(os.path.dirname(arelle.__file__))
+SCHEMA = '<schema xmlns="http://www.w3.org/2001/XMLSchema" targetNamespace="http://example.com/t"/>'
+INSTANCE = (
+    '<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase"'
+    ' xmlns:xlink="http://www.w3.org/1999/xlink"><link:schemaRef xlink:type="simple" xlink:href="t.xsd"/></xbrli:xbrl>'
+)
+LOAD_AND_VALIDATE = '''
+import json, sys
+from arelle import CntlrCmdLine
+CntlrCmdLine.parseAndRun(["--file", sys.argv[1], "--validate", "--internetConnectivity", "offline", "--logFile", sys.argv[2]])
+print(json.dumps(sorted(sys.modules)))
+'''
+MAX_ARELLE_MODULES = 70
+OPTION_SUBSYSTEMS = (
+    "arelle.ModelVersReport", "arelle.RenderingEvaluator", "arelle.SystemInfo", "arelle.ValidateInfoset",
+    "arelle.ViewFile", "arelle.ViewFileRenderedGrid", "openpyxl", "pyparsing", "tinycss2",
+)
+
+
+def test_load_and_validate_imports_bounded_modules(tmp_path):
+    (tmp_path / "t.xsd").write_text(SCHEMA)
+    (tmp_path / "t.xml").write_text(INSTANCE)
+    env = dict(os.environ, XDG_CONFIG_HOME=str(tmp_path), PYTHONPATH=ARELLE_ROOT)
+    result = subprocess.run(
+        [sys.executable, "-c", LOAD_AND_VALIDATE, str(tmp_path / "t.xml"), str(tmp_path / "log.txt")],
+        env=env, cwd=str(tmp_path), capture_output=True, text=True, check=True)
+    modules = json.loads(result.stdout.splitlines()[-1])
+
+    assert "validated in" in (tmp_path / "log.txt").read_text()
+    assert len([m for m in modules if m.startswith("arelle.")]) <= MAX_ARELLE_MODULES
+    assert not [m for m in modules if m.startswith(OPTION_SUBSYSTEMS)]
@@ -0,0 +1,136 @@
+import os
+from concurrent.futures import Future
+from unittest.mock import Mock, patch
+
+from arelle.Cntlr import Cntlr
+from arelle.DiscoveryPrefetcher import DiscoveryPrefetcher, PrefetchedDocument
+
+URL = "http://example.com/a.xsd"
+
+XBRLI_XSD = """<schema xmlns="http://www.w3.org/2001/XMLSchema" targetNamespace="http://www.xbrl.org/2003/instance">
+<element name="item" abstract="true"/>
+<element name="tuple" abstract="true"/>
+</schema>"""
+
+LINKBASE_REF = ('<link:linkbaseRef xlink:type="simple" xlink:href="{}" '
+                'xlink:arcrole="http://www.w3.org/1999/xlink/properties/linkbase"/>')
+
+ROLE_TYPE = ('<link:roleType roleURI="http://example.com/role/E" id="E">'
+             '<link:usedOn>link:presentationLink</link:usedOn></link:roleType>')
+
+
+def _schema(name, imports=(), linkbases=(), appinfo=""):
+    return ('<schema xmlns="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance" '
+            'xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink" '
+            'targetNamespace="http://example.com/{0}">'
+            '<annotation><appinfo>{1}{2}</appinfo></annotation>'
+            '<import namespace="http://www.xbrl.org/2003/instance" schemaLocation="xbrli.xsd"/>{3}'
+            '<element name="C" id="{0}_C" type="string" substitutionGroup="xbrli:item" xbrli:periodType="duration"/>'
+            '</schema>'.format(name, "".join(LINKBASE_REF.format(linkbase) for linkbase in linkbases), appinfo,
+                               "".join('<import namespace="http://example.com/{0}" schemaLocation="{0}.xsd"/>'.format(i)
+                                       for i in imports)))
+
+
+def _writeDTS(directory):
+    """ schemas importing schemas, a linkbase locating concepts of and referencing a role of schemas not yet
+        discovered, a missing linkbase and a malformed schema """
+    directory.mkdir()
+    (directory / "xbrli.xsd").write_text(XBRLI_XSD)
+    (directory / "a.xsd").write_text(_schema("a", ("b", "c"), ("pre.xml", "missing.xml")))
+    (directory / "b.xsd").write_text(_schema("b", ("d",)))
+    (directory / "c.xsd").write_text(_schema("c", ("d", "e", "f")))
+    (directory / "d.xsd").write_text(_schema("d"))
+    (directory / "e.xsd").write_text(_schema("e", appinfo=ROLE_TYPE))
+    (directory / "f.xsd").write_text("<schema")
+    (directory / "g.xsd").write_text(_schema("g"))
+    (directory / "pre.xml").write_text(
+        '<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink">'
+        '<link:roleRef roleURI="http://example.com/role/E" xlink:type="simple" xlink:href="e.xsd#E"/>'
+        '<link:presentationLink xlink:type="extended" xlink:role="http://example.com/role/E">' +
+        "".join('<link:loc xlink:type="locator" xlink:href="{0}.xsd#{0}_C" xlink:label="{0}"/>'.format(name)
+                for name in "abdeg") +
+        "".join('<link:presentationArc xlink:type="arc" xlink:arcrole="http://www.xbrl.org/2003/arcrole/parent-child" '
+                'xlink:from="a" xlink:to="{}" order="{}"/>'.format(name, order) for order, name in enumerate("bdeg")) +
+        '</link:presentationLink></link:linkbase>')
+    return str(directory / "a.xsd")
+
+
+def _discover(entrypoint, discoveryThreads):
+    """ returns urlDocs, namespaceDocs and messages of loading entrypoint, and prefetched documents taken """
+    cntlr = Cntlr(logFileName="logToBuffer")
+    cntlr.webCache.workOffline = True
+    cntlr.modelManager.discoveryThreads = discoveryThreads
+    taken = []
+    take = DiscoveryPrefetcher.take
+
+    def spyTake(self, normalizedUrl, filepath):
+        prefetched = take(self, normalizedUrl, filepath)
+        if prefetched is not None:
+            taken.append(normalizedUrl)
+        return prefetched
+
+    with patch.object(DiscoveryPrefetcher, "take", spyTake):
+        modelXbrl = cntlr.modelManager.load(entrypoint)
+    discovered = (list(modelXbrl.urlDocs),
+                  {namespace: [doc.uri for doc in docs] for namespace, docs in modelXbrl.namespaceDocs.items()},
+                  [(record.messageCode, record.getMessage()) for record in cntlr.logHandler.logRecordBuffer])
+    cntlr.modelManager.close()
+    cntlr.close()
+    return discovered, taken
+
+
+def _prefetcher(filepath):
+    prefetcher = DiscoveryPrefetcher(Mock(), threads=2)
+    stat = os.stat(filepath)
+    future = Future()
+    future.set_running_or_notify_cancel()
+    future.set_result(PrefetchedDocument(filepath, (stat.st_mtime_ns, stat.st_size), Mock(), "utf-8", Mock(), []))
+    prefetcher.prefetches[URL] = future
+    return prefetcher
+
+
+class TestDiscoveryPrefetcherTake:
+    def test_take_prefetched_unchanged_file(self, tmp_path):
+        filepath = tmp_path / "a.xsd"
+        filepath.write_text("<schema/>")
+        prefetcher = _prefetcher(str(filepath))
+
+        assert prefetcher.take(URL, str(filepath)).filepath == str(filepath)
+        assert prefetcher.take(URL, str(filepath)) is None
+        prefetcher.close()
+
+    def test_take_ignores_other_or_changed_file(self, tmp_path):
+        filepath = tmp_path / "a.xsd"
+        filepath.write_text("<schema/>")
+        prefetcher = _prefetcher(str(filepath))
+        assert prefetcher.take(URL, str(tmp_path / "b.xsd")) is None
+
+        prefetcher = _prefetcher(str(filepath))
+        filepath.write_text("<schema></schema>")
+        assert prefetcher.take(URL, str(filepath)) is None
+        prefetcher.close()
+
+    def test_take_does_not_wait_for_unstarted_prefetch(self, tmp_path):
+        prefetcher = DiscoveryPrefetcher(Mock(), threads=2)
+        future = Future()
+        prefetcher.prefetches[URL] = future
+
+        assert prefetcher.take(URL, str(tmp_path / "a.xsd")) is None
+        assert future.cancelled()
+        prefetcher.close()
+
+
+class TestDiscoveryPrefetcherLoad:
+    def test_prefetched_discovery_matches_serial_discovery(self, tmp_path):
+        entrypoint = _writeDTS(tmp_path / "dts")
+        serial, serialTaken = _discover(entrypoint, discoveryThreads=0)
+        prefetched, prefetchedTaken = _discover(entrypoint, discoveryThreads=4)
+
+        assert not serialTaken
+        assert prefetchedTaken
+        urlDocs, namespaceDocs, messages = serial
+        assert len(urlDocs) == 9
+        assert {code for code, _message in messages} == {"IOerror", "xmlSchema:syntax"}
+        assert prefetched[0] == urlDocs
+        assert prefetched[1] == namespaceDocs
+        assert prefetched[2] == messages
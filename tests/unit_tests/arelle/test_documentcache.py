@@ -0,0 +1,126 @@
+import copy
+import gc
+import os
+from unittest.mock import Mock, patch
+
+from lxml import etree
+
+from arelle import DocumentCache as DocumentCacheModule
+from arelle.Cntlr import Cntlr
+from arelle.DocumentCache import DocumentCache, releaseCopiedDocuments
+from arelle.FileSource import FileSource
+
+URL = "http://example.com/a.xsd"
+
+
+class _Element(etree.ElementBase):
+    pass
+
+
+class _NamespaceLookup(etree.CustomElementClassLookup):
+    def lookup(self, node_type, document, ns, ln):
+        return _Element if node_type == "element" else None
+
+
+def _modelXbrl(filepath):
+    cntlr = Mock()
+    cntlr.modelManager.disclosureSystem.defaultXmlEncoding = "utf-8"
+    modelXbrl = Mock()
+    modelXbrl.fileSource = FileSource(filepath, cntlr)
+    modelXbrl.copiedDocumentIds = []
+    return modelXbrl
+
+
+def _parser(modelXbrl, baseUrl):
+    return Mock(), _NamespaceLookup(), etree.PythonElementClassLookup()
+
+
+@patch("arelle.DocumentCache.parser", _parser)
+class TestDocumentCacheCopy:
+    def test_second_copy_is_hit_of_own_document(self, tmp_path):
+        filepath = tmp_path / "a.xsd"
+        filepath.write_text("<schema><element/></schema>")
+        modelXbrl = _modelXbrl(str(filepath))
+        cache = DocumentCache(1048576)
+
+        first = cache.copy(modelXbrl, URL, str(filepath))
+        second = cache.copy(modelXbrl, URL, str(filepath))
+
+        assert (cache.hits, cache.misses, len(cache.documents)) == (1, 1, 1)
+        assert first.xmlDocument is not second.xmlDocument
+        assert isinstance(second.xmlDocument.getroot()[0], _Element)
+        second.xmlDocument.getroot().append(etree.Element("added"))
+        assert len(cache.copy(modelXbrl, URL, str(filepath)).xmlDocument.getroot()) == 1
+
+    def test_changed_file_is_parsed_again(self, tmp_path):
+        filepath = tmp_path / "a.xsd"
+        filepath.write_text("<schema/>")
+        modelXbrl = _modelXbrl(str(filepath))
+        cache = DocumentCache(1048576)
+        cache.copy(modelXbrl, URL, str(filepath))
+
+        filepath.write_text("<schema><element/></schema>")
+        stat = os.stat(filepath)
+        os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+        assert len(cache.copy(modelXbrl, URL, str(filepath)).xmlDocument.getroot()) == 1
+        assert (cache.hits, cache.misses, len(cache.documents)) == (0, 2, 1)
+
+    def test_least_recently_used_evicted(self, tmp_path):
+        filepaths = []
+        for name in ("a.xsd", "b.xsd", "c.xsd"):
+            filepath = tmp_path / name
+            filepath.write_text("<schema>{}</schema>".format("x" * 90))
+            filepaths.append(str(filepath))
+        modelXbrl = _modelXbrl(filepaths[0])
+        cache = DocumentCache(250)
+
+        for filepath in filepaths[:2] + filepaths[:1] + filepaths[2:]:
+            cache.copy(modelXbrl, URL, filepath)
+
+        assert list(cache.documents) == [filepaths[0], filepaths[2]]
+        assert cache.evictions == 1
+        assert cache.size <= 250
+
+    def test_released_copy_lookups_not_used_by_other_documents(self, tmp_path):
+        filepath = tmp_path / "a.xsd"
+        filepath.write_text("<schema><element/></schema>")
+        modelXbrl = _modelXbrl(str(filepath))
+        cache = DocumentCache(1048576)
+        copied = cache.copy(modelXbrl, URL, str(filepath))
+        assert isinstance(copied.xmlDocument.getroot(), _Element)
+        assert len(modelXbrl.copiedDocumentIds) == 1
+
+        del copied
+        gc.collect()
+        cachedElement = cache.documents[str(filepath)].xmlDocument.getroot()[0]
+        for _i in range(10): # new documents of the cache's parser do not take the lookups of the copy
+            assert not isinstance(copy.deepcopy(cachedElement), _Element)
+
+        documentIds = list(modelXbrl.copiedDocumentIds)
+        releaseCopiedDocuments(modelXbrl.copiedDocumentIds)
+        assert not modelXbrl.copiedDocumentIds
+        assert not any(documentId in DocumentCacheModule._copiedDocumentLookups for documentId in documentIds)
+
+
+def test_model_close_releases_copied_documents(tmp_path):
+    (tmp_path / "xbrli.xsd").write_text(
+        '<schema xmlns="http://www.w3.org/2001/XMLSchema" targetNamespace="http://www.xbrl.org/2003/instance">'
+        '<element name="item" abstract="true"/><element name="tuple" abstract="true"/></schema>')
+    (tmp_path / "a.xsd").write_text(
+        '<schema xmlns="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance" '
+        'targetNamespace="http://example.com/a">'
+        '<import namespace="http://www.xbrl.org/2003/instance" schemaLocation="xbrli.xsd"/>'
+        '<element name="C" id="a_C" type="string" substitutionGroup="xbrli:item" xbrli:periodType="duration"/>'
+        '</schema>')
+    cntlr = Cntlr(logFileName="logToBuffer")
+    cntlr.webCache.workOffline = True
+    cntlr.modelManager.documentCacheSize = 1
+    modelXbrl = cntlr.modelManager.load(str(tmp_path / "a.xsd"))
+    documentIds = list(modelXbrl.copiedDocumentIds)
+    assert len(documentIds) == 1 # xbrli.xsd, the entry document is not cached
+    assert all(documentId in DocumentCacheModule._copiedDocumentLookups for documentId in documentIds)
+
+    modelXbrl.close()
+    assert not any(documentId in DocumentCacheModule._copiedDocumentLookups for documentId in documentIds)
+    cntlr.close()
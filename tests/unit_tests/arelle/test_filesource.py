@@ -0,0 +1,142 @@
+import base64
+import io
+import zipfile
+from unittest.mock import Mock, patch
+
+import pytest
+from lxml import etree
+
+from arelle.FileSource import FileSource, openFileSource, openFileStream
+
+DOCUMENT = '<?xml version="1.0" encoding="ISO-8859-1"?>\n<r>café</r>'
+EIS_DOCUMENT = "<document><conformedName>{}</conformedName><contents>{}</contents></document>"
+
+
+def _cntlr(defaultXmlEncoding="utf-8"):
+    cntlr = Mock()
+    cntlr.webCache.getfilename.side_effect = lambda url, **kwargs: url
+    cntlr.modelManager.disclosureSystem.defaultXmlEncoding = defaultXmlEncoding
+    return cntlr
+
+
+class TestFileSourceXmlFile:
+    def test_archived_document_bytes_keep_declaration(self, tmp_path):
+        archive = tmp_path / "a.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("doc.xml", DOCUMENT.encode("iso-8859-1"))
+        filepath = str(archive / "doc.xml")
+        fileSource = openFileSource(filepath, _cntlr())
+
+        file, encoding = fileSource.xmlFile(filepath)
+
+        assert encoding == "ISO-8859-1"
+        assert file.read().startswith(b'<?xml version="1.0" encoding="ISO-8859-1"?>')
+        file.seek(0)
+        assert etree.parse(file).getroot().text == "café"
+        fileSource.close()
+
+    def test_undeclared_document_in_non_utf8_default_encoding_is_decoded(self, tmp_path):
+        filepath = tmp_path / "doc.xml"
+        filepath.write_bytes("<r>café</r>".encode("iso-8859-1"))
+        fileSource = FileSource(str(filepath), _cntlr(defaultXmlEncoding="iso-8859-1"))
+
+        file, encoding = fileSource.xmlFile(str(filepath))
+
+        assert encoding == "iso-8859-1"
+        assert isinstance(file, io.TextIOBase)
+        assert etree.parse(file).getroot().text == "café"
+        file.close()
+
+
+class TestFileSourceEisMembers:
+    def _eisFileSource(self, tmp_path):
+        documents = "".join(EIS_DOCUMENT.format("doc{}.xml".format(i), base64.b64encode("<r>{}</r>".format(i).encode()).decode())
+                            for i in range(3))
+        eis = tmp_path / "s.eis"
+        eis.write_text('<?xml version="1.0" encoding="utf-8"?>'
+                       '<edgarSubmission xmlns="http://www.sec.gov/edgar/common"><attachments>{}{}</attachments></edgarSubmission>'
+                       .format(documents, EIS_DOCUMENT.format("empty.xml", "")))
+        return openFileSource(str(eis), _cntlr()), str(eis)
+
+    def test_members_listed_and_decoded_once(self, tmp_path):
+        fileSource, eis = self._eisFileSource(tmp_path)
+
+        assert fileSource.dir == ["doc0.xml", "doc1.xml", "doc2.xml", "empty.xml"]
+        with patch("arelle.FileSource.base64.b64decode", wraps=base64.b64decode) as b64decode:
+            assert fileSource.file(eis + "/doc1.xml")[0].read() == "<r>1</r>"
+            assert fileSource.file(eis + "/doc1.xml", binary=True)[0].read() == b"<r>1</r>"
+        assert b64decode.call_count == 1
+        fileSource.close()
+
+    def test_member_without_contents_is_not_found(self, tmp_path):
+        fileSource, eis = self._eisFileSource(tmp_path)
+
+        for member in ("empty.xml", "missing.xml"):
+            with pytest.raises(IOError) as err:
+                fileSource.file(eis + "/" + member)
+            assert err.value.filename == member
+        fileSource.close()
+
+
+class TestFileSourceZipMembers:
+    def _zip(self, path, compression=zipfile.ZIP_DEFLATED, **members):
+        with zipfile.ZipFile(path, "w", compression) as zf:
+            for name, contents in members.items():
+                zf.writestr(name.replace("__", "\\"), contents)
+        return str(path)
+
+    def test_members_streamed_from_name_normalized_index(self, tmp_path):
+        archive = self._zip(tmp_path / "a.zip", **{"dir__doc.xml": DOCUMENT.encode("iso-8859-1")})
+        fileSource = openFileSource(archive, _cntlr())
+        fileSource.open()
+
+        assert fileSource.dir == ["dir/doc.xml"]
+        assert fileSource.exists(archive + "/dir/doc.xml") and not fileSource.exists(archive + "/doc.xml")
+        file = fileSource.file(archive + "/dir/doc.xml", binary=True)[0]
+        assert not isinstance(file, io.BytesIO)
+        assert file.read() == DOCUMENT.encode("iso-8859-1")
+        file.close()
+        file = fileSource.file(archive + "/dir/doc.xml", binary=True, seekable=True)[0]
+        file.seek(5)
+        assert file.read(5) == DOCUMENT.encode("iso-8859-1")[5:10]
+        file.seek(0)
+        assert file.read() == DOCUMENT.encode("iso-8859-1")
+        file.close()
+        file, encoding = fileSource.file(archive + "/dir/doc.xml")
+        assert (encoding, file.read()) == ("ISO-8859-1", DOCUMENT)
+        file.close()
+        fileSource.close()
+
+    @pytest.mark.parametrize("outerCompression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+    def test_nested_archive_read_without_extracting_to_memory(self, tmp_path, outerCompression):
+        inner = self._zip(tmp_path / "inner.zip", **{"doc.xml": b"<r>inner</r>"})
+        with open(inner, "rb") as fh:
+            outer = self._zip(tmp_path / "outer.zip", outerCompression, **{"in__inner.zip": fh.read()})
+        outerFileSource = openFileSource(outer, _cntlr())
+        outerFileSource.open()
+        with patch("arelle.FileSource.openFileStream", wraps=openFileStream) as openedFileStream:
+            fileSource = openFileSource(outer + "/in/inner.zip", _cntlr(), sourceFileSource=outerFileSource)
+
+        openedFileStream.assert_not_called() # read from the source file source, not by opening outer again
+        assert fileSource.containingFileSource is None
+        assert fileSource.dir == ["doc.xml"]
+        assert not isinstance(fileSource.nestedArchiveStream, io.BytesIO)
+        assert fileSource.file(outer + "/in/inner.zip/doc.xml", binary=True)[0].read() == b"<r>inner</r>"
+        nestedArchiveStream = fileSource.nestedArchiveStream
+        fileSource.close()
+        assert nestedArchiveStream.closed
+        assert outerFileSource.isOpen and outerFileSource.dir == ["in/inner.zip"]
+        outerFileSource.close()
+
+    def test_nested_archive_without_source_opens_and_closes_its_container(self, tmp_path):
+        inner = self._zip(tmp_path / "inner.zip", **{"doc.xml": b"<r>inner</r>"})
+        with open(inner, "rb") as fh:
+            outer = self._zip(tmp_path / "outer.zip", **{"inner.zip": fh.read()})
+        fileSource = FileSource(outer + "/inner.zip", _cntlr())
+        fileSource.open()
+        containingFileSource = fileSource.containingFileSource
+
+        assert containingFileSource is not None and containingFileSource.isOpen
+        assert fileSource.file(outer + "/inner.zip/doc.xml", binary=True)[0].read() == b"<r>inner</r>"
+        fileSource.close()
+        assert not containingFileSource.isOpen
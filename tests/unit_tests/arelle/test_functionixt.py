@@ -0,0 +1,52 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from arelle import FunctionIxt
+from arelle.ModelValue import qname
+from arelle.formula.XPathContext import FunctionArgType
+
+TR4 = FunctionIxt.ixtNamespaces["ixt v4"]
+
+
+class TestTransform:
+    def test_registry_transform(self):
+        transformResults = {}
+        assert FunctionIxt.transform(qname(TR4, "ixt:num-dot-decimal"), "1,234.50", transformResults) == "1234.5"
+        assert FunctionIxt.transform(qname(TR4, "ixt:date-day-monthname-year-en"), "31 December 2020", transformResults) == "2020-12-31"
+        assert FunctionIxt.transform(qname(TR4, "ixt:num-dot-decimal"), "1,234.50") == "1234.5"
+
+    def test_repeated_inputs_are_transformed_once(self):
+        function = Mock(return_value="1")
+        transformResults = {}
+        with patch.dict(FunctionIxt.ixtFunctions, {(TR4, "num-dot-decimal"): function}):
+            results = [FunctionIxt.transform(qname(TR4, "ixt:num-dot-decimal"), "one", transformResults) for _i in range(3)]
+
+        assert results == ["1", "1", "1"]
+        function.assert_called_once_with("one")
+
+    def test_repeated_invalid_inputs_raise_new_transform_exceptions(self):
+        fmt = qname(TR4, "ixt:num-dot-decimal")
+        transformResults = {}
+        raised = []
+        for _i in range(3):
+            with pytest.raises(FunctionArgType) as excinfo:
+                FunctionIxt.transform(fmt, "not a number", transformResults)
+            assert excinfo.value.expectedType == "ixt:numdotdecimalType"
+            assert excinfo.value.args == ("[err:XPTY0004]: Arg 1 expected type ixt:numdotdecimalType",)
+            raised.append(excinfo.value)
+
+        assert len(transformResults) == 1
+        assert len(set(map(id, raised))) == 3
+
+    def test_results_are_not_added_beyond_maximum_size(self):
+        transformResults = {}
+        with patch.object(FunctionIxt, "transformResultsMaxSize", 1):
+            FunctionIxt.transform(qname(TR4, "ixt:num-dot-decimal"), "1", transformResults)
+            FunctionIxt.transform(qname(TR4, "ixt:num-dot-decimal"), "2", transformResults)
+
+        assert list(transformResults) == [(TR4, "num-dot-decimal", "1")]
+
+    def test_unknown_transform_raises_key_error(self):
+        with pytest.raises(KeyError, match="no-such-transform"):
+            FunctionIxt.transform(qname(TR4, "ixt:no-such-transform"), "1", {})
@@ -0,0 +1,30 @@
+from unittest.mock import Mock, patch
+
+from arelle.ModelRelationshipSet import ModelRelationshipSet
+from arelle import XbrlConst
+
+
+def _relationshipSet():
+    modelXbrl = Mock(baseSets={}, relationshipSets={}, urlDocs={"a.xsd": Mock()})
+    return ModelRelationshipSet(modelXbrl, XbrlConst.conceptLabel)
+
+
+class TestModelRelationshipSetLabelTables:
+    def test_label_found_once_per_role_and_lang(self):
+        relSet = _relationshipSet()
+        concept = Mock()
+        with patch.object(ModelRelationshipSet, "findLabel", return_value="Label") as findLabel:
+            assert relSet.label(concept, XbrlConst.standardLabel, "en") == "Label"
+            assert relSet.label(concept, XbrlConst.standardLabel, "en") == "Label"
+            assert relSet.label(concept, XbrlConst.terseLabel, "en") == "Label"
+            assert relSet.label(concept, XbrlConst.standardLabel, "en", returnMultiple=True) == "Label"
+
+        assert findLabel.call_count == 3
+
+    def test_label_tables_discarded_when_dts_changes(self):
+        relSet = _relationshipSet()
+        concept = Mock()
+        with patch.object(ModelRelationshipSet, "findLabel", side_effect=["Label", "Changed"]):
+            assert relSet.label(concept, XbrlConst.standardLabel, "en") == "Label"
+            relSet.modelXbrl.urlDocs["b.xml"] = Mock()
+            assert relSet.label(concept, XbrlConst.standardLabel, "en") == "Changed"
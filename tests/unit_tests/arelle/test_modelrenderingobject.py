@@ -0,0 +1,42 @@
+from unittest.mock import Mock
+
+from arelle.ModelFormulaObject import Aspect
+from arelle.ModelRenderingObject import TableFactIndex
+from arelle.ModelValue import qname
+
+CONCEPT = qname("{http://example.com}Item")
+DIMENSION = qname("{http://example.com}Dimension")
+TYPED_DIMENSION = qname("{http://example.com}TypedDimension")
+DEFAULT_MEMBER = qname("{http://example.com}Total")
+MEMBER = qname("{http://example.com}Member")
+
+
+def _fact(dims):
+    qnameDims = {dim: Mock(isExplicit=member is not None, memberQname=member) for dim, member in dims.items()}
+    return Mock(qname=CONCEPT, isItem=True, context=Mock(qnameDims=qnameDims))
+
+
+def _index(facts):
+    modelXbrl = Mock(factsInInstance=facts,
+                     qnameConcepts={CONCEPT: Mock(isItem=True), DIMENSION: Mock(), TYPED_DIMENSION: Mock()},
+                     qnameDimensionDefaults={DIMENSION: DEFAULT_MEMBER})
+    return TableFactIndex(Mock(modelXbrl=modelXbrl, filterRelationships=[]), None)
+
+
+class TestTableFactIndex:
+    def test_cell_facts_match_explicit_members(self):
+        defaulted = _fact({})
+        member = _fact({DIMENSION: MEMBER})
+        index = _index([defaulted, member, _fact({TYPED_DIMENSION: None})])
+
+        assert index.cellFacts({Aspect.CONCEPT: CONCEPT, DIMENSION: MEMBER}) == [member]
+        assert index.cellFacts({Aspect.CONCEPT: CONCEPT, DIMENSION: DEFAULT_MEMBER}) == [defaulted]
+        assert index.cellFacts({Aspect.CONCEPT: CONCEPT}) == [defaulted]
+        assert index.cellFacts({Aspect.CONCEPT: qname("{http://example.com}Other")}) is None
+
+    def test_cells_not_indexable_are_not_looked_up(self):
+        index = _index([_fact({})])
+
+        assert index.cellFacts({}) is None
+        assert index.cellFacts({Aspect.CONCEPT: CONCEPT, DIMENSION: None}) is None
+        assert index.cellFacts({Aspect.CONCEPT: CONCEPT, TYPED_DIMENSION: "1"}) is None
@@ -0,0 +1,93 @@
+from unittest.mock import patch
+
+import pytest
+
+from arelle.Cntlr import Cntlr
+from arelle.ModelVersReport import ModelVersReport
+
+XBRLI_XSD = """<schema xmlns="http://www.w3.org/2001/XMLSchema" targetNamespace="http://www.xbrl.org/2003/instance">
+<element name="item" abstract="true"/>
+<element name="tuple" abstract="true"/>
+</schema>"""
+
+LINKBASE_REF = ('<link:linkbaseRef xlink:type="simple" xlink:href="{}" '
+                'xlink:arcrole="http://www.w3.org/1999/xlink/properties/linkbase"/>')
+
+LABEL = ('<link:label xlink:type="resource" xlink:label="{0}_{1}" xlink:role="http://www.xbrl.org/2003/role/{1}" '
+         'xml:lang="en">{2}</link:label><link:labelArc xlink:type="arc" '
+         'xlink:arcrole="http://www.xbrl.org/2003/arcrole/concept-label" xlink:from="{0}" xlink:to="{0}_{1}"/>')
+
+PRESENTATION_ARC = ('<link:presentationArc xlink:type="arc" xlink:arcrole="http://www.xbrl.org/2003/arcrole/parent-child" '
+                    'xlink:from="{}" xlink:to="{}" order="{}"/>')
+
+CONCEPTS = "ABCDE"
+
+
+def _writeDTS(directory, periodTypes, nillables, labels, tree):
+    directory.mkdir(parents=True)
+    (directory / "xbrli.xsd").write_text(XBRLI_XSD)
+    (directory / "v.xsd").write_text(
+        '<schema xmlns="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance" '
+        'xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink" '
+        'targetNamespace="http://example.com/v">'
+        '<annotation><appinfo>' + LINKBASE_REF.format("lab.xml") + LINKBASE_REF.format("pre.xml") + '</appinfo></annotation>'
+        '<import namespace="http://www.xbrl.org/2003/instance" schemaLocation="xbrli.xsd"/>' +
+        "".join('<element name="{0}" id="v_{0}" type="string" substitutionGroup="xbrli:item" '
+                'xbrli:periodType="{1}" nillable="{2}"/>'.format(name, periodTypes.get(name, "duration"),
+                                                                 str(name in nillables).lower())
+                for name in CONCEPTS) +
+        '</schema>')
+    locators = "".join('<link:loc xlink:type="locator" xlink:href="v.xsd#v_{0}" xlink:label="{0}"/>'.format(name)
+                       for name in CONCEPTS)
+    (directory / "lab.xml").write_text(
+        '<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink">'
+        '<link:labelLink xlink:type="extended" xlink:role="http://www.xbrl.org/2003/role/link">' + locators +
+        "".join(LABEL.format(name, role, text) for name, role, text in labels) +
+        '</link:labelLink></link:linkbase>')
+    (directory / "pre.xml").write_text(
+        '<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink">'
+        '<link:presentationLink xlink:type="extended" xlink:role="http://www.xbrl.org/2003/role/link">' + locators +
+        "".join(PRESENTATION_ARC.format(*arc) for arc in tree) +
+        '</link:presentationLink></link:linkbase>')
+    return str(directory / "v.xsd")
+
+
+def _versioningReport(tmp_path, fingerprints):
+    cntlr = Cntlr(logFileName="logToBuffer")
+    cntlr.webCache.workOffline = True
+    labels = [(name, "label", "Label " + name) for name in CONCEPTS]
+    tree = [("A", "B", 1), ("A", "C", 2), ("C", "D", 1)]
+    fromDTS = _writeDTS(tmp_path / "from", {}, {"A"}, labels, tree + [("B", "E", 1)])
+    toDTS = _writeDTS(tmp_path / "to", {"B": "instant"}, {"A", "D"},
+                      labels + [("C", "terseLabel", "C")], tree + [("C", "E", 2)])
+    for dts in (fromDTS, toDTS):
+        modelXbrl = cntlr.modelManager.load(dts)
+        assert not modelXbrl.errors
+    reportFile = str(tmp_path / "report.xml")
+    if fingerprints:
+        cntlr.modelManager.compareDTSes(reportFile)
+    else:
+        with patch.object(ModelVersReport, "conceptFingerprint", lambda self, dts, concept: object()), \
+             patch.object(ModelVersReport, "relationshipTreeFingerprint", lambda self, *args, **kwargs: None):
+            cntlr.modelManager.compareDTSes(reportFile)
+    with open(reportFile, encoding="utf-8") as fh:
+        report = [line for line in fh if "Generated by Arelle" not in line]
+    cntlr.modelManager.close()
+    cntlr.close()
+    return "".join(report)
+
+
+@pytest.fixture
+def report(tmp_path):
+    return _versioningReport(tmp_path / "fingerprints", fingerprints=True)
+
+
+def test_fingerprints_do_not_change_events(tmp_path, report):
+    assert report == _versioningReport(tmp_path / "detailed", fingerprints=False)
+
+
+def test_events_of_changes_are_reported(report):
+    for event in ("vercd:conceptPeriodTypeChange", "vercd:conceptNillableChange", "vercd:conceptLabelAdd",
+                  "verrels:relationshipSetModelDelete", "verrels:relationshipSetModelAdd"):
+        assert event in report
+    assert 'name="v:A"' not in report.replace('fromName="v:A"', "").replace('toName="v:A"', "")
@@ -1,6 +1,9 @@
-from mock import Mock
+import zipfile
+
+from mock import Mock, patch
 
 from arelle import PackageManager
+from arelle.Cntlr import Cntlr
 
 
 def test_package_manager_init_first_pass():
@@ -63,3 +66,144 @@ def test_package_manager_reset():
     assert len(PackageManager.packagesConfig) == 0
     assert len(PackageManager.packagesMappings) == 0
     assert PackageManager._cntlr == cntlr
+
+
+def test_package_manager_mapped_url_with_thousands_of_remappings():
+    """
+    Test that the longest remapping prefix of thousands applies, and that rebuildRemappings refreshes them
+    """
+    cntlr = Mock()
+    PackageManager.init(cntlr, loadPackagesConfig=False)
+    packages = [{'URL': 'http://example.com/package{}.zip'.format(i), 'status': 'enabled',
+                 'remappings': {'http://example.com/taxonomy{}/'.format(i): '/packages/{}/'.format(i),
+                                'http://example.com/taxonomy{}/2023/'.format(i): '/packages/{}-2023/'.format(i)}}
+                for i in range(2500)]
+    PackageManager.packagesConfig['packages'].extend(packages)
+    PackageManager.rebuildRemappings(cntlr)
+    assert len(PackageManager.packagesConfig['remappings']) == 5000
+
+    assert PackageManager.isMappedUrl('http://example.com/taxonomy1234/2023/a.xsd')
+    assert PackageManager.mappedUrl('http://example.com/taxonomy1234/2023/a.xsd') == '/packages/1234-2023/a.xsd'
+    assert PackageManager.mappedUrl('http://example.com/taxonomy123/a.xsd') == '/packages/123/a.xsd'
+    assert not PackageManager.isMappedUrl('http://example.com/taxonomy/a.xsd')
+    assert PackageManager.mappedUrl('http://example.com/taxonomy/a.xsd') == 'http://example.com/taxonomy/a.xsd'
+
+    packages[1234]['status'] = 'disabled'
+    PackageManager.rebuildRemappings(cntlr)
+    assert not PackageManager.isMappedUrl('http://example.com/taxonomy1234/2023/a.xsd')
+    PackageManager.close()
+
+
+def test_package_manager_mapped_url_already_mapped():
+    """
+    Test that a url starting with a remapping's replacement is not remapped again
+    """
+    cntlr = Mock()
+    PackageManager.init(cntlr, loadPackagesConfig=False)
+    PackageManager.packagesConfig['remappings'].update({'http://example.com/': 'http://example.com/package/'})
+    assert not PackageManager.isMappedUrl('http://example.com/package/a.xsd')
+    assert PackageManager.mappedUrl('http://example.com/package/a.xsd') == 'http://example.com/package/a.xsd'
+    assert PackageManager.mappedUrl('http://example.com/a.xsd') == 'http://example.com/package/a.xsd'
+    PackageManager.close()
+
+
+def test_package_manager_package_info_cached_until_package_changes(tmp_path):
+    """
+    Test that a package's info and validation messages are cached, and that it is revalidated when changed
+    """
+    cntlr = Mock(userAppDir=str(tmp_path), hasFileSystem=True, disablePersistentConfig=False)
+    cntlr.webCache.getfilename.side_effect = lambda url, **kwargs: url
+    package = tmp_path / 'package.zip'
+    package.write_bytes(b'package')
+    PackageManager.init(cntlr, loadPackagesConfig=False)
+
+    def packageFileInfo(cntlr, URL, packageFilename, packageManifestName=None, errors=[]):
+        cntlr.addToLog('Package message', messageCode='tpe:message')
+        errors.append('tpe:message')
+        return {'URL': URL, 'name': 'package', 'remappings': {}}
+
+    with patch('arelle.PackageManager.packageFileInfo', side_effect=packageFileInfo) as packageFileInfoMock:
+        for i in range(2):
+            errors = []
+            assert PackageManager.packageInfo(cntlr, str(package), errors=errors)['name'] == 'package'
+            assert errors == ['tpe:message']
+        assert packageFileInfoMock.call_count == 1
+        assert cntlr.addToLog.call_count == 2
+
+        PackageManager.init(cntlr, loadPackagesConfig=False) # cache is reloaded from userAppDir
+        PackageManager.packageInfo(cntlr, str(package))
+        assert packageFileInfoMock.call_count == 1
+
+        package.write_bytes(b'changed package')
+        PackageManager.packageInfo(cntlr, str(package))
+        assert packageFileInfoMock.call_count == 2
+    PackageManager.close()
+
+
+def _writeTaxonomyPackage(path, name, catalog):
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr(name + '/META-INF/taxonomyPackage.xml',
+                    '<?xml version="1.0" encoding="utf-8"?>'
+                    '<tp:taxonomyPackage xml:lang="en" xmlns:tp="http://xbrl.org/2016/taxonomy-package">'
+                    '<tp:identifier>http://example.com/{0}</tp:identifier><tp:name>{0}</tp:name><tp:version>1.0</tp:version>'
+                    '<tp:entryPoints><tp:entryPoint><tp:name>{0} entry point</tp:name>'
+                    '<tp:entryPointDocument href="http://example.com/{0}/a.xsd"/></tp:entryPoint></tp:entryPoints>'
+                    '</tp:taxonomyPackage>'.format(name))
+        zf.writestr(name + '/META-INF/catalog.xml', catalog)
+        zf.writestr(name + '/taxonomy/a.xsd', '<schema xmlns="http://www.w3.org/2001/XMLSchema"/>')
+
+
+def test_package_manager_index_packages_matches_serial_package_info(tmp_path, monkeypatch):
+    """
+    Test that packages indexed in parallel by indexPackages give packageInfo the infos, errors and messages of
+    validating each package serially
+    """
+    cntlr = Cntlr(logFileName='logToBuffer')
+    cntlr.webCache.workOffline = True
+    cntlr.webCache.cacheDir = str(tmp_path / 'cache')
+    schemasDir = tmp_path / 'cache' / 'http' / 'www.xbrl.org' / '2016'
+    schemasDir.mkdir(parents=True)
+    for schema, namespace, element in (('taxonomy-package.xsd', 'http://xbrl.org/2016/taxonomy-package', 'taxonomyPackage'),
+                                       ('taxonomy-package-catalog.xsd', 'urn:oasis:names:tc:entity:xmlns:xml:catalog', 'catalog')):
+        (schemasDir / schema).write_text(
+            '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="{}" elementFormDefault="qualified">'
+            '<xs:element name="{}"><xs:complexType><xs:sequence>'
+            '<xs:any processContents="lax" minOccurs="0" maxOccurs="unbounded"/></xs:sequence>'
+            '<xs:anyAttribute processContents="lax"/></xs:complexType></xs:element></xs:schema>'.format(namespace, element))
+    URLs = [str(tmp_path / 'package1.zip'), str(tmp_path / 'package2.zip')]
+    _writeTaxonomyPackage(URLs[0], 'package1',
+                          '<catalog xmlns="urn:oasis:names:tc:entity:xmlns:xml:catalog">'
+                          '<rewriteURI uriStartString="http://example.com/package1/" rewritePrefix="../taxonomy/"/></catalog>')
+    _writeTaxonomyPackage(URLs[1], 'package2', '<catalog') # invalid catalog, logs an error
+    PackageManager.init(cntlr, loadPackagesConfig=False)
+    monkeypatch.setattr(PackageManager, 'packagesCacheJsonFile', None)
+
+    def packageInfos(indexInParallel):
+        PackageManager.packagesCache = None
+        cntlr.logHandler.logRecordBuffer.clear()
+        with patch('arelle.PackageManager.packageFileInfo', wraps=PackageManager.packageFileInfo) as packageFileInfoMock:
+            if indexInParallel:
+                PackageManager.indexPackages(cntlr, URLs)
+                assert packageFileInfoMock.call_count == 2
+            errors = []
+            infos = [PackageManager.packageInfo(cntlr, URL, errors=errors) for URL in URLs]
+            assert packageFileInfoMock.call_count == 2 # packageInfo used the indexed packages
+        messages = [(record.messageCode, record.getMessage()) for record in cntlr.logHandler.logRecordBuffer]
+        return infos, errors, messages
+
+    serialInfos, serialErrors, serialMessages = packageInfos(indexInParallel=False)
+    assert [info['name'] for info in serialInfos] == ['package1', 'package2']
+    assert serialErrors == ['tpe:invalidCatalogFile']
+    assert [code for code, _message in serialMessages] == ['tpe:invalidCatalogFile']
+    assert packageInfos(indexInParallel=True) == (serialInfos, serialErrors, serialMessages)
+    PackageManager.close()
+    cntlr.close()
+
+
+def test_package_manager_package_cache_key_has_arelle_version():
+    """
+    Test that cached package infos are not used by another version of Arelle, which may validate packages differently
+    """
+    key = PackageManager.packageCacheKey('http://example.com/package.zip', None)
+    with patch.object(PackageManager.Version, '__version__', PackageManager.Version.__version__ + '.other'):
+        assert PackageManager.packageCacheKey('http://example.com/package.zip', None) != key
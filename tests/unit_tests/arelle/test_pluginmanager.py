@@ -4,7 +4,7 @@ import os
 import sys
 
 import pytest
-from mock import Mock
+from mock import Mock, patch
 
 from arelle import PluginManager
 from arelle.Cntlr import Cntlr
@@ -172,5 +172,97 @@ def test_function_loadModule():
 
     PluginManager.close()
 
+PARENT_PLUGIN = """
+def parentHook():
+    pass
+
+__pluginInfo__ = {
+    'name': 'Deferring Parent',
+    'version': '1.0',
+    'import': ('deferredChild.py',),
+    'Parent.Hook': parentHook,
+}
+"""
+
+CHILD_PLUGIN = """
+def childHook():
+    return 'child'
+
+__pluginInfo__ = {
+    'name': 'Deferred Child',
+    'version': '1.0',
+    'Child.Hook': childHook,
+}
+"""
+
+
+def _pluginCntlr(tmp_path):
+    pluginDir = tmp_path / 'plugin'
+    pluginDir.mkdir()
+    (pluginDir / 'deferringParent.py').write_text(PARENT_PLUGIN)
+    (pluginDir / 'deferredChild.py').write_text(CHILD_PLUGIN)
+    cntlr = Mock(pluginDir=str(pluginDir), userAppDir=str(tmp_path), hasFileSystem=True, disablePersistentConfig=False)
+    cntlr.webCache.getfilename.side_effect = lambda url, base=None, **kwargs: os.path.join(base, url)
+    PluginManager.init(cntlr, loadPluginConfig=False)
+    return pluginDir
+
+
+def test_module_info_cached_until_module_changes(tmp_path):
+    """
+    Test that a scanned module info is cached in the plug-in manifests until its module files change
+    """
+    pluginDir = _pluginCntlr(tmp_path)
+    with patch('arelle.PluginManager.scanModuleInfo', wraps=PluginManager.scanModuleInfo) as scanModuleInfo:
+        moduleInfo = PluginManager.moduleModuleInfo('deferringParent.py')
+        assert scanModuleInfo.call_count == 2 # parent and its imported child
+        PluginManager.pluginManifests = None # manifests are reloaded from userAppDir
+        assert PluginManager.moduleModuleInfo('deferringParent.py') == moduleInfo
+        assert scanModuleInfo.call_count == 2
+
+        (pluginDir / 'deferredChild.py').write_text(CHILD_PLUGIN + "\n# changed\n")
+        PluginManager.moduleModuleInfo('deferringParent.py')
+        assert scanModuleInfo.call_count == 4
+
+
+def test_imported_module_import_deferred_until_class_method_dispatched(tmp_path):
+    """
+    Test that once its class methods are known, an imported plug-in module is only imported when one is dispatched
+    """
+    _pluginCntlr(tmp_path)
+    moduleInfo = PluginManager.addPluginModuleInfo(PluginManager.moduleModuleInfo('deferringParent.py'))
+    PluginManager.loadModule(moduleInfo)
+    assert 'Deferred Child' in PluginManager.modulePluginInfos # class methods not yet known, imported with parent
+
+    PluginManager.reset()
+    PluginManager.loadModule(moduleInfo)
+    assert 'Deferring Parent' in PluginManager.modulePluginInfos
+    assert 'Deferred Child' not in PluginManager.modulePluginInfos
+    assert [method() for method in PluginManager.pluginClassMethods('Child.Hook')] == ['child']
+    assert 'Deferred Child' in PluginManager.moduleImportTimes
+
+
+def test_plugin_class_methods_dispatch_table(tmp_path):
+    """
+    Test that a class's dispatch table is kept until the class's modules change, and that profiling collects its stats
+    """
+    _pluginCntlr(tmp_path)
+    PluginManager.addPluginModuleInfo(PluginManager.moduleModuleInfo('deferringParent.py'))
+    dispatchTable = PluginManager.pluginClassMethods('Child.Hook')
+    assert isinstance(dispatchTable, tuple) and len(dispatchTable) == 1
+    assert PluginManager.pluginClassMethods('Child.Hook') is dispatchTable
+    assert PluginManager.pluginClassMethods('Unknown.Hook') == ()
+
+    PluginManager.removePluginModule('Deferring Parent')
+    assert PluginManager.pluginClassMethods('Child.Hook') == ()
+
+    PluginManager.addPluginModuleInfo(PluginManager.moduleModuleInfo('deferringParent.py'))
+    PluginManager.setCollectClassMethodStats(True)
+    try:
+        assert [method() for method in PluginManager.pluginClassMethods('Child.Hook')] == ['child']
+        assert PluginManager.classMethodStats[('Child.Hook', 'Deferred Child')][0] == 1
+    finally:
+        PluginManager.setCollectClassMethodStats(False)
+
+
 def teardown_function():
     PluginManager.close()
@@ -0,0 +1,42 @@
+import os
+from unittest.mock import patch
+
+from lxml.etree import DTD
+
+from arelle import ValidateFilingText
+from arelle.ValidateFilingText import textBlockFindings
+
+CONFIG_DIR = os.path.join(os.path.dirname(ValidateFilingText.__file__), "config")
+
+
+def _findings(value, isInline=False):
+    with open(os.path.join(CONFIG_DIR, "xhtml1-strict-ix.dtd" if isInline else "edbody.dtd")) as fh:
+        dtd = DTD(fh)
+    with patch.object(ValidateFilingText, "edbodyDTD", dtd), patch.object(ValidateFilingText, "isInlineDTD", isInline):
+        return textBlockFindings(value, None, {"data-scheme": True, "mime-types": ["png"], "img-file-extensions": ["gif", "png"]})
+
+
+class TestTextBlockFindings:
+    def test_valid_text_block_has_no_findings(self):
+        assert _findings("<p>Fine &amp; dandy</p>") == []
+
+    def test_findings_in_document_order(self):
+        assert _findings("<p>&foo;<a href='javascript:x()'>a</a><img src='a.bmp'/><img src='b.gif'/><img src='b.gif'/></p>"
+                         "<table><tr><td><table><tr><td>x</td></tr></table></td></tr></table>") == [
+            ("entity", "&foo;"),
+            ("activeContent", "href", "a"),
+            ("graphicFileType", "a.bmp", "img"),
+            ("graphicFile", "b.gif", "img"),
+            ("nestedTable",),
+        ]
+
+    def test_inline_disallowed_elements_have_source_lines(self):
+        findings = _findings("<p>x</p>\n<form>y</form>", isInline=True)
+
+        assert ("disallowedElement", 3, "form") in findings
+
+    def test_xml_error(self):
+        [(kind, error)] = _findings("<p>unclosed <b>x</p>")
+
+        assert kind == "xmlError"
+        assert error.startswith("Opening and ending tag mismatch")
@@ -0,0 +1,38 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from arelle import ViewFile
+
+
+def _writeView(path, streamedRows):
+    with patch("arelle.ViewFile.STREAMED_ROWS", streamedRows):
+        view = ViewFile.View(Mock(), str(path), "Fact List")
+        view.addRow(["Concept", "Value"], asHeader=True)
+        for i in range(5):
+            view.addRow(["Parent{}".format(i), str(i)], treeIndent=0)
+            view.addRow(["Child{}".format(i), "<{}&>".format(i)], treeIndent=1)
+        view.close()
+    return path.read_text(encoding="utf-8")
+
+
+class TestViewFile:
+    @pytest.mark.parametrize("extension", ["html", "xml", "json"])
+    def test_streamed_rows_match_document_written_at_close(self, tmp_path, extension):
+        inMemory = _writeView(tmp_path / ("inMemory." + extension), streamedRows=100)
+        streamed = _writeView(tmp_path / ("streamed." + extension), streamedRows=2)
+
+        assert streamed == inMemory
+        assert "Child4" in streamed
+
+    def test_unwritable_streamed_output_is_logged(self, tmp_path):
+        modelXbrl = Mock()
+        with patch("arelle.ViewFile.STREAMED_ROWS", 1):
+            view = ViewFile.View(modelXbrl, str(tmp_path / "missing" / "facts.json"), "Fact List")
+            view.addRow(["Concept"], asHeader=True)
+            for i in range(3):
+                view.addRow(["Concept{}".format(i)])
+            view.close()
+
+        modelXbrl.exception.assert_called_once()
+        assert modelXbrl.exception.call_args.args[0] == "arelle:htmlIOError"
@@ -0,0 +1,139 @@
+import logging
+from unittest.mock import Mock, patch
+
+import pytest
+
+from arelle import RenderingEvaluator, RenderingResolver, ViewFileRenderedGrid
+from arelle.Cntlr import Cntlr
+from arelle.ModelFormulaObject import FormulaOptions
+from arelle.formula.ParallelEvaluator import parallelEvaluationAvailable
+
+TABLE_LINKROLES = [("http://example.com/role/table{}".format(i), "Table {}".format(i)) for i in range(5)]
+
+XBRLI_XSD = """<schema xmlns="http://www.w3.org/2001/XMLSchema" targetNamespace="http://www.xbrl.org/2003/instance">
+<element name="item" abstract="true"/>
+</schema>"""
+
+TABLE_XSD = """<schema xmlns="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance"
+ xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink"
+ xmlns:gen="http://xbrl.org/2008/generic" targetNamespace="http://example.com/t">
+<annotation><appinfo>
+<link:linkbaseRef xlink:type="simple" xlink:href="table.xml" xlink:arcrole="http://www.w3.org/1999/xlink/properties/linkbase"/>
+<link:roleType roleURI="http://example.com/role/table" id="table"><link:definition>Table</link:definition><link:usedOn>gen:link</link:usedOn></link:roleType>
+</appinfo></annotation>
+<import namespace="http://www.xbrl.org/2003/instance" schemaLocation="xbrli.xsd"/>
+<element name="R1" id="t_R1" type="string" substitutionGroup="xbrli:item" xbrli:periodType="instant"/>
+<element name="R2" id="t_R2" type="string" substitutionGroup="xbrli:item" xbrli:periodType="instant"/>
+</schema>"""
+
+TABLE_LINKBASE = """<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink"
+ xmlns:gen="http://xbrl.org/2008/generic" xmlns:table="http://xbrl.org/2014/table" xmlns:formula="http://xbrl.org/2008/formula"
+ xmlns:label="http://xbrl.org/2008/label" xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:t="http://example.com/t">
+<gen:link xlink:type="extended" xlink:role="http://example.com/role/table">
+<table:table xlink:type="resource" xlink:label="table" parentChildOrder="parent-first"/>
+{}
+</gen:link>
+</link:linkbase>"""
+
+RULE_NODE = """<table:ruleNode xlink:type="resource" xlink:label="{0}">{1}</table:ruleNode>
+<label:label xlink:type="resource" xlink:label="{0}_label" xlink:role="http://www.xbrl.org/2008/role/label" xml:lang="en">{2}</label:label>
+<gen:arc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/element-label" xlink:from="{0}" xlink:to="{0}_label"/>"""
+
+NON_STANDARD_LABEL = """<label:label xlink:type="resource" xlink:label="{0}_{1}" xlink:role="{2}" xml:lang="en">{3}</label:label>
+<gen:arc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/element-label" xlink:from="{0}" xlink:to="{0}_{1}"/>"""
+
+TABLE_ARC = """<table:{0} xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2014/{1}" xlink:from="{2}" xlink:to="{3}" order="{4}"{5}/>"""
+
+
+def _tableLinkbase():
+    nodes = []
+    for axis in ("x", "y", "z"):
+        nodes.append('<table:breakdown xlink:type="resource" xlink:label="{0}" parentChildOrder="parent-first"/>'.format(axis))
+        nodes.append(TABLE_ARC.format("tableBreakdownArc", "table-breakdown", "table", axis, 1, ' axis="{}"'.format(axis)))
+    nodes.append(RULE_NODE.format("x1", "<formula:period><formula:instant value=\"xs:date('2020-12-31')\"/></formula:period>", "Column"))
+    nodes.append(TABLE_ARC.format("breakdownTreeArc", "breakdown-tree", "x", "x1", 1, ""))
+    nodes.append('<table:ruleNode xlink:type="resource" xlink:label="y0" abstract="true"/>')
+    nodes.append(TABLE_ARC.format("breakdownTreeArc", "breakdown-tree", "y", "y0", 1, ""))
+    for i in (1, 2):
+        nodes.append(RULE_NODE.format("y{}".format(i), "<formula:concept><formula:qname>t:R{}</formula:qname></formula:concept>".format(i),
+                                      "Row {}".format(i)))
+        nodes.append(NON_STANDARD_LABEL.format("y{}".format(i), "code", "http://www.eurofiling.info/xbrl/role/rc-code", "0{}0".format(i)))
+        nodes.append(NON_STANDARD_LABEL.format("y{}".format(i), "documentation", "http://www.xbrl.org/2008/role/documentation",
+                                               "Documentation of row {}".format(i)))
+        nodes.append(TABLE_ARC.format("definitionNodeSubtreeArc", "definition-node-subtree", "y0", "y{}".format(i), i, ""))
+    for i in (1, 2, 3):
+        nodes.append(RULE_NODE.format("z{}".format(i), "<formula:entityIdentifier scheme=\"'http://example.com'\" value=\"'e{}'\"/>".format(i),
+                                      "Entity {}".format(i)))
+        nodes.append(TABLE_ARC.format("breakdownTreeArc", "breakdown-tree", "z", "z{}".format(i), i, ""))
+    return TABLE_LINKBASE.format("\n".join(nodes))
+
+
+def _renderTable(directory, reuseLayouts):
+    directory.mkdir()
+    (directory / "xbrli.xsd").write_text(XBRLI_XSD)
+    (directory / "t.xsd").write_text(TABLE_XSD)
+    (directory / "table.xml").write_text(_tableLinkbase())
+    cntlr = Cntlr(logFileName="logToBuffer")
+    cntlr.webCache.workOffline = True
+    cntlr.modelManager.formulaOptions = FormulaOptions()
+    cntlr.modelManager.loadCustomTransforms()
+    modelXbrl = cntlr.modelManager.load(str(directory / "t.xsd"))
+    RenderingEvaluator.init(modelXbrl)
+    resolveTableAxesStructure = RenderingResolver.resolveTableAxesStructure
+    def resolveTableAxesStructureWithoutReuse(view, table, tblAxisRelSet):
+        view.resolvedLayouts = None
+        return resolveTableAxesStructure(view, table, tblAxisRelSet)
+    with patch("arelle.RenderingResolver.resolveTableAxesStructure",
+               resolveTableAxesStructure if reuseLayouts else resolveTableAxesStructureWithoutReuse):
+        ViewFileRenderedGrid.viewRenderedGrid(modelXbrl, str(directory / "table.html"), lang="en")
+    cntlr.modelManager.close()
+    cntlr.close()
+    return (directory / "table.html").read_text(encoding="utf-8")
+
+
+def _viewRenderedGrid(modelXbrl, outfile, lang=None, viewTblELR=None, cssExtras=""):
+    with open(outfile, "w", encoding="utf-8") as fh:
+        fh.write(viewTblELR)
+    modelXbrl.logger.log(logging.INFO, "rendered %(table)s", {"table": viewTblELR}, extra={"messageCode": "info"})
+
+
+def _renderTables(directory, processes):
+    logger = logging.getLogger("test_viewfilerenderedgrid")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    messages = []
+    handler = logging.Handler()
+    handler.emit = lambda logRecord: messages.append(logRecord.getMessage())
+    logger.handlers = [handler]
+    modelXbrl = Mock(logger=logger, logCount={}, errors=[], errorCaptureLevel=logging.ERROR)
+    modelXbrl.modelDocument.uri = "instance.xml"
+    directory.mkdir()
+    with patch("arelle.ViewFileRenderedGrid.viewRenderedGrid", _viewRenderedGrid), \
+         patch("arelle.ViewFileRenderedGrid.tableLinkroles", return_value=TABLE_LINKROLES):
+        ViewFileRenderedGrid.viewRenderedGrids(modelXbrl, str(directory / "tables.html"), processes=processes)
+    files = {path.name: path.read_text(encoding="utf-8") for path in directory.iterdir()}
+    return files, messages
+
+
+class TestViewRenderedGrids:
+    @pytest.mark.skipif(not parallelEvaluationAvailable(), reason="requires fork")
+    def test_output_does_not_depend_on_processes(self, tmp_path):
+        serialFiles, serialMessages = _renderTables(tmp_path / "serial", processes=0)
+        parallelFiles, parallelMessages = _renderTables(tmp_path / "parallel", processes=3)
+
+        assert parallelFiles == serialFiles
+        assert parallelMessages == serialMessages
+        assert serialMessages == ["rendered {}".format(tblELR) for tblELR, label in TABLE_LINKROLES]
+        assert sorted(serialFiles) == ["tables-{}.html".format(i) for i in range(1, 6)] + ["tables.html"]
+        assert 'href="tables-5.html"' in serialFiles["tables.html"]
+
+
+class TestViewRenderedGrid:
+    def test_reused_layouts_render_as_resolved_layouts(self, tmp_path):
+        reused = _renderTable(tmp_path / "reused", reuseLayouts=True)
+
+        assert reused == _renderTable(tmp_path / "resolved", reuseLayouts=False)
+        for text in ("Entity 1", "Entity 2", "Entity 3"):
+            assert text in reused
+        assert reused.count("Documentation of row 2") == 3
+        assert reused.count(">020<") == 3